@@ -3,25 +3,39 @@
 Video to 3D Converter
 
 Command-line tool for converting 2D videos to stereoscopic 3D formats.
-Supports Half Side-by-Side, Full Side-by-Side, Anaglyph, and Top-Bottom formats.
+Supports Half Side-by-Side, Full Side-by-Side, Anaglyph, and Top-Bottom formats,
+plus 2D + depth for players that render the stereo views themselves.
 """
 
 import argparse
+import contextlib
 import logging
+import shutil
+import subprocess
 import sys
 from pathlib import Path
-import shutil
 import time
+from typing import List, Optional
 
 # Add project root to path
 sys.path.insert(0, str(Path(__file__).parent / "src"))
 
 from src.ai_core.depth_estimation import DepthEstimator
 from src.ai_core.temporal_filter import TemporalFilter
-from src.rendering.dibr_renderer import DIBRRenderer
+from src.rendering.active_area import ActiveArea
+from src.rendering.dibr_renderer import create_renderer
 from src.rendering.sbs_composer import SBSComposer
-from src.video_processing.ffmpeg_handler import FFmpegHandler, AudioHandler
+from src.video_processing.ffmpeg_handler import FFmpegHandler
 from src.video_processing.encoder import VideoEncoder
+from src.video_processing.intermediate_format import (
+    INTERMEDIATE_FORMATS,
+    intermediate_format_key,
+    job_intermediate_format,
+)
+from src.video_processing.job_journal import JobJournal, job_work_dir
+from src.video_processing.output_target import OutputTarget
+from src.video_processing.segmented_converter import SegmentedConverter
+from src.video_processing.static_frames import StaticFrameDetector, REUSE_DEPTH, REUSE_OUTPUT
 import cv2
 import numpy as np
 
@@ -32,56 +46,156 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Parent of the per-input job directories
+WORK_ROOT = Path("temp_video_work")
+
+# Frames redone before the resume point to prime the temporal filter
+RESUME_WARMUP_FRAMES = 12
+
 
 def convert_video(
     input_path: Path,
-    output_path: Path,
+    output_path: Optional[Path],
     output_format: str = "half_sbs",
     depth_intensity: float = 0.75,
     use_temporal_filter: bool = True,
     temporal_method: str = "ema",
     fps: float = None,
+    render_mode: str = "remap",
+    stereo_mode: str = "symmetric",
+    render_backend: str = "opencv",
+    depth_dtype: str = "float32",
+    depth_bits: int = 8,
+    write_metadata: bool = False,
     keep_audio: bool = True,
-    save_intermediate: bool = False
+    all_tracks: bool = False,
+    save_intermediate: bool = False,
+    targets: Optional[List[OutputTarget]] = None,
+    crop_bars: bool = True,
+    depth_smoothing: Optional[str] = "fast_bilateral",
+    workers: int = 1,
+    resume: bool = False,
+    intermediate_format: str = "auto",
+    skip_static: bool = True
 ):
     """
     Convert a 2D video to stereoscopic 3D.
     
     Args:
         input_path: Path to input video
-        output_path: Path for output video
-        output_format: Output format (half_sbs, full_sbs, anaglyph, top_bottom)
+        output_path: Path for output video (ignored if targets are given)
+        output_format: Output format (half_sbs, full_sbs, anaglyph, top_bottom,
+            rgbd_sbs, rgbd_tb, row_interleaved, column_interleaved, checkerboard)
         depth_intensity: Depth effect strength (0.0-1.0)
         use_temporal_filter: Apply temporal filtering to reduce flickering
         temporal_method: Temporal filter method (ema, median, gaussian)
         fps: Optional output FPS (None = same as input)
-        keep_audio: Preserve audio track
+        render_mode: DIBR mode (remap, layered)
+        stereo_mode: symmetric, or left_reference/right_reference to keep
+            the original frame as one eye
+        render_backend: Stereo renderer (opencv, or torch on the depth
+            model's device; remap mode only)
+        depth_dtype: Depth map storage (float32, float16, uint16)
+        depth_bits: Depth precision of 2D + depth output (8 or 10)
+        write_metadata: Write a JSON layout sidecar for 2D + depth output
+        keep_audio: Preserve audio track (stream-copied from the input
+            when the output container allows it)
+        all_tracks: Keep all audio and subtitle tracks, not just the first
+            audio track
         save_intermediate: Save intermediate frames
+        targets: Several outputs (format, resolution, codec, path) produced
+            from one decode, depth and render pass; overrides output_path,
+            output_format and depth_bits
+        crop_bars: Detect letterbox/pillarbox bars and run depth estimation
+            and rendering on the picture inside them only
+        depth_smoothing: Edge-preserving depth smoothing at model resolution
+            (fast_bilateral, bilateral, gaussian, median) or None
+        workers: Convert keyframe-aligned segments in this many processes
+            (each loads its own model) and join them without re-encoding
+        resume: Continue an interrupted conversion with the same settings
+            from its journal instead of starting over
+        intermediate_format: Image format of the frames on disk (png,
+            png_fast, bmp, jpg), or auto to benchmark codec CPU time
+            against disk bandwidth
+        skip_static: Reuse the previous output or depth map for duplicate
+            and near-static frames instead of converting them again
     """
+    if not targets:
+        targets = [OutputTarget(output_format, output_path, depth_bits=depth_bits)]
+    
+    # Work is journaled so a failed or cancelled run can be resumed
+    settings = {
+        "depth_intensity": depth_intensity,
+        "temporal_filter": use_temporal_filter,
+        "temporal_method": temporal_method,
+        "fps": fps,
+        "render_mode": render_mode,
+        "stereo_mode": stereo_mode,
+        "render_backend": render_backend,
+        "depth_dtype": depth_dtype,
+        "depth_smoothing": depth_smoothing,
+        "crop_bars": crop_bars,
+        "segmented": workers > 1,
+        "intermediate_format": intermediate_format_key(intermediate_format),
+        "skip_static": skip_static,
+        "targets": [vars(target) for target in targets],
+    }
+    work_dir = job_work_dir(WORK_ROOT, input_path)
+    journal = JobJournal(work_dir, input_path, settings, resume=resume)
+    image_format = job_intermediate_format(intermediate_format, journal)
+    
+    if workers > 1:
+        if fps is not None:
+            logger.warning("Segmented conversion keeps the input frame rate; ignoring --fps")
+        return _convert_segmented(
+            input_path,
+            targets,
+            workers,
+            depth_intensity=depth_intensity,
+            estimator_options={"depth_dtype": depth_dtype, "smoothing": depth_smoothing},
+            renderer_options={
+                "backend": render_backend,
+                "render_mode": render_mode,
+                "stereo_mode": stereo_mode,
+            },
+            # Same per-frame pipeline as the single-process loop below
+            processor_options={
+                "crop_bars": crop_bars,
+                "hole_filling_method": None,
+                "temporal_filter": use_temporal_filter,
+                "temporal_method": temporal_method,
+                "intermediate_format": image_format.name,
+                "skip_static": skip_static,
+            },
+            write_metadata=write_metadata,
+            keep_audio=keep_audio,
+            all_tracks=all_tracks,
+            save_intermediate=save_intermediate,
+            journal=journal
+        )
+    
     logger.info("=" * 60)
     logger.info("2D to 3D Video Conversion")
     logger.info("=" * 60)
     logger.info(f"Input: {input_path}")
-    logger.info(f"Output: {output_path}")
-    logger.info(f"Format: {output_format}")
+    for target in targets:
+        logger.info(f"Output: {target}")
     logger.info(f"Depth Intensity: {depth_intensity}")
     logger.info(f"Temporal Filtering: {use_temporal_filter} ({temporal_method})")
     
     start_time = time.time()
+    succeeded = False
     
-    # Create working directory
-    work_dir = Path("temp_video_work")
+    # Working directory of this input's job
     frames_dir = work_dir / "frames"
     output_frames_dir = work_dir / "output_frames"
-    audio_path = work_dir / "audio.aac"
     
     try:
-        work_dir.mkdir(exist_ok=True)
         frames_dir.mkdir(exist_ok=True)
         output_frames_dir.mkdir(exist_ok=True)
         
         # Step 1: Get video information
-        logger.info("\n[1/6] Analyzing video...")
+        logger.info("\n[1/5] Analyzing video...")
         ffmpeg = FFmpegHandler()
         video_info = ffmpeg.get_video_info(input_path)
         
@@ -93,116 +207,272 @@ def convert_video(
         
         output_fps = fps or video_info['fps']
         
-        # Step 2: Extract audio if present
-        has_audio = False
-        if keep_audio and video_info['has_audio']:
-            logger.info("\n[2/6] Extracting audio...")
-            audio_handler = AudioHandler()
-            has_audio = audio_handler.extract_audio(input_path, audio_path)
-        else:
-            logger.info("\n[2/6] Skipping audio extraction")
+        # Shot boundaries (in output frames), where the temporal filter starts over
+        scene_cuts = set()
+        if use_temporal_filter:
+            try:
+                scene_index = ffmpeg.get_scene_index(input_path)
+                scene_cuts = {round(cut * output_fps / video_info['fps']) for cut in scene_index.cuts}
+                logger.info(f"  Shots: {len(scene_index)}")
+            except (subprocess.CalledProcessError, ValueError) as e:
+                logger.warning(f"  Scene detection failed, filtering across cuts: {e}")
+        
+        # Audio is muxed straight from the input when encoding
+        audio_source = input_path if keep_audio and (video_info['has_audio'] or all_tracks) else None
         
         # Step 3: Extract frames
-        logger.info("\n[3/6] Extracting frames...")
-        frame_count = ffmpeg.extract_frames(
-            input_path,
-            frames_dir,
-            frame_pattern="frame_%06d.png",
-            fps=output_fps
-        )
-        logger.info(f"  Extracted {frame_count} frames")
+        if journal.is_stage_done("extract"):
+            logger.info("\n[2/5] Frames already extracted")
+            frame_count = len(list(frames_dir.glob(image_format.glob)))
+        else:
+            logger.info(f"\n[2/5] Extracting frames ({image_format.name})...")
+            frame_count = ffmpeg.extract_frames(
+                input_path,
+                frames_dir,
+                fps=output_fps,
+                intermediate_format=image_format.name
+            )
+            journal.mark_stage("extract")
+            logger.info(f"  Extracted {frame_count} frames")
         
         # Step 4: Initialize processing pipeline
-        logger.info("\n[4/6] Initializing AI models...")
-        depth_estimator = DepthEstimator()
-        dibr_renderer = DIBRRenderer()
+        logger.info("\n[3/5] Initializing AI models...")
+        depth_estimator = DepthEstimator(depth_dtype=depth_dtype, smoothing=depth_smoothing)
+        dibr_renderer = create_renderer(
+            render_backend,
+            device=depth_estimator.device,
+            render_mode=render_mode,
+            stereo_mode=stereo_mode
+        )
         sbs_composer = SBSComposer()
         
+        # 2D + depth targets skip stereo rendering entirely
+        render_views = any(not target.is_rgbd for target in targets)
+        target_dirs = [output_frames_dir / f"target_{i}" for i in range(len(targets))]
+        for target_dir in target_dirs:
+            target_dir.mkdir(exist_ok=True)
+        
+        # 16-bit (10-bit depth) frames need PNG
+        target_formats = [image_format.for_dtype(target.frame_dtype) for target in targets]
+        
         if use_temporal_filter:
             temporal_filter = TemporalFilter(window_size=3, alpha=0.7)
         
+        # Duplicate and near-static frames reuse earlier results
+        detector = StaticFrameDetector() if skip_static else None
+        last_depth = None
+        last_outputs = None
+        
         # Step 5: Process frames
-        logger.info(f"\n[5/6] Processing {frame_count} frames...")
+        logger.info(f"\n[4/5] Processing {frame_count} frames...")
         logger.info("  This may take a while depending on your hardware...")
         
-        frame_files = sorted(frames_dir.glob("frame_*.png"))
+        frame_files = sorted(frames_dir.glob(image_format.glob))
+        
+        # Black bars are cut off before inference and put back when composing
+        active_area = None
+        if crop_bars and frame_files:
+            active_area = ActiveArea.detect_from_files(frame_files)
+            if active_area.is_full:
+                active_area = None
+            else:
+                logger.info(f"  Black bars detected, processing {active_area}")
+        
+        # Frames written by an interrupted run are kept; the filter is
+        # primed on a few frames before the first missing one
+        resume_from = journal.frames_done
+        warm_from = max(0, resume_from - RESUME_WARMUP_FRAMES)
+        if resume_from:
+            logger.info(f"  Resuming after {resume_from} completed frames")
         
         for i, frame_path in enumerate(frame_files, 1):
+            if i <= warm_from:
+                continue
+            
             # Load frame
             frame_bgr = cv2.imread(str(frame_path))
             frame_rgb = cv2.cvtColor(frame_bgr, cv2.COLOR_BGR2RGB)
+            picture = active_area.crop(frame_rgb) if active_area else frame_rgb
+            output_paths = [
+                target_dir / f"{frame_path.stem}{target_format.extension}"
+                for target_dir, target_format in zip(target_dirs, target_formats)
+            ]
             
-            # Estimate depth
-            depth_map = depth_estimator.estimate_depth(frame_rgb)
+            reuse = None
+            if detector is not None:
+                reuse = detector.check(picture, can_reuse_output=last_outputs is not None)
             
-            # Apply temporal filtering
-            if use_temporal_filter:
-                depth_map = temporal_filter.filter(depth_map, method=temporal_method)
+            if reuse == REUSE_DEPTH:
+                depth_map = last_depth
+            elif reuse is None:
+                # Estimate depth
+                depth_map = depth_estimator.estimate_depth(picture)
+                
+                # Apply temporal filtering, restarting at each cut
+                if use_temporal_filter:
+                    if i - 1 in scene_cuts:
+                        temporal_filter.reset()
+                    depth_map = temporal_filter.filter(depth_map, method=temporal_method)
+                last_depth = depth_map
             
-            # Render stereo pair
-            left_view, right_view = dibr_renderer.render_stereo_pair(
-                frame_rgb,
-                depth_map,
-                depth_intensity=depth_intensity
-            )
+            # Warm-up frame: its output was already written
+            previous_outputs, last_outputs = last_outputs, output_paths
+            if i <= resume_from:
+                continue
             
-            # Compose output format
-            if output_format == "half_sbs":
-                output = sbs_composer.compose_half_sbs(left_view, right_view)
-            elif output_format == "full_sbs":
-                output = sbs_composer.compose_full_sbs(left_view, right_view)
-            elif output_format == "anaglyph":
-                output = sbs_composer.compose_anaglyph(left_view, right_view)
-            elif output_format == "top_bottom":
-                output = sbs_composer.compose_top_bottom(left_view, right_view, half_resolution=True)
+            if reuse == REUSE_OUTPUT:
+                for source, output_path in zip(previous_outputs, output_paths):
+                    shutil.copyfile(source, output_path)
             else:
-                raise ValueError(f"Unknown output format: {output_format}")
-            
-            # Save output frame
-            output_path_frame = output_frames_dir / frame_path.name
-            output_bgr = cv2.cvtColor(output, cv2.COLOR_RGB2BGR)
-            cv2.imwrite(str(output_path_frame), output_bgr)
+                # Render stereo pair once for all targets
+                views = None
+                if render_views:
+                    views = dibr_renderer.render_stereo_pair(
+                        picture,
+                        depth_map,
+                        depth_intensity=depth_intensity
+                    )
+                
+                # Compose and save each target's frame (BGR for OpenCV)
+                for target, target_format, output_path in zip(targets, target_formats, output_paths):
+                    output_bgr = target.compose(
+                        sbs_composer, frame_rgb, depth_map, views, bgr=True, active_area=active_area
+                    )
+                    target_format.write(output_path, output_bgr)
+            journal.mark_frames(i - 1)
             
             # Progress update
             if i % 10 == 0 or i == frame_count:
                 elapsed = time.time() - start_time
-                fps_rate = i / elapsed
+                fps_rate = (i - warm_from) / elapsed
                 eta = (frame_count - i) / fps_rate if fps_rate > 0 else 0
                 logger.info(f"  Progress: {i}/{frame_count} ({i*100//frame_count}%) | "
                           f"Speed: {fps_rate:.2f} fps | ETA: {eta:.0f}s")
         
+        if detector is not None:
+            logger.info(f"  Static frames: {detector.summary}")
+        
         # Step 6: Encode video
-        logger.info("\n[6/6] Encoding final video...")
+        logger.info(f"\n[5/5] Encoding {len(targets)} output video(s)...")
+        journal.flush()
         encoder = VideoEncoder()
-        encoder.encode_from_frames(
-            output_frames_dir,
-            output_path,
-            fps=output_fps,
-            frame_pattern="frame_%06d.png",
-            codec="libx264",
-            crf=18,
-            preset="medium",
-            audio_path=audio_path if has_audio else None
-        )
+        for target, target_dir, target_format in zip(targets, target_dirs, target_formats):
+            encoder.encode_from_frames(
+                target_dir,
+                target.path,
+                fps=output_fps,
+                frame_pattern=target_format.pattern,
+                codec=target.codec,
+                crf=target.crf,
+                preset="medium",
+                audio_path=audio_source,
+                pix_fmt=target.pix_fmt,
+                all_tracks=all_tracks
+            )
+            
+            if target.is_rgbd and write_metadata:
+                encoder.write_metadata_sidecar(
+                    target.path,
+                    target.rgbd_metadata(video_info['height'], video_info['width'])
+                )
         
         # Done!
         total_time = time.time() - start_time
         logger.info("\n" + "=" * 60)
         logger.info("✓ Conversion complete!")
         logger.info(f"  Total time: {total_time:.1f}s ({total_time/60:.1f} minutes)")
-        logger.info(f"  Output: {output_path}")
-        logger.info(f"  File size: {output_path.stat().st_size / (1024*1024):.2f} MB")
+        for target in targets:
+            logger.info(f"  Output: {target.path} "
+                        f"({target.path.stat().st_size / (1024*1024):.2f} MB)")
+        logger.info("=" * 60)
+        succeeded = True
+        
+    except Exception as e:
+        logger.error(f"\n✗ Conversion failed: {e}")
+        raise
+    
+    finally:
+        _finish_job(journal, succeeded, save_intermediate)
+
+
+def _finish_job(journal: JobJournal, succeeded: bool, save_intermediate: bool):
+    """Delete the job's work after success, or keep it for --resume."""
+    if not succeeded:
+        journal.flush()
+        logger.info(f"\nWork kept in {journal.work_dir}; run again with --resume to continue")
+    elif not save_intermediate:
+        logger.info("\nCleaning up temporary files...")
+        journal.discard()
+        with contextlib.suppress(OSError):
+            WORK_ROOT.rmdir()
+
+
+def _convert_segmented(
+    input_path: Path,
+    targets: List[OutputTarget],
+    workers: int,
+    depth_intensity: float,
+    estimator_options: dict,
+    renderer_options: dict,
+    processor_options: dict,
+    write_metadata: bool,
+    keep_audio: bool,
+    all_tracks: bool,
+    save_intermediate: bool,
+    journal: JobJournal
+):
+    """Convert keyframe-aligned segments in parallel processes (see convert_video)."""
+    logger.info("=" * 60)
+    logger.info(f"2D to 3D Video Conversion ({workers} workers)")
+    logger.info("=" * 60)
+    logger.info(f"Input: {input_path}")
+    for target in targets:
+        logger.info(f"Output: {target}")
+    
+    start_time = time.time()
+    succeeded = False
+    
+    try:
+        ffmpeg = FFmpegHandler()
+        converter = SegmentedConverter(ffmpeg, workers=workers)
+        converter.convert(
+            input_path,
+            targets,
+            journal.work_dir / "segments",
+            depth_intensity=depth_intensity,
+            estimator_options=estimator_options,
+            renderer_options=renderer_options,
+            processor_options=processor_options,
+            keep_audio=keep_audio,
+            all_tracks=all_tracks,
+            progress_callback=lambda done, total: logger.info(f"  Segments: {done}/{total}"),
+            journal=journal
+        )
+        
+        if write_metadata:
+            video_info = ffmpeg.get_video_info(input_path)
+            for target in targets:
+                if target.is_rgbd:
+                    VideoEncoder.write_metadata_sidecar(
+                        target.path,
+                        target.rgbd_metadata(video_info['height'], video_info['width'])
+                    )
+        
+        total_time = time.time() - start_time
+        logger.info("\n" + "=" * 60)
+        logger.info("✓ Conversion complete!")
+        logger.info(f"  Total time: {total_time:.1f}s ({total_time/60:.1f} minutes)")
+        for target in targets:
+            logger.info(f"  Output: {target.path}")
         logger.info("=" * 60)
+        succeeded = True
         
     except Exception as e:
         logger.error(f"\n✗ Conversion failed: {e}")
         raise
     
     finally:
-        # Cleanup
-        if not save_intermediate and work_dir.exists():
-            logger.info("\nCleaning up temporary files...")
-            shutil.rmtree(work_dir)
+        _finish_job(journal, succeeded, save_intermediate)
 
 
 def main():
@@ -225,21 +495,37 @@ Examples:
   
   # Save intermediate frames for debugging
   python convert_video.py input.mp4 output.mp4 --save-intermediate
+  
+  # Convert segments in 4 processes (long videos, spare cores or GPU memory)
+  python convert_video.py input.mp4 output.mp4 --workers 4
+  
+  # Continue a failed or cancelled conversion (same input and settings)
+  python convert_video.py input.mp4 output.mp4 --resume
+  
+  # Several deliverables from one pass (decode, depth and rendering shared)
+  python convert_video.py input.mp4 --target format=half_sbs,path=movie_hsbs.mp4 \
+      --target format=anaglyph,size=1280x720,path=movie_ana.mp4
 
 Output Formats:
   half_sbs    - Half Side-by-Side (VR standard, 50% width per eye)
   full_sbs    - Full Side-by-Side (100% width per eye)
   anaglyph    - Red-Cyan anaglyph (for red-cyan glasses)
   top_bottom  - Top-Bottom stereoscopic (50% height per eye)
+  rgbd_sbs    - 2D + depth, depth map to the right (player renders stereo)
+  rgbd_tb     - 2D + depth, depth map below (player renders stereo)
+  row_interleaved    - Alternate rows per eye (line-polarized passive 3D)
+  column_interleaved - Alternate columns per eye (lenticular/barrier panels)
+  checkerboard       - Alternate pixels per eye (DLP 3D)
         """
     )
     
     parser.add_argument("input", type=Path, help="Input video file")
-    parser.add_argument("output", type=Path, help="Output video file")
+    parser.add_argument("output", type=Path, nargs="?", help="Output video file (optional with --target)")
     
     parser.add_argument(
         "--format",
-        choices=["half_sbs", "full_sbs", "anaglyph", "top_bottom"],
+        choices=["half_sbs", "full_sbs", "anaglyph", "top_bottom", "rgbd_sbs", "rgbd_tb",
+                 "row_interleaved", "column_interleaved", "checkerboard"],
         default="half_sbs",
         help="Output format (default: half_sbs)"
     )
@@ -272,12 +558,109 @@ Output Formats:
         help="Output FPS (default: same as input)"
     )
     
+    parser.add_argument(
+        "--render-mode",
+        choices=["remap", "layered"],
+        default="remap",
+        help="DIBR mode: per-pixel remap or depth layers, faster at high resolution (default: remap)"
+    )
+    
+    parser.add_argument(
+        "--render-backend",
+        choices=["opencv", "torch"],
+        default="opencv",
+        help="Stereo renderer: OpenCV, or PyTorch on the depth model's device (remap mode only; default: opencv)"
+    )
+    
+    parser.add_argument(
+        "--stereo-mode",
+        choices=["symmetric", "left_reference", "right_reference"],
+        default="symmetric",
+        help="Synthesize both eyes, or keep the original frame as one eye (default: symmetric)"
+    )
+    
+    parser.add_argument(
+        "--depth-dtype",
+        choices=["float32", "float16", "uint16"],
+        default="float32",
+        help="Depth map storage; compact types cut depth memory traffic (default: float32)"
+    )
+    
+    parser.add_argument(
+        "--depth-smoothing",
+        choices=["fast_bilateral", "bilateral", "gaussian", "median", "none"],
+        default="fast_bilateral",
+        help="Edge-preserving depth smoothing at model resolution (default: fast_bilateral)"
+    )
+    
+    parser.add_argument(
+        "--depth-bits",
+        type=int,
+        choices=[8, 10],
+        default=8,
+        help="Depth precision for rgbd formats; 10-bit encodes with libx265 (default: 8)"
+    )
+    
+    parser.add_argument(
+        "--rgbd-metadata",
+        action="store_true",
+        help="Write a JSON layout sidecar next to rgbd output"
+    )
+    
+    parser.add_argument(
+        "--target",
+        action="append",
+        metavar="SPEC",
+        help="Output target as key=value pairs: format, path ({stem} = input name), "
+             "size (WxH), codec, crf, depth_bits. Repeat for several outputs."
+    )
+    
+    parser.add_argument(
+        "--keep-bars",
+        action="store_true",
+        help="Process letterbox/pillarbox bars like picture instead of cropping them"
+    )
+    
+    parser.add_argument(
+        "--no-skip-static",
+        action="store_true",
+        help="Convert every frame instead of reusing results for duplicate and near-static frames"
+    )
+    
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        metavar="N",
+        help="Convert keyframe-aligned segments in N processes, each with its own model (default: 1)"
+    )
+    
+    parser.add_argument(
+        "--intermediate-format",
+        choices=["auto"] + list(INTERMEDIATE_FORMATS),
+        default="auto",
+        help="Image format of frames on disk: png, png_fast, bmp (uncompressed), jpg (lossy), "
+             "or auto to pick by a quick CPU/disk benchmark (default: auto)"
+    )
+    
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Continue an interrupted conversion with the same settings instead of starting over"
+    )
+    
     parser.add_argument(
         "--no-audio",
         action="store_true",
         help="Don't include audio in output"
     )
     
+    parser.add_argument(
+        "--all-tracks",
+        action="store_true",
+        help="Keep all audio and subtitle tracks (default: first audio track only)"
+    )
+    
     parser.add_argument(
         "--save-intermediate",
         action="store_true",
@@ -291,6 +674,18 @@ Output Formats:
         logger.error(f"Input file not found: {args.input}")
         sys.exit(1)
     
+    if args.output is None and not args.target:
+        logger.error("Give an output file or at least one --target")
+        sys.exit(1)
+    
+    try:
+        targets = [
+            OutputTarget.parse(spec).for_input(args.input.stem) for spec in args.target or []
+        ]
+    except ValueError as e:
+        logger.error(f"Invalid target: {e}")
+        sys.exit(1)
+    
     # Normalize depth intensity to 0-1
     depth_intensity = args.depth_intensity / 100.0
     if not 0 <= depth_intensity <= 1:
@@ -307,8 +702,22 @@ Output Formats:
             use_temporal_filter=not args.no_temporal_filter,
             temporal_method=args.temporal_method,
             fps=args.fps,
+            render_mode=args.render_mode,
+            stereo_mode=args.stereo_mode,
+            render_backend=args.render_backend,
+            depth_dtype=args.depth_dtype,
+            depth_bits=args.depth_bits,
+            write_metadata=args.rgbd_metadata,
             keep_audio=not args.no_audio,
-            save_intermediate=args.save_intermediate
+            all_tracks=args.all_tracks,
+            save_intermediate=args.save_intermediate,
+            targets=targets,
+            crop_bars=not args.keep_bars,
+            depth_smoothing=None if args.depth_smoothing == "none" else args.depth_smoothing,
+            workers=args.workers,
+            resume=args.resume,
+            intermediate_format=args.intermediate_format,
+            skip_static=not args.no_skip_static
         )
     except KeyboardInterrupt:
         logger.info("\n\nConversion cancelled by user")
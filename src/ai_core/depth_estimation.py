@@ -8,6 +8,8 @@ import torch
 from typing import List, Optional, Tuple, Dict
 from pathlib import Path
 
+from .postprocessing import DEPTH_DTYPES, SMOOTHING_METHODS, quantize_depth, smooth_depth_map
+
 
 # Model metadata for UI selection
 MODEL_REGISTRY = {
@@ -15,6 +17,7 @@ MODEL_REGISTRY = {
         'name': 'MiDaS Small (Fastest)',
         'hub_name': 'MiDaS_small',
         'transform_type': 'small_transform',
+        'input_size': 256,
         'description': 'Smallest and fastest model. Good for real-time preview or quick processing.',
         'speed': 'Very Fast (~90 FPS)',
         'quality': 'Basic',
@@ -26,6 +29,7 @@ MODEL_REGISTRY = {
         'name': 'MiDaS Hybrid (Balanced)',
         'hub_name': 'DPT_Hybrid',
         'transform_type': 'dpt_transform',
+        'input_size': 384,
         'description': 'Balanced speed and quality. Best for most use cases.',
         'speed': 'Fast (~30-40 FPS)',
         'quality': 'Good',
@@ -37,6 +41,7 @@ MODEL_REGISTRY = {
         'name': 'MiDaS Swin2-Large (High Quality)',
         'hub_name': 'DPT_Swin2_L_384',
         'transform_type': 'swin384_transform',
+        'input_size': 384,
         'description': 'High quality depth with excellent details. Good balance of speed and accuracy.',
         'speed': 'Medium (~20-25 FPS)',
         'quality': 'Very Good',
@@ -48,6 +53,7 @@ MODEL_REGISTRY = {
         'name': 'MiDaS Swin2-Tiny (Fast)',
         'hub_name': 'DPT_Swin2_T_256',
         'transform_type': 'swin256_transform',
+        'input_size': 256,
         'description': 'Tiny Swin transformer. Very fast with good quality.',
         'speed': 'Very Fast (~64 FPS)',
         'quality': 'Good',
@@ -59,6 +65,7 @@ MODEL_REGISTRY = {
         'name': 'MiDaS Large (Maximum Quality)',
         'hub_name': 'DPT_Large',
         'transform_type': 'dpt_transform',
+        'input_size': 384,
         'description': 'Highest quality depth estimation. Slowest but most accurate.',
         'speed': 'Slow (~5-7 FPS)',
         'quality': 'Excellent',
@@ -80,7 +87,10 @@ class DepthEstimator:
         model_type: str = DEFAULT_MODEL,
         device: str = "auto",
         precision: str = "fp16",
-        batch_size: int = 4
+        batch_size: int = 4,
+        depth_dtype: str = "float32",
+        smoothing: Optional[str] = None,
+        smoothing_strength: int = 5
     ):
         """
         Initialize depth estimator
@@ -90,7 +100,18 @@ class DepthEstimator:
             device: Device for inference ('auto', 'cuda', 'cpu', 'mps')
             precision: Precision mode ('fp32', 'fp16')
             batch_size: Batch size for processing
+            depth_dtype: dtype of normalized depth maps ('float32', 'float16'
+                or 'uint16' with 0-65535 = 0-1). Compact maps halve depth
+                memory traffic through filtering and rendering.
+            smoothing: Edge-preserving smoothing applied at model resolution,
+                before the single upsample to image size (see
+                SMOOTHING_METHODS; 'fast_bilateral' suits video), or None
+            smoothing_strength: Smoothing radius in output pixels
         """
+        if depth_dtype not in DEPTH_DTYPES:
+            raise ValueError(f"Unknown depth dtype: {depth_dtype}")
+        if smoothing is not None and smoothing not in SMOOTHING_METHODS:
+            raise ValueError(f"Unknown smoothing method: {smoothing}")
         if model_type not in MODEL_REGISTRY:
             print(f"Warning: Unknown model '{model_type}', using default '{DEFAULT_MODEL}'")
             model_type = DEFAULT_MODEL
@@ -100,6 +121,9 @@ class DepthEstimator:
         self.device = self._select_device(device)
         self.precision = precision
         self.batch_size = batch_size
+        self.depth_dtype = depth_dtype
+        self.smoothing = smoothing
+        self.smoothing_strength = smoothing_strength
         self.model = None
         self.transform = None
         
@@ -206,26 +230,38 @@ class DepthEstimator:
         """
         return MODEL_REGISTRY.get(model_type)
     
+    @property
+    def model_input_size(self) -> int:
+        """Input size of the model (shorter image side after its transform)"""
+        return self.model_info.get('input_size', 384)
+    
     def estimate_depth(
         self,
         image: np.ndarray,
-        normalize: bool = True
+        normalize: bool = True,
+        output_size: Optional[Tuple[int, int]] = None
     ) -> np.ndarray:
         """
         Estimate depth map for a single image
         
         Args:
-            image: Input RGB image (H, W, 3)
+            image: Input RGB image (H, W, 3); may already be reduced to
+                about the model input size (see model_input_size)
             normalize: Whether to normalize output to [0, 1]
+            output_size: (width, height) of the depth map, e.g. the full
+                frame size when ``image`` is a reduced copy (default: image size)
         
         Returns:
-            Depth map (H, W) with values in [0, 1] if normalized
+            Depth map (H, W) with values in [0, 1] if normalized, stored
+            as depth_dtype (raw model output stays float32)
         """
         if self.model is None:
             raise RuntimeError("Model not loaded. Call _load_model() first.")
         
-        # Store original dimensions
+        # Store output dimensions
         original_height, original_width = image.shape[:2]
+        if output_size is not None:
+            original_width, original_height = output_size
         
         # Convert BGR to RGB if needed (OpenCV loads as BGR)
         if image.shape[2] == 3:
@@ -258,6 +294,8 @@ class DepthEstimator:
             # Remove batch dimension
             depth = depth.squeeze().cpu().numpy()
         
+        depth = self._smooth_prediction(depth, original_width)
+        
         # Resize to original dimensions if needed
         if depth.shape != (original_height, original_width):
             depth = cv2.resize(
@@ -274,6 +312,7 @@ class DepthEstimator:
                 depth = (depth - depth_min) / (depth_max - depth_min)
             else:
                 depth = np.zeros_like(depth)
+            return quantize_depth(depth.astype(np.float32), self.depth_dtype)
         
         return depth.astype(np.float32)
     
@@ -281,7 +320,9 @@ class DepthEstimator:
         self,
         images: List[np.ndarray],
         normalize: bool = True,
-        batch_size: int = 4
+        batch_size: int = 4,
+        as_tensor: bool = False,
+        output_size: Optional[Tuple[int, int]] = None
     ) -> List[np.ndarray]:
         """
         Estimate depth maps for multiple images (batch processing)
@@ -290,20 +331,29 @@ class DepthEstimator:
             images: List of RGB images
             normalize: Whether to normalize outputs
             batch_size: Number of images to process at once
+            as_tensor: Return a (N, H, W) float32 tensor on the inference
+                device instead of numpy arrays (images must share one size).
+                Used by the tensor DIBR backend to skip the numpy round-trip.
+                Compact depth dtypes give a float16 tensor.
+            output_size: (width, height) of all depth maps, for images
+                reduced to model resolution (default: each image's size)
         
         Returns:
-            List of depth maps
+            List of depth maps (or a tensor if as_tensor is set)
         """
         if not images:
             return []
         
+        if as_tensor:
+            return self._batch_estimate_tensor(images, normalize, batch_size, output_size)
+        
         depth_maps: List[np.ndarray] = []
 
         # Convert all images to transformed tensors first (CxHxW)
         tensors = []
         original_sizes = []
         for img in images:
-            original_sizes.append(img.shape[:2])
+            original_sizes.append(img.shape[:2] if output_size is None else output_size[::-1])
             t = self.transform(img)
             # Ensure tensor is 3D (C,H,W)
             if t.dim() == 3:
@@ -337,6 +387,7 @@ class DepthEstimator:
             for i_in_batch, pred in enumerate(pred_batch):
                 global_idx = start + i_in_batch
                 orig_h, orig_w = original_sizes[global_idx]
+                pred = self._smooth_prediction(pred, orig_w)
 
                 # pred may be in shape (H', W')
                 if pred.shape != (orig_h, orig_w):
@@ -351,11 +402,113 @@ class DepthEstimator:
                         pred_resized = (pred_resized - dmin) / (dmax - dmin)
                     else:
                         pred_resized = np.zeros_like(pred_resized)
+                    pred_resized = quantize_depth(pred_resized.astype(np.float32), self.depth_dtype)
 
-                depth_maps.append(pred_resized.astype(np.float32))
+                depth_maps.append(pred_resized if normalize else pred_resized.astype(np.float32))
 
         return depth_maps
     
+    def _batch_estimate_tensor(
+        self,
+        images: List[np.ndarray],
+        normalize: bool,
+        batch_size: int,
+        output_size: Optional[Tuple[int, int]] = None
+    ) -> torch.Tensor:
+        """
+        Batched depth estimation that keeps results on the inference device
+        
+        Args:
+            images: List of RGB images of identical size
+            normalize: Whether to normalize each map to [0, 1]
+            batch_size: Number of images to process at once
+            output_size: (width, height) of the depth maps (default: image size)
+        
+        Returns:
+            Depth tensor (N, H, W) at the original image resolution
+        """
+        orig_h, orig_w = images[0].shape[:2]
+        if any(img.shape[:2] != (orig_h, orig_w) for img in images):
+            raise ValueError("Tensor depth output requires images of equal size")
+        if output_size is not None:
+            orig_w, orig_h = output_size
+        
+        outputs = []
+        for start in range(0, len(images), batch_size):
+            tensors = []
+            for img in images[start:start + batch_size]:
+                t = self.transform(img)
+                tensors.append(t if t.dim() == 3 else t.squeeze(0))
+            batch = torch.stack(tensors, dim=0).to(self.device)
+            
+            if self.precision == "fp16" and self.device.type == "cuda":
+                batch = batch.half()
+            
+            with torch.no_grad():
+                preds = self.model(batch)
+            
+            pred_batch = preds if isinstance(preds, torch.Tensor) else preds[0]
+            if pred_batch.dim() == 3:
+                pred_batch = pred_batch.unsqueeze(1)
+            
+            if self.smoothing is not None:
+                # Model-resolution maps are small; smooth them on the CPU
+                smoothed = [
+                    self._smooth_prediction(pred, orig_w)
+                    for pred in pred_batch[:, 0].float().cpu().numpy()
+                ]
+                pred_batch = torch.from_numpy(np.stack(smoothed)).unsqueeze(1).to(self.device)
+            
+            # Resize on device (bicubic, like the numpy path)
+            depth = torch.nn.functional.interpolate(
+                pred_batch.float(),
+                size=(orig_h, orig_w),
+                mode='bicubic',
+                align_corners=False
+            ).squeeze(1)
+            
+            if normalize:
+                dmin = depth.amin(dim=(1, 2), keepdim=True)
+                dmax = depth.amax(dim=(1, 2), keepdim=True)
+                span = dmax - dmin
+                depth = torch.where(
+                    span > 1e-6,
+                    (depth - dmin) / span.clamp_min(1e-6),
+                    torch.zeros_like(depth)
+                )
+                if self.depth_dtype != "float32":
+                    # No unsigned 16-bit math on device; half floats instead
+                    depth = depth.half()
+            
+            outputs.append(depth)
+        
+        return torch.cat(outputs, dim=0)
+    
+    def _smooth_prediction(self, prediction: np.ndarray, output_width: int) -> np.ndarray:
+        """
+        Smooth a raw model-resolution prediction before it is upsampled
+        
+        Args:
+            prediction: Model output (H', W') in arbitrary units
+            output_width: Width of the final depth map (scales the radius)
+        
+        Returns:
+            Smoothed float32 prediction in the same units
+        """
+        if self.smoothing is None:
+            return prediction
+        
+        low, high = float(prediction.min()), float(prediction.max())
+        span = high - low
+        if span <= 1e-6:
+            return prediction
+        
+        # Filters expect [0, 1] depth; map back to model units afterwards
+        normalized = (prediction.astype(np.float32) - low) / span
+        strength = max(1, round(self.smoothing_strength * prediction.shape[1] / output_width))
+        smoothed = smooth_depth_map(normalized, self.smoothing, strength)
+        return smoothed * np.float32(span) + np.float32(low)
+    
     def set_quality_preset(self, preset: str):
         """
         Set quality preset for depth estimation
@@ -3,46 +3,89 @@ Depth Map Post-processing
 """
 import cv2
 import numpy as np
+from typing import Tuple
+
+
+# Compact depth representations; uint16 stores [0, 1] as 0-65535
+DEPTH_DTYPES = ('float32', 'float16', 'uint16')
+
+# Smoothing methods of smooth_depth_map
+SMOOTHING_METHODS = ('fast_bilateral', 'bilateral', 'gaussian', 'median')
+
+# Longest side of the grid fast_bilateral filters on (above model resolution,
+# so upsampling the result keeps depth edges about as sharp as a full pass)
+FAST_SMOOTHING_SIZE = 768
 
 
 def smooth_depth_map(
     depth_map: np.ndarray,
     method: str = "bilateral",
-    strength: int = 5
+    strength: int = 5,
+    working_size: int = FAST_SMOOTHING_SIZE
 ) -> np.ndarray:
     """
     Smooth depth map while preserving edges
     
+    'fast_bilateral' filters a copy downsampled to ``working_size`` and
+    upsamples the result once, about 10x faster than 'bilateral' at 4K.
+    Smaller maps (e.g. at model resolution) are filtered directly.
+    
     Args:
-        depth_map: Input depth map
-        method: Smoothing method ('bilateral', 'gaussian', 'median')
-        strength: Smoothing strength (kernel size)
+        depth_map: Input depth map normalized to [0, 1] (any supported dtype)
+        method: Smoothing method ('fast_bilateral', 'bilateral', 'gaussian', 'median')
+        strength: Smoothing strength (kernel radius in pixels of the input)
+        working_size: Longest side of the fast_bilateral grid
     
     Returns:
-        Smoothed depth map
+        Smoothed depth map (float16 for float16 input, float32 otherwise)
     """
-    if method == "bilateral":
+    depth = dequantize_depth(depth_map)
+    
+    if method == "fast_bilateral":
+        smoothed = _fast_bilateral(depth, strength, working_size)
+    elif method == "bilateral":
         # Bilateral filter preserves edges
         smoothed = cv2.bilateralFilter(
-            depth_map.astype(np.float32),
+            depth,
             d=strength * 2 + 1,
             sigmaColor=0.1,
             sigmaSpace=strength
         )
     elif method == "gaussian":
         smoothed = cv2.GaussianBlur(
-            depth_map,
+            depth,
             (strength * 2 + 1, strength * 2 + 1),
             0
         )
     elif method == "median":
         smoothed = cv2.medianBlur(
-            (depth_map * 255).astype(np.uint8),
+            cv2.convertScaleAbs(depth, alpha=255.0),
             strength * 2 + 1
-        ) / 255.0
+        )
+        smoothed = np.multiply(smoothed, np.float32(1.0 / 255.0), dtype=np.float32)
     else:
         raise ValueError(f"Unknown method: {method}")
     
+    return smoothed.astype(np.float16) if depth_map.dtype == np.float16 else smoothed
+
+
+def _fast_bilateral(depth: np.ndarray, strength: int, working_size: int) -> np.ndarray:
+    """Edge-preserving smoothing on a reduced grid (float32 in and out)"""
+    h, w = depth.shape[:2]
+    scale = min(1.0, working_size / max(h, w))
+    radius = max(1, int(round(strength * scale)))
+    
+    small = depth
+    if scale < 1.0:
+        small = cv2.resize(
+            depth, (max(1, round(w * scale)), max(1, round(h * scale))),
+            interpolation=cv2.INTER_AREA
+        )
+    
+    smoothed = cv2.bilateralFilter(small, d=radius * 2 + 1, sigmaColor=0.1, sigmaSpace=radius)
+    if scale < 1.0:
+        smoothed = cv2.resize(smoothed, (w, h), interpolation=cv2.INTER_LINEAR)
+    
     return smoothed
 
 
@@ -51,24 +94,26 @@ def enhance_edges(depth_map: np.ndarray) -> np.ndarray:
     Enhance edges in depth map
     
     Args:
-        depth_map: Input depth map
+        depth_map: Input depth map normalized to [0, 1] (any supported dtype)
     
     Returns:
-        Edge-enhanced depth map
+        Edge-enhanced float32 depth map
     """
-    # Apply Sobel edge detection
-    sobel_x = cv2.Sobel(depth_map, cv2.CV_64F, 1, 0, ksize=3)
-    sobel_y = cv2.Sobel(depth_map, cv2.CV_64F, 0, 1, ksize=3)
-    edges = np.sqrt(sobel_x**2 + sobel_y**2)
+    depth = dequantize_depth(depth_map)
     
-    # Normalize edges
-    edges = edges / edges.max() if edges.max() > 0 else edges
+    # Apply Sobel edge detection
+    sobel_x = cv2.Sobel(depth, cv2.CV_32F, 1, 0, ksize=3)
+    sobel_y = cv2.Sobel(depth, cv2.CV_32F, 0, 1, ksize=3)
+    edges = cv2.magnitude(sobel_x, sobel_y)
     
-    # Sharpen original depth map using edges
-    enhanced = depth_map + 0.1 * edges
-    enhanced = np.clip(enhanced, 0, 1)
+    # Sharpen original depth map using normalized edges
+    peak = float(edges.max())
+    if peak > 0:
+        enhanced = cv2.scaleAdd(edges, 0.1 / peak, depth)
+    else:
+        enhanced = depth.copy()
     
-    return enhanced
+    return np.clip(enhanced, 0, 1, out=enhanced)
 
 
 def adjust_depth_range(
@@ -95,3 +140,105 @@ def adjust_depth_range(
         clipped = (clipped - near_clip) / (far_clip - near_clip)
     
     return clipped
+
+
+def depth_scale(dtype) -> float:
+    """
+    Get the stored value that represents depth 1.0 for a dtype
+    
+    Args:
+        dtype: Depth map dtype
+    
+    Returns:
+        65535 for uint16, 255 for uint8, 1.0 for floating point
+    """
+    dtype = np.dtype(dtype)
+    if dtype.kind == 'u':
+        return float(np.iinfo(dtype).max)
+    return 1.0
+
+
+def quantize_depth(depth_map: np.ndarray, dtype: str = 'uint16') -> np.ndarray:
+    """
+    Convert a normalized depth map to a compact representation
+    
+    Args:
+        depth_map: Depth map normalized to [0, 1] (any supported dtype)
+        dtype: Target dtype ('float32', 'float16', 'uint16')
+    
+    Returns:
+        Depth map in the target dtype
+    """
+    if dtype not in DEPTH_DTYPES:
+        raise ValueError(f"Unknown depth dtype: {dtype}")
+    
+    if depth_map.dtype == np.dtype(dtype):
+        return depth_map
+    
+    depth_map = dequantize_depth(depth_map)
+    if dtype == 'uint16':
+        scaled = np.multiply(depth_map, np.float32(65535.0))
+        scaled += 0.5
+        return np.clip(scaled, 0, 65535, out=scaled).astype(np.uint16)
+    
+    return depth_map.astype(dtype)
+
+
+def dequantize_depth(depth_map: np.ndarray) -> np.ndarray:
+    """
+    Convert a depth map of any supported dtype to float32 in [0, 1]
+    
+    Args:
+        depth_map: Depth map
+    
+    Returns:
+        float32 depth map (the input itself if already float32)
+    """
+    if depth_map.dtype == np.float32:
+        return depth_map
+    
+    scale = depth_scale(depth_map.dtype)
+    if scale == 1.0:
+        return depth_map.astype(np.float32)
+    
+    return np.multiply(depth_map, np.float32(1.0 / scale), dtype=np.float32)
+
+
+def resize_depth(
+    depth_map: np.ndarray,
+    size: Tuple[int, int],
+    interpolation: int = cv2.INTER_LINEAR
+) -> np.ndarray:
+    """
+    Resize a depth map keeping its dtype
+    
+    Args:
+        depth_map: Depth map (float32, float16 or unsigned integer)
+        size: Target (width, height)
+        interpolation: OpenCV interpolation flag
+    
+    Returns:
+        Resized depth map
+    """
+    if depth_map.dtype == np.float16:
+        # OpenCV cannot resize half floats
+        resized = cv2.resize(depth_map.astype(np.float32), size, interpolation=interpolation)
+        return resized.astype(np.float16)
+    
+    return cv2.resize(depth_map, size, interpolation=interpolation)
+
+
+def depth_to_uint8(depth_map: np.ndarray) -> np.ndarray:
+    """
+    Convert a depth map to an 8-bit image for saving or display
+    
+    Args:
+        depth_map: Depth map normalized to [0, 1] (any supported dtype)
+    
+    Returns:
+        uint8 depth image
+    """
+    if depth_map.dtype == np.uint16:
+        return (depth_map >> 8).astype(np.uint8)
+    
+    return cv2.convertScaleAbs(dequantize_depth(depth_map), alpha=255.0)
@@ -2,14 +2,19 @@
 Temporal Filtering for Video Consistency
 Reduces flickering between frames
 """
+import cv2
 import numpy as np
 from collections import deque
 from typing import Optional
 
+from .postprocessing import dequantize_depth
+
 
 class TemporalFilter:
     """Applies temporal smoothing to depth maps in video sequences"""
     
+    METHODS = ('ema', 'median', 'gaussian')
+    
     def __init__(self, window_size: int = 5, alpha: float = 0.3):
         """
         Initialize temporal filter
@@ -23,25 +28,46 @@ class TemporalFilter:
         self.history = deque(maxlen=window_size)
         self.prev_depth = None
     
-    def filter(self, depth_map: np.ndarray) -> np.ndarray:
+    def filter(self, depth_map: np.ndarray, method: str = 'ema') -> np.ndarray:
         """
         Apply temporal filtering to current depth map
         
         Args:
-            depth_map: Current frame depth map
+            depth_map: Current frame depth map (float32, float16 or uint16)
+            method: 'ema' (blend with the previous result), 'median' or
+                'gaussian' (over the last window_size frames, the
+                gaussian weighting recent frames most)
         
         Returns:
-            Temporally filtered depth map
+            Temporally filtered depth map in the same dtype
         """
+        if method not in self.METHODS:
+            raise ValueError(f"Unknown temporal filter method: {method}")
+        
         # Add to history
         self.history.append(depth_map.copy())
         
-        # Exponential moving average with previous frame
-        if self.prev_depth is not None:
-            filtered = (
-                self.alpha * depth_map +
-                (1 - self.alpha) * self.prev_depth
+        if method == 'median':
+            filtered = self._to_dtype(np.median(np.stack(self.history), axis=0), depth_map.dtype)
+        elif method == 'gaussian':
+            ages = np.arange(len(self.history) - 1, -1, -1, dtype=np.float32)
+            weights = np.exp(-0.5 * (ages / (self.window_size / 2)) ** 2)
+            filtered = self._to_dtype(
+                np.tensordot(weights / weights.sum(), np.stack(self.history).astype(np.float32), axes=1),
+                depth_map.dtype
             )
+        # Exponential moving average with previous frame
+        elif self.prev_depth is not None:
+            if depth_map.dtype == np.uint16:
+                # Blend the 16-bit maps directly (rounded, saturating)
+                filtered = cv2.addWeighted(
+                    depth_map, self.alpha, self.prev_depth, 1 - self.alpha, 0
+                )
+            else:
+                filtered = (
+                    self.alpha * depth_map.astype(np.float32, copy=False) +
+                    (1 - self.alpha) * self.prev_depth
+                ).astype(depth_map.dtype, copy=False)
         else:
             filtered = depth_map.copy()
         
@@ -49,6 +75,13 @@ class TemporalFilter:
         
         return filtered
     
+    @staticmethod
+    def _to_dtype(depth_map: np.ndarray, dtype: np.dtype) -> np.ndarray:
+        """Cast a float result back to the depth dtype (rounded for uint16)"""
+        if dtype == np.uint16:
+            depth_map = np.rint(depth_map)
+        return depth_map.astype(dtype)
+    
     def reset(self):
         """Reset filter state"""
         self.history.clear()
@@ -71,7 +104,7 @@ def detect_scene_change(
     Returns:
         True if scene change detected
     """
-    # Calculate mean absolute difference
-    diff = np.abs(depth_map1 - depth_map2).mean()
+    # Calculate mean absolute difference (in [0, 1] units for any dtype)
+    diff = np.abs(dequantize_depth(depth_map1) - dequantize_depth(depth_map2)).mean()
     
     return diff > threshold
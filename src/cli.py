@@ -45,8 +45,8 @@ Examples:
     # Convert command
     convert_parser = subparsers.add_parser('convert', help='Convert single file')
     convert_parser.add_argument('input', type=str, help='Input file path')
-    convert_parser.add_argument('-o', '--output', type=str, required=True,
-                               help='Output file path')
+    convert_parser.add_argument('-o', '--output', type=str,
+                               help='Output file path (optional with --target)')
     convert_parser.add_argument('--depth', type=int, default=75,
                                help='Depth intensity (0-100, default: 75)')
     convert_parser.add_argument('--ipd', type=int, default=65,
@@ -54,8 +54,10 @@ Examples:
     convert_parser.add_argument('--convergence', type=float, default=1.0,
                                help='Convergence distance (default: 1.0)')
     convert_parser.add_argument('--format', type=str, default='half_sbs',
-                               choices=['half_sbs', 'full_sbs', 'top_bottom', 'anaglyph'],
-                               help='Output format (default: half_sbs)')
+                               choices=['half_sbs', 'full_sbs', 'top_bottom', 'anaglyph',
+                                        'rgbd_sbs', 'rgbd_tb', 'row_interleaved', 'column_interleaved', 'checkerboard'],
+                               help='Output format; rgbd_* is 2D + depth for player-side stereo, '
+                                    '*_interleaved/checkerboard suit passive 3D displays (default: half_sbs)')
     convert_parser.add_argument('--quality', type=str, default='balanced',
                                choices=['fast', 'balanced', 'high'],
                                help='Quality preset (default: balanced)')
@@ -64,6 +66,21 @@ Examples:
                                help='Depth estimation model (default: midas_v3)')
     convert_parser.add_argument('--gpu', type=int, default=0,
                                help='GPU device ID (default: 0, use -1 for CPU)')
+    convert_parser.add_argument('--render-mode', type=str, default='remap',
+                               choices=['remap', 'layered'],
+                               help='DIBR mode: per-pixel remap or faster depth layers (default: remap)')
+    convert_parser.add_argument('--render-backend', type=str, default='opencv',
+                               choices=['opencv', 'torch'],
+                               help='Stereo renderer: OpenCV, or PyTorch on the depth model device '
+                                    '(remap mode only; default: opencv)')
+    convert_parser.add_argument('--stereo-mode', type=str, default='symmetric',
+                               choices=['symmetric', 'left_reference', 'right_reference'],
+                               help='Synthesize both eyes, or keep the original frame as one eye (default: symmetric)')
+    convert_parser.add_argument('--threads', type=int, default=None,
+                               help='Threads rendering strips of the frame (default: all cores)')
+    convert_parser.add_argument('--target', type=str, action='append', metavar='SPEC',
+                               help='Extra output as key=value pairs: format, path ({stem} = input name, {ext} = its extension), '
+                                    'size (WxH), codec, crf, depth_bits; repeatable, one pass for all')
     
     # Batch command
     batch_parser = subparsers.add_parser('batch', help='Batch convert folder')
@@ -75,11 +92,31 @@ Examples:
     batch_parser.add_argument('--depth', type=int, default=75,
                              help='Depth intensity (0-100)')
     batch_parser.add_argument('--format', type=str, default='half_sbs',
-                             choices=['half_sbs', 'full_sbs', 'top_bottom'],
-                             help='Output format')
+                             choices=['half_sbs', 'full_sbs', 'top_bottom', 'rgbd_sbs', 'rgbd_tb',
+                                      'row_interleaved', 'column_interleaved', 'checkerboard'],
+                             help='Output format; rgbd_* is 2D + depth for player-side stereo, '
+                                  '*_interleaved/checkerboard suit passive 3D displays')
     batch_parser.add_argument('--quality', type=str, default='balanced',
                              choices=['fast', 'balanced', 'high'],
                              help='Quality preset')
+    batch_parser.add_argument('--render-mode', type=str, default='remap',
+                             choices=['remap', 'layered'],
+                             help='DIBR mode: per-pixel remap or faster depth layers')
+    batch_parser.add_argument('--render-backend', type=str, default='opencv',
+                             choices=['opencv', 'torch'],
+                             help='Stereo renderer: OpenCV, or PyTorch on the depth model device (remap mode only)')
+    batch_parser.add_argument('--stereo-mode', type=str, default='symmetric',
+                             choices=['symmetric', 'left_reference', 'right_reference'],
+                             help='Synthesize both eyes, or keep the original frame as one eye')
+    batch_parser.add_argument('--depth-bits', type=int, default=8, choices=[8, 10],
+                             help='Depth precision of rgbd video output')
+    batch_parser.add_argument('--rgbd-metadata', action='store_true',
+                             help='Write a JSON layout sidecar next to rgbd video output')
+    batch_parser.add_argument('--target', type=str, action='append', metavar='SPEC',
+                             help='Output target (format=...,path={stem}_x{ext},size=WxH,codec=...); '
+                                  'repeatable, replaces --format, one pass for all')
+    batch_parser.add_argument('--resume', action='store_true',
+                             help='Continue an interrupted video conversion with the same settings')
     
     # Info command
     info_parser = subparsers.add_parser('info', help='Show system information')
@@ -91,6 +128,8 @@ Examples:
                                help='Frame number for video (default: 0)')
     preview_parser.add_argument('--depth', type=int, default=75,
                                help='Depth intensity')
+    preview_parser.add_argument('-o', '--output', type=str,
+                               help='Output image (default: <input>_preview_<frame>.png)')
     
     args = parser.parse_args()
     
@@ -9,8 +9,16 @@ from typing import Any
 import logging
 
 from .ai_core.depth_estimation import DepthEstimator
-from .rendering.dibr_renderer import DIBRRenderer
+from .rendering.dibr_renderer import DIBRRenderer, create_renderer
 from .rendering.sbs_composer import SBSComposer
+from .rendering.strip_renderer import StripRenderer
+from .video_processing.output_target import OutputTarget
+
+
+def _write_image(path: Any, image: np.ndarray):
+    """Write an image, raising if OpenCV could not write it"""
+    if not cv2.imwrite(str(path), image):
+        raise RuntimeError(f"Could not write image: {path}")
 
 
 def convert_file(args: Any, logger: logging.Logger) -> int:
@@ -20,6 +28,18 @@ def convert_file(args: Any, logger: logging.Logger) -> int:
     logger.info(f"Parameters: depth={args.depth}, ipd={args.ipd}, format={args.format}")
     
     try:
+        # Several targets share one depth pass and one stereo render
+        targets = [OutputTarget.parse(spec) for spec in args.target or []]
+        targets = [
+            target.for_input(Path(args.input).stem, ext=target.image_extension(args.input))
+            for target in targets
+        ]
+        if targets and args.output:
+            targets.insert(0, OutputTarget(args.format, args.output))
+        elif not args.output and not targets:
+            logger.error("Give an output path (-o) or at least one --target")
+            return 1
+        
         # Load image
         logger.info("Loading image...")
         image_bgr = cv2.imread(args.input)
@@ -41,34 +61,49 @@ def convert_file(args: Any, logger: logging.Logger) -> int:
         depth_map = estimator.estimate_depth(image, normalize=True)
         logger.info(f"Depth estimated (range: {depth_map.min():.3f} - {depth_map.max():.3f})")
         
-        # Render stereoscopic pair
-        logger.info("Rendering stereo pair...")
-        renderer = DIBRRenderer(ipd=args.ipd)
-        left_view, right_view = renderer.render_stereo_pair(
-            image, depth_map, depth_intensity=args.depth
+        renderer = create_renderer(
+            args.render_backend,
+            ipd=args.ipd,
+            device=estimator.device,
+            render_mode=args.render_mode,
+            stereo_mode=args.stereo_mode
         )
-        logger.info("Stereo pair rendered")
-        
-        # Compose output
-        logger.info(f"Composing {args.format} output...")
         composer = SBSComposer()
         
-        if args.format == "half_sbs":
-            output = composer.compose_half_sbs(left_view, right_view)
-        elif args.format == "full_sbs":
-            output = composer.compose_full_sbs(left_view, right_view)
-        elif args.format == "anaglyph":
-            output = composer.compose_anaglyph(left_view, right_view)
-        elif args.format == "top_bottom":
-            output = composer.compose_top_bottom(left_view, right_view, half=True)
+        if targets:
+            views = None
+            if any(not target.is_rgbd for target in targets):
+                logger.info("Rendering stereo pair...")
+                views = renderer.render_stereo_pair(image, depth_map, depth_intensity=args.depth)
+            
+            for target in targets:
+                logger.info(f"Composing {target}...")
+                target.path.parent.mkdir(parents=True, exist_ok=True)
+                _write_image(
+                    target.path,
+                    target.compose(composer, image, depth_map, views, bgr=True)
+                )
+            
+            logger.info(f"✅ Conversion complete! {len(targets)} outputs written")
+            return 0
+        
+        if args.format in SBSComposer.FORMATS:
+            # Render and compose horizontal strips of the frame in parallel
+            logger.info(f"Rendering {args.format} output ({args.threads or 'all'} threads)...")
+            strip_renderer = StripRenderer(
+                renderer, composer, workers=args.threads, hole_method=None
+            )
+            output = strip_renderer.render(
+                image, depth_map, args.format, depth_intensity=args.depth, bgr=True
+            )
+            strip_renderer.close()
         else:
             logger.error(f"Unknown format: {args.format}")
             return 1
         
         # Save output
         logger.info("Saving output...")
-        output_bgr = cv2.cvtColor(output, cv2.COLOR_RGB2BGR)
-        cv2.imwrite(args.output, output_bgr)
+        _write_image(args.output, output)
         logger.info(f"Saved to: {args.output}")
         
         logger.info("✅ Conversion complete!")
@@ -94,6 +129,13 @@ def batch_convert(args: Any, logger: logging.Logger) -> int:
     
     output_dir.mkdir(parents=True, exist_ok=True)
     
+    # Output targets are path templates resolved per input file
+    try:
+        targets = [OutputTarget.parse(spec) for spec in args.target or []]
+    except ValueError as e:
+        logger.error(f"Invalid target: {e}")
+        return 1
+    
     # Check if input is a video file
     video_extensions = {'.mp4', '.avi', '.mov', '.mkv', '.webm', '.flv'}
     
@@ -110,8 +152,15 @@ def batch_convert(args: Any, logger: logging.Logger) -> int:
                 output_format=args.format,
                 depth_intensity=args.depth,
                 use_temporal_filter=True,
+                render_mode=args.render_mode,
+                stereo_mode=args.stereo_mode,
+                render_backend=args.render_backend,
+                depth_bits=args.depth_bits,
+                write_metadata=args.rgbd_metadata,
                 keep_audio=True,
-                save_intermediate=False
+                save_intermediate=False,
+                targets=[target.for_input(input_path.stem, output_dir) for target in targets],
+                resume=args.resume
             )
             return 0
         except Exception as e:
@@ -130,7 +179,13 @@ def batch_convert(args: Any, logger: logging.Logger) -> int:
         # Initialize pipeline once
         logger.info("Initializing conversion pipeline...")
         estimator = DepthEstimator(model_type="midas_v3", device="auto")
-        renderer = DIBRRenderer(ipd=args.ipd)
+        renderer = create_renderer(
+            args.render_backend,
+            ipd=args.ipd,
+            device=estimator.device,
+            render_mode=args.render_mode,
+            stereo_mode=args.stereo_mode
+        )
         composer = SBSComposer()
         
         success_count = 0
@@ -148,24 +203,54 @@ def batch_convert(args: Any, logger: logging.Logger) -> int:
                 
                 # Process
                 depth_map = estimator.estimate_depth(image, normalize=True)
-                left_view, right_view = renderer.render_stereo_pair(
-                    image, depth_map, depth_intensity=args.depth
-                )
                 
-                # Compose
-                if args.format == "half_sbs":
-                    output = composer.compose_half_sbs(left_view, right_view)
-                elif args.format == "full_sbs":
-                    output = composer.compose_full_sbs(left_view, right_view)
-                elif args.format == "anaglyph":
-                    output = composer.compose_anaglyph(left_view, right_view)
-                elif args.format == "top_bottom":
-                    output = composer.compose_top_bottom(left_view, right_view, half=True)
+                if targets:
+                    # One stereo render, composed once per target
+                    views = None
+                    if any(not target.is_rgbd for target in targets):
+                        views = renderer.render_stereo_pair(
+                            image, depth_map, depth_intensity=args.depth
+                        )
+                    for target in targets:
+                        target = target.for_input(
+                            file_path.stem, output_dir, ext=target.image_extension(file_path)
+                        )
+                        _write_image(
+                            target.path,
+                            target.compose(composer, image, depth_map, views, bgr=True)
+                        )
+                        logger.info(f"✓ Saved: {target.path}")
+                    
+                    success_count += 1
+                    continue
+                
+                # Render and compose (half formats directly at output size)
+                if args.format in SBSComposer.RGBD_FORMATS:
+                    output = composer.compose_rgbd(image, depth_map, args.format)
+                elif args.format in ("half_sbs", "top_bottom"):
+                    output = renderer.render_half_format(
+                        image, depth_map, args.format, depth_intensity=args.depth
+                    )
+                elif args.format in SBSComposer.INTERLEAVED_FORMATS:
+                    output = composer.interleave_eyes(
+                        *renderer.render_interleaved(
+                            image, depth_map, args.format, depth_intensity=args.depth
+                        ),
+                        args.format
+                    )
+                else:
+                    left_view, right_view = renderer.render_stereo_pair(
+                        image, depth_map, depth_intensity=args.depth
+                    )
+                    if args.format == "full_sbs":
+                        output = composer.compose_full_sbs(left_view, right_view)
+                    elif args.format == "anaglyph":
+                        output = composer.compose_anaglyph(left_view, right_view)
                 
                 # Save
                 output_path = output_dir / file_path.name
                 output_bgr = cv2.cvtColor(output, cv2.COLOR_RGB2BGR)
-                cv2.imwrite(str(output_path), output_bgr)
+                _write_image(output_path, output_bgr)
                 
                 success_count += 1
                 logger.info(f"✓ Saved: {output_path}")
@@ -212,7 +297,35 @@ def preview_frame(args: Any, logger: logging.Logger) -> int:
     logger.info(f"Previewing: {args.input}")
     logger.info(f"Frame: {args.frame}")
     
-    # TODO: Implement preview
-    logger.warning("Preview not yet implemented - placeholder")
+    input_path = Path(args.input)
+    video_extensions = {'.mp4', '.avi', '.mov', '.mkv', '.webm', '.flv'}
     
-    return 0
+    try:
+        if input_path.suffix.lower() in video_extensions:
+            # Keyframe seek from the file's (cached) seek index, then a short decode
+            from .video_processing.ffmpeg_handler import FFmpegHandler
+            image_bgr = FFmpegHandler().read_frame(input_path, args.frame)
+        else:
+            image_bgr = cv2.imread(str(input_path))
+            if image_bgr is None:
+                logger.error(f"Could not load image: {args.input}")
+                return 1
+        
+        image = cv2.cvtColor(image_bgr, cv2.COLOR_BGR2RGB)
+        
+        logger.info("Estimating depth...")
+        estimator = DepthEstimator(model_type="midas_v3", device="auto")
+        depth_map = estimator.estimate_depth(image, normalize=True)
+        
+        renderer = DIBRRenderer()
+        left_view, right_view = renderer.render_stereo_pair(image, depth_map, depth_intensity=args.depth)
+        output = SBSComposer.compose_half_sbs(left_view, right_view, bgr=True)
+        
+        output_path = Path(args.output or f"{input_path.stem}_preview_{args.frame:06d}.png")
+        cv2.imwrite(str(output_path), output)
+        logger.info(f"Saved preview to: {output_path}")
+        return 0
+        
+    except Exception as e:
+        logger.error(f"Preview failed: {e}")
+        return 1
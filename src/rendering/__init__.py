@@ -3,7 +3,14 @@ Rendering Module - Stereoscopic rendering and DIBR
 """
 
 __all__ = [
+    'ActiveArea',
     'DIBRRenderer',
+    'TorchDIBRRenderer',
+    'create_renderer',
+    'MultiViewRenderer',
+    'MultiViewComposer',
     'StereoscopyManager',
     'SBSComposer',
+    'StripRenderer',
+    'WatermarkCompositor',
 ]
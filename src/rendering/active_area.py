@@ -0,0 +1,287 @@
+"""
+Active Picture Area
+Detect letterbox/pillarbox bars so depth estimation, DIBR and hole filling
+only run on the picture, then put the bars back around the composed frame
+"""
+import numpy as np
+import cv2
+from typing import List, Optional, Sequence, Tuple
+
+from .sbs_composer import SBSComposer, _ensure_output
+from ..ai_core.postprocessing import depth_scale
+
+
+# Eye tiles of each view format: (tile rows, tile columns, y divisor, x divisor)
+_TILE_LAYOUTS = {
+    'half_sbs': (1, 2, 1, 2),
+    'full_sbs': (1, 2, 1, 1),
+    'top_bottom': (2, 1, 2, 1),
+    'anaglyph': (1, 1, 1, 1),
+    'row_interleaved': (1, 1, 1, 1),
+    'column_interleaved': (1, 1, 1, 1),
+    'checkerboard': (1, 1, 1, 1),
+}
+
+
+class ActiveArea:
+    """
+    Rectangle of a frame inside black bars
+    
+    Bounds are even so half-size and interleaved formats keep their eye
+    grids aligned. Bars are filled from the source frame when composing,
+    so they stay at screen depth and keep anything drawn on them (e.g.
+    subtitles placed in the letterbox).
+    """
+    
+    def __init__(
+        self,
+        height: int,
+        width: int,
+        top: int = 0,
+        bottom: Optional[int] = None,
+        left: int = 0,
+        right: Optional[int] = None
+    ):
+        """
+        Initialize active area
+        
+        Args:
+            height: Full frame height
+            width: Full frame width
+            top: First picture row
+            bottom: Row after the last picture row (default: height)
+            left: First picture column
+            right: Column after the last picture column (default: width)
+        """
+        bottom = height if bottom is None else bottom
+        right = width if right is None else right
+        if not (0 <= top < bottom <= height and 0 <= left < right <= width):
+            raise ValueError(
+                f"Invalid active area rows {top}:{bottom}, columns {left}:{right} "
+                f"for a {width}x{height} frame"
+            )
+        
+        self.height = height
+        self.width = width
+        self.top = top
+        self.bottom = bottom
+        self.left = left
+        self.right = right
+    
+    @classmethod
+    def detect(
+        cls,
+        frames: Sequence[np.ndarray],
+        threshold: int = 24,
+        min_fraction: float = 0.005,
+        min_bar: int = 8
+    ) -> 'ActiveArea':
+        """
+        Detect the picture area from a few sampled frames
+        
+        A row or column belongs to the picture if, in any sample, more than
+        ``min_fraction`` of its pixels are brighter than ``threshold``.
+        Taking the union over samples keeps dark scenes from being cropped.
+        
+        Args:
+            frames: Sampled frames of one shot or video (H, W) or (H, W, C), uint8
+            threshold: Brightest value still counted as black
+            min_fraction: Share of bright pixels that marks a row/column active
+            min_bar: Bars thinner than this are ignored
+        
+        Returns:
+            Active area (the full frame if no bars were found)
+        """
+        if not frames:
+            raise ValueError("No frames to detect the active area from")
+        
+        h, w = frames[0].shape[:2]
+        row_counts = np.zeros(h, dtype=np.int64)
+        col_counts = np.zeros(w, dtype=np.int64)
+        for frame in frames:
+            if frame.shape[:2] != (h, w):
+                raise ValueError("Sampled frames differ in size")
+            
+            luma = frame.max(axis=2) if frame.ndim == 3 else frame
+            bright = luma > threshold
+            row_counts = np.maximum(row_counts, np.count_nonzero(bright, axis=1))
+            col_counts = np.maximum(col_counts, np.count_nonzero(bright, axis=0))
+        
+        rows = np.flatnonzero(row_counts > w * min_fraction)
+        cols = np.flatnonzero(col_counts > h * min_fraction)
+        if len(rows) == 0 or len(cols) == 0:
+            # Black frames: nothing to crop against
+            return cls(h, w)
+        
+        top, bottom = _even_bounds(int(rows[0]), int(rows[-1]) + 1, h, min_bar)
+        left, right = _even_bounds(int(cols[0]), int(cols[-1]) + 1, w, min_bar)
+        
+        return cls(h, w, top, bottom, left, right)
+    
+    @classmethod
+    def detect_from_files(cls, frame_paths: Sequence, samples: int = 5, **kwargs) -> 'ActiveArea':
+        """
+        Detect the picture area from frames evenly sampled from a sequence
+        
+        Args:
+            frame_paths: Frame image paths in order
+            samples: Number of frames to read
+            **kwargs: Detection settings (see detect)
+        
+        Returns:
+            Active area of the sequence
+        """
+        if not frame_paths:
+            raise ValueError("No frames to detect the active area from")
+        
+        step = max(1, len(frame_paths) // samples)
+        frames = []
+        for path in list(frame_paths)[step // 2::step][:samples]:
+            frame = cv2.imread(str(path))
+            if frame is None:
+                raise ValueError(f"Failed to load frame: {path}")
+            frames.append(frame)
+        
+        return cls.detect(frames, **kwargs)
+    
+    @property
+    def is_full(self) -> bool:
+        """Whether the picture fills the frame (nothing to crop)"""
+        return (self.top, self.bottom, self.left, self.right) == (0, self.height, 0, self.width)
+    
+    @property
+    def shape(self) -> Tuple[int, int]:
+        """(height, width) of the picture area"""
+        return self.bottom - self.top, self.right - self.left
+    
+    def crop(self, image: np.ndarray) -> np.ndarray:
+        """
+        Get the picture area of a full frame
+        
+        Args:
+            image: Full frame (or depth map)
+        
+        Returns:
+            View of the picture area
+        """
+        return image[self.top:self.bottom, self.left:self.right]
+    
+    def uncrop_depth(self, depth: np.ndarray, far: float = 1.0) -> np.ndarray:
+        """
+        Extend a picture-area depth map to the full frame
+        
+        Args:
+            depth: Depth map of the picture area, normalized to [0, 1]
+            far: Normalized depth of the bars
+        
+        Returns:
+            Full-frame depth map with the bars at ``far``
+        """
+        if self.is_full:
+            return depth
+        
+        full = np.full((self.height, self.width), far * depth_scale(depth.dtype), dtype=depth.dtype)
+        self.crop(full)[...] = depth
+        return full
+    
+    def paste(
+        self,
+        frame: np.ndarray,
+        source: np.ndarray,
+        output_format: str,
+        out: Optional[np.ndarray] = None,
+        bgr: bool = False
+    ) -> np.ndarray:
+        """
+        Place a frame composed from the picture area into the full frame
+        
+        Each eye tile gets the composed picture at the picture position;
+        its bars are taken from the source frame (scaled like the eye for
+        half-size formats).
+        
+        Args:
+            frame: Frame composed from the cropped views (same format)
+            source: Full RGB source frame
+            output_format: View output format (not 2D + depth, which
+                extends the depth map instead, see uncrop_depth)
+            out: Optional preallocated full-size output frame
+            bgr: ``frame`` and ``out`` are BGR
+        
+        Returns:
+            Full-size composed frame
+        """
+        if output_format not in _TILE_LAYOUTS:
+            raise ValueError(f"Cannot paste {output_format} frames; extend the depth map instead")
+        
+        rows, cols, y_div, x_div = _TILE_LAYOUTS[output_format]
+        shape = SBSComposer.output_shape(self.height, self.width, output_format) + frame.shape[2:]
+        out = _ensure_output(out, shape, frame.dtype)
+        
+        tile_h, tile_w = shape[0] // rows, shape[1] // cols
+        crop_h, crop_w = frame.shape[0] // rows, frame.shape[1] // cols
+        y0, x0 = self.top // y_div, self.left // x_div
+        bars = self._tile_bars(source, tile_h, tile_w, (y0, y0 + crop_h, x0, x0 + crop_w), y_div, x_div, bgr)
+        
+        for r in range(rows):
+            for c in range(cols):
+                tile = out[r * tile_h:(r + 1) * tile_h, c * tile_w:(c + 1) * tile_w]
+                tile[y0:y0 + crop_h, x0:x0 + crop_w] = frame[
+                    r * crop_h:(r + 1) * crop_h, c * crop_w:(c + 1) * crop_w
+                ]
+                for region, pixels in bars:
+                    tile[region] = pixels
+        
+        return out
+    
+    def _tile_bars(
+        self,
+        source: np.ndarray,
+        tile_h: int,
+        tile_w: int,
+        picture: Tuple[int, int, int, int],
+        y_div: int,
+        x_div: int,
+        bgr: bool
+    ) -> List[Tuple[Tuple[slice, slice], np.ndarray]]:
+        """Get (tile region, pixels) of the bars around the picture in one eye tile"""
+        top, bottom, left, right = picture
+        bands = [
+            (0, top, 0, tile_w),
+            (bottom, tile_h, 0, tile_w),
+            (top, bottom, 0, left),
+            (top, bottom, right, tile_w),
+        ]
+        
+        bars = []
+        for y_start, y_stop, x_start, x_stop in bands:
+            if y_stop <= y_start or x_stop <= x_start:
+                continue
+            
+            pixels = source[y_start * y_div:y_stop * y_div, x_start * x_div:x_stop * x_div]
+            if y_div > 1 or x_div > 1:
+                pixels = cv2.resize(
+                    np.ascontiguousarray(pixels),
+                    (x_stop - x_start, y_stop - y_start),
+                    interpolation=cv2.INTER_AREA
+                )
+            if bgr:
+                pixels = pixels[..., ::-1]
+            bars.append(((slice(y_start, y_stop), slice(x_start, x_stop)), pixels))
+        
+        return bars
+    
+    def __repr__(self) -> str:
+        h, w = self.shape
+        return (
+            f"ActiveArea({w}x{h} at ({self.left}, {self.top}) "
+            f"in {self.width}x{self.height})"
+        )
+
+
+def _even_bounds(start: int, stop: int, size: int, min_bar: int) -> Tuple[int, int]:
+    """Shrink [start, stop) to even bounds, dropping bars thinner than min_bar"""
+    start = 0 if start < min_bar else start + start % 2
+    stop = size if size - stop < min_bar else stop - stop % 2
+    if stop <= start:
+        return 0, size
+    return start, stop
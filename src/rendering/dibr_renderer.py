@@ -4,22 +4,64 @@ Core algorithm for generating stereoscopic views from depth maps
 """
 import numpy as np
 import cv2
-from typing import Tuple
+from typing import Dict, Optional, Tuple
+
+from .sbs_composer import SBSComposer
+from .view_synthesis import ViewSynthesizer
+from ..ai_core.postprocessing import depth_scale, resize_depth
+
+
+RENDER_MODES = ('remap', 'layered')
+
+# Depth dtypes converted with a cached per-setting transform (uint16
+# stores [0, 1] as 0-65535)
+_TRANSFORM_DTYPES = (np.dtype(np.float32), np.dtype(np.float16), np.dtype(np.uint16), np.dtype(np.uint8))
+
+# How each eye is shifted, as a multiple of the disparity; 0 = source frame
+STEREO_MODES = {
+    'symmetric': (-0.5, 0.5),
+    'left_reference': (0.0, 1.0),
+    'right_reference': (-1.0, 0.0),
+}
 
 
 class DIBRRenderer:
     """Depth Image-Based Rendering for stereoscopic view generation"""
     
-    def __init__(self, ipd: float = 65.0, convergence: float = 1.0):
+    def __init__(
+        self,
+        ipd: float = 65.0,
+        convergence: float = 1.0,
+        render_mode: str = 'remap',
+        num_layers: int = 16,
+        stereo_mode: str = 'symmetric'
+    ):
         """
         Initialize DIBR renderer
         
         Args:
             ipd: Interpupillary distance in mm (typical: 55-75)
             convergence: Convergence distance multiplier
+            render_mode: 'remap' (per-pixel warp) or 'layered' (depth planes
+                moved by one translation each; faster at high resolution)
+            num_layers: Number of depth planes in layered mode
+            stereo_mode: 'symmetric' (both eyes shifted by half the
+                disparity) or 'left_reference'/'right_reference' (that eye
+                is the untouched source frame, the other gets the full
+                disparity; half the render and hole-filling work)
         """
+        if render_mode not in RENDER_MODES:
+            raise ValueError(f"Unknown render mode: {render_mode}")
+        if stereo_mode not in STEREO_MODES:
+            raise ValueError(f"Unknown stereo mode: {stereo_mode}")
+        
         self.ipd = ipd
         self.convergence = convergence
+        self.render_mode = render_mode
+        self.stereo_mode = stereo_mode
+        self.view_synthesizer = ViewSynthesizer(num_layers=num_layers)
+        self._grid_cache: Dict[Tuple, Tuple[np.ndarray, np.ndarray]] = {}
+        self._disparity_transforms: Dict[Tuple, Tuple[float, float]] = {}
     
     def render_stereo_pair(
         self,
@@ -36,17 +78,33 @@ class DIBRRenderer:
             depth_intensity: Depth effect strength (0-100)
         
         Returns:
-            Tuple of (left_view, right_view)
+            Tuple of (left_view, right_view); in a reference stereo mode
+            the reference view is ``image`` itself
         """
+        if self.render_mode == 'layered':
+            return self._render_layered(image, depth, depth_intensity)
+        
         # Compute disparity map
         disparity = self.compute_disparity(depth, depth_intensity)
         
         # Generate left and right views
-        left_view = self.shift_pixels(image, -disparity / 2)
-        right_view = self.shift_pixels(image, disparity / 2)
+        left_view, right_view = (
+            image if factor == 0 else self.shift_pixels(image, disparity * factor)
+            for factor in STEREO_MODES[self.stereo_mode]
+        )
         
         return left_view, right_view
     
+    @property
+    def reference_eye(self) -> Optional[str]:
+        """Eye shown as the untouched source frame ('left', 'right' or None)"""
+        left_factor, right_factor = STEREO_MODES[self.stereo_mode]
+        if left_factor == 0:
+            return 'left'
+        elif right_factor == 0:
+            return 'right'
+        return None
+    
     def compute_disparity(
         self,
         depth: np.ndarray,
@@ -55,6 +113,10 @@ class DIBRRenderer:
         """
         Convert depth map to disparity (pixel shift amount)
         
+        Depth arrays (float32, float16 or uint16) are converted in one fused
+        pass with a transform precomputed per (ipd, intensity, convergence),
+        reading compact depth directly without a float copy.
+        
         Args:
             depth: Normalized depth map [0, 1]
             depth_intensity: Strength multiplier (0-100)
@@ -62,6 +124,57 @@ class DIBRRenderer:
         Returns:
             Disparity map in pixels
         """
+        if isinstance(depth, np.ndarray) and depth.ndim == 2 and depth.dtype in _TRANSFORM_DTYPES:
+            gain, offset = self._get_disparity_transform(depth.dtype, depth_intensity)
+            return cv2.addWeighted(depth, gain, depth, 0.0, offset, dtype=cv2.CV_32F)
+        
+        return self._disparity_from_depth(depth, depth_intensity)
+    
+    def disocclusion_masks(
+        self,
+        depth: np.ndarray,
+        depth_intensity: float = 75.0
+    ) -> Tuple[Optional[np.ndarray], Optional[np.ndarray]]:
+        """
+        Get the pixels of each rendered eye that show disoccluded background
+        
+        A view pixel at x samples the source at x + f * d(x). If the
+        disparity found at that source pixel moves it by more than a pixel
+        differently, the sample belongs to another depth layer: the pixel
+        lies in background that the source frame hid behind an edge.
+        Samples clamped to the frame border count as holes too. Dark but
+        consistently rendered content is never masked.
+        
+        Args:
+            depth: Depth map (H, W) normalized to [0, 1]
+            depth_intensity: Depth effect strength (0-100)
+        
+        Returns:
+            Tuple of (left_mask, right_mask), float32 (H, W) with 1 = hole;
+            None for the reference eye of a reference stereo mode
+        """
+        h, w = depth.shape[:2]
+        disparity = self.compute_disparity(depth, depth_intensity)
+        base_x, base_y = self._get_eye_grid(h, w, h, w)
+        
+        masks = []
+        for factor in STEREO_MODES[self.stereo_mode]:
+            if factor == 0:
+                masks.append(None)
+                continue
+            
+            map_x = base_x + disparity * factor
+            sampled = cv2.remap(
+                disparity, np.clip(map_x, 0, w - 1), base_y, cv2.INTER_NEAREST
+            )
+            holes = np.abs((sampled - disparity) * factor) > 1.0
+            holes |= (map_x < 0) | (map_x > w - 1)
+            masks.append(holes.astype(np.float32))
+        
+        return masks[0], masks[1]
+    
+    def _disparity_from_depth(self, depth, depth_intensity: float):
+        """Disparity formula on normalized float depth (arrays or tensors)"""
         # Scale depth by intensity
         intensity_factor = depth_intensity / 100.0
         
@@ -73,6 +186,19 @@ class DIBRRenderer:
         
         return disparity
     
+    def _get_disparity_transform(self, dtype: np.dtype, depth_intensity: float) -> Tuple[float, float]:
+        """Get (gain, offset) mapping stored depth values to disparity (cached per setting)"""
+        key = (dtype.str, self.ipd, depth_intensity, self.convergence)
+        if key not in self._disparity_transforms:
+            # Disparity is affine in depth: evaluate the model at near and far
+            near, far = self._disparity_from_depth(np.array([0.0, 1.0]), depth_intensity)
+            self._disparity_transforms[key] = (
+                float(far - near) / depth_scale(dtype),
+                float(near)
+            )
+        
+        return self._disparity_transforms[key]
+    
     def shift_pixels(
         self,
         image: np.ndarray,
@@ -110,6 +236,235 @@ class DIBRRenderer:
         
         return shifted
     
+    def render_half_format(
+        self,
+        image: np.ndarray,
+        depth: np.ndarray,
+        output_format: str = 'half_sbs',
+        depth_intensity: float = 75.0,
+        out: Optional[np.ndarray] = None
+    ) -> np.ndarray:
+        """
+        Render a half-resolution stereo frame directly at output size
+        
+        Each eye is remapped straight onto its final per-eye grid and written
+        into its half of the output frame, instead of rendering two
+        full-resolution views and downscaling them in the composer.
+        
+        Args:
+            image: Input RGB image (H, W, 3)
+            depth: Depth map (H, W) normalized to [0, 1]
+            output_format: 'half_sbs' or 'top_bottom'
+            depth_intensity: Depth effect strength (0-100)
+            out: Optional preallocated output frame (see half_format_shape)
+        
+        Returns:
+            Composed frame; use split_half_format to get the eye views
+        """
+        h, w = image.shape[:2]
+        out_shape = self.half_format_shape(h, w, output_format)
+        if out is None:
+            out = np.empty(out_shape + image.shape[2:], dtype=image.dtype)
+        
+        left_half, right_half = self.split_half_format(out, output_format)
+        eye_h, eye_w = left_half.shape[:2]
+        
+        if self.render_mode == 'layered':
+            # Planes are moved on the eye grid, shifts scaled to match
+            eye_image = cv2.resize(image, (eye_w, eye_h), interpolation=cv2.INTER_AREA)
+            eye_depth = resize_depth(depth, (eye_w, eye_h), interpolation=cv2.INTER_NEAREST)
+            self._render_layered(
+                eye_image, eye_depth, depth_intensity,
+                scale=eye_w / w, out=(left_half, right_half)
+            )
+            return out
+        
+        base_x, base_y = self._get_eye_grid(h, w, eye_h, eye_w)
+        
+        # Disparity is sampled on the eye grid but measured in source pixels
+        eye_depth = resize_depth(depth, (eye_w, eye_h), interpolation=cv2.INTER_LINEAR)
+        disparity = self.compute_disparity(eye_depth, depth_intensity)
+        
+        for factor, target in zip(STEREO_MODES[self.stereo_mode], (left_half, right_half)):
+            if factor == 0:
+                # Reference eye is only scaled to the eye grid
+                cv2.resize(image, (eye_w, eye_h), dst=target, interpolation=cv2.INTER_LINEAR)
+                continue
+            
+            map_x = np.clip(base_x + disparity * factor, 0, w - 1).astype(np.float32)
+            cv2.remap(
+                image,
+                map_x,
+                base_y,
+                cv2.INTER_LINEAR,
+                dst=target,
+                borderMode=cv2.BORDER_REPLICATE
+            )
+        
+        return out
+    
+    @staticmethod
+    def half_format_shape(height: int, width: int, output_format: str) -> Tuple[int, int]:
+        """
+        Get (height, width) of a half-resolution stereo frame
+        
+        Args:
+            height: Source height
+            width: Source width
+            output_format: 'half_sbs' or 'top_bottom'
+        
+        Returns:
+            Output frame size, matching SBSComposer's half formats
+        """
+        if output_format == 'half_sbs':
+            return height, (width // 2) * 2
+        elif output_format == 'top_bottom':
+            return (height // 2) * 2, width
+        raise ValueError(f"Not a half-resolution format: {output_format}")
+    
+    @staticmethod
+    def split_half_format(
+        frame: np.ndarray,
+        output_format: str
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Get writable (left, right) views into a half-resolution stereo frame
+        
+        Args:
+            frame: Composed half_sbs or top_bottom frame
+            output_format: 'half_sbs' or 'top_bottom'
+        
+        Returns:
+            Tuple of (left_half, right_half) array views
+        """
+        if output_format == 'half_sbs':
+            half = frame.shape[1] // 2
+            return frame[:, :half], frame[:, half:]
+        elif output_format == 'top_bottom':
+            half = frame.shape[0] // 2
+            return frame[:half], frame[half:]
+        raise ValueError(f"Not a half-resolution format: {output_format}")
+    
+    def render_interleaved(
+        self,
+        image: np.ndarray,
+        depth: np.ndarray,
+        output_format: str = 'row_interleaved',
+        depth_intensity: float = 75.0
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Render only the pixels each eye contributes to an interleaved frame
+        
+        Each eye is remapped on its own packed sample grid (see
+        SBSComposer.sample_interleaved), so together both eyes cost one
+        full-frame remap. Combine with SBSComposer.interleave_eyes.
+        
+        Args:
+            image: Input RGB image (H, W, 3)
+            depth: Depth map (H, W) normalized to [0, 1]
+            output_format: 'row_interleaved', 'column_interleaved' or 'checkerboard'
+            depth_intensity: Depth effect strength (0-100)
+        
+        Returns:
+            Tuple of packed (left_samples, right_samples)
+        """
+        if self.render_mode == 'layered':
+            # Planes are translated whole; sample the full views
+            views = self._render_layered(image, depth, depth_intensity)
+            return tuple(
+                SBSComposer.sample_interleaved(view, output_format, eye)
+                for view, eye in zip(views, ('left', 'right'))
+            )
+        
+        h, w = image.shape[:2]
+        samples = []
+        for factor, eye in zip(STEREO_MODES[self.stereo_mode], ('left', 'right')):
+            if factor == 0:
+                samples.append(np.ascontiguousarray(
+                    SBSComposer.sample_interleaved(image, output_format, eye)
+                ))
+                continue
+            
+            base_x, base_y = self._get_interleaved_grid(h, w, output_format, eye)
+            disparity = self.compute_disparity(
+                SBSComposer.sample_interleaved(depth, output_format, eye), depth_intensity
+            )
+            
+            map_x = np.clip(base_x + disparity * factor, 0, w - 1).astype(np.float32)
+            samples.append(cv2.remap(
+                image,
+                map_x,
+                base_y,
+                cv2.INTER_LINEAR,
+                borderMode=cv2.BORDER_REPLICATE
+            ))
+        
+        return samples[0], samples[1]
+    
+    def _render_layered(
+        self,
+        image: np.ndarray,
+        depth: np.ndarray,
+        depth_intensity: float,
+        scale: float = 1.0,
+        out: Tuple[Optional[np.ndarray], Optional[np.ndarray]] = (None, None)
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Render both eyes from one depth quantization (layered mode)"""
+        synthesizer = self.view_synthesizer
+        labels = synthesizer.quantize_depth(depth)
+        
+        # Per-plane shifts follow the same disparity model as remap mode;
+        # remap samples at x + f*d, so content moves by -f*d
+        shifts = self.compute_disparity(synthesizer.plane_depths(), depth_intensity) * scale
+        
+        views = []
+        for factor, target in zip(STEREO_MODES[self.stereo_mode], out):
+            if factor == 0:
+                if target is not None:
+                    np.copyto(target, image)
+                views.append(image if target is None else target)
+            else:
+                views.append(synthesizer.render_layers(image, labels, -factor * shifts, out=target))
+        
+        return views[0], views[1]
+    
+    def _get_eye_grid(
+        self,
+        h: int,
+        w: int,
+        eye_h: int,
+        eye_w: int
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Get source coordinates of each eye-grid pixel (cached per size)"""
+        key = (h, w, eye_h, eye_w)
+        if key not in self._grid_cache:
+            # Pixel-center mapping, the same convention as cv2.resize
+            xs = (np.arange(eye_w, dtype=np.float32) + 0.5) * (w / eye_w) - 0.5
+            ys = (np.arange(eye_h, dtype=np.float32) + 0.5) * (h / eye_h) - 0.5
+            xs = np.clip(xs, 0, w - 1)
+            ys = np.clip(ys, 0, h - 1)
+            base_x = np.broadcast_to(xs, (eye_h, eye_w))
+            base_y = np.ascontiguousarray(np.broadcast_to(ys[:, np.newaxis], (eye_h, eye_w)))
+            self._grid_cache[key] = (base_x, base_y)
+        return self._grid_cache[key]
+    
+    def _get_interleaved_grid(
+        self,
+        h: int,
+        w: int,
+        output_format: str,
+        eye: str
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Get source coordinates of an eye's interleaved samples (cached per size)"""
+        key = (h, w, output_format, eye)
+        if key not in self._grid_cache:
+            ys, xs = np.mgrid[0:h, 0:w].astype(np.float32)
+            self._grid_cache[key] = (
+                np.ascontiguousarray(SBSComposer.sample_interleaved(xs, output_format, eye)),
+                np.ascontiguousarray(SBSComposer.sample_interleaved(ys, output_format, eye))
+            )
+        return self._grid_cache[key]
+    
     def set_ipd(self, ipd: float):
         """Set interpupillary distance"""
         self.ipd = max(50.0, min(80.0, ipd))  # Clamp to reasonable range
@@ -117,3 +472,46 @@ class DIBRRenderer:
     def set_convergence(self, convergence: float):
         """Set convergence distance"""
         self.convergence = max(0.1, convergence)
+
+
+RENDER_BACKENDS = ('opencv', 'torch')
+
+
+def create_renderer(
+    backend: str = 'opencv',
+    ipd: float = 65.0,
+    convergence: float = 1.0,
+    device: str = 'cpu',
+    render_mode: str = 'remap',
+    stereo_mode: str = 'symmetric'
+) -> DIBRRenderer:
+    """
+    Create a DIBR renderer for the requested backend
+    
+    Args:
+        backend: 'opencv' (per-frame numpy/OpenCV) or 'torch' (batched
+            grid_sample on the depth model's device)
+        ipd: Interpupillary distance in mm
+        convergence: Convergence distance multiplier
+        device: Device for the torch backend
+        render_mode: 'remap' or 'layered' (OpenCV backend only)
+        stereo_mode: 'symmetric', 'left_reference' or 'right_reference'
+    
+    Returns:
+        Renderer instance
+    """
+    if backend == 'opencv':
+        return DIBRRenderer(
+            ipd=ipd, convergence=convergence,
+            render_mode=render_mode, stereo_mode=stereo_mode
+        )
+    elif backend == 'torch':
+        if render_mode != 'remap':
+            raise ValueError("The torch backend only supports the 'remap' render mode")
+        # Imported lazily so the OpenCV path does not require torch
+        from .dibr_torch import TorchDIBRRenderer
+        return TorchDIBRRenderer(
+            ipd=ipd, convergence=convergence, device=device, stereo_mode=stereo_mode
+        )
+    
+    raise ValueError(f"Unknown render backend: {backend}")
@@ -0,0 +1,161 @@
+"""
+Tensor-based DIBR Backend
+Batched stereo rendering with torch grid_sample on the inference device
+"""
+import numpy as np
+import torch
+import torch.nn.functional as F
+from typing import Dict, List, Sequence, Tuple, Union
+
+from .dibr_renderer import DIBRRenderer, STEREO_MODES
+from ..ai_core.postprocessing import dequantize_depth
+
+
+class TorchDIBRRenderer(DIBRRenderer):
+    """
+    DIBR renderer working on batches of tensors
+
+    Renders both eyes for a whole batch of frames with a single
+    grid_sample call per eye, on the same device as the depth model, so
+    depth maps never round-trip through numpy. Sampling matches the
+    OpenCV backend (bilinear, clamped to the frame border).
+    """
+
+    def __init__(
+        self,
+        ipd: float = 65.0,
+        convergence: float = 1.0,
+        device: Union[str, torch.device] = "cpu",
+        stereo_mode: str = "symmetric"
+    ):
+        """
+        Initialize tensor DIBR renderer
+
+        Args:
+            ipd: Interpupillary distance in mm (typical: 55-75)
+            convergence: Convergence distance multiplier
+            device: Device to render on (should match the depth model)
+            stereo_mode: 'symmetric', 'left_reference' or 'right_reference'
+        """
+        super().__init__(ipd=ipd, convergence=convergence, stereo_mode=stereo_mode)
+        self.device = torch.device(device)
+        self._tensor_grid_cache: Dict[Tuple[int, int], Tuple[torch.Tensor, torch.Tensor]] = {}
+
+    def render_stereo_pair(
+        self,
+        image: np.ndarray,
+        depth: np.ndarray,
+        depth_intensity: float = 75.0
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Render stereo pair from image and depth map (numpy interface)
+
+        Args:
+            image: Input RGB image (H, W, 3)
+            depth: Depth map (H, W) normalized to [0, 1] (float32, float16
+                or uint16)
+            depth_intensity: Depth effect strength (0-100)
+
+        Returns:
+            Tuple of (left_view, right_view)
+        """
+        depth_tensor = torch.as_tensor(dequantize_depth(depth), device=self.device).unsqueeze(0)
+        left, right = self.render_stereo_batch([image], depth_tensor, depth_intensity)
+
+        return self.to_numpy(left)[0], self.to_numpy(right)[0]
+
+    def render_stereo_batch(
+        self,
+        images: Union[torch.Tensor, Sequence[np.ndarray]],
+        depths: torch.Tensor,
+        depth_intensity: float = 75.0
+    ) -> Tuple[torch.Tensor, torch.Tensor]:
+        """
+        Render stereo pairs for a batch of frames
+
+        Args:
+            images: RGB frames, either a (N, 3, H, W) tensor or a list of
+                (H, W, 3) uint8 arrays of equal size
+            depths: Depth maps (N, H, W) normalized to [0, 1]; integer
+                tensors store [0, 1] as 0 to their maximum (uint16: 65535)
+            depth_intensity: Depth effect strength (0-100)
+
+        Returns:
+            Tuple of (left_views, right_views) as (N, 3, H, W) float tensors
+            in the 0-255 range
+        """
+        images = self.to_tensor(images)
+        if depths.is_floating_point():
+            depths = depths.to(self.device, dtype=torch.float32)
+        else:
+            scale = 1.0 / torch.iinfo(depths.dtype).max
+            depths = depths.to(self.device, dtype=torch.float32).mul_(scale)
+        n, _, h, w = images.shape
+
+        disparity = self.compute_disparity(depths, depth_intensity)
+
+        base_x, base_y = self._get_base_grid(h, w)
+        # Disparity in pixels -> normalized grid units (align_corners=True)
+        disparity = disparity * (2.0 / max(w - 1, 1))
+        grid_y = base_y.expand(n, h, w)
+
+        left, right = (
+            images if factor == 0 else self._sample(images, base_x + factor * disparity, grid_y)
+            for factor in STEREO_MODES[self.stereo_mode]
+        )
+
+        return left, right
+
+    def to_tensor(self, images: Union[torch.Tensor, Sequence[np.ndarray]]) -> torch.Tensor:
+        """
+        Move frames to the render device as a (N, 3, H, W) float tensor
+
+        Args:
+            images: Tensor batch or list of (H, W, 3) uint8 arrays
+
+        Returns:
+            Float tensor on the render device
+        """
+        if not isinstance(images, torch.Tensor):
+            images = torch.from_numpy(np.stack(images)).permute(0, 3, 1, 2)
+        return images.to(self.device, dtype=torch.float32)
+
+    @staticmethod
+    def to_numpy(views: torch.Tensor) -> List[np.ndarray]:
+        """
+        Convert rendered views back to (H, W, 3) uint8 arrays
+
+        Args:
+            views: (N, 3, H, W) tensor in the 0-255 range
+
+        Returns:
+            List of RGB images
+        """
+        views = views.round_().clamp_(0, 255).to(torch.uint8)
+        views = views.permute(0, 2, 3, 1).contiguous().cpu().numpy()
+        return list(views)
+
+    def _sample(
+        self,
+        images: torch.Tensor,
+        grid_x: torch.Tensor,
+        grid_y: torch.Tensor
+    ) -> torch.Tensor:
+        """Bilinear sampling with border clamping, like cv2.remap + BORDER_REPLICATE"""
+        grid = torch.stack((grid_x.clamp(-1.0, 1.0), grid_y), dim=-1)
+        return F.grid_sample(
+            images,
+            grid,
+            mode='bilinear',
+            padding_mode='border',
+            align_corners=True
+        )
+
+    def _get_base_grid(self, h: int, w: int) -> Tuple[torch.Tensor, torch.Tensor]:
+        """Get identity sampling grid in normalized coordinates (cached per size)"""
+        key = (h, w)
+        if key not in self._tensor_grid_cache:
+            xs = torch.linspace(-1.0, 1.0, w, device=self.device)
+            ys = torch.linspace(-1.0, 1.0, h, device=self.device)
+            self._tensor_grid_cache[key] = (xs.view(1, 1, w), ys.view(1, h, 1))
+        return self._tensor_grid_cache[key]
@@ -4,6 +4,9 @@ Fill disocclusions (holes) in rendered stereoscopic views
 """
 import cv2
 import numpy as np
+from typing import Dict, Optional, Tuple
+
+from ..ai_core.postprocessing import dequantize_depth, depth_scale, resize_depth
 
 
 def fill_holes_fast_marching(image: np.ndarray, mask: np.ndarray) -> np.ndarray:
@@ -85,23 +88,14 @@ def detect_holes(left_view: np.ndarray, right_view: np.ndarray) -> Tuple[np.ndar
     Returns:
         Tuple of (left_holes_mask, right_holes_mask)
     """
-    # Simple hole detection: look for black pixels or sudden changes
-    # This is a placeholder - real implementation would be more sophisticated
-    
-    left_gray = cv2.cvtColor(left_view, cv2.COLOR_RGB2GRAY)
-    right_gray = cv2.cvtColor(right_view, cv2.COLOR_RGB2GRAY)
-    
-    # Detect very dark regions (potential holes)
-    left_holes = (left_gray < 10).astype(np.float32)
-    right_holes = (right_gray < 10).astype(np.float32)
-    
-    return left_holes, right_holes
+    return _detect_view_holes(left_view), _detect_view_holes(right_view)
 
 
 def fill_stereo_pair_holes(
     left_view: np.ndarray,
     right_view: np.ndarray,
-    method: str = 'fast_marching'
+    method: str = 'fast_marching',
+    reference_eye: Optional[str] = None
 ) -> Tuple[np.ndarray, np.ndarray]:
     """
     Fill holes in both views of stereo pair
@@ -110,23 +104,188 @@ def fill_stereo_pair_holes(
         left_view: Left eye view
         right_view: Right eye view
         method: Hole filling method
+        reference_eye: 'left' or 'right' if that view is the untouched
+            source frame, which has no holes and is returned as is
     
     Returns:
         Tuple of filled (left_view, right_view)
     """
-    # Detect holes
-    left_mask, right_mask = detect_holes(left_view, right_view)
+    filled = []
+    for eye, view in (('left', left_view), ('right', right_view)):
+        if eye == reference_eye:
+            filled.append(view)
+            continue
+        
+        # Unknown methods leave the view untouched
+        filled.append(_fill_spatial(view, _detect_view_holes(view), method))
     
-    # Fill holes
+    return filled[0], filled[1]
+
+
+class TemporalHoleFiller:
+    """
+    Fill disocclusions in video from a per-shot background plate
+
+    Background revealed by a disocclusion was usually visible a few frames
+    earlier in static or slowly panning shots. The filler accumulates
+    far-depth pixels of each eye view into a plate and fills holes by
+    lookup, falling back to spatial filling where the plate has no data.
+    """
+
+    def __init__(
+        self,
+        far_threshold: float = 0.6,
+        scene_threshold: float = 0.3,
+        spatial_method: str = 'fast_marching'
+    ):
+        """
+        Initialize temporal hole filler
+
+        Args:
+            far_threshold: Depth above which a pixel counts as background
+                (depth map convention: 0 = near, 1 = far)
+            scene_threshold: Mean depth change that resets the plates
+            spatial_method: Fallback method for holes the plate cannot fill
+        """
+        self.far_threshold = far_threshold
+        self.scene_threshold = scene_threshold
+        self.spatial_method = spatial_method
+        self.plates: Dict[str, Tuple[np.ndarray, np.ndarray]] = {}
+        self.prev_depth: Optional[np.ndarray] = None
+
+    def reset(self):
+        """Drop the background plates (call on scene change)"""
+        self.plates.clear()
+        self.prev_depth = None
+
+    def fill_stereo_pair(
+        self,
+        left_view: np.ndarray,
+        right_view: np.ndarray,
+        depth: np.ndarray,
+        masks: Tuple[Optional[np.ndarray], Optional[np.ndarray]],
+        reference_eye: Optional[str] = None
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Fill holes in both views of a video frame
+
+        Args:
+            left_view: Left eye view (H, W, 3)
+            right_view: Right eye view (H, W, 3)
+            depth: Depth map normalized to [0, 1]; resized to the view size
+                if it differs (e.g. half-resolution eye views)
+            masks: (left, right) hole masks from the renderer (see
+                DIBRRenderer.disocclusion_masks), 1 = hole; resized to the
+                view size if they differ. A None mask means no holes.
+            reference_eye: 'left' or 'right' if that view is the untouched
+                source frame; it is returned as is and gets no plate
+
+        Returns:
+            Tuple of filled (left_view, right_view)
+        """
+        h, w = left_view.shape[:2]
+        if depth.shape[:2] != (h, w):
+            depth = resize_depth(depth, (w, h), interpolation=cv2.INTER_LINEAR)
+
+        self._check_scene_change(depth, (h, w))
+
+        filled = []
+        for eye, view, mask in (('left', left_view, masks[0]), ('right', right_view, masks[1])):
+            if eye == reference_eye:
+                filled.append(view)
+                continue
+
+            if mask is None:
+                mask = np.zeros((h, w), dtype=np.float32)
+            elif mask.shape[:2] != (h, w):
+                # Any hole pixel under a smaller view pixel makes it a hole
+                mask = (cv2.resize(mask, (w, h), interpolation=cv2.INTER_AREA) > 0).astype(np.float32)
+            filled.append(self.fill(eye, view, mask, depth))
+
+        return filled[0], filled[1]
+
+    def fill(
+        self,
+        eye: str,
+        view: np.ndarray,
+        mask: np.ndarray,
+        depth: np.ndarray
+    ) -> np.ndarray:
+        """
+        Update the plate for one eye and fill its holes
+
+        The renderer warps backwards, so the depth map is already aligned
+        with the rendered view and can be used to classify its pixels.
+
+        Args:
+            eye: Plate key ('left' or 'right')
+            view: Rendered view (H, W, 3)
+            mask: Binary mask where 1 = hole, 0 = valid (H, W)
+            depth: Depth map (H, W) aligned with the view
+
+        Returns:
+            View with holes filled
+        """
+        holes = mask > 0
+        plate, plate_valid = self._get_plate(eye, view)
+
+        # Accumulate visible background into the plate
+        background = ~holes & (depth >= self.far_threshold * depth_scale(depth.dtype))
+        np.copyto(plate, view, where=background[:, :, np.newaxis])
+        plate_valid |= background
+
+        if not holes.any():
+            return view
+
+        filled = view.copy()
+        from_plate = holes & plate_valid
+        np.copyto(filled, plate, where=from_plate[:, :, np.newaxis])
+
+        remaining = holes & ~plate_valid
+        if remaining.any():
+            filled = _fill_spatial(filled, remaining.astype(np.float32), self.spatial_method)
+
+        return filled
+
+    def _get_plate(self, eye: str, view: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Get (plate, valid mask) for an eye, allocating on first use"""
+        if eye not in self.plates or self.plates[eye][0].shape != view.shape:
+            self.plates[eye] = (
+                np.zeros_like(view),
+                np.zeros(view.shape[:2], dtype=bool)
+            )
+        return self.plates[eye]
+
+    def _check_scene_change(self, depth: np.ndarray, frame_shape: Tuple[int, int]):
+        """Reset the plates when the depth layout changes abruptly"""
+        # Compare small thumbnails - a cut changes the global layout
+        small = dequantize_depth(resize_depth(depth, (64, 36), interpolation=cv2.INTER_AREA))
+
+        if self.prev_depth is not None:
+            from ..ai_core.temporal_filter import detect_scene_change
+            if detect_scene_change(self.prev_depth, small, self.scene_threshold):
+                self.reset()
+
+        for plate, _ in self.plates.values():
+            if plate.shape[:2] != frame_shape:
+                self.reset()
+                break
+
+        self.prev_depth = small
+
+
+def _detect_view_holes(view: np.ndarray) -> np.ndarray:
+    """Mask of very dark pixels (potential holes) in one view"""
+    # Simple hole detection: look for black pixels
+    # This is a placeholder - real implementation would be more sophisticated
+    gray = cv2.cvtColor(view, cv2.COLOR_RGB2GRAY)
+    return (gray < 10).astype(np.float32)
+
+
+def _fill_spatial(image: np.ndarray, mask: np.ndarray, method: str) -> np.ndarray:
+    """Fill holes with one of the spatial methods"""
     if method == 'fast_marching':
-        left_filled = fill_holes_fast_marching(left_view, left_mask)
-        right_filled = fill_holes_fast_marching(right_view, right_mask)
+        return fill_holes_fast_marching(image, mask)
     elif method == 'nearest':
-        left_filled = fill_holes_nearest(left_view, left_mask)
-        right_filled = fill_holes_nearest(right_view, right_mask)
-    else:
-        # No filling
-        left_filled = left_view
-        right_filled = right_view
-    
-    return left_filled, right_filled
+        return fill_holes_nearest(image, mask)
+    return image
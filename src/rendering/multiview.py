@@ -0,0 +1,331 @@
+"""
+Multi-view Rendering
+N-view synthesis and interleaving for lenticular and light-field displays
+"""
+import math
+import numpy as np
+import cv2
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from .dibr_renderer import DIBRRenderer
+from .sbs_composer import _ensure_output
+from ..ai_core.postprocessing import resize_depth
+
+
+class MultiViewRenderer(DIBRRenderer):
+    """
+    Render N evenly spaced views from one depth pass
+    
+    The disparity field and the sampling grid are computed once per frame
+    and shared by every view; each view is a single remap with its own
+    scale of that disparity.
+    """
+    
+    def __init__(
+        self,
+        num_views: int = 8,
+        ipd: float = 65.0,
+        convergence: float = 1.0,
+        view_spread: float = 1.0
+    ):
+        """
+        Initialize multi-view renderer
+        
+        Args:
+            num_views: Number of views to generate (autostereo panels: 8-45)
+            ipd: Interpupillary distance in mm
+            convergence: Convergence distance multiplier
+            view_spread: Baseline between the outermost views, relative to a
+                stereo pair (1.0 = outer views match the left/right eyes)
+        """
+        super().__init__(ipd=ipd, convergence=convergence)
+        self.num_views = max(1, num_views)
+        self.view_spread = view_spread
+    
+    def view_offsets(self) -> np.ndarray:
+        """
+        Get each view's position as a multiple of the disparity
+        
+        Returns:
+            (num_views,) offsets from left (-spread/2) to right (+spread/2)
+        """
+        if self.num_views == 1:
+            return np.zeros(1, dtype=np.float32)
+        return np.linspace(
+            -self.view_spread / 2, self.view_spread / 2, self.num_views, dtype=np.float32
+        )
+    
+    def render_views(
+        self,
+        image: np.ndarray,
+        depth: np.ndarray,
+        depth_intensity: float = 75.0,
+        view_size: Optional[Tuple[int, int]] = None,
+        out: Optional[Sequence[np.ndarray]] = None
+    ) -> List[np.ndarray]:
+        """
+        Render all views
+        
+        Args:
+            image: Input RGB image (H, W, 3)
+            depth: Depth map (H, W) normalized to [0, 1]
+            depth_intensity: Depth effect strength (0-100)
+            view_size: Per-view (width, height); defaults to the source size
+            out: Optional preallocated views, e.g. the tiles from
+                MultiViewComposer.split_tiles (sets the view size)
+        
+        Returns:
+            List of views, leftmost first
+        """
+        h, w = image.shape[:2]
+        if out is not None:
+            view_h, view_w = out[0].shape[:2]
+        elif view_size is not None:
+            view_w, view_h = view_size
+        else:
+            view_h, view_w = h, w
+        
+        base_x, base_y = self._get_eye_grid(h, w, view_h, view_w)
+        
+        # Disparity sampled on the view grid, measured in source pixels
+        if (view_h, view_w) != (h, w):
+            depth = resize_depth(depth, (view_w, view_h), interpolation=cv2.INTER_LINEAR)
+        disparity = self.compute_disparity(depth, depth_intensity).astype(np.float32, copy=False)
+        
+        views = []
+        map_x = np.empty((view_h, view_w), dtype=np.float32)
+        for index, offset in enumerate(self.view_offsets()):
+            # Same convention as render_stereo_pair: left eye samples at x - d/2
+            np.multiply(disparity, offset, out=map_x)
+            map_x += base_x
+            np.clip(map_x, 0, w - 1, out=map_x)
+            
+            target = out[index] if out is not None else None
+            views.append(cv2.remap(
+                image,
+                map_x,
+                base_y,
+                cv2.INTER_LINEAR,
+                dst=target,
+                borderMode=cv2.BORDER_REPLICATE
+            ))
+        
+        return views
+    
+    def render_lenticular(
+        self,
+        image: np.ndarray,
+        depth: np.ndarray,
+        composer: 'MultiViewComposer',
+        depth_intensity: float = 75.0,
+        out: Optional[np.ndarray] = None,
+        bgr: bool = False
+    ) -> np.ndarray:
+        """
+        Render an interleaved lenticular frame without materializing views
+        
+        Every output subpixel belongs to one view, so each color channel
+        is a single remap whose per-pixel offset is picked from the
+        display's view map. Cost is independent of the number of views.
+        
+        Args:
+            image: Input RGB image (H, W, 3)
+            depth: Depth map (H, W) normalized to [0, 1]
+            composer: Composer describing the panel's lens geometry
+            depth_intensity: Depth effect strength (0-100)
+            out: Optional preallocated output frame (H, W, 3)
+            bgr: Produce BGR channel order
+        
+        Returns:
+            Interleaved frame at source resolution
+        """
+        h, w = image.shape[:2]
+        out = _ensure_output(out, (h, w, 3), image.dtype)
+        
+        base_x, base_y = self._get_eye_grid(h, w, h, w)
+        disparity = self.compute_disparity(depth, depth_intensity).astype(np.float32, copy=False)
+        view_map = composer.lenticular_view_map(h, w)
+        offsets = self.view_offsets()
+        
+        map_x = np.empty((h, w), dtype=np.float32)
+        sample = np.empty((h, w), dtype=image.dtype)
+        for channel, plane in enumerate(cv2.split(image)):
+            np.multiply(disparity, offsets[view_map[:, :, channel]], out=map_x)
+            map_x += base_x
+            np.clip(map_x, 0, w - 1, out=map_x)
+            
+            cv2.remap(
+                plane,
+                map_x,
+                base_y,
+                cv2.INTER_LINEAR,
+                dst=sample,
+                borderMode=cv2.BORDER_REPLICATE
+            )
+            out[:, :, 2 - channel if bgr else channel] = sample
+        
+        return out
+
+
+class MultiViewComposer:
+    """
+    Pack N views into a display frame
+    
+    Supports a view-tiled grid (quilt) and a per-subpixel lenticular
+    interleave described by lens pitch, slant and offset.
+    """
+    
+    def __init__(
+        self,
+        num_views: int = 8,
+        columns: Optional[int] = None,
+        pitch: Optional[float] = None,
+        slant: float = 0.0,
+        offset: float = 0.0
+    ):
+        """
+        Initialize multi-view composer
+        
+        Args:
+            num_views: Number of views
+            columns: Tile columns for the grid layout (default: near square)
+            pitch: Lens width in subpixels (default: num_views)
+            slant: Lens shift in pixels per pixel row (tan of the lens angle)
+            offset: Lens phase offset in subpixels
+        """
+        self.num_views = max(1, num_views)
+        self.columns = columns or math.ceil(math.sqrt(self.num_views))
+        self.pitch = float(pitch or self.num_views)
+        self.slant = slant
+        self.offset = offset
+        self._view_maps: Dict[Tuple[int, int], np.ndarray] = {}
+    
+    def grid_shape(self) -> Tuple[int, int]:
+        """
+        Get (rows, columns) of the tiled layout
+        
+        Returns:
+            Tile rows and columns
+        """
+        rows = math.ceil(self.num_views / self.columns)
+        return rows, self.columns
+    
+    def tiled_shape(self, view_height: int, view_width: int) -> Tuple[int, int]:
+        """
+        Get (height, width) of a tiled frame
+        
+        Args:
+            view_height: Height of one view
+            view_width: Width of one view
+        
+        Returns:
+            Output frame size
+        """
+        rows, columns = self.grid_shape()
+        return rows * view_height, columns * view_width
+    
+    def split_tiles(self, frame: np.ndarray) -> List[np.ndarray]:
+        """
+        Get writable per-view tiles of a tiled frame (row-major, top-left first)
+        
+        Args:
+            frame: Tiled output frame
+        
+        Returns:
+            List of num_views array views
+        """
+        rows, columns = self.grid_shape()
+        tile_h = frame.shape[0] // rows
+        tile_w = frame.shape[1] // columns
+        
+        tiles = []
+        for index in range(self.num_views):
+            row, column = divmod(index, columns)
+            tiles.append(frame[row * tile_h:(row + 1) * tile_h,
+                               column * tile_w:(column + 1) * tile_w])
+        return tiles
+    
+    def compose_tiled(
+        self,
+        views: Sequence[np.ndarray],
+        out: Optional[np.ndarray] = None,
+        bgr: bool = False
+    ) -> np.ndarray:
+        """
+        Copy rendered views into a tile grid
+        
+        Render with MultiViewRenderer.render_views(out=split_tiles(frame))
+        to skip this copy entirely.
+        
+        Args:
+            views: List of num_views images of equal size
+            out: Optional preallocated output frame
+            bgr: Produce BGR channel order
+        
+        Returns:
+            Tiled frame; unused tiles are black
+        """
+        view_h, view_w = views[0].shape[:2]
+        shape = self.tiled_shape(view_h, view_w) + views[0].shape[2:]
+        out = _ensure_output(out, shape, views[0].dtype)
+        
+        tiles = self.split_tiles(out)
+        if len(views) < self.grid_shape()[0] * self.columns:
+            out.fill(0)
+        
+        for view, tile in zip(views, tiles):
+            np.copyto(tile, view[:, :, ::-1] if bgr else view)
+        
+        return out
+    
+    def compose_lenticular(
+        self,
+        views: Sequence[np.ndarray],
+        out: Optional[np.ndarray] = None,
+        bgr: bool = False
+    ) -> np.ndarray:
+        """
+        Interleave full-resolution views per subpixel
+        
+        Args:
+            views: List of num_views RGB images (H, W, 3)
+            out: Optional preallocated output frame
+            bgr: Produce BGR channel order
+        
+        Returns:
+            Interleaved frame
+        """
+        h, w = views[0].shape[:2]
+        out = _ensure_output(out, (h, w, 3), views[0].dtype)
+        view_map = self.lenticular_view_map(h, w)
+        
+        for channel in range(3):
+            target = out[:, :, 2 - channel if bgr else channel]
+            channel_map = view_map[:, :, channel]
+            for index, view in enumerate(views):
+                np.copyto(target, view[:, :, channel], where=channel_map == index)
+        
+        return out
+    
+    def lenticular_view_map(self, height: int, width: int) -> np.ndarray:
+        """
+        Get the view index of every RGB subpixel (cached per size)
+        
+        Args:
+            height: Frame height
+            width: Frame width
+        
+        Returns:
+            (H, W, 3) uint8 view indices in physical RGB subpixel order
+        """
+        key = (height, width)
+        if key not in self._view_maps:
+            subpixel = np.arange(width * 3, dtype=np.float64).reshape(1, width, 3)
+            row_shift = (np.arange(height, dtype=np.float64) * 3 * self.slant).reshape(height, 1, 1)
+            
+            phase = np.mod((subpixel + self.offset - row_shift) / self.pitch, 1.0)
+            view_map = np.minimum(phase * self.num_views, self.num_views - 1)
+            self._view_maps[key] = view_map.astype(np.uint8)
+        
+        return self._view_maps[key]
+
@@ -3,16 +3,105 @@ Side-by-Side (SBS) and Other Format Composition
 """
 import numpy as np
 import cv2
-from typing import Tuple
+from typing import Any, Dict, List, Optional, Tuple
+
+from ..ai_core.postprocessing import dequantize_depth
 
 
 class SBSComposer:
-    """Compose stereo pairs into various output formats"""
+    """Compose stereo pairs into various output formats
+    
+    All compose methods accept an optional caller-owned ``out`` buffer (see
+    ``output_shape``) and a ``bgr`` flag that writes channel-swapped output
+    for OpenCV/ffmpeg BGR sinks, so no separate cvtColor is needed.
+    
+    The 2D + depth formats pack the source frame next to its depth map
+    (see ``compose_rgbd``) so the player does the stereo shift itself.
+    
+    Interleaved formats (passive 3D TVs, projectors) take alternate rows,
+    columns or a checkerboard from each eye with strided slice assignments.
+    The left eye owns even rows/columns (and the top-left pixel).
+    """
+    
+    RGBD_FORMATS = ('rgbd_sbs', 'rgbd_tb')
+    INTERLEAVED_FORMATS = ('row_interleaved', 'column_interleaved', 'checkerboard')
+    FORMATS = ('half_sbs', 'full_sbs', 'top_bottom', 'anaglyph') + INTERLEAVED_FORMATS + RGBD_FORMATS
+    
+    # Depth precision of the 2D + depth formats; 10-bit frames are uint16
+    RGBD_DEPTH_BITS = (8, 10)
+    
+    @staticmethod
+    def output_shape(height: int, width: int, output_format: str) -> Tuple[int, int]:
+        """
+        Get (height, width) of the composed frame for a format
+        
+        Args:
+            height: Eye view height
+            width: Eye view width
+            output_format: Output format
+        
+        Returns:
+            Output frame size
+        """
+        if output_format == 'half_sbs':
+            return height, (width // 2) * 2
+        elif output_format == 'full_sbs':
+            return height, width * 2
+        elif output_format == 'top_bottom':
+            return (height // 2) * 2, width
+        elif output_format == 'anaglyph':
+            return height, width
+        elif output_format in SBSComposer.INTERLEAVED_FORMATS:
+            # Even size, so both eyes own the same number of pixels
+            return (height // 2) * 2, (width // 2) * 2
+        elif output_format == 'rgbd_sbs':
+            return height, width * 2
+        elif output_format == 'rgbd_tb':
+            return height * 2, width
+        raise ValueError(f"Unknown output format: {output_format}")
+    
+    @classmethod
+    def compose(
+        cls,
+        left_view: np.ndarray,
+        right_view: np.ndarray,
+        output_format: str,
+        out: Optional[np.ndarray] = None,
+        bgr: bool = False
+    ) -> np.ndarray:
+        """
+        Compose a stereo pair into the given output format
+        
+        Args:
+            left_view: Left eye view (H, W, 3)
+            right_view: Right eye view (H, W, 3)
+            output_format: One of FORMATS except RGBD_FORMATS
+            out: Optional preallocated output frame
+            bgr: Write BGR channel order (for OpenCV/ffmpeg sinks)
+        
+        Returns:
+            Composed frame (``out`` if given)
+        """
+        if output_format in cls.RGBD_FORMATS:
+            raise ValueError(f"{output_format} is composed from image and depth, use compose_rgbd")
+        if output_format == 'half_sbs':
+            return cls.compose_half_sbs(left_view, right_view, out=out, bgr=bgr)
+        elif output_format == 'full_sbs':
+            return cls.compose_full_sbs(left_view, right_view, out=out, bgr=bgr)
+        elif output_format == 'top_bottom':
+            return cls.compose_top_bottom(left_view, right_view, half=True, out=out, bgr=bgr)
+        elif output_format == 'anaglyph':
+            return cls.compose_anaglyph(left_view, right_view, out=out, bgr=bgr)
+        elif output_format in cls.INTERLEAVED_FORMATS:
+            return cls.compose_interleaved(left_view, right_view, output_format, out=out, bgr=bgr)
+        raise ValueError(f"Unknown output format: {output_format}")
     
     @staticmethod
     def compose_half_sbs(
         left_view: np.ndarray,
-        right_view: np.ndarray
+        right_view: np.ndarray,
+        out: Optional[np.ndarray] = None,
+        bgr: bool = False
     ) -> np.ndarray:
         """
         Compose Half Side-by-Side format
@@ -21,25 +110,28 @@ class SBSComposer:
         Args:
             left_view: Left eye view (H, W, 3)
             right_view: Right eye view (H, W, 3)
+            out: Optional preallocated output frame (H, W, 3)
+            bgr: Write BGR channel order
         
         Returns:
             Half-SBS image (H, W, 3) - same size as input
         """
         h, w = left_view.shape[:2]
+        half = w // 2
+        out = _ensure_output(out, (h, half * 2) + left_view.shape[2:], left_view.dtype)
         
-        # Resize both views to half width
-        left_half = cv2.resize(left_view, (w // 2, h), interpolation=cv2.INTER_LINEAR)
-        right_half = cv2.resize(right_view, (w // 2, h), interpolation=cv2.INTER_LINEAR)
+        # Resize both views to half width, straight into the output halves
+        _resize_into(left_view, out[:, :half], bgr)
+        _resize_into(right_view, out[:, half:], bgr)
         
-        # Concatenate horizontally
-        half_sbs = np.concatenate([left_half, right_half], axis=1)
-        
-        return half_sbs
+        return out
     
     @staticmethod
     def compose_full_sbs(
         left_view: np.ndarray,
-        right_view: np.ndarray
+        right_view: np.ndarray,
+        out: Optional[np.ndarray] = None,
+        bgr: bool = False
     ) -> np.ndarray:
         """
         Compose Full Side-by-Side format
@@ -48,20 +140,27 @@ class SBSComposer:
         Args:
             left_view: Left eye view (H, W, 3)
             right_view: Right eye view (H, W, 3)
+            out: Optional preallocated output frame (H, 2W, 3)
+            bgr: Write BGR channel order
         
         Returns:
             Full-SBS image (H, 2W, 3) - double width
         """
-        # Simply concatenate horizontally
-        full_sbs = np.concatenate([left_view, right_view], axis=1)
+        h, w = left_view.shape[:2]
+        out = _ensure_output(out, (h, w * 2) + left_view.shape[2:], left_view.dtype)
         
-        return full_sbs
+        _copy_into(left_view, out[:, :w], bgr)
+        _copy_into(right_view, out[:, w:], bgr)
+        
+        return out
     
     @staticmethod
     def compose_top_bottom(
         left_view: np.ndarray,
         right_view: np.ndarray,
-        half: bool = True
+        half: bool = True,
+        out: Optional[np.ndarray] = None,
+        bgr: bool = False
     ) -> np.ndarray:
         """
         Compose Top-Bottom (Over-Under) format
@@ -70,6 +169,8 @@ class SBSComposer:
             left_view: Left eye view (H, W, 3)
             right_view: Right eye view (H, W, 3)
             half: Whether to use half resolution (compressed height)
+            out: Optional preallocated output frame
+            bgr: Write BGR channel order
         
         Returns:
             Top-Bottom image
@@ -77,23 +178,26 @@ class SBSComposer:
         h, w = left_view.shape[:2]
         
         if half:
-            # Resize both views to half height
-            left_half = cv2.resize(left_view, (w, h // 2), interpolation=cv2.INTER_LINEAR)
-            right_half = cv2.resize(right_view, (w, h // 2), interpolation=cv2.INTER_LINEAR)
-            
-            # Stack vertically
-            result = np.concatenate([left_half, right_half], axis=0)
+            # Resize both views to half height, straight into the output halves
+            eye_h = h // 2
+            out = _ensure_output(out, (eye_h * 2, w) + left_view.shape[2:], left_view.dtype)
+            _resize_into(left_view, out[:eye_h], bgr)
+            _resize_into(right_view, out[eye_h:], bgr)
         else:
             # Full resolution vertical stack
-            result = np.concatenate([left_view, right_view], axis=0)
+            out = _ensure_output(out, (h * 2, w) + left_view.shape[2:], left_view.dtype)
+            _copy_into(left_view, out[:h], bgr)
+            _copy_into(right_view, out[h:], bgr)
         
-        return result
+        return out
     
     @staticmethod
     def compose_anaglyph(
         left_view: np.ndarray,
         right_view: np.ndarray,
-        mode: str = 'red_cyan'
+        mode: str = 'red_cyan',
+        out: Optional[np.ndarray] = None,
+        bgr: bool = False
     ) -> np.ndarray:
         """
         Compose anaglyph 3D image (for red-cyan glasses)
@@ -102,33 +206,249 @@ class SBSComposer:
             left_view: Left eye view (H, W, 3)
             right_view: Right eye view (H, W, 3)
             mode: Anaglyph mode ('red_cyan', 'amber_blue')
+            out: Optional preallocated output frame (H, W, 3)
+            bgr: Write BGR channel order
         
         Returns:
             Anaglyph image (H, W, 3)
         """
         if mode == 'red_cyan':
             # Red channel from left, green+blue from right
-            anaglyph = np.zeros_like(left_view)
-            anaglyph[:, :, 0] = left_view[:, :, 0]  # Red from left
-            anaglyph[:, :, 1] = right_view[:, :, 1]  # Green from right
-            anaglyph[:, :, 2] = right_view[:, :, 2]  # Blue from right
+            sources = (left_view, right_view, right_view)
         elif mode == 'amber_blue':
             # Amber (red+green) from left, blue from right
-            anaglyph = np.zeros_like(left_view)
-            anaglyph[:, :, 0] = left_view[:, :, 0]  # Red from left
-            anaglyph[:, :, 1] = left_view[:, :, 1]  # Green from left
-            anaglyph[:, :, 2] = right_view[:, :, 2]  # Blue from right
+            sources = (left_view, left_view, right_view)
         else:
             raise ValueError(f"Unknown anaglyph mode: {mode}")
         
-        return anaglyph
+        out = _ensure_output(out, left_view.shape, left_view.dtype)
+        
+        # Every output channel is written, so no zero-fill is needed
+        for channel, source in enumerate(sources):
+            target = 2 - channel if bgr else channel
+            out[:, :, target] = source[:, :, channel]
+        
+        return out
+    
+    @classmethod
+    def compose_interleaved(
+        cls,
+        left_view: np.ndarray,
+        right_view: np.ndarray,
+        output_format: str = 'row_interleaved',
+        out: Optional[np.ndarray] = None,
+        bgr: bool = False
+    ) -> np.ndarray:
+        """
+        Compose row-, column- or checkerboard-interleaved stereo
+        
+        Only the pixels each eye contributes are read, straight from the
+        full-resolution views into strided regions of the output. Columns
+        are interleaved as pixel pairs with a single channel shuffle.
+        
+        Args:
+            left_view: Left eye view (H, W, 3)
+            right_view: Right eye view (H, W, 3)
+            output_format: One of INTERLEAVED_FORMATS
+            out: Optional preallocated output frame (see output_shape)
+            bgr: Write BGR channel order
+        
+        Returns:
+            Interleaved image, cropped to even height and width
+        """
+        h, w = cls.output_shape(*left_view.shape[:2], output_format)
+        out = _ensure_output(out, (h, w) + left_view.shape[2:], left_view.dtype)
+        left_view, right_view = left_view[:h, :w], right_view[:h, :w]
+        
+        if output_format == 'row_interleaved':
+            _copy_into(left_view[0::2], out[0::2], bgr)
+            _copy_into(right_view[1::2], out[1::2], bgr)
+            return out
+        
+        # Even columns: first pixel of each pair, odd columns: second
+        left_pairs = _source_pairs(left_view)
+        right_pairs = _source_pairs(right_view)
+        if output_format == 'column_interleaved':
+            _interleave_columns(left_pairs, 0, right_pairs, 3, out, bgr)
+        else:
+            _interleave_columns(left_pairs[0::2], 0, right_pairs[0::2], 3, out[0::2], bgr)
+            _interleave_columns(right_pairs[1::2], 0, left_pairs[1::2], 3, out[1::2], bgr)
+        
+        return out
+    
+    @staticmethod
+    def sample_interleaved(array: np.ndarray, output_format: str, eye: str) -> np.ndarray:
+        """
+        Get the pixels one eye contributes to an interleaved frame
+        
+        The samples are packed densely: alternate rows (H/2, W) for
+        row_interleaved, alternate columns (H, W/2) for column_interleaved
+        and checkerboard, where row y holds that row's pixels of the eye.
+        
+        Args:
+            array: Full-size image, depth map or coordinate grid
+            output_format: One of INTERLEAVED_FORMATS
+            eye: 'left' or 'right'
+        
+        Returns:
+            Packed samples (a strided view where possible)
+        """
+        h, w = (array.shape[0] // 2) * 2, (array.shape[1] // 2) * 2
+        regions = [region for owner, region in _interleave_regions(output_format) if owner == eye]
+        if len(regions) == 1:
+            return array[:h, :w][regions[0]]
+        
+        # Checkerboard: even and odd rows start on different columns
+        packed = np.empty((h, w // 2) + array.shape[2:], dtype=array.dtype)
+        for row_start, region in enumerate(regions):
+            packed[row_start::2] = array[:h, :w][region]
+        return packed
+    
+    @classmethod
+    def interleave_eyes(
+        cls,
+        left_samples: np.ndarray,
+        right_samples: np.ndarray,
+        output_format: str,
+        out: Optional[np.ndarray] = None,
+        bgr: bool = False
+    ) -> np.ndarray:
+        """
+        Scatter packed eye samples (see sample_interleaved) into a frame
+        
+        Used with DIBRRenderer.render_interleaved, which renders only the
+        pixels each eye contributes.
+        
+        Args:
+            left_samples: Packed left eye samples
+            right_samples: Packed right eye samples
+            output_format: One of INTERLEAVED_FORMATS
+            out: Optional preallocated output frame
+            bgr: Write BGR channel order
+        
+        Returns:
+            Interleaved image
+        """
+        h, w = left_samples.shape[:2]
+        if output_format == 'row_interleaved':
+            h *= 2
+        else:
+            w *= 2
+        out = _ensure_output(out, (h, w) + left_samples.shape[2:], left_samples.dtype)
+        
+        if output_format == 'row_interleaved':
+            _copy_into(left_samples, out[0::2], bgr)
+            _copy_into(right_samples, out[1::2], bgr)
+        elif output_format == 'column_interleaved':
+            _interleave_columns(left_samples, 0, right_samples, 0, out, bgr)
+        else:
+            _interleave_columns(left_samples[0::2], 0, right_samples[0::2], 0, out[0::2], bgr)
+            _interleave_columns(right_samples[1::2], 0, left_samples[1::2], 0, out[1::2], bgr)
+        
+        return out
+    
+    @classmethod
+    def compose_rgbd(
+        cls,
+        image: np.ndarray,
+        depth: np.ndarray,
+        output_format: str = 'rgbd_sbs',
+        depth_bits: int = 8,
+        near_white: bool = True,
+        out: Optional[np.ndarray] = None,
+        bgr: bool = False
+    ) -> np.ndarray:
+        """
+        Compose 2D + depth: the source frame next to its grayscale depth map
+        
+        No stereo views are rendered; the player synthesizes them, at any
+        IPD. 10-bit output is a uint16 frame (color scaled by 257, depth
+        codes bit-replicated to 16 bits) for a 10-bit encode.
+        
+        Args:
+            image: Source RGB image (H, W, 3) uint8
+            depth: Depth map (H, W) normalized to [0, 1], 1 = far
+            output_format: 'rgbd_sbs' (depth right) or 'rgbd_tb' (depth below)
+            depth_bits: Depth precision, 8 or 10
+            near_white: Store near as white (the usual 2D + depth convention)
+            out: Optional preallocated output frame (see output_shape)
+            bgr: Write BGR channel order
+        
+        Returns:
+            Packed frame, uint8 for 8-bit and uint16 for 10-bit depth
+        """
+        if depth_bits not in cls.RGBD_DEPTH_BITS:
+            raise ValueError(f"Unsupported depth bits: {depth_bits}")
+        
+        h, w = image.shape[:2]
+        dtype = np.uint8 if depth_bits == 8 else np.uint16
+        out = _ensure_output(out, cls.output_shape(h, w, output_format) + (3,), dtype)
+        
+        if output_format == 'rgbd_sbs':
+            color, depth_region = out[:, :w], out[:, w:]
+        else:
+            color, depth_region = out[:h], out[h:]
+        
+        # Depth codes: d * levels, or (1 - d) * levels for near = white
+        levels = (1 << depth_bits) - 1
+        depth = dequantize_depth(depth)
+        alpha, beta = (-levels, levels) if near_white else (levels, 0)
+        
+        if depth_bits == 8:
+            _copy_into(image, color, bgr)
+            codes = cv2.convertScaleAbs(depth, alpha=alpha, beta=beta)
+        else:
+            np.multiply(image[:, :, ::-1] if bgr else image, 257, out=color, dtype=np.uint16)
+            codes = np.clip(np.rint(depth * alpha + beta), 0, levels)
+            codes = np.rint(codes * (65535.0 / levels)).astype(np.uint16)
+        
+        cv2.cvtColor(codes, cv2.COLOR_GRAY2RGB, dst=depth_region)
+        
+        return out
+    
+    @classmethod
+    def rgbd_metadata(
+        cls,
+        output_format: str,
+        height: int,
+        width: int,
+        depth_bits: int = 8,
+        near_white: bool = True
+    ) -> Dict[str, Any]:
+        """
+        Describe a 2D + depth layout for a player-side metadata sidecar
+        
+        Args:
+            output_format: 'rgbd_sbs' or 'rgbd_tb'
+            height: Source frame height
+            width: Source frame width
+            depth_bits: Depth precision
+            near_white: Whether near is stored as white
+        
+        Returns:
+            JSON-serializable layout description; rects are [x, y, w, h]
+        """
+        if output_format not in cls.RGBD_FORMATS:
+            raise ValueError(f"Not a 2D + depth format: {output_format}")
+        
+        depth_origin = [width, 0] if output_format == 'rgbd_sbs' else [0, height]
+        return {
+            'format': output_format,
+            'layout': 'side_by_side' if output_format == 'rgbd_sbs' else 'top_bottom',
+            'color_rect': [0, 0, width, height],
+            'depth_rect': depth_origin + [width, height],
+            'depth_bits': depth_bits,
+            'depth_near': 'white' if near_white else 'black',
+            'depth_units': 'relative',
+        }
     
     @staticmethod
     def add_watermark(
         image: np.ndarray,
         text: str = "2D3D Converter - Free Version",
         position: str = 'bottom_right',
-        opacity: float = 0.5
+        opacity: float = 0.5,
+        inplace: bool = False
     ) -> np.ndarray:
         """
         Add watermark to image (for free tier)
@@ -137,22 +457,112 @@ class SBSComposer:
             image: Input image
             text: Watermark text
             position: Position ('bottom_right', 'bottom_center', 'top_right')
-            opacity: Watermark opacity (0-1)
+            opacity: Opacity of the background box (0-1)
+            inplace: Draw into ``image`` instead of a copy
         
         Returns:
             Image with watermark
         """
-        result = image.copy()
-        h, w = result.shape[:2]
+        result = image if inplace else image.copy()
+        return _watermark_compositor.apply(result, text, position, opacity)
+
+
+class WatermarkCompositor:
+    """
+    Cached watermark overlay
+    
+    The text and its background box are rendered once per (text, frame
+    size, position, opacity) into a small sprite holding per-pixel keep
+    weights and premultiplied color. Each frame then only blends that ROI
+    in place, with no full-frame copies.
+    """
+    
+    def __init__(self, max_sprites: int = 8):
+        """
+        Initialize compositor
         
-        # Calculate text size and position
+        Args:
+            max_sprites: Number of cached sprites (oldest is dropped first)
+        """
+        self.max_sprites = max_sprites
+        self._sprites: Dict[tuple, Tuple[Tuple[int, int], np.ndarray, np.ndarray]] = {}
+    
+    def apply(
+        self,
+        image: np.ndarray,
+        text: str = "2D3D Converter - Free Version",
+        position: str = 'bottom_right',
+        opacity: float = 0.5
+    ) -> np.ndarray:
+        """
+        Blend the watermark into ``image`` in place
+        
+        Args:
+            image: Frame to modify (H, W, 3) uint8
+            text: Watermark text
+            position: Position ('bottom_right', 'bottom_center', 'top_right')
+            opacity: Opacity of the background box (0-1)
+        
+        Returns:
+            The same image
+        """
+        h, w = image.shape[:2]
+        (x0, y0), keep, add = self._get_sprite(text, h, w, position, opacity)
+        
+        # Clip the sprite to the frame
+        sh, sw = keep.shape
+        fx0, fy0 = max(x0, 0), max(y0, 0)
+        fx1, fy1 = min(x0 + sw, w), min(y0 + sh, h)
+        if fx0 >= fx1 or fy0 >= fy1:
+            return image
+        
+        keep = keep[fy0 - y0:fy1 - y0, fx0 - x0:fx1 - x0]
+        add = add[fy0 - y0:fy1 - y0, fx0 - x0:fx1 - x0]
+        if image.ndim == 3:
+            keep = keep[:, :, None]
+            add = add[:, :, None]
+        
+        # out = roi * (1 - alpha) + color * alpha, in 8.8 fixed point
+        roi = image[fy0:fy1, fx0:fx1]
+        blended = (roi * keep + add) >> 8
+        np.copyto(roi, blended, casting='unsafe')
+        
+        return image
+    
+    def _get_sprite(
+        self,
+        text: str,
+        h: int,
+        w: int,
+        position: str,
+        opacity: float
+    ) -> Tuple[Tuple[int, int], np.ndarray, np.ndarray]:
+        """Get (origin, keep, add) sprite for a frame size (cached)"""
+        key = (text, h, w, position, opacity)
+        sprite = self._sprites.get(key)
+        if sprite is None:
+            if len(self._sprites) >= self.max_sprites:
+                self._sprites.pop(next(iter(self._sprites)))
+            sprite = self._render_sprite(text, h, w, position, opacity)
+            self._sprites[key] = sprite
+        return sprite
+    
+    @staticmethod
+    def _render_sprite(
+        text: str,
+        h: int,
+        w: int,
+        position: str,
+        opacity: float
+    ) -> Tuple[Tuple[int, int], np.ndarray, np.ndarray]:
+        """Render text and background box into blend weights"""
         font = cv2.FONT_HERSHEY_SIMPLEX
         font_scale = max(0.5, min(w / 1000, 1.5))
         thickness = max(1, int(font_scale * 2))
         
         (text_w, text_h), baseline = cv2.getTextSize(text, font, font_scale, thickness)
         
-        # Position calculations
+        # Position calculations (text origin is the baseline start)
         margin = 20
         if position == 'bottom_right':
             x = w - text_w - margin
@@ -167,27 +577,167 @@ class SBSComposer:
             x = margin
             y = h - margin
         
-        # Draw semi-transparent background
-        overlay = result.copy()
-        cv2.rectangle(
-            overlay,
-            (x - 5, y - text_h - 5),
-            (x + text_w + 5, y + 5),
-            (0, 0, 0),
-            -1
-        )
-        cv2.addWeighted(overlay, 0.5, result, 0.5, 0, result)
+        # Sprite covers the 5px padded box plus descenders and stroke width
+        pad = 5
+        x0, y0 = x - pad, y - text_h - pad
+        sprite_w = text_w + 2 * pad + 1 + thickness
+        sprite_h = text_h + pad + max(pad, baseline + thickness) + 1
+        box_h = text_h + 2 * pad + 1
         
-        # Draw text
+        box_alpha = np.zeros((sprite_h, sprite_w), dtype=np.float32)
+        box_alpha[:box_h, :text_w + 2 * pad + 1] = np.clip(opacity, 0.0, 1.0)
+        
+        coverage = np.zeros((sprite_h, sprite_w), dtype=np.uint8)
         cv2.putText(
-            result,
-            text,
-            (x, y),
-            font,
-            font_scale,
-            (255, 255, 255),
-            thickness,
-            cv2.LINE_AA
+            coverage, text, (pad, text_h + pad), font, font_scale,
+            255, thickness, cv2.LINE_AA
         )
+        text_alpha = coverage.astype(np.float32) / 255.0
+        
+        # Dark box first, then anti-aliased white text on top
+        keep = (1.0 - box_alpha) * (1.0 - text_alpha)
+        keep = np.round(keep * 256.0).astype(np.uint16)
+        add = np.round(text_alpha * 255.0 * 256.0).astype(np.uint16)
         
-        return result
+        return (x0, y0), keep, add
+
+
+_watermark_compositor = WatermarkCompositor()
+
+
+class FrameBufferPool:
+    """
+    Small ring of reusable output frames for streaming composition
+    
+    A frame returned by acquire() is handed out again after ``size`` more
+    calls, so it must be written or encoded before then.
+    """
+    
+    def __init__(self, size: int = 3):
+        """
+        Initialize buffer pool
+        
+        Args:
+            size: Number of frames kept in rotation
+        """
+        self.size = max(1, size)
+        self._buffers: List[np.ndarray] = []
+        self._next = 0
+    
+    def acquire(self, shape: Tuple[int, ...], dtype=np.uint8) -> np.ndarray:
+        """
+        Get the next buffer of the given shape (reallocated if it changed)
+        
+        Args:
+            shape: Frame shape
+            dtype: Frame dtype
+        
+        Returns:
+            Reusable frame buffer (contents undefined)
+        """
+        shape = tuple(shape)
+        if len(self._buffers) < self.size:
+            buffer = np.empty(shape, dtype=dtype)
+            self._buffers.append(buffer)
+            return buffer
+        
+        index = self._next
+        self._next = (self._next + 1) % self.size
+        
+        buffer = self._buffers[index]
+        if buffer.shape != shape or buffer.dtype != dtype:
+            buffer = np.empty(shape, dtype=dtype)
+            self._buffers[index] = buffer
+        
+        return buffer
+
+
+def _ensure_output(
+    out: Optional[np.ndarray],
+    shape: Tuple[int, ...],
+    dtype
+) -> np.ndarray:
+    """Allocate an output frame or check a caller-provided one"""
+    if out is None:
+        return np.empty(shape, dtype=dtype)
+    if out.shape != tuple(shape):
+        raise ValueError(f"Output buffer has shape {out.shape}, expected {tuple(shape)}")
+    return out
+
+
+def _interleave_regions(output_format: str) -> List[Tuple[str, Tuple[slice, slice]]]:
+    """(eye, region) pairs of an interleaved frame; checkerboard lists even rows first"""
+    every = slice(None)
+    if output_format == 'row_interleaved':
+        return [('left', (slice(0, None, 2), every)), ('right', (slice(1, None, 2), every))]
+    elif output_format == 'column_interleaved':
+        return [('left', (every, slice(0, None, 2))), ('right', (every, slice(1, None, 2)))]
+    elif output_format == 'checkerboard':
+        even, odd = slice(0, None, 2), slice(1, None, 2)
+        return [
+            ('left', (even, even)), ('left', (odd, odd)),
+            ('right', (even, odd)), ('right', (odd, even)),
+        ]
+    raise ValueError(f"Not an interleaved format: {output_format}")
+
+
+def _pixel_pairs(image: np.ndarray) -> Optional[np.ndarray]:
+    """(H, W/2, 2C) view of horizontally adjacent pixel pairs, or None if rows aren't packed"""
+    h, w, channels = image.shape
+    if w % 2 or image.strides[2] != image.itemsize or image.strides[1] != channels * image.itemsize:
+        return None
+    return np.lib.stride_tricks.as_strided(
+        image,
+        (h, w // 2, 2 * channels),
+        (image.strides[0], 2 * image.strides[1], image.strides[2])
+    )
+
+
+def _source_pairs(image: np.ndarray) -> np.ndarray:
+    """Pixel-pair view of a source image, copying it first if needed"""
+    pairs = _pixel_pairs(image)
+    return pairs if pairs is not None else _pixel_pairs(np.ascontiguousarray(image))
+
+
+def _interleave_columns(
+    even: np.ndarray,
+    even_first: int,
+    odd: np.ndarray,
+    odd_first: int,
+    dst: np.ndarray,
+    bgr: bool
+):
+    """
+    Write two sources into the even and odd columns of ``dst``
+    
+    Sources are packed (H, W/2, 3) samples (first channel 0) or pixel-pair
+    views (first channel 0 or 3). One mixChannels call moves everything,
+    much faster than two 3-byte-strided copies.
+    """
+    pairs = _pixel_pairs(dst)
+    if pairs is None:
+        _copy_into(even[:, :, even_first:even_first + 3], dst[:, 0::2], bgr)
+        _copy_into(odd[:, :, odd_first:odd_first + 3], dst[:, 1::2], bgr)
+        return
+    
+    from_to = []
+    for channel, target in enumerate((2, 1, 0) if bgr else (0, 1, 2)):
+        from_to += [even_first + channel, target]
+        from_to += [even.shape[2] + odd_first + channel, 3 + target]
+    cv2.mixChannels([even, odd], [pairs], from_to)
+
+
+def _copy_into(src: np.ndarray, dst: np.ndarray, bgr: bool):
+    """Copy a view into an output region, swapping channels for BGR sinks"""
+    if bgr:
+        np.copyto(dst, src[:, :, ::-1])
+    else:
+        np.copyto(dst, src)
+
+
+def _resize_into(src: np.ndarray, dst: np.ndarray, bgr: bool):
+    """Resize a view straight into an output region"""
+    h, w = dst.shape[:2]
+    cv2.resize(src, (w, h), dst=dst, interpolation=cv2.INTER_LINEAR)
+    if bgr:
+        cv2.cvtColor(dst, cv2.COLOR_RGB2BGR, dst=dst)
@@ -14,11 +14,15 @@ class StereoscopyManager:
     IPD_MAX = 80.0
     IPD_DEFAULT = 65.0
     
+    # Eye synthesis modes (see DIBRRenderer)
+    STEREO_MODES = ('symmetric', 'left_reference', 'right_reference')
+    
     def __init__(self):
         """Initialize stereoscopy manager"""
         self.ipd = self.IPD_DEFAULT
         self.convergence = 1.0
         self.depth_budget = 1.0
+        self.stereo_mode = 'symmetric'
     
     def calculate_stereo_params(
         self,
@@ -44,6 +48,7 @@ class StereoscopyManager:
             'convergence': self.convergence,
             'max_disparity_px': max_disparity,
             'depth_intensity': depth_intensity,
+            'stereo_mode': self.stereo_mode,
             'comfort_zone': self._calculate_comfort_zone(max_disparity, image_width),
         }
         
@@ -73,12 +78,15 @@ class StereoscopyManager:
             'recommended_max': image_width * 0.02,
         }
     
-    def adjust_for_content_type(self, content_type: str):
+    def adjust_for_content_type(self, content_type: str, stereo_mode: str = None):
         """
         Adjust parameters based on content type
         
         Args:
             content_type: Type of content ('action', 'documentary', 'animation', etc.)
+            stereo_mode: Eye synthesis mode overriding the preset's symmetric
+                rendering (e.g. 'left_reference' to keep the original frame as
+                the left eye and render only the right one)
         """
         presets = {
             'action': {'depth_intensity': 85, 'convergence': 1.2},
@@ -87,11 +95,13 @@ class StereoscopyManager:
             'talking_head': {'depth_intensity': 50, 'convergence': 0.8},
         }
         
-        if content_type in presets:
-            preset = presets[content_type]
-            return preset
+        if stereo_mode is not None and stereo_mode not in self.STEREO_MODES:
+            raise ValueError(f"Unknown stereo mode: {stereo_mode}")
         
-        return {'depth_intensity': 75, 'convergence': 1.0}
+        preset = dict(presets.get(content_type, {'depth_intensity': 75, 'convergence': 1.0}))
+        preset['stereo_mode'] = stereo_mode or 'symmetric'
+        self.stereo_mode = preset['stereo_mode']
+        return preset
     
     def validate_parameters(self) -> bool:
         """
@@ -106,4 +116,7 @@ class StereoscopyManager:
         if not (0.1 <= self.convergence <= 2.0):
             return False
         
+        if self.stereo_mode not in self.STEREO_MODES:
+            return False
+        
         return True
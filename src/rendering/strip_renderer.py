@@ -0,0 +1,263 @@
+"""
+Strip-parallel Rendering
+Render, hole-fill and compose one large frame on a thread pool
+"""
+import os
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional, Tuple
+
+from .dibr_renderer import DIBRRenderer
+from .hole_filling import fill_stereo_pair_holes
+from .sbs_composer import SBSComposer, _copy_into
+
+
+class StripRenderer:
+    """
+    Split a frame into horizontal strips and process them concurrently
+    
+    DIBR only moves pixels along rows, so strips render independently;
+    each strip is rendered with ``halo`` extra rows for vertical
+    resampling that are dropped before writing its output rows. Hole
+    filling (inpainting) can reach any distance, so with a hole method the
+    strips only render the eye views, holes are filled once on the
+    assembled views and the frame is composed from them. OpenCV releases
+    the GIL, so strips run in parallel on threads.
+    """
+    
+    def __init__(
+        self,
+        renderer: Optional[DIBRRenderer] = None,
+        composer: Optional[SBSComposer] = None,
+        workers: Optional[int] = None,
+        hole_method: Optional[str] = 'fast_marching',
+        halo: int = 8,
+        min_strip_rows: int = 64
+    ):
+        """
+        Initialize strip renderer
+        
+        Args:
+            renderer: DIBR renderer (creates default if None)
+            composer: SBS composer (creates default if None)
+            workers: Number of threads (default: all cores)
+            hole_method: Spatial hole filling method, or None to skip
+            halo: Extra rows on each side of a strip for vertical resampling
+            min_strip_rows: Frames are not split below this strip height
+        """
+        self.renderer = renderer or DIBRRenderer()
+        self.composer = composer or SBSComposer()
+        self.workers = max(1, workers or os.cpu_count() or 1)
+        self.hole_method = hole_method
+        self.halo = halo + halo % 2
+        self.min_strip_rows = min_strip_rows
+        self._executor: Optional[ThreadPoolExecutor] = None
+    
+    def render(
+        self,
+        image: np.ndarray,
+        depth: np.ndarray,
+        output_format: str = 'half_sbs',
+        depth_intensity: float = 75.0,
+        out: Optional[np.ndarray] = None,
+        bgr: bool = False
+    ) -> np.ndarray:
+        """
+        Render a composed stereo frame
+        
+        Args:
+            image: Input RGB image (H, W, 3)
+            depth: Depth map (H, W) normalized to [0, 1]
+            output_format: Output format (see SBSComposer.FORMATS)
+            depth_intensity: Depth effect strength (0-100)
+            out: Optional preallocated output frame
+            bgr: Produce BGR output
+        
+        Returns:
+            Composed frame, identical in layout to the single-threaded path
+        """
+        if output_format in self.composer.RGBD_FORMATS:
+            # 2D + depth is a plain copy, nothing to render
+            return self.composer.compose_rgbd(
+                image, depth, output_format, out=out, bgr=bgr
+            )
+        
+        h, w = image.shape[:2]
+        shape = self.composer.output_shape(h, w, output_format) + image.shape[2:]
+        if out is None:
+            out = np.empty(shape, dtype=image.dtype)
+        elif out.shape != shape:
+            raise ValueError(f"Output buffer has shape {out.shape}, expected {shape}")
+        
+        strips = self.split_rows(h)
+        if self.hole_method is None:
+            self._run(strips, self._render_strip, image, depth, output_format, depth_intensity, out, bgr)
+            return out
+        
+        # Inpainting reaches across strip seams: assemble the unfilled
+        # views, fill them in one piece, then compose
+        left, right = self._view_buffers(image, output_format)
+        self._run(strips, self._render_strip_views, image, depth, output_format, depth_intensity, left, right)
+        left, right = fill_stereo_pair_holes(
+            left, right,
+            method=self.hole_method,
+            reference_eye=self.renderer.reference_eye
+        )
+        
+        if output_format in ('half_sbs', 'top_bottom'):
+            left_out, right_out = self.renderer.split_half_format(out, output_format)
+            _copy_into(left, left_out, bgr)
+            _copy_into(right, right_out, bgr)
+        elif output_format in self.composer.INTERLEAVED_FORMATS:
+            self.composer.interleave_eyes(left, right, output_format, out=out, bgr=bgr)
+        else:
+            self.composer.compose(left, right, output_format, out=out, bgr=bgr)
+        
+        return out
+    
+    def split_rows(self, height: int) -> List[Tuple[int, int]]:
+        """
+        Get (start, stop) source rows of each strip
+        
+        Boundaries are even so half-height formats map whole eye rows to
+        each strip.
+        
+        Args:
+            height: Frame height
+        
+        Returns:
+            List of row ranges covering the frame
+        """
+        count = max(1, min(self.workers, height // max(self.min_strip_rows, 2)))
+        step = -(-height // count)
+        step += step % 2
+        
+        return [(start, min(start + step, height)) for start in range(0, height, step)]
+    
+    def close(self):
+        """Shut down the thread pool"""
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+    
+    def _get_executor(self) -> ThreadPoolExecutor:
+        """Create the thread pool on first use"""
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.workers, thread_name_prefix='strip-render'
+            )
+        return self._executor
+    
+    def _run(self, strips: List[Tuple[int, int]], task, *args):
+        """Run a per-strip task on all strips"""
+        if len(strips) == 1:
+            task(strips[0], *args)
+            return
+        
+        # Surface the first worker exception, like a sequential loop would
+        executor = self._get_executor()
+        futures = [executor.submit(task, rows, *args) for rows in strips]
+        for future in futures:
+            future.result()
+    
+    def _view_buffers(self, image: np.ndarray, output_format: str) -> Tuple[np.ndarray, np.ndarray]:
+        """Allocate the frame's (left, right) eye views or packed interleaved samples"""
+        h, w = image.shape[:2]
+        if output_format in ('half_sbs', 'top_bottom'):
+            frame = np.empty(self.renderer.half_format_shape(h, w, output_format) + image.shape[2:], image.dtype)
+            return self.renderer.split_half_format(frame, output_format)
+        
+        if output_format in self.composer.INTERLEAVED_FORMATS:
+            h, w = (h // 2) * 2, (w // 2) * 2
+            shape = (h // 2, w) if output_format == 'row_interleaved' else (h, w // 2)
+        else:
+            shape = (h, w)
+        return np.empty(shape + image.shape[2:], image.dtype), np.empty(shape + image.shape[2:], image.dtype)
+    
+    def _strip_views(
+        self,
+        rows: Tuple[int, int],
+        image: np.ndarray,
+        depth: np.ndarray,
+        output_format: str,
+        depth_intensity: float
+    ) -> Tuple[np.ndarray, np.ndarray, slice]:
+        """
+        Render the eye views (or packed samples) of one strip
+        
+        Returns:
+            (left, right, rows) with the halo dropped; rows are the rows of
+            the frame's eye views (or packed samples) they cover
+        """
+        start, stop = rows
+        h = image.shape[0]
+        top = max(0, start - self.halo)
+        bottom = min(h, stop + self.halo)
+        
+        strip_image = image[top:bottom]
+        strip_depth = depth[top:bottom]
+        
+        if output_format in ('half_sbs', 'top_bottom'):
+            # Eye rows: 1:1 for half_sbs, one per two source rows for top_bottom
+            scale = 2 if output_format == 'top_bottom' else 1
+            frame = self.renderer.render_half_format(
+                strip_image, strip_depth, output_format, depth_intensity=depth_intensity
+            )
+            left, right = self.renderer.split_half_format(frame, output_format)
+        elif output_format in self.composer.INTERLEAVED_FORMATS:
+            # Strips start on even rows, so row parity matches the frame;
+            # row_interleaved packs one sample row per two source rows
+            scale = 2 if output_format == 'row_interleaved' else 1
+            stop = min(stop, (h // 2) * 2)
+            left, right = self.renderer.render_interleaved(
+                strip_image, strip_depth, output_format, depth_intensity=depth_intensity
+            )
+        else:
+            scale = 1
+            left, right = self.renderer.render_stereo_pair(
+                strip_image, strip_depth, depth_intensity=depth_intensity
+            )
+        
+        core = slice((start - top) // scale, (stop - top) // scale)
+        return left[core], right[core], slice(start // scale, stop // scale)
+    
+    def _render_strip_views(
+        self,
+        rows: Tuple[int, int],
+        image: np.ndarray,
+        depth: np.ndarray,
+        output_format: str,
+        depth_intensity: float,
+        left_out: np.ndarray,
+        right_out: np.ndarray
+    ):
+        """Render one strip's rows of the frame's unfilled eye views"""
+        left, right, target = self._strip_views(rows, image, depth, output_format, depth_intensity)
+        left_out[target] = left
+        right_out[target] = right
+    
+    def _render_strip(
+        self,
+        rows: Tuple[int, int],
+        image: np.ndarray,
+        depth: np.ndarray,
+        output_format: str,
+        depth_intensity: float,
+        out: np.ndarray,
+        bgr: bool
+    ):
+        """Render and write the output rows of one strip (no hole filling)"""
+        left, right, target = self._strip_views(rows, image, depth, output_format, depth_intensity)
+        
+        if output_format in ('half_sbs', 'top_bottom'):
+            left_out, right_out = self.renderer.split_half_format(out, output_format)
+            _copy_into(left, left_out[target], bgr)
+            _copy_into(right, right_out[target], bgr)
+            return
+        
+        start, stop = rows
+        stop = min(stop, out.shape[0])
+        if output_format in self.composer.INTERLEAVED_FORMATS:
+            self.composer.interleave_eyes(left, right, output_format, out=out[start:stop], bgr=bgr)
+        else:
+            self.composer.compose(left, right, output_format, out=out[start:stop], bgr=bgr)
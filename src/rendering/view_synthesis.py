@@ -4,95 +4,225 @@ Advanced rendering for complex scenes
 """
 import numpy as np
 import cv2
-from typing import List, Tuple
+from typing import List, Optional, Sequence
+
+from ..ai_core.postprocessing import depth_scale
 
 
 class ViewSynthesizer:
-    """Multi-layer rendering for improved quality"""
+    """
+    Multi-layer rendering for improved quality
+    
+    Depth is quantized into a stack of fronto-parallel planes. Each plane
+    is moved with a single horizontal translation and the planes are
+    composited back-to-front with uint8 premultiplied alpha, which is much
+    cheaper than a per-pixel remap on high-resolution frames at the cost of
+    some depth precision.
+    """
     
-    def __init__(self, num_layers: int = 3):
+    def __init__(self, num_layers: int = 3, subpixel: bool = False):
         """
         Initialize view synthesizer
         
         Args:
             num_layers: Number of depth layers to use
+            subpixel: Move planes by fractional shifts with blended edges.
+                Whole-pixel shifts reduce each plane to one masked copy.
         """
-        self.num_layers = num_layers
+        self.num_layers = max(1, min(255, num_layers))
+        self.subpixel = subpixel
     
     def synthesize_view(
         self,
         image: np.ndarray,
         depth: np.ndarray,
-        shift: float
+        shift: float,
+        out: Optional[np.ndarray] = None
     ) -> np.ndarray:
         """
         Synthesize new view using layered approach
         
         Args:
-            image: Source image
-            depth: Depth map
-            shift: Horizontal shift amount
+            image: Source image (H, W, 3) uint8
+            depth: Depth map (H, W) normalized to [0, 1], 1 = far
+            shift: Horizontal shift in pixels of the nearest content
+                (positive moves content right); scaled by (1 - depth) per plane
+            out: Optional preallocated output image
         
         Returns:
             Synthesized view
         """
-        # Segment depth into layers
-        layers = self._segment_depth_layers(depth)
+        labels = self.quantize_depth(depth)
+        plane_shifts = shift * (1.0 - self.plane_depths())
+        
+        return self.render_layers(image, labels, plane_shifts, out=out)
+    
+    def plane_depths(self) -> np.ndarray:
+        """
+        Get the representative depth of each plane
         
-        # Render each layer separately
-        rendered_layers = []
-        for layer_mask in layers:
-            layer_img = image * layer_mask[:, :, np.newaxis]
-            # Apply shift to this layer
-            # TODO: Implement layer-wise shifting
-            rendered_layers.append(layer_img)
+        Returns:
+            (num_layers,) array of plane center depths, nearest first
+        """
+        return (np.arange(self.num_layers, dtype=np.float32) + 0.5) / self.num_layers
+    
+    def quantize_depth(self, depth: np.ndarray) -> np.ndarray:
+        """
+        Quantize depth into plane indices
         
-        # Composite layers back-to-front
-        result = self._composite_layers(rendered_layers)
+        Args:
+            depth: Depth map normalized to [0, 1] (float or uint16 0-65535)
         
-        return result
+        Returns:
+            (H, W) uint8 plane index map, 0 = nearest plane
+        """
+        if depth.dtype == np.float16:
+            depth = depth.astype(np.float32)
+        
+        # floor(depth * N) via a saturating uint8 conversion
+        labels = cv2.convertScaleAbs(
+            depth, alpha=self.num_layers / depth_scale(depth.dtype), beta=-0.5
+        )
+        return np.minimum(labels, self.num_layers - 1, out=labels)
     
-    def _segment_depth_layers(self, depth: np.ndarray) -> List[np.ndarray]:
+    def render_layers(
+        self,
+        image: np.ndarray,
+        labels: np.ndarray,
+        plane_shifts: Sequence[float],
+        out: Optional[np.ndarray] = None
+    ) -> np.ndarray:
         """
-        Segment depth map into discrete layers
+        Translate each plane and composite back-to-front in place
+        
+        The whole frame moved by the farthest plane's shift is used as the
+        backdrop, so disocclusions are covered like the border-replicating
+        remap path instead of being left black.
         
         Args:
-            depth: Depth map
+            image: Source image (H, W, 3) uint8
+            labels: Plane index map from quantize_depth
+            plane_shifts: Horizontal shift in pixels per plane, nearest first
+            out: Optional preallocated output image
         
         Returns:
-            List of binary masks for each layer
+            Synthesized view
         """
-        layers = []
-        layer_boundaries = np.linspace(0, 1, self.num_layers + 1)
+        h, w = labels.shape
+        if out is None:
+            out = np.empty_like(image)
+        if not self.subpixel:
+            plane_shifts = np.round(plane_shifts)
         
-        for i in range(self.num_layers):
-            lower = layer_boundaries[i]
-            upper = layer_boundaries[i + 1]
+        # Backdrop: farthest plane (and everything else) in one translation
+        _translate(image, float(plane_shifts[-1]), w, cv2.BORDER_REPLICATE, dst=out)
+        
+        # Nearer planes, back to front
+        for plane in range(len(plane_shifts) - 2, -1, -1):
+            alpha = cv2.compare(labels, plane, cv2.CMP_EQ)
+            x0, y0, roi_w, roi_h = cv2.boundingRect(alpha)
+            if roi_w == 0 or roi_h == 0:
+                continue
             
-            mask = ((depth >= lower) & (depth < upper)).astype(np.float32)
-            layers.append(mask)
+            self._composite_plane(
+                out, image, alpha, float(plane_shifts[plane]),
+                x0, y0, x0 + roi_w, y0 + roi_h
+            )
+        
+        return out
+    
+    def _composite_plane(
+        self,
+        out: np.ndarray,
+        image: np.ndarray,
+        alpha: np.ndarray,
+        shift: float,
+        x0: int,
+        y0: int,
+        x1: int,
+        y1: int
+    ):
+        """Blend one plane's bounding box, translated by ``shift``, over ``out``"""
+        w = out.shape[1]
+        
+        # Destination columns reached by the translated bounding box
+        dx0 = max(0, x0 + int(np.floor(shift)))
+        dx1 = min(w, x1 + int(np.ceil(shift)))
+        if dx0 >= dx1:
+            return
         
-        return layers
+        src_alpha = alpha[y0:y1, x0:x1]
+        target = out[y0:y1, dx0:dx1]
+        
+        if shift == int(shift):
+            # Whole-pixel shift: binary alpha, a masked copy is enough
+            sx0 = dx0 - int(shift)
+            sx1 = dx1 - int(shift)
+            cv2.copyTo(image[y0:y1, sx0:sx1], alpha[y0:y1, sx0:sx1], target)
+            return
+        
+        premultiplied = cv2.bitwise_and(
+            image[y0:y1, x0:x1], image[y0:y1, x0:x1], mask=src_alpha
+        )
+        
+        # Subpixel translation keeps color and alpha premultiplied
+        offset = x0 + shift - dx0
+        color = _translate(premultiplied, offset, dx1 - dx0, cv2.BORDER_CONSTANT)
+        coverage = _translate(src_alpha, offset, dx1 - dx0, cv2.BORDER_CONSTANT)
+        
+        # out = color + out * (1 - alpha)
+        keep = cv2.cvtColor(cv2.bitwise_not(coverage), cv2.COLOR_GRAY2RGB)
+        cv2.multiply(target, keep, dst=target, scale=1.0 / 255.0)
+        cv2.add(target, color, dst=target)
     
-    def _composite_layers(self, layers: List[np.ndarray]) -> np.ndarray:
+    def _segment_depth_layers(self, depth: np.ndarray) -> List[np.ndarray]:
         """
-        Composite layers from back to front
+        Segment depth map into discrete layers
         
         Args:
-            layers: List of layer images
+            depth: Depth map
         
         Returns:
-            Composited image
+            List of binary masks for each layer
         """
-        if not layers:
-            return np.zeros_like(layers[0])
-        
-        result = layers[-1].copy()  # Start with furthest layer
+        labels = self.quantize_depth(depth)
         
-        # Composite front-to-back
-        for layer in reversed(layers[:-1]):
-            # Simple alpha blend (could be more sophisticated)
-            alpha = (layer.sum(axis=2) > 0).astype(np.float32)[:, :, np.newaxis]
-            result = layer * alpha + result * (1 - alpha)
-        
-        return result
+        return [(labels == i).astype(np.float32) for i in range(self.num_layers)]
+
+
+def _translate(
+    src: np.ndarray,
+    offset: float,
+    width: int,
+    border: int,
+    dst: Optional[np.ndarray] = None
+) -> np.ndarray:
+    """
+    Move an image right by ``offset`` pixels with linear interpolation
+    
+    Column j of the result samples src at j - offset. A horizontal
+    translation is two shifted slices and one weighted add, far cheaper
+    than a general warp.
+    """
+    k = int(np.floor(offset))
+    frac = offset - k
+    
+    # Source columns -k-1 .. width-k-1 are needed; pad whatever falls outside
+    lo, hi = -k - 1, width - k
+    pad_left = max(0, -lo)
+    pad_right = max(0, hi - src.shape[1])
+    if pad_left or pad_right:
+        src = cv2.copyMakeBorder(src, 0, 0, pad_left, pad_right, border, value=0)
+    lo += pad_left
+    hi += pad_left
+    
+    current = src[:, lo + 1:hi]
+    previous = src[:, lo:hi - 1]
+    
+    if frac == 0.0:
+        if dst is None:
+            return np.ascontiguousarray(current)
+        np.copyto(dst, current)
+        return dst
+    
+    return cv2.addWeighted(current, 1.0 - frac, previous, frac, 0.0, dst=dst)
@@ -15,6 +15,8 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+VIDEO_EXTENSIONS = {'.mp4', '.avi', '.mov', '.mkv'}
+
 
 class BatchManagerDialog(QDialog):
     """Dialog for managing batch conversion queue."""
@@ -23,6 +25,7 @@ class BatchManagerDialog(QDialog):
         """Initialize batch manager."""
         super().__init__(parent)
         self.queue = []
+        self._ffmpeg = None
         self._setup_ui()
         self.setWindowTitle("Batch Manager")
         self.resize(800, 600)
@@ -119,6 +122,13 @@ class BatchManagerDialog(QDialog):
         self.start_btn.clicked.connect(self._start_batch)
         button_layout.addWidget(self.start_btn)
         
+        self.resume_btn = QPushButton("Resume")
+        self.resume_btn.setToolTip(
+            "Continue unfinished items, reusing the frames already converted"
+        )
+        self.resume_btn.clicked.connect(self._resume_batch)
+        button_layout.addWidget(self.resume_btn)
+        
         button_layout.addStretch()
         
         self.save_queue_btn = QPushButton("Save Queue")
@@ -145,8 +155,7 @@ class BatchManagerDialog(QDialog):
         
         if file_dialog.exec():
             files = file_dialog.selectedFiles()
-            for file_path in files:
-                self._add_to_queue(file_path)
+            self._add_paths(files)
     
     def _add_folder(self):
         """Add folder contents to queue."""
@@ -156,13 +165,39 @@ class BatchManagerDialog(QDialog):
             media_extensions = {'.jpg', '.jpeg', '.png', '.bmp', '.mp4', '.avi', '.mov', '.mkv'}
             files = [str(f) for f in folder_path.iterdir() 
                     if f.suffix.lower() in media_extensions]
-            for file_path in files:
-                self._add_to_queue(file_path)
+            self._add_paths(files)
+    
+    def _add_paths(self, file_paths):
+        """Add files to queue, probing all videos in one concurrent pass."""
+        videos = [p for p in file_paths if Path(p).suffix.lower() in VIDEO_EXTENSIONS]
+        video_info = self._probe_videos(videos)
+        
+        for file_path in file_paths:
+            self._add_to_queue(file_path, video_info.get(Path(file_path)), update_table=False)
+        self._update_table()
     
-    def _add_to_queue(self, file_path):
+    def _probe_videos(self, video_paths):
+        """Get metadata of videos (cached ffprobe results; empty without FFmpeg)."""
+        if not video_paths:
+            return {}
+        
+        if self._ffmpeg is None:
+            try:
+                from ..video_processing.ffmpeg_handler import FFmpegHandler
+                self._ffmpeg = FFmpegHandler()
+            except RuntimeError as e:
+                logger.warning(f"Not probing queued videos: {e}")
+                return {}
+        
+        return self._ffmpeg.probe_many(video_paths)
+    
+    def _add_to_queue(self, file_path, info=None, update_table=True):
         """Add single file to queue."""
         path = Path(file_path)
-        file_type = "Video" if path.suffix.lower() in {'.mp4', '.avi', '.mov', '.mkv'} else "Image"
+        file_type = "Video" if path.suffix.lower() in VIDEO_EXTENSIONS else "Image"
+        if info:
+            minutes, seconds = divmod(int(info['duration']), 60)
+            file_type += f" ({info['width']}x{info['height']}, {minutes}:{seconds:02d})"
         
         format_map = {
             "Half Side-by-Side": "half_sbs",
@@ -178,10 +213,12 @@ class BatchManagerDialog(QDialog):
             'type': file_type,
             'format': format_code,
             'priority': priority,
-            'status': 'Pending'
+            'status': 'Pending',
+            'info': info
         })
         
-        self._update_table()
+        if update_table:
+            self._update_table()
     
     def _update_table(self):
         """Update queue table."""
@@ -234,7 +271,19 @@ class BatchManagerDialog(QDialog):
     
     def _start_batch(self):
         """Start batch conversion."""
-        if not self.queue:
+        self._run_batch(self.queue, resume=False)
+    
+    def _resume_batch(self):
+        """Resume unfinished items from their conversion journals."""
+        items = [item for item in self.queue if item['status'] != 'Completed']
+        if self.queue and not items:
+            QMessageBox.information(self, "Nothing to Resume", "All items are completed.")
+            return
+        self._run_batch(items, resume=True)
+    
+    def _run_batch(self, items, resume):
+        """Convert queue items, optionally resuming interrupted jobs."""
+        if not items:
             QMessageBox.warning(self, "Empty Queue", "Please add files to the queue first.")
             return
         
@@ -244,11 +293,12 @@ class BatchManagerDialog(QDialog):
             'ipd': 65,
             'output_format': 'half_sbs',
             'quality': 'high',
-            'hole_filling': True
+            'hole_filling': True,
+            'resume': resume
         }
         
         # Extract file paths
-        files = [item['path'] for item in self.queue]
+        files = [item['path'] for item in items]
         
         # Open progress dialog
         from .progress_dialog import ProgressDialog
@@ -257,7 +307,7 @@ class BatchManagerDialog(QDialog):
         
         if result:
             # Update status
-            for item in self.queue:
+            for item in items:
                 item['status'] = 'Completed'
             self._update_table()
     
@@ -6,17 +6,88 @@ Displays preview of original image, depth map, and stereoscopic output.
 
 from PyQt6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QLabel, 
-    QTabWidget, QScrollArea
+    QTabWidget, QScrollArea, QSlider
 )
-from PyQt6.QtCore import Qt, pyqtSignal
+from PyQt6.QtCore import Qt, QThread, QTimer, pyqtSignal
 from PyQt6.QtGui import QImage, QPixmap
 from pathlib import Path
+import threading
 import cv2
 import numpy as np
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Delay after the last scrubber move before a frame is decoded
+SCRUB_DEBOUNCE_MS = 80
+
+
+class FrameDecodeThread(QThread):
+    """
+    Decodes preview frames off the GUI thread.
+    
+    Only the latest request is kept: requests made while a frame is being
+    decoded replace each other, so scrubbing never queues up decodes.
+    """
+    
+    frame_count_ready = pyqtSignal(int, int)  # request id, frame count
+    frame_ready = pyqtSignal(int, int, object, bool)  # request id, frame number, BGR frame, final
+    decode_failed = pyqtSignal(int, int, str)  # request id, frame number, error
+    
+    def __init__(self, count_frames, read_frame, parent=None):
+        """
+        Initialize decode thread.
+        
+        Args:
+            count_frames: Function(file path) -> frame count
+            read_frame: Function(file path, frame number) -> BGR frame
+            parent: Parent object
+        """
+        super().__init__(parent)
+        self._count_frames = count_frames
+        self._read_frame = read_frame
+        self._lock = threading.Lock()
+        self._request = None
+        self._active = False
+    
+    def request(self, request_id: int, file_path: str, frame_number: int, final: bool, count: bool = False):
+        """
+        Decode a frame, replacing any request that has not started yet.
+        
+        Args:
+            request_id: Id echoed in the result signals
+            file_path: Video file
+            frame_number: Frame to decode
+            final: Whether the frame should get depth and 3D output
+            count: Count the video's frames first (frame_count_ready)
+        """
+        with self._lock:
+            self._request = (request_id, file_path, frame_number, final, count)
+            start = not self._active
+            self._active = True
+        if start:
+            # A previous run() may still be returning
+            self.wait()
+            self.start()
+    
+    def run(self):
+        """Serve requests until none is pending."""
+        while True:
+            with self._lock:
+                request, self._request = self._request, None
+                if request is None:
+                    self._active = False
+                    return
+            
+            request_id, file_path, frame_number, final, count = request
+            try:
+                if count:
+                    self.frame_count_ready.emit(request_id, self._count_frames(file_path))
+                frame = self._read_frame(file_path, frame_number)
+                self.frame_ready.emit(request_id, frame_number, frame, final)
+            except Exception as e:
+                self.decode_failed.emit(request_id, frame_number, str(e))
+
 
 class PreviewWidget(QWidget):
     """Widget for previewing conversion results."""
@@ -31,6 +102,12 @@ class PreviewWidget(QWidget):
         self.depth_map = None
         self.stereo_output = None
         self.settings = {}  # Store settings for depth estimation
+        self._ffmpeg = None
+        self._frame_request = 0
+        self._decoder = FrameDecodeThread(self._count_video_frames, self._read_video_frame, self)
+        self._decoder.frame_count_ready.connect(self._on_frame_count_ready)
+        self._decoder.frame_ready.connect(self._on_frame_decoded)
+        self._decoder.decode_failed.connect(self._on_frame_failed)
         self._setup_ui()
         
         logger.info("PreviewWidget initialized")
@@ -61,6 +138,27 @@ class PreviewWidget(QWidget):
         
         layout.addWidget(self.tab_widget)
         
+        # Frame scrubber (videos only)
+        self.frame_bar = QWidget()
+        frame_layout = QHBoxLayout(self.frame_bar)
+        frame_layout.setContentsMargins(5, 0, 5, 0)
+        frame_layout.addWidget(QLabel("Frame:"))
+        self.frame_slider = QSlider(Qt.Orientation.Horizontal)
+        self.frame_slider.valueChanged.connect(self._on_frame_changed)
+        self.frame_slider.sliderReleased.connect(self._on_frame_released)
+        frame_layout.addWidget(self.frame_slider)
+        
+        # Scrubbing decodes only once the slider rests for a moment
+        self._scrub_timer = QTimer(self)
+        self._scrub_timer.setSingleShot(True)
+        self._scrub_timer.setInterval(SCRUB_DEBOUNCE_MS)
+        self._scrub_timer.timeout.connect(self._on_scrub_timeout)
+        
+        self.frame_label = QLabel("0 / 0")
+        frame_layout.addWidget(self.frame_label)
+        self.frame_bar.hide()
+        layout.addWidget(self.frame_bar)
+        
         # Info label
         self.info_label = QLabel("No file loaded")
         self.info_label.setStyleSheet("padding: 5px; background-color: #f8f9fa;")
@@ -123,10 +221,14 @@ class PreviewWidget(QWidget):
             is_video = path.suffix.lower() in {'.mp4', '.avi', '.mov', '.mkv', '.webm'}
             
             if is_video:
-                # For videos, extract first frame
-                self._load_video_frame(file_path)
+                # For videos, count frames and decode the first one in the
+                # background, then allow scrubbing
+                self.frame_bar.hide()
+                self._request_frame(0, final=True, count=True)
             else:
                 # For images, load directly
+                self._frame_request += 1
+                self.frame_bar.hide()
                 self._load_image(file_path)
             
             self.info_label.setText(f"Loaded: {path.name} ({self._get_file_size_str(path)})")
@@ -151,26 +253,108 @@ class PreviewWidget(QWidget):
         # Generate initial depth map
         self._generate_depth_map()
     
-    def _load_video_frame(self, file_path: str):
-        """Load first frame from video."""
+    def _request_frame(self, frame_number: int, final: bool, count: bool = False):
+        """Decode a frame of the current video in the background (see _on_frame_decoded)."""
+        self._frame_request += 1
+        self._decoder.request(self._frame_request, self.current_file, frame_number, final, count)
+    
+    def _on_frame_decoded(self, request_id: int, frame_number: int, frame: np.ndarray, final: bool):
+        """Show a decoded frame, unless a newer request superseded it."""
+        if request_id != self._frame_request:
+            return
+        
+        self.original_image = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+        
+        # Display original
+        self._display_image(self.original_image, self.original_tab)
+        
+        # Generate depth map once the scrubber rests
+        if final:
+            self._generate_depth_map()
+    
+    def _on_frame_failed(self, request_id: int, frame_number: int, error: str):
+        """Report a frame that could not be decoded."""
+        if request_id != self._frame_request:
+            return
+        logger.error(f"Failed to load frame {frame_number}: {error}")
+        self.info_label.setText(f"Error loading frame {frame_number}: {error}")
+    
+    def _get_ffmpeg(self):
+        """FFmpeg handler for frame seeking, or None if FFmpeg is unavailable."""
+        if self._ffmpeg is None:
+            try:
+                from ..video_processing.ffmpeg_handler import FFmpegHandler
+                self._ffmpeg = FFmpegHandler()
+            except RuntimeError as e:
+                logger.warning(f"Frame seeking without FFmpeg: {e}")
+                self._ffmpeg = False
+        return self._ffmpeg or None
+    
+    def _read_video_frame(self, file_path: str, frame_number: int) -> np.ndarray:
+        """Read frame N (BGR) with a keyframe seek from the file's seek index."""
+        ffmpeg = self._get_ffmpeg()
+        if ffmpeg is not None:
+            return ffmpeg.read_frame(Path(file_path), frame_number)
+        
+        # Fallback: OpenCV's own seek
         cap = cv2.VideoCapture(file_path)
         
         if not cap.isOpened():
             raise ValueError("Failed to open video")
         
+        cap.set(cv2.CAP_PROP_POS_FRAMES, frame_number)
         ret, frame = cap.read()
         cap.release()
         
         if not ret:
             raise ValueError("Failed to read video frame")
+        return frame
+    
+    def _count_video_frames(self, file_path: str) -> int:
+        """Frame count of a video (from its seek index; runs in the decode thread)."""
+        ffmpeg = self._get_ffmpeg()
+        if ffmpeg is not None:
+            return ffmpeg.get_seek_index(Path(file_path)).frame_count
         
-        self.original_image = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+        cap = cv2.VideoCapture(file_path)
+        frame_count = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+        cap.release()
+        return frame_count
+    
+    def _on_frame_count_ready(self, request_id: int, frame_count: int):
+        """Set the frame scrubber's range to the video's frame count."""
+        if request_id != self._frame_request:
+            return
         
-        # Display original
-        self._display_image(self.original_image, self.original_tab)
+        self.frame_slider.blockSignals(True)
+        self.frame_slider.setRange(0, max(0, frame_count - 1))
+        self.frame_slider.setValue(0)
+        self.frame_slider.blockSignals(False)
+        self.frame_label.setText(f"0 / {frame_count}")
+        self.frame_bar.setVisible(frame_count > 1)
+    
+    def _on_frame_changed(self, frame_number: int):
+        """Follow the scrubber: preview frames while dragging, depth once it rests."""
+        if self.current_file is None:
+            return
         
-        # Generate initial depth map
-        self._generate_depth_map()
+        self.frame_label.setText(f"{frame_number} / {self.frame_slider.maximum() + 1}")
+        if self.frame_slider.isSliderDown():
+            self._scrub_timer.start()
+        else:
+            self._scrub_timer.stop()
+            self._request_frame(frame_number, final=True)
+    
+    def _on_scrub_timeout(self):
+        """Preview the frame the dragged scrubber paused on."""
+        if self.current_file is not None and self.frame_slider.isSliderDown():
+            self._request_frame(self.frame_slider.value(), final=False)
+    
+    def _on_frame_released(self):
+        """Generate depth and 3D output for the frame the scrubber stopped on."""
+        self._scrub_timer.stop()
+        if self.current_file is not None:
+            self._request_frame(self.frame_slider.value(), final=True)
     
     def _generate_depth_map(self):
         """Generate depth map from original image."""
@@ -225,7 +409,10 @@ class PreviewWidget(QWidget):
             from ..rendering.sbs_composer import SBSComposer
             
             # Render stereo pair
-            renderer = DIBRRenderer(ipd=settings.get('ipd', 65))
+            renderer = DIBRRenderer(
+                ipd=settings.get('ipd', 65),
+                stereo_mode=settings.get('stereo_mode', 'symmetric')
+            )
             left_view, right_view = renderer.render_stereo_pair(
                 self.original_image,
                 self.depth_map,
@@ -332,6 +519,10 @@ class PreviewWidget(QWidget):
         self.depth_map = None
         self.stereo_output = None
         
+        # Results of pending decodes are dropped
+        self._frame_request += 1
+        self._scrub_timer.stop()
+        
         # Reset all displays
         for tab in [self.original_tab, self.depth_tab, self.stereo_tab]:
             label = tab.widget()
@@ -342,6 +533,7 @@ class PreviewWidget(QWidget):
         self.comp_depth.setPixmap(QPixmap())
         self.comp_stereo.setPixmap(QPixmap())
         
+        self.frame_bar.hide()
         self.info_label.setText("No file loaded")
     
     def save_preview(self, output_path: str):
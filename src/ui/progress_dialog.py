@@ -15,6 +15,8 @@ import cv2
 import numpy as np
 import time
 import logging
+import shutil
+import subprocess
 
 logger = logging.getLogger(__name__)
 
@@ -56,15 +58,25 @@ class ConversionWorker(QThread):
         # Initialize models once
         try:
             from ..ai_core.depth_estimation import DepthEstimator
-            from ..rendering.dibr_renderer import DIBRRenderer
+            from ..rendering.dibr_renderer import create_renderer
             from ..rendering.sbs_composer import SBSComposer
             
             # Get model type from settings
             model_type = self.settings.get('model_type', 'midas_hybrid')
             
             self.progress_updated.emit(0, total_count, f"Initializing AI model: {model_type}...")
-            estimator = DepthEstimator(model_type=model_type)
-            renderer = DIBRRenderer(ipd=self.settings.get('ipd', 65))
+            estimator = DepthEstimator(
+                model_type=model_type,
+                depth_dtype=self.settings.get('depth_dtype', 'float32'),
+                smoothing=self.settings.get('depth_smoothing', 'fast_bilateral')
+            )
+            renderer = create_renderer(
+                self.settings.get('render_backend', 'opencv'),
+                ipd=self.settings.get('ipd', 65),
+                device=estimator.device,
+                render_mode=self.settings.get('render_mode', 'remap'),
+                stereo_mode=self.settings.get('stereo_mode', 'symmetric')
+            )
             composer = SBSComposer()
             
             # Confirm models loaded successfully
@@ -109,6 +121,8 @@ class ConversionWorker(QThread):
     def _convert_image(self, file_path, estimator, renderer, composer):
         """Convert single image."""
         try:
+            from ..rendering.strip_renderer import StripRenderer
+            
             filename = Path(file_path).name
             
             # Load image
@@ -128,24 +142,15 @@ class ConversionWorker(QThread):
             
             # Render stereo
             self.progress_updated.emit(0, 1, f"👁️ Rendering stereo views...")
-            left_view, right_view = renderer.render_stereo_pair(
-                image_rgb,
-                depth_map,
-                depth_intensity=self.settings.get('depth_intensity', 75)
-            )
-            self.progress_updated.emit(0, 1, f"✓ Stereo pair created")
-            
-            # Compose output
-            self.progress_updated.emit(0, 1, f"🎨 Composing 3D output...")
             output_format = self.settings.get('output_format', 'half_sbs')
-            if output_format == 'half_sbs':
-                output = composer.compose_half_sbs(left_view, right_view)
-            elif output_format == 'full_sbs':
-                output = composer.compose_full_sbs(left_view, right_view)
-            elif output_format == 'anaglyph':
-                output = composer.compose_anaglyph(left_view, right_view)
-            elif output_format == 'top_bottom':
-                output = composer.compose_top_bottom(left_view, right_view, half=True)
+            depth_intensity = self.settings.get('depth_intensity', 75)
+            # Horizontal strips are rendered and composed on all cores
+            strip_renderer = StripRenderer(renderer, composer, hole_method=None)
+            output = strip_renderer.render(
+                image_rgb, depth_map, output_format, depth_intensity=depth_intensity
+            )
+            strip_renderer.close()
+            self.progress_updated.emit(0, 1, f"✓ Stereo frame created")
             
             # Emit preview
             self.preview_updated.emit(output)
@@ -169,48 +174,86 @@ class ConversionWorker(QThread):
     
     def _convert_video(self, file_path, estimator, renderer, composer):
         """Convert video file."""
+        journal = None
         try:
             from ..video_processing.ffmpeg_handler import FFmpegHandler
-            from ..video_processing.audio_handler import AudioHandler
-            from ..video_processing.encoder import VideoEncoder
+            from ..video_processing.encoder import INTERLEAVED_PIXEL_FORMAT, VideoEncoder
+            from ..video_processing.intermediate_format import (
+                intermediate_format_key, job_intermediate_format
+            )
+            from ..video_processing.job_journal import JobJournal, job_work_dir
+            from ..video_processing.static_frames import StaticFrameDetector, REUSE_DEPTH, REUSE_OUTPUT
             from ..ai_core.temporal_filter import TemporalFilter
+            from ..rendering.hole_filling import TemporalHoleFiller
+            from ..rendering.active_area import ActiveArea
             import tempfile
             
-            # Setup paths in system temp directory
+            # Setup per-file job paths in system temp directory; the journal
+            # keeps them across failures and cancels so the job can resume
             temp_base = Path(tempfile.gettempdir())
-            work_dir = temp_base / "temp_conversion"
+            work_dir = job_work_dir(temp_base / "temp_conversion", Path(file_path))
+            requested_format = self.settings.get('intermediate_format', 'auto')
+            job_settings = {key: value for key, value in self.settings.items() if key != 'resume'}
+            job_settings['intermediate_format'] = intermediate_format_key(requested_format)
+            journal = JobJournal(
+                work_dir,
+                Path(file_path),
+                job_settings,
+                resume=self.settings.get('resume', False)
+            )
             frames_dir = work_dir / "frames"
             output_frames_dir = work_dir / "output_frames"
-            audio_path = work_dir / "audio.aac"
             
-            work_dir.mkdir(exist_ok=True)
             frames_dir.mkdir(exist_ok=True)
             output_frames_dir.mkdir(exist_ok=True)
+            image_format = job_intermediate_format(requested_format, journal)
             
             # Extract frames
             ffmpeg = FFmpegHandler()
             video_info = ffmpeg.get_video_info(Path(file_path))
             
-            self.progress_updated.emit(0, 100, "Extracting frames...")
-            frame_count = ffmpeg.extract_frames(
-                Path(file_path),
-                frames_dir,
-                frame_pattern="frame_%06d.png"
-            )
+            if journal.is_stage_done("extract"):
+                frame_count = len(list(frames_dir.glob(image_format.glob)))
+            else:
+                self.progress_updated.emit(0, 100, "Extracting frames...")
+                frame_count = ffmpeg.extract_frames(
+                    Path(file_path),
+                    frames_dir,
+                    intermediate_format=image_format.name
+                )
+                journal.mark_stage("extract")
             
-            # Extract audio
-            has_audio = False
-            if video_info['has_audio']:
-                audio_handler = AudioHandler(ffmpeg_handler=ffmpeg)
-                has_audio = audio_handler.extract_audio(Path(file_path), audio_path)
+            # Shot boundaries, where the temporal filter and hole filler start over
+            self.progress_updated.emit(0, 100, "Detecting scenes...")
+            try:
+                scene_cuts = set(ffmpeg.get_scene_index(Path(file_path)).cuts)
+            except (subprocess.CalledProcessError, ValueError) as e:
+                logger.warning(f"Scene detection failed, filtering across cuts: {e}")
+                scene_cuts = set()
             
             # Process frames
             temporal_filter = TemporalFilter(window_size=3, alpha=0.7)
-            frame_files = sorted(frames_dir.glob("frame_*.png"))
+            hole_filler = TemporalHoleFiller() if self.settings.get('hole_filling', True) else None
+            detector = StaticFrameDetector() if self.settings.get('skip_static', True) else None
+            last_depth = None
+            last_output = None
+            frame_files = sorted(frames_dir.glob(image_format.glob))
+            
+            # Depth and rendering only cover the picture inside black bars
+            active_area = ActiveArea.detect_from_files(frame_files) if frame_files else None
+            if active_area is not None and active_area.is_full:
+                active_area = None
+            
+            # Skip frames finished by an earlier run, re-running a few before
+            # the first missing one to prime the temporal filter/hole filler
+            resume_from = journal.frames_done
+            warm_from = max(0, resume_from - 12)
             
             for i, frame_path in enumerate(frame_files, 1):
                 if self.is_cancelled:
                     break
+                if i <= warm_from:
+                    continue
                 
                 progress = int((i / frame_count) * 100)
                 self.progress_updated.emit(progress, 100, f"Processing frame {i}/{frame_count}")
@@ -218,60 +261,148 @@ class ConversionWorker(QThread):
                 # Load frame
                 frame_bgr = cv2.imread(str(frame_path))
                 frame_rgb = cv2.cvtColor(frame_bgr, cv2.COLOR_BGR2RGB)
+                picture = active_area.crop(frame_rgb) if active_area else frame_rgb
+                output_path = output_frames_dir / frame_path.name
+                
+                if i - 1 in scene_cuts:
+                    temporal_filter.reset()
+                    if hole_filler is not None:
+                        hole_filler.reset()
+                
+                # Duplicate and near-static frames reuse earlier results
+                reuse = None
+                if detector is not None:
+                    reuse = detector.check(picture, can_reuse_output=last_output is not None)
+                if reuse == REUSE_OUTPUT:
+                    previous_output, last_output = last_output, output_path
+                    if i > resume_from:
+                        shutil.copyfile(previous_output, output_path)
+                        journal.mark_frames(i - 1)
+                    continue
                 
                 # Estimate depth with temporal filtering
-                depth_map = estimator.estimate_depth(frame_rgb, normalize=True)
-                depth_map = temporal_filter.filter(depth_map)
+                if reuse == REUSE_DEPTH:
+                    depth_map = last_depth
+                else:
+                    depth_map = estimator.estimate_depth(picture, normalize=True)
+                    depth_map = temporal_filter.filter(depth_map)
+                    last_depth = depth_map
                 
                 # Render and compose
-                left_view, right_view = renderer.render_stereo_pair(
-                    frame_rgb, depth_map,
-                    depth_intensity=self.settings.get('depth_intensity', 75)
-                )
-                
                 output_format = self.settings.get('output_format', 'half_sbs')
-                if output_format == 'half_sbs':
-                    output = composer.compose_half_sbs(left_view, right_view)
-                elif output_format == 'full_sbs':
-                    output = composer.compose_full_sbs(left_view, right_view)
-                elif output_format == 'anaglyph':
-                    output = composer.compose_anaglyph(left_view, right_view)
-                elif output_format == 'top_bottom':
-                    output = composer.compose_top_bottom(left_view, right_view, half=True)
+                depth_intensity = self.settings.get('depth_intensity', 75)
+                if output_format in composer.RGBD_FORMATS:
+                    # 2D + depth: the player renders the views
+                    if active_area is not None:
+                        depth_map = active_area.uncrop_depth(depth_map)
+                    output = composer.compose_rgbd(frame_rgb, depth_map, output_format)
+                elif output_format in ('half_sbs', 'top_bottom'):
+                    # Render each eye straight into its half of the output frame
+                    output = renderer.render_half_format(
+                        picture, depth_map, output_format,
+                        depth_intensity=depth_intensity
+                    )
+                    if hole_filler is not None:
+                        left_half, right_half = renderer.split_half_format(output, output_format)
+                        left_half[...], right_half[...] = hole_filler.fill_stereo_pair(
+                            left_half, right_half, depth_map,
+                            renderer.disocclusion_masks(depth_map, depth_intensity),
+                            reference_eye=renderer.reference_eye
+                        )
+                elif output_format in composer.INTERLEAVED_FORMATS:
+                    # Render only the pixels each eye contributes
+                    left_samples, right_samples = renderer.render_interleaved(
+                        picture, depth_map, output_format,
+                        depth_intensity=depth_intensity
+                    )
+                    if hole_filler is not None:
+                        masks = [
+                            None if mask is None else composer.sample_interleaved(mask, output_format, eye)
+                            for mask, eye in zip(
+                                renderer.disocclusion_masks(depth_map, depth_intensity), ('left', 'right')
+                            )
+                        ]
+                        left_samples, right_samples = hole_filler.fill_stereo_pair(
+                            left_samples, right_samples, depth_map, masks,
+                            reference_eye=renderer.reference_eye
+                        )
+                    output = composer.interleave_eyes(left_samples, right_samples, output_format)
+                else:
+                    left_view, right_view = renderer.render_stereo_pair(
+                        picture, depth_map,
+                        depth_intensity=depth_intensity
+                    )
+                    
+                    # Fill disocclusions from the shot's background plate
+                    if hole_filler is not None:
+                        left_view, right_view = hole_filler.fill_stereo_pair(
+                            left_view, right_view, depth_map,
+                            renderer.disocclusion_masks(depth_map, depth_intensity),
+                            reference_eye=renderer.reference_eye
+                        )
+                    
+                    if output_format == 'full_sbs':
+                        output = composer.compose_full_sbs(left_view, right_view)
+                    elif output_format == 'anaglyph':
+                        output = composer.compose_anaglyph(left_view, right_view)
+                
+                # Put the bars back around the rendered picture
+                if active_area is not None and output_format not in composer.RGBD_FORMATS:
+                    output = active_area.paste(output, frame_rgb, output_format)
+                
+                # Warm-up frame: its output was already written
+                last_output = output_path
+                if i <= resume_from:
+                    continue
                 
                 # Save frame
-                output_path = output_frames_dir / frame_path.name
                 output_bgr = cv2.cvtColor(output, cv2.COLOR_RGB2BGR)
-                cv2.imwrite(str(output_path), output_bgr)
+                image_format.write(output_path, output_bgr)
+                journal.mark_frames(i - 1)
                 
                 # Emit preview occasionally
                 if i % 10 == 0:
                     self.preview_updated.emit(output)
             
+            if detector is not None:
+                logger.info(f"Static frames: {detector.summary}")
+            
+            # Keep the finished frames for "Resume" instead of encoding a partial video
+            if self.is_cancelled:
+                journal.flush()
+                return False
+            
             # Encode video
             self.progress_updated.emit(100, 100, "Encoding video...")
             encoder = VideoEncoder(ffmpeg_handler=ffmpeg)
             output_path = self._get_output_path(file_path)
             
-            # Only include audio if file actually exists and has content
-            audio_file = None
-            if has_audio and audio_path.exists() and audio_path.stat().st_size > 0:
-                audio_file = audio_path
-                logger.info(f"Including audio file: {audio_file} ({audio_path.stat().st_size} bytes)")
-            else:
-                logger.info("No audio file to include in output")
+            # Audio is muxed straight from the input (copied when possible)
+            all_tracks = self.settings.get('all_tracks', False)
+            audio_source = Path(file_path) if video_info['has_audio'] or all_tracks else None
             
             encoder.encode_from_frames(
                 output_frames_dir,
                 Path(output_path),
                 fps=video_info['fps'],
-                frame_pattern="frame_%06d.png",
-                audio_path=audio_file
+                frame_pattern=image_format.pattern,
+                audio_path=audio_source,
+                all_tracks=all_tracks,
+                pix_fmt=(INTERLEAVED_PIXEL_FORMAT
+                         if self.settings.get('output_format') in composer.INTERLEAVED_FORMATS
+                         else "yuv420p")
             )
             
+            # Tell players how the 2D + depth frame is laid out
+            output_format = self.settings.get('output_format', 'half_sbs')
+            if output_format in composer.RGBD_FORMATS:
+                encoder.write_metadata_sidecar(
+                    Path(output_path),
+                    composer.rgbd_metadata(output_format, video_info['height'], video_info['width'])
+                )
+            
             # Cleanup
-            import shutil
-            shutil.rmtree(work_dir)
+            journal.discard()
             
             return True
             
@@ -279,6 +410,8 @@ class ConversionWorker(QThread):
             import traceback
             error_msg = f"{str(e)}\n{traceback.format_exc()}"
             logger.error(f"Video conversion error: {error_msg}")
+            if journal is not None:
+                journal.flush()
             return False
     
     def _get_output_path(self, input_path):
@@ -38,6 +38,9 @@ class SettingsPanel(QWidget):
             'output_format': 'half_sbs',
             'quality': 'high',
             'hole_filling': True,
+            'stereo_mode': 'symmetric',
+            'render_backend': 'opencv',
+            'render_mode': 'remap',
         }
         
         # Load saved preferences
@@ -59,6 +62,8 @@ class SettingsPanel(QWidget):
             # Load other settings
             self.settings['depth_intensity'] = config.get('rendering.depth_intensity', 75)
             self.settings['ipd'] = config.get('rendering.ipd', 65)
+            self.settings['render_backend'] = config.get('rendering.render_backend', 'opencv')
+            self.settings['render_mode'] = config.get('rendering.render_mode', 'remap')
             
         except Exception as e:
             print(f"Could not load preferences: {e}")
@@ -72,6 +77,8 @@ class SettingsPanel(QWidget):
             config.set('depth_estimation.model', self.settings['model_type'])
             config.set('rendering.depth_intensity', self.settings['depth_intensity'])
             config.set('rendering.ipd', self.settings['ipd'])
+            config.set('rendering.render_backend', self.settings['render_backend'])
+            config.set('rendering.render_mode', self.settings['render_mode'])
             config.save()
             
         except Exception as e:
@@ -439,6 +446,60 @@ class SettingsPanel(QWidget):
         
         layout.addLayout(ipd_layout)
         
+        # Eye synthesis mode
+        mode_layout = QHBoxLayout()
+        mode_layout.addWidget(QLabel('Eyes:'))
+        
+        self.stereo_mode_combo = QComboBox()
+        self.stereo_mode_combo.addItem('Both synthesized', 'symmetric')
+        self.stereo_mode_combo.addItem('Left = original (faster)', 'left_reference')
+        self.stereo_mode_combo.addItem('Right = original (faster)', 'right_reference')
+        self.stereo_mode_combo.setToolTip(
+            'Keep the original frame as one eye and synthesize only the other.\n'
+            'Halves rendering and hole filling and keeps that eye sharp.'
+        )
+        self.stereo_mode_combo.currentIndexChanged.connect(self.on_stereo_mode_changed)
+        
+        mode_layout.addWidget(self.stereo_mode_combo)
+        layout.addLayout(mode_layout)
+        
+        # Rendering backend
+        backend_layout = QHBoxLayout()
+        backend_layout.addWidget(QLabel('Renderer:'))
+        
+        self.backend_combo = QComboBox()
+        self.backend_combo.addItem('OpenCV (CPU)', 'opencv')
+        self.backend_combo.addItem('PyTorch (GPU, batched)', 'torch')
+        self.backend_combo.setToolTip(
+            'PyTorch renders whole batches on the depth model\'s device.\n'
+            'Fastest with a GPU; supports per-pixel rendering only.'
+        )
+        index = self.backend_combo.findData(self.settings['render_backend'])
+        self.backend_combo.setCurrentIndex(max(index, 0))
+        self.backend_combo.currentIndexChanged.connect(self.on_backend_changed)
+        
+        backend_layout.addWidget(self.backend_combo)
+        layout.addLayout(backend_layout)
+        
+        # Rendering mode
+        render_mode_layout = QHBoxLayout()
+        render_mode_layout.addWidget(QLabel('Rendering:'))
+        
+        self.render_mode_combo = QComboBox()
+        self.render_mode_combo.addItem('Per-pixel', 'remap')
+        self.render_mode_combo.addItem('Depth layers (faster at 4K)', 'layered')
+        self.render_mode_combo.setToolTip(
+            'Depth layers shift 16 depth planes instead of every pixel.\n'
+            'Much faster at high resolution; OpenCV renderer only.'
+        )
+        index = self.render_mode_combo.findData(self.settings['render_mode'])
+        self.render_mode_combo.setCurrentIndex(max(index, 0))
+        self._update_render_mode_combo()
+        self.render_mode_combo.currentIndexChanged.connect(self.on_render_mode_changed)
+        
+        render_mode_layout.addWidget(self.render_mode_combo)
+        layout.addLayout(render_mode_layout)
+        
         return group
     
     def create_output_settings(self) -> QGroupBox:
@@ -461,7 +522,15 @@ class SettingsPanel(QWidget):
             'Full Side-by-Side',
             'Top-Bottom',
             'Anaglyph (Red-Cyan)',
+            '2D + Depth (Side-by-Side)',
+            '2D + Depth (Top-Bottom)',
+            'Row Interleaved',
+            'Column Interleaved',
+            'Checkerboard',
         ])
+        self.format_combo.setToolTip(
+            '2D + Depth packs the frame and its depth map; the player renders stereo'
+        )
         self.format_combo.currentTextChanged.connect(self.on_format_changed)
         
         format_layout.addWidget(self.format_combo)
@@ -493,6 +562,32 @@ class SettingsPanel(QWidget):
         self.settings['ipd'] = value
         self.on_settings_changed()
     
+    def on_stereo_mode_changed(self, index: int):
+        """Handle eye synthesis mode change"""
+        self.settings['stereo_mode'] = self.stereo_mode_combo.itemData(index)
+        self.on_settings_changed()
+    
+    def on_backend_changed(self, index: int):
+        """Handle rendering backend change"""
+        self.settings['render_backend'] = self.backend_combo.itemData(index)
+        self._update_render_mode_combo()
+        self._save_preferences()
+        self.on_settings_changed()
+    
+    def on_render_mode_changed(self, index: int):
+        """Handle rendering mode change"""
+        self.settings['render_mode'] = self.render_mode_combo.itemData(index)
+        self._save_preferences()
+        self.on_settings_changed()
+    
+    def _update_render_mode_combo(self):
+        """Depth layers are OpenCV-only: force per-pixel for PyTorch"""
+        opencv = self.settings['render_backend'] == 'opencv'
+        if not opencv:
+            self.settings['render_mode'] = 'remap'
+            self.render_mode_combo.setCurrentIndex(0)
+        self.render_mode_combo.setEnabled(opencv)
+    
     def on_format_changed(self, format_text: str):
         """Handle output format change"""
         format_map = {
@@ -500,6 +595,11 @@ class SettingsPanel(QWidget):
             'Full Side-by-Side': 'full_sbs',
             'Top-Bottom': 'top_bottom',
             'Anaglyph (Red-Cyan)': 'anaglyph',
+            '2D + Depth (Side-by-Side)': 'rgbd_sbs',
+            '2D + Depth (Top-Bottom)': 'rgbd_tb',
+            'Row Interleaved': 'row_interleaved',
+            'Column Interleaved': 'column_interleaved',
+            'Checkerboard': 'checkerboard',
         }
         self.settings['output_format'] = format_map.get(format_text, 'half_sbs')
         self.on_settings_changed()
@@ -521,6 +621,9 @@ class SettingsPanel(QWidget):
         
         self.intensity_slider.setValue(75)
         self.ipd_slider.setValue(65)
+        self.stereo_mode_combo.setCurrentIndex(0)
+        self.backend_combo.setCurrentIndex(0)
+        self.render_mode_combo.setCurrentIndex(0)
         self.format_combo.setCurrentIndex(0)
         self.quality_combo.setCurrentText('High')
         self.hole_filling_check.setChecked(True)
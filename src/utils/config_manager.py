@@ -17,16 +17,22 @@ class ConfigManager:
             'device': 'auto',
             'batch_size': 4,
             'precision': 'fp16',
+            'depth_dtype': 'float32',  # float32, float16, uint16 (compact)
+            'depth_smoothing': 'fast_bilateral',  # fast_bilateral, bilateral, gaussian, median, None
         },
         'rendering': {
             'ipd': 65.0,
             'depth_intensity': 75.0,
-            'hole_filling': 'fast_marching',
+            'hole_filling': 'fast_marching',  # fast_marching, nearest, temporal
+            'render_backend': 'opencv',  # opencv, torch (batched grid_sample)
+            'render_mode': 'remap',  # remap, layered (depth planes, faster)
+            'stereo_mode': 'symmetric',  # symmetric, left_reference, right_reference
         },
         'video': {
             'fps': 30,
             'quality': 'high',
             'codec': 'libx264',
+            'intermediate_format': 'auto',  # auto (benchmark), png, png_fast, bmp, jpg (lossy)
         },
         'ui': {
             'theme': 'light',
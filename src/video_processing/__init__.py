@@ -7,6 +7,15 @@ __all__ = [
     'FFmpegHandler',
     'FrameExtractor',
     'FrameManager',
+    'DualResolutionReader',
+    'FrameStore',
+    'JobJournal',
+    'ProbeCache',
+    'SceneIndex',
+    'SeekIndex',
+    'StaticFrameDetector',
     'AudioHandler',
     'VideoEncoder',
+    'OutputTarget',
+    'SegmentedConverter',
 ]
@@ -6,18 +6,70 @@ and stereoscopic rendering pipeline.
 """
 
 from pathlib import Path
-from typing import List, Optional, Callable, Dict, Any
+from typing import List, Optional, Callable, Dict, Any, Iterator, Sequence, Tuple, Union
 import logging
+import shutil
 import cv2
 import numpy as np
 
 from ..ai_core.depth_estimation import DepthEstimator
-from ..rendering.dibr_renderer import DIBRRenderer
-from ..rendering.hole_filling import fill_stereo_pair_holes
-from ..rendering.sbs_composer import SBSComposer
+from ..ai_core.postprocessing import depth_to_uint8
+from ..ai_core.temporal_filter import TemporalFilter
+from ..rendering.active_area import ActiveArea
+from ..rendering.dibr_renderer import DIBRRenderer, create_renderer
+from ..rendering.hole_filling import fill_stereo_pair_holes, TemporalHoleFiller
+from ..rendering.sbs_composer import SBSComposer, FrameBufferPool
+from ..rendering.strip_renderer import StripRenderer
+from .ffmpeg_handler import FFmpegHandler
+from .frame_reader import DualResolutionReader, model_frame_size
+from .intermediate_format import IntermediateFormat, get_intermediate_format
+from .output_target import OutputTarget
+from .static_frames import StaticFrameDetector, REUSE_DEPTH, REUSE_OUTPUT
 
 logger = logging.getLogger(__name__)
 
+# Formats rendered directly at per-eye output size
+HALF_FORMATS = ("half_sbs", "top_bottom")
+
+
+def detect_video_active_area(
+    ffmpeg_handler: FFmpegHandler,
+    video_path: Path,
+    start_frame: int = 0,
+    frame_count: Optional[int] = None,
+    samples: int = 5
+) -> Optional[ActiveArea]:
+    """
+    Detect letterbox/pillarbox bars on frames fetched with keyframe seeks.
+    
+    Args:
+        ffmpeg_handler: FFmpeg handler
+        video_path: Path to video file
+        start_frame: First frame of the sampled range
+        frame_count: Number of frames in the range (None = to the end)
+        samples: Number of frames sampled evenly across the range
+    
+    Returns:
+        Picture area, or None if there are no bars
+    """
+    last = ffmpeg_handler.get_seek_index(video_path).frame_count
+    if frame_count is not None:
+        last = min(last, start_frame + frame_count)
+    step = max(1, (last - start_frame) // samples)
+    frames = [
+        ffmpeg_handler.read_frame(video_path, frame)
+        for frame in range(start_frame + step // 2, last, step)
+    ][:samples]
+    if not frames:
+        return None
+    
+    area = ActiveArea.detect(frames)
+    if area.is_full:
+        return None
+    
+    logger.info(f"Black bars detected, processing the picture only: {area}")
+    return area
+
 
 class BatchProcessor:
     """Processes video frames in batches through the 3D conversion pipeline."""
@@ -27,24 +79,134 @@ class BatchProcessor:
         depth_estimator: Optional[DepthEstimator] = None,
         dibr_renderer: Optional[DIBRRenderer] = None,
         sbs_composer: Optional[SBSComposer] = None,
-        max_workers: int = 1
+        max_workers: int = 1,
+        hole_filling_method: Optional[str] = "fast_marching",
+        rgbd_depth_bits: int = 8,
+        crop_bars: bool = True,
+        temporal_filter: bool = False,
+        temporal_method: str = "ema",
+        intermediate_format: str = "png",
+        skip_static: bool = True,
+        render_backend: str = "opencv"
     ):
         """
         Initialize batch processor.
         
         Args:
-            depth_estimator: Depth estimation model (creates default if None)
-            dibr_renderer: DIBR renderer (creates default if None)
+            depth_estimator: Depth estimation model (creates one with
+                fast_bilateral smoothing if None)
+            dibr_renderer: DIBR renderer (creates default if None); a
+                TorchDIBRRenderer renders whole batches in process_frames
             sbs_composer: SBS composer (creates default if None)
-            max_workers: Number of parallel workers (1 = sequential)
+            max_workers: Number of threads rendering horizontal strips of
+                each frame (1 = sequential)
+            hole_filling_method: Hole filling method (fast_marching, nearest,
+                temporal). 'temporal' reuses background from earlier frames
+                in process_frames and falls back to fast_marching elsewhere;
+                None leaves the rendered views as they are.
+            rgbd_depth_bits: Depth precision of the 2D + depth formats; 10-bit
+                frames are written as 16-bit images
+            crop_bars: Detect letterbox/pillarbox bars on sampled frames and
+                run depth estimation, rendering and hole filling only on
+                the picture inside them
+            temporal_filter: Smooth each depth map with the previous ones
+                in process_frames(_multi) to reduce flicker
+            temporal_method: Temporal filter method (ema, median, gaussian)
+            intermediate_format: Image format of written frames (png,
+                png_fast, bmp, jpg, or auto); 16-bit frames are always PNG
+            skip_static: Detect duplicate and near-static frames in
+                process_frames(_multi) and reuse the previous output or
+                depth map instead of running inference again
+            render_backend: Backend of the default renderer (opencv, or
+                torch on the depth model's device); unused with dibr_renderer
         """
-        self.depth_estimator = depth_estimator or DepthEstimator()
-        self.dibr_renderer = dibr_renderer or DIBRRenderer()
+        self.depth_estimator = depth_estimator or DepthEstimator(smoothing="fast_bilateral")
+        self.dibr_renderer = dibr_renderer or create_renderer(
+            render_backend, device=self.depth_estimator.device
+        )
         self.sbs_composer = sbs_composer or SBSComposer()
         self.max_workers = max_workers
+        self.hole_filling_method = hole_filling_method
+        self.rgbd_depth_bits = rgbd_depth_bits
+        self.crop_bars = crop_bars
+        self.temporal_filter = temporal_filter
+        self.temporal_method = temporal_method
+        self.intermediate_format = intermediate_format
+        self.skip_static = skip_static
+        
+        # Frames of the last sequence that reused earlier results
+        self.reuse_counts = {REUSE_OUTPUT: 0, REUSE_DEPTH: 0}
+        
+        # Picture-area frames, composed before the bars are put back
+        self._picture_pool = FrameBufferPool(size=1)
+        
+        # Spatial render/fill/compose split across threads within a frame
+        self.strip_renderer = None
+        if max_workers > 1:
+            self.strip_renderer = StripRenderer(
+                self.dibr_renderer,
+                self.sbs_composer,
+                workers=max_workers,
+                hole_method=self._spatial_hole_method()
+            )
         
         logger.info(f"BatchProcessor initialized with {max_workers} worker(s)")
     
+    def open_video(
+        self,
+        ffmpeg_handler: FFmpegHandler,
+        video_path: Path,
+        start_frame: int = 0,
+        frame_count: Optional[int] = None,
+        prefetch: int = 16,
+        active_area: Optional[ActiveArea] = None
+    ) -> DualResolutionReader:
+        """
+        Open a video as the frame source of process_frames(_multi).
+        
+        Frames are decoded once, at full resolution for rendering and at
+        the depth model's input resolution for inference, instead of
+        being extracted to image files and downscaled in Python. Bars are
+        detected on a few frames fetched with keyframe seeks.
+        
+        Args:
+            ffmpeg_handler: FFmpeg handler
+            video_path: Path to video file
+            start_frame: First frame to decode
+            frame_count: Number of frames (None = to the end)
+            prefetch: Frames decoded ahead of processing
+            active_area: Picture area detected beforehand, e.g. once for
+                all segments of a video (skips detection)
+            
+        Returns:
+            Frame reader; output frames are named frame_000001... from the
+            first decoded frame, like extracted frames
+        """
+        info = ffmpeg_handler.get_video_info(video_path)
+        fps = info["fps"]
+        
+        if active_area is None and self.crop_bars:
+            active_area = detect_video_active_area(
+                ffmpeg_handler, video_path, start_frame, frame_count
+            )
+        
+        width, height = info["width"], info["height"]
+        if active_area is not None:
+            height, width = active_area.shape
+        input_size = getattr(self.depth_estimator, 'model_input_size', 384)
+        
+        # Seek half a frame early so rounding cannot skip the first frame
+        start_time = max(0.0, (start_frame - 0.5) / fps) if start_frame else None
+        return DualResolutionReader(
+            ffmpeg_handler,
+            video_path,
+            model_frame_size(width, height, input_size),
+            active_area=active_area,
+            start_time=start_time,
+            frame_count=frame_count,
+            prefetch=prefetch
+        )
+    
     def process_frame(
         self,
         frame_path: Path,
@@ -59,7 +221,8 @@ class BatchProcessor:
         Args:
             frame_path: Path to input frame
             output_dir: Directory for output
-            output_format: Output format (half_sbs, full_sbs, anaglyph, top_bottom)
+            output_format: Output format (half_sbs, full_sbs, anaglyph, top_bottom,
+                or rgbd_sbs/rgbd_tb for 2D + depth without stereo rendering)
             depth_intensity: Depth effect strength (0.0-1.0)
             save_intermediate: Save depth maps and stereo pairs
             
@@ -72,73 +235,60 @@ class BatchProcessor:
             raise ValueError(f"Failed to load frame: {frame_path}")
         
         frame_rgb = cv2.cvtColor(frame_bgr, cv2.COLOR_BGR2RGB)
+        active_area = self._detect_active_area(frames=[frame_bgr])
         
         # Estimate depth
-        depth_map = self.depth_estimator.estimate_depth(frame_rgb)
+        picture = active_area.crop(frame_rgb) if active_area else frame_rgb
+        depth_map = self.depth_estimator.estimate_depth(picture)
         
-        # Render stereo pair
-        left_view, right_view = self.dibr_renderer.render_stereo_pair(
+        # Render, fill holes and compose (a single frame has no history
+        # for temporal hole filling)
+        output, left_view, right_view = self._render_frame(
             frame_rgb,
             depth_map,
-            depth_intensity=depth_intensity
+            output_format,
+            depth_intensity,
+            bgr=True,
+            keep_views=save_intermediate,
+            active_area=active_area
         )
         
-        # Fill holes
-        left_view, right_view = fill_stereo_pair_holes(left_view, right_view)
-        
-        # Compose output format
-        if output_format == "half_sbs":
-            output = self.sbs_composer.compose_half_sbs(left_view, right_view)
-        elif output_format == "full_sbs":
-            output = self.sbs_composer.compose_full_sbs(left_view, right_view)
-        elif output_format == "anaglyph":
-            output = self.sbs_composer.compose_anaglyph(left_view, right_view)
-        elif output_format == "top_bottom":
-            output = self.sbs_composer.compose_top_bottom(left_view, right_view, half_resolution=True)
-        else:
-            raise ValueError(f"Unknown output format: {output_format}")
-        
-        # Save output
+        # Save output (already in BGR order for OpenCV)
         output_dir.mkdir(parents=True, exist_ok=True)
-        output_path = output_dir / frame_path.name
-        output_bgr = cv2.cvtColor(output, cv2.COLOR_RGB2BGR)
-        cv2.imwrite(str(output_path), output_bgr)
+        output_path = self._write_frame(output_dir, frame_path.stem, output)
         
         # Save intermediate results if requested
         if save_intermediate:
-            depth_path = output_dir / f"depth_{frame_path.name}"
-            depth_normalized = (depth_map * 255).astype(np.uint8)
-            cv2.imwrite(str(depth_path), depth_normalized)
-            
-            left_path = output_dir / f"left_{frame_path.name}"
-            left_bgr = cv2.cvtColor(left_view, cv2.COLOR_RGB2BGR)
-            cv2.imwrite(str(left_path), left_bgr)
-            
-            right_path = output_dir / f"right_{frame_path.name}"
-            right_bgr = cv2.cvtColor(right_view, cv2.COLOR_RGB2BGR)
-            cv2.imwrite(str(right_path), right_bgr)
+            self._save_intermediate(
+                output_dir, frame_path.stem, depth_map, left_view, right_view,
+                views_bgr=output_format in HALF_FORMATS
+            )
         
         return output_path
     
     def process_frames(
         self,
-        frame_paths: List[Path],
+        frame_paths: Union[List[Path], DualResolutionReader],
         output_dir: Path,
         output_format: str = "half_sbs",
         depth_intensity: float = 0.75,
         progress_callback: Optional[Callable[[int, int], None]] = None,
-        save_intermediate: bool = False
+        save_intermediate: bool = False,
+        scene_cuts: Sequence[int] = ()
     ) -> List[Path]:
         """
         Process frames sequentially through the pipeline.
         
         Args:
-            frame_paths: List of input frame paths
+            frame_paths: List of input frame paths, or a video opened
+                with open_video
             output_dir: Directory for output frames
             output_format: Output format
             depth_intensity: Depth effect strength
             progress_callback: Callback function(current, total)
             save_intermediate: Save depth maps and stereo pairs
+            scene_cuts: Positions (0-based, in this sequence) of frames that
+                start a new shot; temporal state is reset there
             
         Returns:
             List of output frame paths
@@ -148,16 +298,297 @@ class BatchProcessor:
 
         logger.info(f"Processing {total} frames (batch mode)...")
 
+        # Output frames are recycled instead of allocated per frame
+        output_pool = FrameBufferPool(size=2)
+
+        # Temporal hole filling keeps background plates across the sequence
+        hole_filler = None
+        if self.hole_filling_method == "temporal":
+            hole_filler = TemporalHoleFiller()
+        depth_filter = self._create_depth_filter()
+        detector = self._create_static_detector()
+        last_depth = None
+        scene_cuts = set(scene_cuts)
+
+        # Filtered depth must be rendered per frame, not in tensor batches
+        active_area = self._detect_active_area(frame_paths)
+        frames = self._iter_frames(
+            frame_paths, depth_intensity,
+            render_views=output_format not in SBSComposer.RGBD_FORMATS and depth_filter is None,
+            active_area=active_area,
+            detector=detector,
+            reuse_output=not save_intermediate
+        )
+        for index, frame_path, image, depth_map, stereo_views, reuse in frames:
+            try:
+                if index - 1 in scene_cuts:
+                    self._reset_temporal_state(depth_filter, hole_filler)
+
+                if reuse == REUSE_OUTPUT:
+                    output_paths.append(self._copy_frame(output_paths[-1], output_dir, frame_path.stem))
+                    self._report_progress(index, total, progress_callback)
+                    continue
+
+                # Reused depth was already filtered
+                if reuse == REUSE_DEPTH:
+                    depth_map = last_depth = self._depth_to_numpy(last_depth)
+                elif depth_filter is not None:
+                    depth_map = depth_filter.filter(depth_map, method=self.temporal_method)
+                last_depth = depth_map
+
+                if stereo_views is not None and (hole_filler is not None or save_intermediate):
+                    depth_map = depth_map.cpu().numpy()
+
+                # Render, fill holes and compose into a recycled BGR frame
+                h, w = image.shape[:2]
+                out = output_pool.acquire(
+                    self.sbs_composer.output_shape(h, w, output_format) + (3,),
+                    dtype=self._output_dtype(output_format)
+                )
+                output, left_view, right_view = self._render_frame(
+                    image,
+                    depth_map,
+                    output_format,
+                    depth_intensity,
+                    hole_filler=hole_filler,
+                    stereo_views=stereo_views,
+                    out=out,
+                    bgr=True,
+                    keep_views=save_intermediate,
+                    active_area=active_area
+                )
+
+                # Save output
+                output_dir.mkdir(parents=True, exist_ok=True)
+                output_path = self._write_frame(output_dir, frame_path.stem, output)
+                output_paths.append(output_path)
+
+                # Save intermediate results if requested
+                if save_intermediate:
+                    self._save_intermediate(
+                        output_dir, frame_path.stem, depth_map, left_view, right_view,
+                        views_bgr=stereo_views is None and output_format in HALF_FORMATS
+                    )
+
+                self._report_progress(index, total, progress_callback)
+
+            except Exception as e:
+                logger.error(f"Failed to process frame {frame_path}: {e}")
+                raise
+
+        self._log_reuse(detector)
+        logger.info(f"Successfully processed {len(output_paths)} frames")
+        return output_paths
+    
+    def process_frames_multi(
+        self,
+        frame_paths: Union[List[Path], DualResolutionReader],
+        output_dir: Path,
+        targets: Sequence[OutputTarget],
+        depth_intensity: float = 0.75,
+        progress_callback: Optional[Callable[[int, int], None]] = None,
+        scene_cuts: Sequence[int] = ()
+    ) -> List[List[Path]]:
+        """
+        Process frames once and compose them for several output targets.
+        
+        Decode, depth estimation, stereo rendering and hole filling run once
+        per frame; only composition (and scaling) runs per target. Frames of
+        target ``i`` are written to ``output_dir / f"target_{i}"``.
+        
+        Args:
+            frame_paths: List of input frame paths, or a video opened
+                with open_video
+            output_dir: Directory for per-target output frame directories
+            targets: Output targets (format, resolution, codec, path)
+            depth_intensity: Depth effect strength
+            progress_callback: Callback function(current, total)
+            scene_cuts: Positions (0-based, in this sequence) of frames that
+                start a new shot; temporal state is reset there
+            
+        Returns:
+            Output frame paths per target, in target order
+        """
+        total = len(frame_paths)
+        target_dirs = [output_dir / f"target_{i}" for i in range(len(targets))]
+        for target_dir in target_dirs:
+            target_dir.mkdir(parents=True, exist_ok=True)
+        output_paths: List[List[Path]] = [[] for _ in targets]
+
+        logger.info(f"Processing {total} frames for {len(targets)} targets: {list(targets)}")
+
+        # One recycled native-size frame per target
+        pools = [FrameBufferPool(size=1) for _ in targets]
+
+        hole_filler = None
+        if self.hole_filling_method == "temporal":
+            hole_filler = TemporalHoleFiller()
+        depth_filter = self._create_depth_filter()
+        detector = self._create_static_detector()
+        last_depth = None
+        scene_cuts = set(scene_cuts)
+
+        # 2D + depth targets need no stereo views
+        render_views = any(not target.is_rgbd for target in targets)
+        active_area = self._detect_active_area(frame_paths)
+        frames = self._iter_frames(
+            frame_paths, depth_intensity,
+            render_views=render_views and depth_filter is None,
+            active_area=active_area,
+            detector=detector
+        )
+        for index, frame_path, image, depth_map, stereo_views, reuse in frames:
+            try:
+                if index - 1 in scene_cuts:
+                    self._reset_temporal_state(depth_filter, hole_filler)
+
+                if reuse == REUSE_OUTPUT:
+                    for target_dir, paths in zip(target_dirs, output_paths):
+                        paths.append(self._copy_frame(paths[-1], target_dir, frame_path.stem))
+                    self._report_progress(index, total, progress_callback)
+                    continue
+
+                # Reused depth was already filtered
+                if reuse == REUSE_DEPTH:
+                    depth_map = last_depth
+                else:
+                    if stereo_views is not None:
+                        depth_map = depth_map.cpu().numpy()
+                    if depth_filter is not None:
+                        depth_map = depth_filter.filter(depth_map, method=self.temporal_method)
+                    last_depth = depth_map
+
+                # Render and fill holes once, at full resolution
+                picture = active_area.crop(image) if active_area else image
+                views = None
+                if render_views:
+                    if stereo_views is None:
+                        stereo_views = self.dibr_renderer.render_stereo_pair(
+                            picture, depth_map, depth_intensity=depth_intensity
+                        )
+                    views = self._fill_holes(*stereo_views, depth_map, hole_filler, depth_intensity)
+
+                h, w = image.shape[:2]
+                for target, pool, target_dir, paths in zip(targets, pools, target_dirs, output_paths):
+                    out = pool.acquire(target.frame_shape(h, w), dtype=target.frame_dtype)
+                    output = target.compose(
+                        self.sbs_composer, image, depth_map, views, out=out, bgr=True,
+                        active_area=active_area
+                    )
+
+                    paths.append(self._write_frame(target_dir, frame_path.stem, output))
+
+                self._report_progress(index, total, progress_callback)
+
+            except Exception as e:
+                logger.error(f"Failed to process frame {frame_path}: {e}")
+                raise
+
+        self._log_reuse(detector)
+        logger.info(f"Successfully processed {total} frames for {len(targets)} targets")
+        return output_paths
+    
+    def _iter_frames(
+        self,
+        frame_paths: Union[List[Path], DualResolutionReader],
+        depth_intensity: float,
+        render_views: bool = True,
+        active_area: Optional[ActiveArea] = None,
+        detector: Optional[StaticFrameDetector] = None,
+        reuse_output: bool = True
+    ) -> Iterator[Tuple[int, Path, np.ndarray, Any, Optional[Tuple[np.ndarray, np.ndarray]], Optional[str]]]:
+        """
+        Load frames and estimate depth in batches.
+        
+        With the tensor backend (and ``render_views``) whole batches are
+        also rendered on the model's device; depth then stays a tensor.
+        With an ``active_area``, depth and views cover only the picture
+        inside the bars while the yielded image is the full frame. Frames
+        from a DualResolutionReader come with model-resolution copies that
+        depth is estimated from. Frames the ``detector`` finds (nearly)
+        unchanged are not estimated or rendered; they come with a reuse
+        mode and no depth.
+        
+        Yields:
+            (index, frame_path, image, depth_map, stereo_views or None,
+            REUSE_OUTPUT, REUSE_DEPTH or None), with a 1-based global index
+        """
         # Determine batch size from depth estimator if available
         batch_size = getattr(self.depth_estimator, 'batch_size', 4)
         # Fallback to 4 if not set
         if not isinstance(batch_size, int) or batch_size <= 0:
             batch_size = 4
 
-        # Process in batches: run depth estimation in batches, then render/save each frame (can be parallelized)
-        for start in range(0, total, batch_size):
-            end = min(start + batch_size, total)
-            batch_paths = frame_paths[start:end]
+        # Process in batches: run depth estimation in batches, then render/save each frame
+        for start, batch_paths, images, model_images in self._frame_batches(frame_paths, batch_size):
+            # The model and renderer only see the picture inside the bars
+            pictures = images
+            if active_area is not None:
+                pictures = [np.ascontiguousarray(active_area.crop(image)) for image in images]
+
+            # Reduced frames (already cropped) go to the model; depth comes
+            # back at picture size
+            depth_inputs, depth_options = pictures, {}
+            if model_images is not None:
+                h, w = pictures[0].shape[:2]
+                depth_inputs, depth_options = model_images, {'output_size': (w, h)}
+
+            # Only frames that changed enough go through the model
+            reuse = [None] * len(images)
+            if detector is not None:
+                reuse = [detector.check(image, can_reuse_output=reuse_output) for image in depth_inputs]
+            processed = [i for i, mode in enumerate(reuse) if mode is None]
+            depth_inputs = [depth_inputs[i] for i in processed]
+
+            # Run batched depth estimation. The tensor backend renders the whole
+            # batch on the model's device, so depth stays a tensor until needed.
+            depth_maps, stereo_views = [], [None] * len(processed)
+            if processed and render_views and hasattr(self.dibr_renderer, 'render_stereo_batch'):
+                depth_maps = self.depth_estimator.batch_estimate(
+                    depth_inputs, normalize=True, batch_size=batch_size, as_tensor=True, **depth_options
+                )
+                left_batch, right_batch = self.dibr_renderer.render_stereo_batch(
+                    [pictures[i] for i in processed], depth_maps, depth_intensity=depth_intensity
+                )
+                stereo_views = list(zip(
+                    self.dibr_renderer.to_numpy(left_batch),
+                    self.dibr_renderer.to_numpy(right_batch)
+                ))
+            elif processed:
+                depth_maps = self.depth_estimator.batch_estimate(
+                    depth_inputs, normalize=True, batch_size=batch_size, **depth_options
+                )
+
+            results = iter(zip(depth_maps, stereo_views))
+            for idx, frame_path in enumerate(batch_paths):
+                depth_map, views = next(results) if reuse[idx] is None else (None, None)
+                yield start + idx + 1, frame_path, images[idx], depth_map, views, reuse[idx]
+    
+    @staticmethod
+    def _frame_batches(
+        frame_paths: Union[List[Path], DualResolutionReader],
+        batch_size: int
+    ) -> Iterator[Tuple[int, List[Path], List[np.ndarray], Optional[List[np.ndarray]]]]:
+        """
+        Read RGB frames in batches from files or a video reader
+        
+        Yields:
+            (index of the first frame, frame paths, images, model-resolution
+            images or None); reader frames are named like extracted frames
+        """
+        if isinstance(frame_paths, DualResolutionReader):
+            batch = []
+            for i, (image, model_image) in enumerate(frame_paths):
+                batch.append((Path(f"frame_{i + 1:06d}"), image, model_image))
+                if len(batch) == batch_size:
+                    yield i + 1 - batch_size, *map(list, zip(*batch))
+                    batch = []
+            if batch:
+                yield i + 1 - len(batch), *map(list, zip(*batch))
+            return
+
+        for start in range(0, len(frame_paths), batch_size):
+            batch_paths = frame_paths[start:start + batch_size]
 
             # Load batch images into memory
             images = []
@@ -165,70 +596,297 @@ class BatchProcessor:
                 img_bgr = cv2.imread(str(p))
                 if img_bgr is None:
                     raise ValueError(f"Failed to load frame: {p}")
-                img_rgb = cv2.cvtColor(img_bgr, cv2.COLOR_BGR2RGB)
-                images.append(img_rgb)
-
-            # Run batched depth estimation
-            depth_maps = self.depth_estimator.batch_estimate(images, normalize=True, batch_size=batch_size)
-
-            # For each result in the batch, render and save. Rendering/hole-filling/composition are CPU-bound
-            for i_in_batch, frame_path in enumerate(batch_paths, start + 1):
-                try:
-                    depth_map = depth_maps[i_in_batch - start]
-
-                    # Render stereo pair
-                    left_view, right_view = self.dibr_renderer.render_stereo_pair(
-                        images[i_in_batch - start],
-                        depth_map,
-                        depth_intensity=depth_intensity
-                    )
+                images.append(cv2.cvtColor(img_bgr, cv2.COLOR_BGR2RGB))
 
-                    # Fill holes (method comes from config manager elsewhere; using default fast_marching)
-                    left_view, right_view = fill_stereo_pair_holes(left_view, right_view)
-
-                    # Compose output format
-                    if output_format == "half_sbs":
-                        output = self.sbs_composer.compose_half_sbs(left_view, right_view)
-                    elif output_format == "full_sbs":
-                        output = self.sbs_composer.compose_full_sbs(left_view, right_view)
-                    elif output_format == "anaglyph":
-                        output = self.sbs_composer.compose_anaglyph(left_view, right_view)
-                    elif output_format == "top_bottom":
-                        output = self.sbs_composer.compose_top_bottom(left_view, right_view, half_resolution=True)
-                    else:
-                        raise ValueError(f"Unknown output format: {output_format}")
-
-                    # Save output
-                    output_dir.mkdir(parents=True, exist_ok=True)
-                    output_path = output_dir / frame_path.name
-                    output_bgr = cv2.cvtColor(output, cv2.COLOR_RGB2BGR)
-                    cv2.imwrite(str(output_path), output_bgr)
-                    output_paths.append(output_path)
-
-                    # Save intermediate results if requested
-                    if save_intermediate:
-                        depth_path = output_dir / f"depth_{frame_path.name}"
-                        depth_normalized = (depth_map * 255).astype(np.uint8)
-                        cv2.imwrite(str(depth_path), depth_normalized)
-
-                        left_path = output_dir / f"left_{frame_path.name}"
-                        left_bgr = cv2.cvtColor(left_view, cv2.COLOR_RGB2BGR)
-                        cv2.imwrite(str(left_path), left_bgr)
-
-                        right_path = output_dir / f"right_{frame_path.name}"
-                        right_bgr = cv2.cvtColor(right_view, cv2.COLOR_RGB2BGR)
-                        cv2.imwrite(str(right_path), right_bgr)
-
-                    # Progress callback (global index)
-                    if progress_callback:
-                        progress_callback(i_in_batch, total)
-
-                    if i_in_batch % 10 == 0 or i_in_batch == total:
-                        logger.info(f"Processed {i_in_batch}/{total} frames ({i_in_batch*100//total}%)")
-
-                except Exception as e:
-                    logger.error(f"Failed to process frame {frame_path}: {e}")
-                    raise
+            yield start, batch_paths, images, None
+    
+    @staticmethod
+    def _report_progress(
+        index: int,
+        total: int,
+        progress_callback: Optional[Callable[[int, int], None]]
+    ):
+        """Report progress by global 1-based frame index"""
+        if progress_callback:
+            progress_callback(index, total)
 
-        logger.info(f"Successfully processed {len(output_paths)} frames")
-        return output_paths
+        if index % 10 == 0 or index == total:
+            logger.info(f"Processed {index}/{total} frames ({index*100//max(total, 1)}%)")
+    
+    def _render_frame(
+        self,
+        image: np.ndarray,
+        depth_map: np.ndarray,
+        output_format: str,
+        depth_intensity: float,
+        hole_filler: Optional[TemporalHoleFiller] = None,
+        stereo_views: Optional[Tuple[np.ndarray, np.ndarray]] = None,
+        out: Optional[np.ndarray] = None,
+        bgr: bool = False,
+        keep_views: bool = True,
+        active_area: Optional[ActiveArea] = None
+    ) -> Tuple[np.ndarray, Optional[np.ndarray], Optional[np.ndarray]]:
+        """
+        Render, hole-fill and compose one frame.
+        
+        Half-resolution formats are rendered directly at output size, so
+        hole filling also runs on the half-size eye views. Interleaved
+        formats render and return packed per-eye samples.
+        
+        Args:
+            image: RGB frame
+            depth_map: Depth map for the frame
+            output_format: Output format
+            depth_intensity: Depth effect strength
+            hole_filler: Temporal hole filler for frame sequences (optional)
+            stereo_views: Already rendered (left, right) views (optional)
+            out: Preallocated output frame (optional)
+            bgr: Produce BGR output for OpenCV/ffmpeg sinks. Half-format
+                views are regions of the output and share its channel order.
+            keep_views: Return the eye views. When False and spatial hole
+                filling is used, the frame may be rendered in parallel
+                strips and no views are returned.
+            active_area: Picture area inside black bars; ``image`` is the
+                full frame, ``depth_map`` and ``stereo_views`` cover only
+                the picture. Views returned are picture-sized.
+            
+        Returns:
+            Tuple of (output, left_view, right_view)
+        """
+        if active_area is not None:
+            if output_format in SBSComposer.RGBD_FORMATS:
+                # Carry the bars in the depth map at far depth
+                depth_map = active_area.uncrop_depth(depth_map)
+            else:
+                picture_out = self._picture_pool.acquire(
+                    self.sbs_composer.output_shape(*active_area.shape, output_format) + (3,),
+                    dtype=self._output_dtype(output_format)
+                )
+                output, left_view, right_view = self._render_frame(
+                    active_area.crop(image), depth_map, output_format, depth_intensity,
+                    hole_filler=hole_filler, stereo_views=stereo_views,
+                    out=picture_out, bgr=bgr, keep_views=keep_views
+                )
+                output = active_area.paste(output, image, output_format, out=out, bgr=bgr)
+                return output, left_view, right_view
+        
+        if output_format in SBSComposer.RGBD_FORMATS:
+            # 2D + depth: the player renders the views, no DIBR or hole filling
+            output = self.sbs_composer.compose_rgbd(
+                image, depth_map, output_format,
+                depth_bits=self.rgbd_depth_bits, out=out, bgr=bgr
+            )
+            return output, None, None
+        
+        if (not keep_views and self.strip_renderer is not None
+                and stereo_views is None and hole_filler is None):
+            output = self.strip_renderer.render(
+                image, depth_map, output_format, depth_intensity, out=out, bgr=bgr
+            )
+            return output, None, None
+        
+        if stereo_views is None and output_format in SBSComposer.INTERLEAVED_FORMATS:
+            # Only the pixels each eye contributes are rendered and filled
+            left_samples, right_samples = self.dibr_renderer.render_interleaved(
+                image, depth_map, output_format, depth_intensity=depth_intensity
+            )
+            left_samples, right_samples = self._fill_holes(
+                left_samples, right_samples, depth_map, hole_filler, depth_intensity, output_format
+            )
+            output = self.sbs_composer.interleave_eyes(
+                left_samples, right_samples, output_format, out=out, bgr=bgr
+            )
+            return output, left_samples, right_samples
+        
+        if stereo_views is None and output_format in HALF_FORMATS:
+            output = self.dibr_renderer.render_half_format(
+                image, depth_map, output_format, depth_intensity=depth_intensity, out=out
+            )
+            left_half, right_half = self.dibr_renderer.split_half_format(output, output_format)
+            left_filled, right_filled = self._fill_holes(
+                left_half, right_half, depth_map, hole_filler, depth_intensity
+            )
+            if left_filled is not left_half:
+                left_half[...] = left_filled
+            if right_filled is not right_half:
+                right_half[...] = right_filled
+            
+            if bgr:
+                cv2.cvtColor(output, cv2.COLOR_RGB2BGR, dst=output)
+            
+            return output, left_half, right_half
+        
+        if stereo_views is not None:
+            left_view, right_view = stereo_views
+        else:
+            left_view, right_view = self.dibr_renderer.render_stereo_pair(
+                image,
+                depth_map,
+                depth_intensity=depth_intensity
+            )
+        
+        left_view, right_view = self._fill_holes(
+            left_view, right_view, depth_map, hole_filler, depth_intensity
+        )
+        
+        # Compose output format
+        output = self.sbs_composer.compose(
+            left_view, right_view, output_format, out=out, bgr=bgr
+        )
+        
+        return output, left_view, right_view
+    
+    def _fill_holes(
+        self,
+        left_view: np.ndarray,
+        right_view: np.ndarray,
+        depth_map: np.ndarray,
+        hole_filler: Optional[TemporalHoleFiller],
+        depth_intensity: float,
+        output_format: Optional[str] = None
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Fill holes with the temporal filler if given, else spatially
+        
+        The temporal filler only touches the renderer's disocclusions;
+        ``output_format`` marks packed interleaved samples.
+        """
+        if self.hole_filling_method is None:
+            return left_view, right_view
+        
+        # The source-frame eye of a reference stereo mode has no holes
+        reference_eye = self.dibr_renderer.reference_eye
+        if hole_filler is not None:
+            masks = self.dibr_renderer.disocclusion_masks(depth_map, depth_intensity)
+            if output_format in SBSComposer.INTERLEAVED_FORMATS:
+                masks = [
+                    None if mask is None else SBSComposer.sample_interleaved(mask, output_format, eye)
+                    for mask, eye in zip(masks, ('left', 'right'))
+                ]
+            return hole_filler.fill_stereo_pair(
+                left_view, right_view, depth_map, masks, reference_eye=reference_eye
+            )
+        return fill_stereo_pair_holes(
+            left_view, right_view,
+            method=self._spatial_hole_method(),
+            reference_eye=reference_eye
+        )
+    
+    def _frame_format(self, output_dir: Path) -> IntermediateFormat:
+        """Intermediate format of frames written to output_dir"""
+        return get_intermediate_format(self.intermediate_format, output_dir)
+    
+    def _write_frame(self, output_dir: Path, stem: str, image: np.ndarray) -> Path:
+        """Write a BGR frame in the intermediate format"""
+        image_format = self._frame_format(output_dir).for_dtype(image.dtype)
+        output_path = output_dir / f"{stem}{image_format.extension}"
+        image_format.write(output_path, image)
+        return output_path
+    
+    def _save_intermediate(
+        self,
+        output_dir: Path,
+        stem: str,
+        depth_map: np.ndarray,
+        left_view: Optional[np.ndarray],
+        right_view: Optional[np.ndarray],
+        views_bgr: bool = False
+    ):
+        """Save depth map and stereo views (when rendered) next to an output frame"""
+        self._write_frame(output_dir, f"depth_{stem}", depth_to_uint8(depth_map))
+        
+        for prefix, view in (("left", left_view), ("right", right_view)):
+            if view is None:
+                continue
+            view_bgr = view if views_bgr else cv2.cvtColor(view, cv2.COLOR_RGB2BGR)
+            self._write_frame(output_dir, f"{prefix}_{stem}", view_bgr)
+    
+    def _output_dtype(self, output_format: str) -> np.dtype:
+        """Output frame dtype (16-bit for 10-bit 2D + depth)"""
+        if output_format in SBSComposer.RGBD_FORMATS and self.rgbd_depth_bits > 8:
+            return np.dtype(np.uint16)
+        return np.dtype(np.uint8)
+    
+    def _create_depth_filter(self) -> Optional[TemporalFilter]:
+        """Create the per-sequence depth filter, if enabled"""
+        if not self.temporal_filter:
+            return None
+        return TemporalFilter(window_size=3, alpha=0.7)
+    
+    @staticmethod
+    def _reset_temporal_state(
+        depth_filter: Optional[TemporalFilter],
+        hole_filler: Optional[TemporalHoleFiller]
+    ):
+        """Forget depth and background history at a shot boundary"""
+        if depth_filter is not None:
+            depth_filter.reset()
+        if hole_filler is not None:
+            hole_filler.reset()
+    
+    def _create_static_detector(self) -> Optional[StaticFrameDetector]:
+        """Create the per-sequence static frame detector, if enabled"""
+        self.reuse_counts = {REUSE_OUTPUT: 0, REUSE_DEPTH: 0}
+        if not self.skip_static:
+            return None
+        return StaticFrameDetector()
+    
+    def _log_reuse(self, detector: Optional[StaticFrameDetector]):
+        """Record and log how many frames reused earlier results"""
+        if detector is None:
+            return
+        self.reuse_counts = {REUSE_OUTPUT: detector.outputs_reused, REUSE_DEPTH: detector.depths_reused}
+        if detector.outputs_reused or detector.depths_reused:
+            logger.info(f"Static frames: {detector.summary}")
+    
+    @staticmethod
+    def _depth_to_numpy(depth_map: Any) -> np.ndarray:
+        """Depth map as a NumPy array (tensor backend depth stays on the device)"""
+        if isinstance(depth_map, np.ndarray):
+            return depth_map
+        return depth_map.cpu().numpy()
+    
+    @staticmethod
+    def _copy_frame(source: Path, output_dir: Path, stem: str) -> Path:
+        """Write an already written frame again under another name"""
+        output_path = output_dir / f"{stem}{source.suffix}"
+        shutil.copyfile(source, output_path)
+        return output_path
+    
+    def _detect_active_area(
+        self,
+        frame_paths: Sequence[Path] = (),
+        frames: Optional[Sequence[np.ndarray]] = None
+    ) -> Optional[ActiveArea]:
+        """
+        Detect letterbox/pillarbox bars if enabled
+        
+        Args:
+            frame_paths: Sequence to sample frames from (or a video opened
+                with open_video)
+            frames: Already loaded frames (instead of frame_paths)
+        
+        Returns:
+            Picture area, or None if disabled or there are no bars
+        """
+        if isinstance(frame_paths, DualResolutionReader):
+            # Detected when the video was opened
+            return frame_paths.active_area
+        if not self.crop_bars or not (frames or frame_paths):
+            return None
+        
+        if frames is not None:
+            area = ActiveArea.detect(frames)
+        else:
+            area = ActiveArea.detect_from_files(frame_paths)
+        if area.is_full:
+            return None
+        
+        logger.info(f"Black bars detected, processing the picture only: {area}")
+        return area
+    
+    def _spatial_hole_method(self) -> str:
+        """Hole filling method to use where no frame history is available"""
+        if self.hole_filling_method == "temporal":
+            return "fast_marching"
+        return self.hole_filling_method
@@ -6,12 +6,19 @@ Reassembles frames into video with optional audio.
 """
 
 from pathlib import Path
-from typing import Optional, List
+from typing import Any, Dict, Optional, List, Tuple
+import json
 import subprocess
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Output pixel format per frame bit depth (10-bit carries 2D + depth maps)
+PIXEL_FORMATS = {8: "yuv420p", 10: "yuv420p10le"}
+
+# Interleaved stereo alternates eyes every row/column; 4:2:0 chroma would mix them
+INTERLEAVED_PIXEL_FORMAT = "yuv444p"
+
 
 class VideoEncoder:
     """Encodes frames into video."""
@@ -24,6 +31,7 @@ class VideoEncoder:
             ffmpeg_handler: FFmpegHandler instance (preferred)
             ffmpeg_path: Path to FFmpeg executable (fallback)
         """
+        self.ffmpeg_handler = ffmpeg_handler
         if ffmpeg_handler is not None:
             self.ffmpeg_path = ffmpeg_handler.ffmpeg_path
         elif ffmpeg_path is not None:
@@ -32,11 +40,33 @@ class VideoEncoder:
             # Try to get from installer
             try:
                 from .ffmpeg_handler import FFmpegHandler
-                handler = FFmpegHandler()
-                self.ffmpeg_path = handler.ffmpeg_path
+                self.ffmpeg_handler = FFmpegHandler()
+                self.ffmpeg_path = self.ffmpeg_handler.ffmpeg_path
             except Exception:
                 self.ffmpeg_path = "ffmpeg"
     
+    def _audio_args(
+        self,
+        audio_path: Optional[Path],
+        output_path: Path,
+        input_index: int,
+        all_tracks: bool
+    ) -> Tuple[List[str], List[str]]:
+        """Input options and output options that carry audio over from audio_path."""
+        if not audio_path or not Path(audio_path).exists():
+            return [], []
+        
+        if self.ffmpeg_handler is None:
+            from .ffmpeg_handler import FFmpegHandler
+            self.ffmpeg_handler = FFmpegHandler(self.ffmpeg_path)
+        
+        mux_args = self.ffmpeg_handler.stream_mux_args(
+            Path(audio_path), output_path, input_index=input_index, all_tracks=all_tracks
+        )
+        if not mux_args:
+            return [], []
+        return ["-i", str(audio_path)], mux_args + ["-shortest"]
+    
     def encode_from_frames(
         self,
         frame_dir: Path,
@@ -46,7 +76,11 @@ class VideoEncoder:
         codec: str = "libx264",
         crf: int = 18,
         preset: str = "medium",
-        audio_path: Optional[Path] = None
+        audio_path: Optional[Path] = None,
+        pix_fmt: str = "yuv420p",
+        start_number: int = 1,
+        intermediate_format: Optional[str] = None,
+        all_tracks: bool = False
     ) -> None:
         """
         Encode video from frames.
@@ -59,39 +93,46 @@ class VideoEncoder:
             codec: Video codec to use
             crf: Constant Rate Factor (0-51, lower = better quality)
             preset: Encoding preset (ultrafast, fast, medium, slow, veryslow)
-            audio_path: Optional audio file to include
+            audio_path: File whose audio is muxed in, usually the original
+                input; streams are copied unless the container needs a
+                transcode (see FFmpegHandler.stream_mux_args)
+            pix_fmt: Output pixel format (see PIXEL_FORMATS); 16-bit
+                frames are needed for 10-bit output
+            start_number: Number of the first frame to encode
+            intermediate_format: Frame image format; overrides the
+                extension of frame_pattern (see intermediate_format)
+            all_tracks: Keep all audio and subtitle tracks of audio_path
         """
         output_path.parent.mkdir(parents=True, exist_ok=True)
         
+        if intermediate_format is not None:
+            from .intermediate_format import get_intermediate_format
+            frame_pattern = get_intermediate_format(intermediate_format, frame_dir).pattern
+        
         # Build FFmpeg command
         input_pattern = frame_dir / frame_pattern
         
         cmd = [
             self.ffmpeg_path,
             "-framerate", str(fps),
+            "-start_number", str(start_number),
             "-i", str(input_pattern)
         ]
         
-        # Add audio input if provided
-        if audio_path and audio_path.exists():
-            cmd.extend(["-i", str(audio_path)])
+        # Audio input and its stream mapping, if provided
+        audio_inputs, audio_outputs = self._audio_args(audio_path, output_path, 1, all_tracks)
+        cmd.extend(audio_inputs)
+        if audio_outputs:
+            cmd.extend(["-map", "0:v:0"] + audio_outputs)
         
-        # Now add output options (after all inputs)
+        # Video output options
         cmd.extend([
             "-c:v", codec,
             "-crf", str(crf),
             "-preset", preset,
-            "-pix_fmt", "yuv420p"
+            "-pix_fmt", pix_fmt
         ])
         
-        # Add audio encoding options if audio is present
-        if audio_path and audio_path.exists():
-            cmd.extend([
-                "-c:a", "aac",
-                "-b:a", "192k",
-                "-shortest"  # Match shortest stream
-            ])
-        
         cmd.extend([
             "-hide_banner",
             "-loglevel", "error",
@@ -100,7 +141,7 @@ class VideoEncoder:
         ])
         
         logger.info(f"Encoding video: {output_path.name}")
-        logger.info(f"Settings: {codec}, CRF={crf}, preset={preset}, FPS={fps}")
+        logger.info(f"Settings: {codec}, {pix_fmt}, CRF={crf}, preset={preset}, FPS={fps}")
         logger.info(f"FFmpeg command: {' '.join(cmd)}")
         
         try:
@@ -131,7 +172,8 @@ class VideoEncoder:
         codec: str = "libx264",
         crf: int = 18,
         preset: str = "medium",
-        audio_path: Optional[Path] = None
+        audio_path: Optional[Path] = None,
+        all_tracks: bool = False
     ) -> None:
         """
         Encode stereo video from separate left/right frame directories.
@@ -146,7 +188,8 @@ class VideoEncoder:
             codec: Video codec
             crf: Constant Rate Factor
             preset: Encoding preset
-            audio_path: Optional audio file
+            audio_path: File whose audio is muxed in (see encode_from_frames)
+            all_tracks: Keep all audio and subtitle tracks of audio_path
         """
         output_path.parent.mkdir(parents=True, exist_ok=True)
         
@@ -171,26 +214,29 @@ class VideoEncoder:
             "-framerate", str(fps),
             "-i", str(left_pattern),
             "-framerate", str(fps),
-            "-i", str(right_pattern),
-            "-filter_complex", filter_complex,
+            "-i", str(right_pattern)
+        ]
+        
+        # Audio goes in as the third input
+        audio_inputs, audio_outputs = self._audio_args(audio_path, output_path, 2, all_tracks)
+        cmd.extend(audio_inputs)
+        if audio_outputs:
+            filter_complex += "[v]"
+        
+        cmd.extend(["-filter_complex", filter_complex])
+        if audio_outputs:
+            cmd.extend(["-map", "[v]"] + audio_outputs)
+        
+        cmd.extend([
             "-c:v", codec,
             "-crf", str(crf),
             "-preset", preset,
             "-pix_fmt", "yuv420p",
             "-hide_banner",
             "-loglevel", "error",
-            "-stats"
-        ]
-        
-        if audio_path and audio_path.exists():
-            cmd.extend([
-                "-i", str(audio_path),
-                "-c:a", "aac",
-                "-b:a", "192k",
-                "-shortest"
-            ])
-        
-        cmd.extend(["-y", str(output_path)])
+            "-stats",
+            "-y", str(output_path)
+        ])
         
         logger.info(f"Encoding stereo video: {output_format}")
         
@@ -208,4 +254,22 @@ class VideoEncoder:
         except subprocess.CalledProcessError as e:
             logger.error(f"Stereo video encoding failed: {e}")
             raise
-
+    
+    @staticmethod
+    def write_metadata_sidecar(output_path: Path, metadata: Dict[str, Any]) -> Path:
+        """
+        Write a JSON metadata sidecar next to an output video.
+        
+        Args:
+            output_path: Path of the encoded video
+            metadata: JSON-serializable metadata (e.g. SBSComposer.rgbd_metadata)
+            
+        Returns:
+            Path to the sidecar file (same name, .json extension)
+        """
+        sidecar_path = Path(output_path).with_suffix(".json")
+        with open(sidecar_path, "w") as f:
+            json.dump(metadata, f, indent=2)
+        
+        logger.info(f"Metadata sidecar written: {sidecar_path}")
+        return sidecar_path
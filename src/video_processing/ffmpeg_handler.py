@@ -6,25 +6,64 @@ Includes frame extraction, video encoding, and audio handling.
 """
 
 import subprocess
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Iterable
 import logging
 import json
 import re
+import numpy as np
+
+from .probe_cache import ProbeCache
+from .scene_index import SceneIndex
+from .seek_index import SeekIndex
 
 logger = logging.getLogger(__name__)
 
+# What each output container can take without re-encoding: audio and
+# subtitle codecs that are stream-copied (None = any), the single transcode
+# for other audio, and the codec text subtitles are converted to
+_MP4_STREAMS = {
+    "audio": {"aac", "mp3", "ac3", "eac3", "alac"},
+    "subtitle": {"mov_text"},
+    "audio_fallback": ("aac", "192k"),
+    "text_subtitle": "mov_text",
+}
+CONTAINER_STREAMS = {
+    ".mp4": _MP4_STREAMS,
+    ".m4v": _MP4_STREAMS,
+    ".mov": dict(_MP4_STREAMS, audio=_MP4_STREAMS["audio"] | {"pcm_s16le", "pcm_s24le"}),
+    ".mkv": {"audio": None, "subtitle": None, "audio_fallback": ("aac", "192k"), "text_subtitle": None},
+    ".webm": {
+        "audio": {"opus", "vorbis"},
+        "subtitle": {"webvtt"},
+        "audio_fallback": ("libopus", "160k"),
+        "text_subtitle": "webvtt",
+    },
+    ".avi": {
+        "audio": {"mp3", "ac3", "pcm_s16le"},
+        "subtitle": set(),
+        "audio_fallback": ("libmp3lame", "192k"),
+        "text_subtitle": None,
+    },
+}
+
+TEXT_SUBTITLE_CODECS = {"subrip", "srt", "ass", "ssa", "webvtt", "mov_text", "text"}
+
 
 class FFmpegHandler:
     """Main class for FFmpeg operations."""
     
-    def __init__(self, ffmpeg_path: Optional[str] = None):
+    def __init__(self, ffmpeg_path: Optional[str] = None, probe_cache: Optional[ProbeCache] = None):
         """
         Initialize FFmpeg handler.
         
         Args:
             ffmpeg_path: Path to FFmpeg executable (None = auto-detect/install)
+            probe_cache: Cache for ffprobe results (None = shared per-user cache)
         """
+        self.probe_cache = probe_cache if probe_cache is not None else ProbeCache.default()
+        
         if ffmpeg_path is None:
             # Try to find FFmpeg in PATH or common locations first (prioritize Homebrew)
             self.ffmpeg_path = self._find_ffmpeg()
@@ -114,7 +153,7 @@ class FFmpegHandler:
             version_line = result.stdout.split('\n')[0]
             logger.info(f"FFmpeg verified: {version_line}")
             return True
-            
+        
         except (subprocess.TimeoutExpired, FileNotFoundError, RuntimeError) as e:
             logger.error(f"FFmpeg verification failed: {e}")
             
@@ -167,8 +206,11 @@ class FFmpegHandler:
         self,
         video_path: Path,
         output_dir: Path,
-        frame_pattern: str = "frame_%06d.png",
-        fps: Optional[float] = None
+        frame_pattern: Optional[str] = None,
+        fps: Optional[float] = None,
+        start_time: Optional[float] = None,
+        frame_count: Optional[int] = None,
+        intermediate_format: str = "png"
     ) -> int:
         """
         Extract frames from video.
@@ -176,29 +218,41 @@ class FFmpegHandler:
         Args:
             video_path: Path to input video
             output_dir: Directory for output frames
-            frame_pattern: Naming pattern for frames
+            frame_pattern: Naming pattern for frames (default:
+                frame_%06d with the intermediate format's extension)
             fps: Optional FPS for frame extraction (None = extract all)
-            
+            start_time: Seek here before decoding (frame-accurate; fast
+                when it is just before a keyframe)
+            frame_count: Stop after this many frames (None = to the end)
+            intermediate_format: Frame image format (png, png_fast, bmp,
+                jpg, or auto; see intermediate_format)
+        
         Returns:
             Number of frames extracted
         """
+        from .intermediate_format import get_intermediate_format
+        
         output_dir.mkdir(parents=True, exist_ok=True)
+        image_format = get_intermediate_format(intermediate_format, output_dir)
+        frame_pattern = frame_pattern or image_format.pattern
         output_path = output_dir / frame_pattern
         
-        cmd = [
-            self.ffmpeg_path,
+        cmd = [self.ffmpeg_path]
+        if start_time:
+            cmd.extend(["-ss", f"{start_time:.6f}"])
+        cmd.extend([
             "-i", str(video_path),
             "-hide_banner",
             "-loglevel", "error"
-        ]
+        ])
         
         if fps is not None:
             cmd.extend(["-vf", f"fps={fps}"])
+        if frame_count is not None:
+            cmd.extend(["-frames:v", str(frame_count)])
         
-        cmd.extend([
-            "-q:v", "2",  # High quality
-            str(output_path)
-        ])
+        cmd.extend(image_format.ffmpeg_args)
+        cmd.append(str(output_path))
         
         logger.info(f"Extracting frames from {video_path.name}...")
         
@@ -206,10 +260,10 @@ class FFmpegHandler:
             subprocess.run(cmd, check=True, capture_output=True)
             
             # Count extracted frames
-            frame_count = len(list(output_dir.glob("frame_*.png")))
+            frame_count = len(list(output_dir.glob("frame_*" + Path(frame_pattern).suffix)))
             logger.info(f"Extracted {frame_count} frames")
             return frame_count
-            
+        
         except subprocess.CalledProcessError as e:
             logger.error(f"Frame extraction failed: {e.stderr.decode()}")
             raise
@@ -218,12 +272,76 @@ class FFmpegHandler:
         """
         Get video metadata.
         
+        Results are cached by path, size and modification time, so probing
+        the same unchanged file again does not start ffprobe.
+        
         Args:
             video_path: Path to video file
-            
+        
         Returns:
             Dictionary with video information
         """
+        info = self.probe_cache.get(video_path, "video_info")
+        if info is None:
+            info = self._probe_video_info(video_path)
+            self.probe_cache.put(video_path, "video_info", info)
+            logger.info(f"Video info: {info['width']}x{info['height']} @ {info['fps']:.2f} fps")
+        
+        return dict(info)
+    
+    def probe_many(
+        self,
+        video_paths: Iterable[Path],
+        max_workers: int = 4
+    ) -> Dict[Path, Optional[Dict[str, Any]]]:
+        """
+        Get metadata of many videos, running ffprobe concurrently.
+        
+        Cached files are answered without ffprobe; the disk cache is
+        written once at the end.
+        
+        Args:
+            video_paths: Paths to video files
+            max_workers: Concurrent ffprobe processes
+        
+        Returns:
+            {path: video information, or None if the file could not be probed}
+        """
+        results: Dict[Path, Optional[Dict[str, Any]]] = {}
+        pending = []
+        for path in video_paths:
+            path = Path(path)
+            try:
+                info = self.probe_cache.get(path, "video_info")
+            except OSError as e:
+                logger.warning(f"Cannot probe {path}: {e}")
+                results[path] = None
+                continue
+            
+            if info is not None:
+                results[path] = dict(info)
+            else:
+                pending.append(path)
+        
+        def probe(path: Path) -> Optional[Dict[str, Any]]:
+            try:
+                info = self._probe_video_info(path)
+            except (subprocess.CalledProcessError, ValueError, KeyError, OSError) as e:
+                logger.warning(f"Cannot probe {path}: {e}")
+                return None
+            self.probe_cache.put(path, "video_info", info, save=False)
+            return dict(info)
+        
+        if pending:
+            with ThreadPoolExecutor(max_workers=max(1, max_workers)) as pool:
+                for path, info in zip(pending, pool.map(probe, pending)):
+                    results[path] = info
+            self.probe_cache.save()
+        
+        return results
+    
+    def _probe_video_info(self, video_path: Path) -> Dict[str, Any]:
+        """Run ffprobe and parse the video metadata (uncached)."""
         cmd = [
             self.ffprobe_path,
             "-v", "quiet",
@@ -269,12 +387,308 @@ class FFmpegHandler:
                 "frame_count": int(video_stream.get("nb_frames", 0))
             }
             
-            logger.info(f"Video info: {info['width']}x{info['height']} @ {info['fps']:.2f} fps")
             return info
-            
+        
         except subprocess.CalledProcessError as e:
             logger.error(f"Failed to get video info: {e}")
             raise
+    
+    def get_keyframe_times(self, video_path: Path) -> List[float]:
+        """
+        Get the timestamps of the video keyframes.
+        
+        Args:
+            video_path: Path to video file
+        
+        Returns:
+            Sorted keyframe times in seconds
+        """
+        return self.get_seek_index(video_path).keyframe_times
+    
+    def get_seek_index(self, video_path: Path) -> SeekIndex:
+        """
+        Get the keyframe index of the first video stream.
+        
+        Reads packet timestamps and flags in one pass, without decoding,
+        and caches the result by path, size and modification time.
+        
+        Args:
+            video_path: Path to video file
+        
+        Returns:
+            Seek index
+        """
+        data = self.probe_cache.get(video_path, "seek_index")
+        if data is not None:
+            return SeekIndex.from_dict(data)
+        
+        cmd = [
+            self.ffprobe_path,
+            "-v", "error",
+            "-select_streams", "v:0",
+            "-show_entries", "packet=pts_time,flags",
+            "-of", "csv=p=0",
+            str(video_path)
+        ]
+        
+        try:
+            result = subprocess.run(cmd, check=True, capture_output=True, text=True)
+        except subprocess.CalledProcessError as e:
+            logger.error(f"Failed to read keyframes: {e}")
+            raise
+        
+        packets = []
+        for line in result.stdout.splitlines():
+            fields = line.strip().split(",")
+            if len(fields) >= 2 and fields[0] != "N/A":
+                packets.append((float(fields[0]), fields[1].startswith("K")))
+        
+        index = SeekIndex.from_packets(packets)
+        self.probe_cache.put(video_path, "seek_index", index.to_dict())
+        logger.info(f"Indexed {Path(video_path).name}: {index}")
+        return index
+    
+    def get_scene_index(self, video_path: Path, threshold: float = 0.3) -> SceneIndex:
+        """
+        Get the shot boundaries of the video.
+        
+        Scores every frame with FFmpeg's scene change detection in one
+        decode scaled down to 160 pixels wide, and caches the scores by
+        path, size and modification time, so later calls with any
+        threshold down to MIN_SCENE_SCORE need no decode.
+        
+        Args:
+            video_path: Path to video file
+            threshold: Scene score (0-1) above which a frame starts a new shot
+        
+        Returns:
+            Scene index
+        """
+        data = self.probe_cache.get(video_path, "scene_index")
+        if data is not None:
+            return SceneIndex.from_dict(data, threshold)
+        
+        cmd = [
+            self.ffmpeg_path,
+            "-hide_banner", "-loglevel", "error",
+            "-i", str(video_path),
+            "-an", "-sn",
+            "-vf", "scale=160:-2:flags=area,select=gte(scene\\,0),"
+                   "metadata=print:key=lavfi.scene_score:file=-",
+            "-f", "null", "-"
+        ]
+        
+        try:
+            result = subprocess.run(cmd, check=True, capture_output=True, text=True)
+        except subprocess.CalledProcessError as e:
+            logger.error(f"Failed to detect scenes: {e.stderr}")
+            raise
+        
+        # "frame:N pts:... pts_time:..." followed by "lavfi.scene_score=S"
+        scores = []
+        frame = None
+        for line in result.stdout.splitlines():
+            if line.startswith("frame:"):
+                frame = int(line.split()[0][len("frame:"):])
+            elif line.startswith("lavfi.scene_score=") and frame is not None:
+                scores.append((frame, float(line.split("=", 1)[1])))
+        
+        index = SceneIndex.from_scores(scores, threshold)
+        self.probe_cache.put(video_path, "scene_index", index.to_dict())
+        logger.info(f"Scene index of {Path(video_path).name}: {index}")
+        return index
+    
+    def read_frame(self, video_path: Path, frame_number: int) -> np.ndarray:
+        """
+        Decode a single frame by number.
+        
+        Seeks to the keyframe before the frame (see get_seek_index) and
+        decodes forward from there, so the cost is bounded by the keyframe
+        interval rather than the frame's position in the file.
+        
+        Args:
+            video_path: Path to video file
+            frame_number: Frame number (0-based)
+        
+        Returns:
+            Frame as a BGR uint8 image
+        """
+        info = self.get_video_info(video_path)
+        index = self.get_seek_index(video_path)
+        key_time, key_frame = index.keyframe_before(frame_number)
+        
+        cmd = [self.ffmpeg_path, "-hide_banner", "-loglevel", "error"]
+        if key_frame > 0:
+            # Seek (by stream timestamp) to half a frame after the keyframe,
+            # without dropping frames before the target: decoding starts at
+            # the keyframe, which is frame 0 of the select filter
+            seek_time = key_time + 0.5 / info["fps"]
+            cmd.extend(["-noaccurate_seek", "-seek_timestamp", "1", "-ss", f"{seek_time:.6f}"])
+        cmd.extend([
+            "-i", str(video_path),
+            "-an", "-sn",
+            "-vf", f"select=eq(n\\,{frame_number - key_frame})",
+            "-frames:v", "1",
+            "-f", "rawvideo",
+            "-pix_fmt", "bgr24",
+            "-"
+        ])
+        
+        try:
+            result = subprocess.run(cmd, check=True, capture_output=True)
+        except subprocess.CalledProcessError as e:
+            logger.error(f"Failed to read frame {frame_number}: {e.stderr.decode()}")
+            raise
+        
+        width, height = info["width"], info["height"]
+        if len(result.stdout) < width * height * 3:
+            raise ValueError(f"Could not decode frame {frame_number} of {video_path}")
+        
+        return np.frombuffer(result.stdout[:width * height * 3], np.uint8).reshape(height, width, 3)
+    
+    def get_stream_codecs(self, media_path: Path) -> Dict[str, List[str]]:
+        """
+        Get the codecs of the audio and subtitle streams (cached).
+        
+        Args:
+            media_path: Video or audio file
+        
+        Returns:
+            {"audio": [codec, ...], "subtitle": [codec, ...]} in stream order
+        """
+        streams = self.probe_cache.get(media_path, "streams")
+        if streams is not None:
+            return {kind: list(codecs) for kind, codecs in streams.items()}
+        
+        cmd = [
+            self.ffprobe_path,
+            "-v", "quiet",
+            "-print_format", "json",
+            "-show_entries", "stream=codec_type,codec_name",
+            str(media_path)
+        ]
+        
+        try:
+            result = subprocess.run(cmd, check=True, capture_output=True, text=True)
+        except subprocess.CalledProcessError as e:
+            logger.error(f"Failed to read streams: {e}")
+            raise
+        
+        streams = {"audio": [], "subtitle": []}
+        for stream in json.loads(result.stdout).get("streams", []):
+            if stream.get("codec_type") in streams:
+                streams[stream["codec_type"]].append(stream.get("codec_name", "unknown"))
+        
+        self.probe_cache.put(media_path, "streams", streams)
+        return {kind: list(codecs) for kind, codecs in streams.items()}
+    
+    def stream_mux_args(
+        self,
+        source_path: Path,
+        output_path: Path,
+        input_index: int = 1,
+        all_tracks: bool = False
+    ) -> List[str]:
+        """
+        Build the options that carry audio (and subtitles) over from a source.
+        
+        Streams are mapped straight from ``source_path`` (usually the
+        original input) and copied when the output container can hold their
+        codec; only the others are transcoded, once. Subtitles that cannot
+        be copied or converted to a text format the container takes are
+        dropped with a warning.
+        
+        Args:
+            source_path: File the streams are taken from
+            output_path: Output file (its extension selects the container)
+            input_index: Index of ``source_path`` among the command's inputs
+            all_tracks: Keep every audio and subtitle track, not just the
+                first audio track
+        
+        Returns:
+            FFmpeg output options (empty if the source has no audio)
+        """
+        streams = self.get_stream_codecs(source_path)
+        rules = CONTAINER_STREAMS.get(Path(output_path).suffix.lower(), _MP4_STREAMS)
+        
+        args = []
+        audio_codecs = streams["audio"] if all_tracks else streams["audio"][:1]
+        for i, codec in enumerate(audio_codecs):
+            args.extend(["-map", f"{input_index}:a:{i}"])
+            if rules["audio"] is None or codec in rules["audio"]:
+                args.extend([f"-c:a:{i}", "copy"])
+            else:
+                fallback_codec, bitrate = rules["audio_fallback"]
+                logger.info(f"Audio track {i} ({codec}) cannot be copied, transcoding to {fallback_codec}")
+                args.extend([f"-c:a:{i}", fallback_codec, f"-b:a:{i}", bitrate])
+        
+        if all_tracks:
+            kept = 0
+            for i, codec in enumerate(streams["subtitle"]):
+                if rules["subtitle"] is None or codec in rules["subtitle"]:
+                    subtitle_codec = "copy"
+                elif codec in TEXT_SUBTITLE_CODECS and rules["text_subtitle"]:
+                    subtitle_codec = rules["text_subtitle"]
+                else:
+                    logger.warning(f"Dropping subtitle track {i} ({codec}): not supported by {Path(output_path).suffix}")
+                    continue
+                args.extend(["-map", f"{input_index}:s:{i}", f"-c:s:{kept}", subtitle_codec])
+                kept += 1
+        
+        return args
+    
+    def concat_segments(
+        self,
+        segment_paths: List[Path],
+        output_path: Path,
+        audio_source: Optional[Path] = None,
+        all_tracks: bool = False
+    ) -> None:
+        """
+        Join encoded segments with the concat demuxer (no re-encoding).
+        
+        Segments must share codec settings. Audio is taken once from
+        ``audio_source`` (e.g. the original input) for the whole output,
+        stream-copied where possible (see stream_mux_args).
+        
+        Args:
+            segment_paths: Segment files in playback order
+            output_path: Path for the joined video
+            audio_source: File whose audio tracks are muxed in (optional)
+            all_tracks: Keep all audio and subtitle tracks of audio_source
+        """
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        list_path = output_path.parent / f".{output_path.stem}_segments.txt"
+        with open(list_path, "w") as f:
+            for path in segment_paths:
+                escaped = str(Path(path).resolve()).replace("'", "'\\''")
+                f.write(f"file '{escaped}'\n")
+        
+        cmd = [
+            self.ffmpeg_path,
+            "-f", "concat",
+            "-safe", "0",
+            "-i", str(list_path)
+        ]
+        if audio_source is not None:
+            cmd.extend(["-i", str(audio_source), "-map", "0:v:0"])
+            cmd.extend(self.stream_mux_args(audio_source, output_path, all_tracks=all_tracks))
+        cmd.extend([
+            "-c:v", "copy",
+            "-hide_banner",
+            "-loglevel", "error",
+            "-y", str(output_path)
+        ])
+        
+        logger.info(f"Joining {len(segment_paths)} segments into {output_path.name}")
+        
+        try:
+            subprocess.run(cmd, check=True, capture_output=True)
+        except subprocess.CalledProcessError as e:
+            logger.error(f"Segment concat failed: {e.stderr.decode()}")
+            raise
+        finally:
+            list_path.unlink(missing_ok=True)
 
 
 
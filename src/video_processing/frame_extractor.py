@@ -5,6 +5,7 @@ High-level frame extraction with progress tracking
 import os
 from pathlib import Path
 from typing import Callable, Optional
+import cv2
 from .ffmpeg_handler import FFmpegHandler
 
 
@@ -66,7 +67,10 @@ class FrameExtractor:
         threshold: float = 0.3
     ) -> int:
         """
-        Extract only key frames (scene changes)
+        Extract only key frames (the first frame of each shot)
+        
+        Shots come from the video's scene index (see
+        FFmpegHandler.get_scene_index), so repeated calls do not rescan it.
         
         Args:
             video_path: Input video path
@@ -78,18 +82,12 @@ class FrameExtractor:
         """
         os.makedirs(output_dir, exist_ok=True)
         
-        # FFmpeg scene detection
-        cmd_args = [
-            '-i', video_path,
-            '-vf', f'select=gt(scene\\,{threshold})',
-            '-vsync', 'vfr',
-            os.path.join(output_dir, 'keyframe_%06d.png')
-        ]
-        
-        # TODO: Execute FFmpeg command
-        print(f"Would extract key frames with threshold {threshold}")
+        scene_index = self.ffmpeg.get_scene_index(video_path, threshold)
+        for i, (start, _) in enumerate(scene_index.shots, 1):
+            frame = self.ffmpeg.read_frame(video_path, start)
+            cv2.imwrite(os.path.join(output_dir, f'keyframe_{i:06d}.png'), frame)
         
-        return 0
+        return len(scene_index)
     
     def estimate_extraction_time(self, video_path: str) -> float:
         """
@@ -9,18 +9,44 @@ from typing import List, Dict, Optional
 import numpy as np
 import cv2
 
+from ..ai_core.postprocessing import dequantize_depth, quantize_depth
+from .frame_store import FrameStore
+from .intermediate_format import get_intermediate_format
+
+# Storage backends: one image/.npy file per frame, or one FrameStore per stream
+STORAGE_BACKENDS = ('files', 'store')
+
 
 class FrameManager:
     """Manage video frames and associated data"""
     
-    def __init__(self, work_dir: str):
+    def __init__(
+        self,
+        work_dir: str,
+        storage: str = 'files',
+        frame_count: Optional[int] = None,
+        intermediate_format: str = 'png'
+    ):
         """
         Initialize frame manager
         
         Args:
             work_dir: Working directory for frame storage
+            storage: 'files' (PNG/.npy per frame) or 'store' (one
+                memory-mapped FrameStore per stream, O(1) status counters)
+            frame_count: Number of frames; required by the 'store' backend,
+                whose files are sized when the first record is written
+            intermediate_format: Image format of frame and view files
+                ('files' storage; png, png_fast, bmp, jpg or auto)
         """
+        if storage not in STORAGE_BACKENDS:
+            raise ValueError(f"Unknown frame storage: {storage}")
+        if storage == 'store' and not frame_count:
+            raise ValueError("The 'store' backend needs the frame count")
+        
         self.work_dir = Path(work_dir)
+        self.storage = storage
+        self.frame_count = frame_count
         self.frames_dir = self.work_dir / 'frames'
         self.depth_dir = self.work_dir / 'depth_maps'
         self.left_dir = self.work_dir / 'left_views'
@@ -28,22 +54,71 @@ class FrameManager:
         self.metadata_file = self.work_dir / 'metadata.json'
         
         # Create directories
-        for directory in [self.frames_dir, self.depth_dir, self.left_dir, self.right_dir]:
-            directory.mkdir(parents=True, exist_ok=True)
+        self.image_format = None
+        if storage == 'files':
+            self.image_format = get_intermediate_format(intermediate_format, self.work_dir)
+            for directory in [self.frames_dir, self.depth_dir, self.left_dir, self.right_dir]:
+                directory.mkdir(parents=True, exist_ok=True)
+        else:
+            self.work_dir.mkdir(parents=True, exist_ok=True)
+        
+        # Stream stores, reopened if an earlier run left them behind
+        self._stores: Dict[str, FrameStore] = {}
+        if storage == 'store':
+            for stream in ('frames', 'depth', 'left', 'right'):
+                path = self._store_path(stream)
+                if path.exists():
+                    self._stores[stream] = FrameStore.open(path)
+    
+    def _store_path(self, stream: str) -> Path:
+        """Container file of a stream"""
+        return self.work_dir / f'{stream}.fstore'
+    
+    def _store(self, stream: str, like: np.ndarray) -> FrameStore:
+        """Get a stream's store, creating it for records like ``like``"""
+        store = self._stores.get(stream)
+        if store is None:
+            store = FrameStore.create(
+                self._store_path(stream), self.frame_count, like.shape, like.dtype
+            )
+            self._stores[stream] = store
+        return store
+    
+    def _stored_count(self, stream: str) -> int:
+        """Number of records written to a stream"""
+        store = self._stores.get(stream)
+        return store.count if store is not None else 0
     
     def get_frame_list(self) -> List[Path]:
         """
-        Get list of all frames
+        Get list of all frame files ('files' storage)
         
         Returns:
             Sorted list of frame paths
         """
-        frames = sorted(self.frames_dir.glob('frame_*.png'))
+        frames = sorted(self.frames_dir.glob(self.image_format.glob))
         return frames
     
     def get_frame_count(self) -> int:
         """Get total number of frames"""
-        return len(list(self.frames_dir.glob('frame_*.png')))
+        if self.storage == 'store':
+            return self._stored_count('frames')
+        return len(list(self.frames_dir.glob(self.image_format.glob)))
+    
+    def save_frame(self, frame_index: int, frame: np.ndarray):
+        """
+        Save a frame
+        
+        Args:
+            frame_index: Frame index (0-based)
+            frame: RGB frame
+        """
+        if self.storage == 'store':
+            self._store('frames', frame).write(frame_index, frame)
+            return
+        
+        frame_path = self.frames_dir / f'frame_{frame_index:06d}{self.image_format.extension}'
+        self.image_format.write(frame_path, cv2.cvtColor(frame, cv2.COLOR_RGB2BGR))
     
     def load_frame(self, frame_index: int) -> Optional[np.ndarray]:
         """
@@ -55,7 +130,11 @@ class FrameManager:
         Returns:
             Frame image or None if not found
         """
-        frame_path = self.frames_dir / f'frame_{frame_index:06d}.png'
+        if self.storage == 'store':
+            store = self._stores.get('frames')
+            return store.read(frame_index) if store is not None else None
+        
+        frame_path = self.frames_dir / f'frame_{frame_index:06d}{self.image_format.extension}'
         
         if not frame_path.exists():
             return None
@@ -65,33 +144,60 @@ class FrameManager:
         
         return frame
     
-    def save_depth_map(self, frame_index: int, depth_map: np.ndarray):
+    def save_depth_map(
+        self,
+        frame_index: int,
+        depth_map: np.ndarray,
+        dtype: Optional[str] = None
+    ):
         """
         Save depth map for a frame
         
         Args:
             frame_index: Frame index
-            depth_map: Depth map array
+            depth_map: Depth map array (normalized to [0, 1])
+            dtype: Store as this dtype ('float32', 'float16', 'uint16');
+                'uint16' is half the size of float32. Default: as given.
         """
+        if dtype is not None:
+            depth_map = quantize_depth(depth_map, dtype)
+        
+        if self.storage == 'store':
+            self._store('depth', depth_map).write(frame_index, depth_map)
+            return
+        
         depth_path = self.depth_dir / f'depth_{frame_index:06d}.npy'
         np.save(depth_path, depth_map)
     
-    def load_depth_map(self, frame_index: int) -> Optional[np.ndarray]:
+    def load_depth_map(
+        self,
+        frame_index: int,
+        as_float: bool = False
+    ) -> Optional[np.ndarray]:
         """
         Load depth map for a frame
         
         Args:
             frame_index: Frame index
+            as_float: Convert compact maps to float32 in [0, 1]
         
         Returns:
-            Depth map or None
+            Depth map in its stored dtype (or float32), or None
         """
+        if self.storage == 'store':
+            store = self._stores.get('depth')
+            depth_map = store.read(frame_index) if store is not None else None
+            if depth_map is None:
+                return None
+            return dequantize_depth(depth_map) if as_float else depth_map
+        
         depth_path = self.depth_dir / f'depth_{frame_index:06d}.npy'
         
         if not depth_path.exists():
             return None
         
-        return np.load(depth_path)
+        depth_map = np.load(depth_path)
+        return dequantize_depth(depth_map) if as_float else depth_map
     
     def save_stereo_pair(
         self,
@@ -107,15 +213,21 @@ class FrameManager:
             left_view: Left eye view
             right_view: Right eye view
         """
-        left_path = self.left_dir / f'left_{frame_index:06d}.png'
-        right_path = self.right_dir / f'right_{frame_index:06d}.png'
+        if self.storage == 'store':
+            self._store('left', left_view).write(frame_index, left_view)
+            self._store('right', right_view).write(frame_index, right_view)
+            return
+        
+        extension = self.image_format.extension
+        left_path = self.left_dir / f'left_{frame_index:06d}{extension}'
+        right_path = self.right_dir / f'right_{frame_index:06d}{extension}'
         
         # Convert RGB to BGR for OpenCV
         left_bgr = cv2.cvtColor(left_view, cv2.COLOR_RGB2BGR)
         right_bgr = cv2.cvtColor(right_view, cv2.COLOR_RGB2BGR)
         
-        cv2.imwrite(str(left_path), left_bgr)
-        cv2.imwrite(str(right_path), right_bgr)
+        self.image_format.write(left_path, left_bgr)
+        self.image_format.write(right_path, right_bgr)
     
     def save_metadata(self, metadata: Dict):
         """
@@ -144,6 +256,7 @@ class FrameManager:
         """Clean up all temporary files"""
         import shutil
         
+        self.close()
         if self.work_dir.exists():
             shutil.rmtree(self.work_dir)
     
@@ -155,8 +268,12 @@ class FrameManager:
             Status dictionary
         """
         total_frames = self.get_frame_count()
-        depth_maps = len(list(self.depth_dir.glob('depth_*.npy')))
-        stereo_pairs = len(list(self.left_dir.glob('left_*.png')))
+        if self.storage == 'store':
+            depth_maps = self._stored_count('depth')
+            stereo_pairs = self._stored_count('left')
+        else:
+            depth_maps = len(list(self.depth_dir.glob('depth_*.npy')))
+            stereo_pairs = len(list(self.left_dir.glob(f'left_*{self.image_format.extension}')))
         
         return {
             'total_frames': total_frames,
@@ -164,3 +281,9 @@ class FrameManager:
             'stereo_pairs_generated': stereo_pairs,
             'progress': stereo_pairs / max(total_frames, 1),
         }
+    
+    def close(self):
+        """Flush and close the stream stores ('store' storage)"""
+        for store in self._stores.values():
+            store.close()
+        self._stores.clear()
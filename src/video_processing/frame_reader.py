@@ -0,0 +1,228 @@
+"""
+Frame Reader Module
+
+Streams decoded frames from FFmpeg at two resolutions at once: full
+resolution for rendering and composition, and the depth model's input
+resolution for inference, both produced by a single decode.
+"""
+
+from pathlib import Path
+from typing import Iterator, Optional, Tuple
+import logging
+import queue
+import subprocess
+import tempfile
+import threading
+import numpy as np
+
+from ..rendering.active_area import ActiveArea
+from .ffmpeg_handler import FFmpegHandler
+
+logger = logging.getLogger(__name__)
+
+
+def model_frame_size(width: int, height: int, input_size: int) -> Tuple[int, int]:
+    """
+    Size of the frames fed to the depth model.
+
+    The shorter side is scaled to the model's input size (like the MiDaS
+    transforms do), the aspect ratio is kept and frames are never
+    upscaled.
+
+    Args:
+        width: Picture width
+        height: Picture height
+        input_size: Model input size (shorter side)
+
+    Returns:
+        (width, height), both even
+    """
+    scale = min(1.0, input_size / min(width, height))
+    return max(2, round(width * scale / 2) * 2), max(2, round(height * scale / 2) * 2)
+
+
+class DualResolutionReader:
+    """
+    Iterates (full-resolution, model-resolution) RGB frame pairs of a video.
+
+    FFmpeg decodes each frame once and splits it: one branch stays at full
+    size, the other is cropped to the active area (if any) and scaled to
+    the model size. Both are stacked into a single raw frame, so the two
+    streams cannot drift apart, and a background thread reads ahead up to
+    ``prefetch`` frames while the caller renders.
+    """
+
+    def __init__(
+        self,
+        ffmpeg_handler: FFmpegHandler,
+        video_path: Path,
+        model_size: Tuple[int, int],
+        active_area: Optional[ActiveArea] = None,
+        start_time: Optional[float] = None,
+        frame_count: Optional[int] = None,
+        prefetch: int = 16
+    ):
+        """
+        Initialize reader.
+
+        Args:
+            ffmpeg_handler: FFmpeg handler
+            video_path: Path to video file
+            model_size: (width, height) of the model-resolution frames
+                (see model_frame_size)
+            active_area: Picture area inside black bars; model frames
+                cover only this area
+            start_time: Start time in seconds (None = beginning)
+            frame_count: Number of frames to read (None = to the end)
+            prefetch: Frames decoded ahead of the caller
+        """
+        self.ffmpeg = ffmpeg_handler
+        self.video_path = Path(video_path)
+        self.model_size = tuple(model_size)
+        self.active_area = active_area
+        self.start_time = start_time
+        self.frame_count = frame_count
+        self.prefetch = max(1, prefetch)
+
+        info = self.ffmpeg.get_video_info(self.video_path)
+        self.width = info["width"]
+        self.height = info["height"]
+        if self.model_size[0] > self.width:
+            raise ValueError(f"Model frames {self.model_size} wider than the video ({self.width})")
+
+        # Expected length, for progress (reading stops at the real end)
+        if frame_count is None:
+            total = info["frame_count"] or round(info["duration"] * info["fps"])
+            frame_count_estimate = total - round((start_time or 0.0) * info["fps"])
+        else:
+            frame_count_estimate = frame_count
+        self._length = max(0, frame_count_estimate)
+
+        self._process: Optional[subprocess.Popen] = None
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+    def __len__(self) -> int:
+        """Expected number of frames."""
+        return self._length
+
+    def _build_command(self) -> list:
+        """FFmpeg command writing stacked full/model frames to stdout."""
+        model_w, model_h = self.model_size
+        low = "[low]"
+        if self.active_area is not None:
+            area = self.active_area
+            h, w = area.shape
+            low += f"crop={w}:{h}:{area.left}:{area.top},"
+        filter_graph = (
+            f"[0:v]split=2[full][low];"
+            f"{low}scale={model_w}:{model_h}:flags=area,pad={self.width}:ih[model];"
+            f"[full][model]vstack=inputs=2[out]"
+        )
+
+        cmd = [self.ffmpeg.ffmpeg_path, "-hide_banner", "-loglevel", "error"]
+        if self.start_time is not None:
+            cmd.extend(["-ss", str(self.start_time)])
+        cmd.extend([
+            "-i", str(self.video_path),
+            "-filter_complex", filter_graph,
+            "-map", "[out]"
+        ])
+        if self.frame_count is not None:
+            cmd.extend(["-frames:v", str(self.frame_count)])
+        cmd.extend(["-f", "rawvideo", "-pix_fmt", "rgb24", "-"])
+        return cmd
+
+    def __iter__(self) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+        """
+        Decode the video.
+
+        Yields:
+            (full frame (H, W, 3), model frame (h, w, 3)), RGB uint8; the
+            model frame is a view into the same buffer
+        """
+        model_w, model_h = self.model_size
+        frame_bytes = self.width * (self.height + model_h) * 3
+        frames: "queue.Queue" = queue.Queue(maxsize=self.prefetch)
+        stderr = tempfile.TemporaryFile()
+
+        self._stop.clear()
+        self._process = subprocess.Popen(
+            self._build_command(), stdout=subprocess.PIPE, stderr=stderr, bufsize=frame_bytes
+        )
+        self._thread = threading.Thread(
+            target=self._read_frames, args=(self._process, frame_bytes, frames), daemon=True
+        )
+        self._thread.start()
+
+        count = 0
+        try:
+            while True:
+                buffer = frames.get()
+                if buffer is None:
+                    break
+                stacked = np.frombuffer(buffer, np.uint8).reshape(self.height + model_h, self.width, 3)
+                count += 1
+                yield stacked[:self.height], stacked[self.height:, :model_w]
+
+            # End of stream: let FFmpeg exit on its own to get its status
+            returncode = self._process.wait()
+            if returncode != 0 and count == 0:
+                stderr.seek(0)
+                message = stderr.read().decode(errors="replace").strip()
+                raise RuntimeError(f"Decoding {self.video_path.name} failed: {message}")
+            if returncode != 0:
+                logger.warning(f"Decoding {self.video_path.name} stopped early after {count} frames")
+            logger.debug(f"Read {count} frames from {self.video_path.name}")
+        finally:
+            self.close()
+            stderr.close()
+
+    def _read_frames(self, process: subprocess.Popen, frame_bytes: int, frames: "queue.Queue"):
+        """Reader thread: queue raw stacked frames until the stream ends."""
+        try:
+            while not self._stop.is_set():
+                buffer = bytearray(frame_bytes)
+                view = memoryview(buffer)
+                filled = 0
+                while filled < frame_bytes:
+                    n = process.stdout.readinto(view[filled:])
+                    if not n:
+                        break
+                    filled += n
+                if filled < frame_bytes:
+                    break
+
+                while not self._stop.is_set():
+                    try:
+                        frames.put(buffer, timeout=0.1)
+                        break
+                    except queue.Full:
+                        continue
+        finally:
+            # End marker, unless the consumer has stopped reading
+            while not self._stop.is_set():
+                try:
+                    frames.put(None, timeout=0.1)
+                    break
+                except queue.Full:
+                    continue
+
+    def close(self):
+        """Stop decoding and release the FFmpeg process."""
+        self._stop.set()
+        if self._process is not None and self._process.poll() is None:
+            self._process.kill()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        if self._process is not None:
+            self._process.stdout.close()
+            self._process.wait()
+            self._process = None
+
+    def __enter__(self) -> "DualResolutionReader":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
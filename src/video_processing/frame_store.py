@@ -0,0 +1,203 @@
+"""
+Frame Store
+One preallocated, memory-mapped file per stream of per-frame arrays
+(frames, depth maps, stereo views) instead of one image file per frame
+"""
+import json
+from pathlib import Path
+from typing import Optional, Tuple, Union
+import numpy as np
+
+
+class FrameStore:
+    """
+    Fixed-stride records of equally shaped arrays in a single file
+    
+    Layout: a JSON header padded to HEADER_SIZE bytes, one "written" flag
+    byte per record (padded to a page), then the records. The file is
+    created at full size (sparse, so disk blocks are only used as records
+    are written) and accessed through memory maps, so reading or writing
+    frame ``i`` is a copy at a fixed offset and the number of written
+    records is a counter, not a directory listing.
+    """
+    
+    MAGIC = 'frame_store'
+    VERSION = 1
+    HEADER_SIZE = 4096
+    
+    def __init__(
+        self,
+        path: Union[str, Path],
+        capacity: int,
+        shape: Tuple[int, ...],
+        dtype: Union[str, np.dtype],
+        readonly: bool = False
+    ):
+        """
+        Map an existing store file (see create and open)
+        
+        Args:
+            path: Store file
+            capacity: Number of records
+            shape: Shape of one record
+            dtype: Record dtype
+            readonly: Map read-only
+        """
+        self.path = Path(path)
+        self.capacity = capacity
+        self.shape = tuple(shape)
+        self.dtype = np.dtype(dtype)
+        self.readonly = readonly
+        
+        mode = 'r' if readonly else 'r+'
+        self._flags = np.memmap(
+            self.path, dtype=np.uint8, mode=mode,
+            offset=self.HEADER_SIZE, shape=(capacity,)
+        )
+        self._records = np.memmap(
+            self.path, dtype=self.dtype, mode=mode,
+            offset=self._records_offset(capacity), shape=(capacity,) + self.shape
+        )
+        
+        # Counted once when opened, then kept up to date on writes
+        self._count = int(np.count_nonzero(self._flags))
+    
+    @classmethod
+    def create(
+        cls,
+        path: Union[str, Path],
+        capacity: int,
+        shape: Tuple[int, ...],
+        dtype: Union[str, np.dtype]
+    ) -> 'FrameStore':
+        """
+        Create an empty store (replacing any existing file)
+        
+        Args:
+            path: Store file
+            capacity: Number of records (e.g. the video's frame count)
+            shape: Shape of one record, e.g. (H, W, 3) or (H, W)
+            dtype: Record dtype
+        
+        Returns:
+            Writable store
+        """
+        if capacity <= 0:
+            raise ValueError(f"Store capacity must be positive, got {capacity}")
+        
+        dtype = np.dtype(dtype)
+        header = json.dumps({
+            'magic': cls.MAGIC,
+            'version': cls.VERSION,
+            'capacity': capacity,
+            'shape': list(shape),
+            'dtype': dtype.str,
+        }).encode()
+        if len(header) >= cls.HEADER_SIZE:
+            raise ValueError(f"Record shape {shape} does not fit the store header")
+        
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        size = cls._records_offset(capacity) + capacity * int(np.prod(shape)) * dtype.itemsize
+        with open(path, 'wb') as f:
+            f.write(header.ljust(cls.HEADER_SIZE, b' '))
+            f.truncate(size)
+        
+        return cls(path, capacity, shape, dtype)
+    
+    @classmethod
+    def open(cls, path: Union[str, Path], readonly: bool = False) -> 'FrameStore':
+        """
+        Open an existing store
+        
+        Args:
+            path: Store file
+            readonly: Map read-only
+        
+        Returns:
+            Store with the records written so far
+        """
+        with open(path, 'rb') as f:
+            header = json.loads(f.read(cls.HEADER_SIZE).decode().rstrip())
+        
+        if header.get('magic') != cls.MAGIC or header.get('version') != cls.VERSION:
+            raise ValueError(f"Not a frame store: {path}")
+        
+        return cls(path, header['capacity'], tuple(header['shape']), header['dtype'], readonly)
+    
+    @classmethod
+    def _records_offset(cls, capacity: int) -> int:
+        """Byte offset of the first record (page-aligned after the flags)"""
+        flags_size = -(-capacity // cls.HEADER_SIZE) * cls.HEADER_SIZE
+        return cls.HEADER_SIZE + flags_size
+    
+    @property
+    def count(self) -> int:
+        """Number of written records"""
+        return self._count
+    
+    def __len__(self) -> int:
+        return self.capacity
+    
+    def __contains__(self, index: int) -> bool:
+        return 0 <= index < self.capacity and bool(self._flags[index])
+    
+    def write(self, index: int, array: np.ndarray):
+        """
+        Write a record
+        
+        Args:
+            index: Record index (0-based)
+            array: Array of the store's shape (cast to the store's dtype)
+        """
+        if not 0 <= index < self.capacity:
+            raise IndexError(f"Record {index} outside store of {self.capacity}")
+        if array.shape != self.shape:
+            raise ValueError(f"Record shape {array.shape} does not match store shape {self.shape}")
+        
+        self._records[index] = array
+        if not self._flags[index]:
+            self._flags[index] = 1
+            self._count += 1
+    
+    def read(self, index: int, copy: bool = True) -> Optional[np.ndarray]:
+        """
+        Read a record
+        
+        Args:
+            index: Record index (0-based)
+            copy: Return a copy instead of a view into the mapped file
+                (views are only valid until the store is closed)
+        
+        Returns:
+            Record, or None if it has not been written
+        """
+        if index not in self:
+            return None
+        
+        record = self._records[index]
+        return np.array(record) if copy else record
+    
+    def flush(self):
+        """Write mapped changes to disk"""
+        if not self.readonly:
+            self._records.flush()
+            self._flags.flush()
+    
+    def close(self):
+        """Flush and unmap the file"""
+        self.flush()
+        del self._records
+        del self._flags
+    
+    def __enter__(self) -> 'FrameStore':
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.close()
+    
+    def __repr__(self) -> str:
+        return (
+            f"FrameStore({self.path.name}, {self._count}/{self.capacity} records "
+            f"of {self.shape} {self.dtype})"
+        )
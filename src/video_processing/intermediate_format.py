@@ -0,0 +1,247 @@
+"""
+Intermediate Frame Format Module
+
+Image codec for frames that go through disk between pipeline stages
+(extraction, processed frames, save_intermediate), chosen per host by a
+quick benchmark of codec CPU time against disk bandwidth.
+"""
+
+from pathlib import Path
+from typing import Dict, List, Optional, Union
+import logging
+import os
+import tempfile
+import time
+import cv2
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+class IntermediateFormat:
+    """Image codec and settings for intermediate frame files."""
+
+    def __init__(
+        self,
+        name: str,
+        extension: str,
+        imwrite_params: List[int],
+        ffmpeg_args: List[str],
+        lossless: bool = True,
+        high_bit_depth: bool = False
+    ):
+        """
+        Initialize intermediate format.
+
+        Args:
+            name: Format name (see INTERMEDIATE_FORMATS)
+            extension: File extension, including the dot
+            imwrite_params: OpenCV imwrite parameters
+            ffmpeg_args: FFmpeg encoder options for extraction
+            lossless: Whether frames round-trip exactly
+            high_bit_depth: Whether 16-bit frames can be stored
+        """
+        self.name = name
+        self.extension = extension
+        self.imwrite_params = imwrite_params
+        self.ffmpeg_args = ffmpeg_args
+        self.lossless = lossless
+        self.high_bit_depth = high_bit_depth
+
+    @property
+    def pattern(self) -> str:
+        """FFmpeg image sequence pattern of numbered frames."""
+        return f"frame_%06d{self.extension}"
+
+    @property
+    def glob(self) -> str:
+        """Glob matching the numbered frames."""
+        return f"frame_*{self.extension}"
+
+    def for_dtype(self, dtype: np.dtype) -> "IntermediateFormat":
+        """Get this format, or lossless PNG if it cannot store ``dtype``."""
+        if np.dtype(dtype).itemsize > 1 and not self.high_bit_depth:
+            return INTERMEDIATE_FORMATS["png"]
+        return self
+
+    def write(self, path: Union[str, Path], image: np.ndarray) -> bool:
+        """
+        Write a BGR image with this format's settings.
+
+        Args:
+            path: Output file (should have this format's extension)
+            image: BGR image, uint8 (or uint16 if high_bit_depth)
+
+        Returns:
+            True if written
+        """
+        return cv2.imwrite(str(path), image, self.imwrite_params)
+
+    def __repr__(self) -> str:
+        return f"IntermediateFormat({self.name})"
+
+
+INTERMEDIATE_FORMATS: Dict[str, IntermediateFormat] = {
+    # OpenCV/FFmpeg default zlib settings
+    "png": IntermediateFormat("png", ".png", [], [], high_bit_depth=True),
+    # Lowest zlib level with a cheap filter: a bit larger, much faster
+    "png_fast": IntermediateFormat(
+        "png_fast", ".png",
+        [
+            cv2.IMWRITE_PNG_COMPRESSION, 1,
+            cv2.IMWRITE_PNG_FILTER, cv2.IMWRITE_PNG_FILTER_SUB,
+            cv2.IMWRITE_PNG_STRATEGY, cv2.IMWRITE_PNG_STRATEGY_RLE,
+        ],
+        ["-compression_level", "1", "-pred", "sub"],
+        high_bit_depth=True
+    ),
+    # Uncompressed: almost no CPU, 6 MB per 1080p frame
+    "bmp": IntermediateFormat("bmp", ".bmp", [], []),
+    # Lossy, for throwaway work only (never chosen automatically)
+    "jpg": IntermediateFormat(
+        "jpg", ".jpg", [cv2.IMWRITE_JPEG_QUALITY, 95], ["-q:v", "2"], lossless=False
+    ),
+}
+
+# Benchmark results per filesystem (device id)
+_auto_formats: Dict[int, str] = {}
+
+
+def get_intermediate_format(
+    name: str = "auto",
+    work_dir: Optional[Union[str, Path]] = None
+) -> IntermediateFormat:
+    """
+    Look up an intermediate format.
+
+    Args:
+        name: Format name, or 'auto' to pick the fastest lossless format
+            for ``work_dir`` (benchmarked once per filesystem)
+        work_dir: Directory the frames will be written to (for 'auto')
+
+    Returns:
+        Intermediate format
+    """
+    if name == "auto":
+        name = choose_intermediate_format(work_dir)
+    if name not in INTERMEDIATE_FORMATS:
+        raise ValueError(f"Unknown intermediate format: {name}")
+    return INTERMEDIATE_FORMATS[name]
+
+
+def intermediate_format_key(name: str = "auto") -> str:
+    """
+    Job setting of a requested intermediate format (see job_journal).
+
+    Lossless formats give the same output, so they share one value and
+    another benchmark result or an explicit png/bmp never restarts a job.
+
+    Args:
+        name: Format name or 'auto'
+
+    Returns:
+        'lossless', or the name of a lossy format
+    """
+    if name != "auto" and name not in INTERMEDIATE_FORMATS:
+        raise ValueError(f"Unknown intermediate format: {name}")
+    return "lossless" if name == "auto" or INTERMEDIATE_FORMATS[name].lossless else name
+
+
+def job_intermediate_format(name: str, journal) -> IntermediateFormat:
+    """
+    Intermediate format of a journaled job.
+
+    Resolved on the job's first run (benchmarking 'auto' in its working
+    directory) and recorded in the journal, so a resumed run reads the
+    frames already on disk in the format they were written in.
+
+    Args:
+        name: Format name or 'auto'
+        journal: JobJournal of the job
+
+    Returns:
+        Intermediate format
+    """
+    chosen = journal.choice(
+        "intermediate_format", lambda: get_intermediate_format(name, journal.work_dir).name
+    )
+    if name not in ("auto", chosen):
+        logger.info(f"Resumed job keeps its {chosen} frames instead of {name}")
+    return INTERMEDIATE_FORMATS[chosen]
+
+
+def choose_intermediate_format(work_dir: Optional[Union[str, Path]] = None) -> str:
+    """
+    Pick the lossless format with the lowest per-frame cost on this host.
+
+    Cost is codec CPU time (encode + decode of a 1080p frame) plus the
+    time to write and read its file at the measured disk bandwidth: fast
+    disks favour BMP, slow disks or network shares favour PNG.
+
+    Args:
+        work_dir: Directory on the disk to measure (default: temp dir)
+
+    Returns:
+        Format name
+    """
+    work_dir = Path(work_dir) if work_dir is not None else Path(tempfile.gettempdir())
+    work_dir.mkdir(parents=True, exist_ok=True)
+    device = work_dir.stat().st_dev
+    if device in _auto_formats:
+        return _auto_formats[device]
+
+    bandwidth = measure_disk_bandwidth(work_dir)
+    costs = {}
+    for name, (cpu_time, size) in benchmark_codecs().items():
+        if INTERMEDIATE_FORMATS[name].lossless:
+            costs[name] = cpu_time + 2 * size / bandwidth
+
+    best = min(costs, key=costs.get)
+    logger.info(
+        f"Intermediate format: {best} (disk {bandwidth / 1e6:.0f} MB/s, per-frame cost "
+        + ", ".join(f"{name} {cost * 1000:.0f} ms" for name, cost in costs.items()) + ")"
+    )
+    _auto_formats[device] = best
+    return best
+
+
+def benchmark_codecs(width: int = 1920, height: int = 1080) -> Dict[str, tuple]:
+    """
+    Time each format's codec on a synthetic textured frame.
+
+    Returns:
+        {name: (encode + decode seconds, encoded bytes)}
+    """
+    rng = np.random.default_rng(0)
+    frame = cv2.GaussianBlur(rng.integers(0, 256, (height, width, 3), dtype=np.uint8), (0, 0), 1.5)
+
+    results = {}
+    for name, fmt in INTERMEDIATE_FORMATS.items():
+        start = time.perf_counter()
+        ok, data = cv2.imencode(fmt.extension, frame, fmt.imwrite_params)
+        cv2.imdecode(data, cv2.IMREAD_COLOR)
+        if ok:
+            results[name] = (time.perf_counter() - start, data.nbytes)
+    return results
+
+
+def measure_disk_bandwidth(work_dir: Path, size: int = 64 * 1024 * 1024) -> float:
+    """
+    Measure synced write bandwidth of the disk holding ``work_dir``.
+
+    Returns:
+        Bytes per second
+    """
+    block = np.random.default_rng(0).integers(0, 256, 4 * 1024 * 1024, dtype=np.uint8).tobytes()
+    fd, path = tempfile.mkstemp(dir=work_dir, suffix=".bench")
+    try:
+        start = time.perf_counter()
+        with os.fdopen(fd, "wb") as f:
+            for _ in range(size // len(block)):
+                f.write(block)
+            f.flush()
+            os.fsync(f.fileno())
+        elapsed = time.perf_counter() - start
+    finally:
+        os.unlink(path)
+    return size / max(elapsed, 1e-6)
@@ -0,0 +1,232 @@
+"""
+Job Journal Module
+
+Crash-safe record of a conversion's completed work (stages, frame ranges,
+encoded segments), so an interrupted job resumes instead of restarting.
+"""
+
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+import hashlib
+import json
+import logging
+import os
+import shutil
+import time
+
+logger = logging.getLogger(__name__)
+
+JOURNAL_VERSION = 1
+
+
+def job_key(input_path: Path, settings: Dict[str, Any]) -> str:
+    """
+    Hash identifying a conversion job.
+
+    Covers the input file (path, size and modification time) and every
+    setting that changes the output, so work done with other settings or
+    on a replaced file is never reused.
+
+    Args:
+        input_path: Input video
+        settings: Output-affecting settings (JSON-serializable or str-able)
+
+    Returns:
+        Hex digest
+    """
+    input_path = Path(input_path).resolve()
+    stat = input_path.stat()
+    payload = json.dumps(
+        {
+            "version": JOURNAL_VERSION,
+            "input": str(input_path),
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+            "settings": settings,
+        },
+        sort_keys=True,
+        default=str
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def job_work_dir(base_dir: Path, input_path: Path) -> Path:
+    """
+    Working directory of one input's job under ``base_dir``.
+
+    Each input gets its own directory so queued jobs do not clobber each
+    other's intermediate files.
+    """
+    input_path = Path(input_path).resolve()
+    digest = hashlib.sha1(str(input_path).encode()).hexdigest()[:8]
+    return Path(base_dir) / f"{input_path.stem}_{digest}"
+
+
+class JobJournal:
+    """Journal of completed work in a conversion's working directory."""
+
+    FILENAME = "journal.json"
+
+    def __init__(
+        self,
+        work_dir: Path,
+        input_path: Path,
+        settings: Dict[str, Any],
+        resume: bool = False,
+        flush_interval: float = 5.0
+    ):
+        """
+        Open the journal of a job.
+
+        Without ``resume``, or if the journal belongs to another input or
+        other settings, the working directory is cleared and the job
+        starts from scratch.
+
+        Args:
+            work_dir: Job working directory (see job_work_dir)
+            input_path: Input video
+            settings: Output-affecting settings (see job_key)
+            resume: Reuse the work recorded by an earlier run
+            flush_interval: Minimum seconds between journal writes for
+                frame progress; at most this much work is redone
+        """
+        self.work_dir = Path(work_dir)
+        self.path = self.work_dir / self.FILENAME
+        self.key = job_key(input_path, settings)
+        self.flush_interval = flush_interval
+        self._last_flush = 0.0
+
+        state = self._load() if resume else None
+        self.resumed = state is not None
+        if state is None:
+            if self.work_dir.exists():
+                shutil.rmtree(self.work_dir)
+            state = {"key": self.key, "stages": [], "frames": [], "segments": {}, "choices": {}}
+        self.work_dir.mkdir(parents=True, exist_ok=True)
+        self._state = state
+
+        if self.resumed:
+            logger.info(
+                f"Resuming job in {self.work_dir}: stages {self._state['stages']}, "
+                f"{self.frames_done} frames, {len(self._state['segments'])} segments done"
+            )
+        self.flush()
+
+    def _load(self) -> Optional[Dict[str, Any]]:
+        """Load the journal if it belongs to this job."""
+        if not self.path.exists():
+            return None
+
+        try:
+            with open(self.path, "r") as f:
+                state = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable journal {self.path}: {e}")
+            return None
+
+        if state.get("key") != self.key:
+            logger.info("Input or settings changed since the last run; starting over")
+            return None
+        return state
+
+    def is_stage_done(self, name: str) -> bool:
+        """Whether a whole stage (e.g. frame extraction) has completed."""
+        return name in self._state["stages"]
+
+    def mark_stage(self, name: str):
+        """Record a completed stage."""
+        if name not in self._state["stages"]:
+            self._state["stages"].append(name)
+        self.flush()
+
+    @property
+    def completed_ranges(self) -> List[Tuple[int, int]]:
+        """Completed frames as sorted, merged [start, stop) ranges (0-based)."""
+        return [tuple(r) for r in self._state["frames"]]
+
+    @property
+    def frames_done(self) -> int:
+        """Number of frames completed without a gap from the first frame."""
+        ranges = self._state["frames"]
+        return ranges[0][1] if ranges and ranges[0][0] == 0 else 0
+
+    def mark_frames(self, start: int, stop: Optional[int] = None):
+        """
+        Record completed frames.
+
+        Written to disk at most every ``flush_interval`` seconds; call
+        flush() before stopping on purpose.
+
+        Args:
+            start: First completed frame (0-based)
+            stop: Frame after the last completed one (default: start + 1)
+        """
+        stop = start + 1 if stop is None else stop
+        merged = []
+        for range_start, range_stop in sorted(self._state["frames"] + [[start, stop]]):
+            if merged and range_start <= merged[-1][1]:
+                merged[-1][1] = max(merged[-1][1], range_stop)
+            else:
+                merged.append([range_start, range_stop])
+        self._state["frames"] = merged
+
+        if time.monotonic() - self._last_flush >= self.flush_interval:
+            self.flush()
+
+    def segment_outputs(self, key: str) -> Optional[List[Path]]:
+        """
+        Get the encoded files of a completed segment.
+
+        Returns:
+            Segment files (in target order), or None if the segment is not
+            done or its files are gone
+        """
+        paths = self._state["segments"].get(key)
+        if paths is None:
+            return None
+
+        paths = [Path(path) for path in paths]
+        if not all(path.exists() for path in paths):
+            return None
+        return paths
+
+    def mark_segment(self, key: str, paths: Sequence[Path]):
+        """Record a completed segment and its encoded files."""
+        self._state["segments"][key] = [str(path) for path in paths]
+        self.flush()
+
+    def choice(self, name: str, choose: Callable[[], Any]) -> Any:
+        """
+        Get a value chosen once per job (e.g. by a benchmark).
+
+        The first run calls ``choose`` and records its result; resumed runs
+        get the recorded value, so files written with it stay usable even
+        if choosing again would give something else.
+
+        Args:
+            name: Name of the choice
+            choose: Makes the choice (result must be JSON-serializable)
+
+        Returns:
+            Chosen value
+        """
+        choices = self._state.setdefault("choices", {})
+        if name not in choices:
+            choices[name] = choose()
+            self.flush()
+        return choices[name]
+
+    def flush(self):
+        """Write the journal atomically (survives crashes and power loss)."""
+        tmp_path = self.path.with_suffix(".tmp")
+        with open(tmp_path, "w") as f:
+            json.dump(self._state, f, indent=2)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.path)
+        self._last_flush = time.monotonic()
+
+    def discard(self):
+        """Delete the working directory once the job has finished."""
+        if self.work_dir.exists():
+            shutil.rmtree(self.work_dir)
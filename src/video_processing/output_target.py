@@ -0,0 +1,246 @@
+"""
+Output Target Module
+
+Describes one deliverable of a conversion (format, resolution, codec, path)
+so a single decode/depth/render pass can feed several outputs.
+"""
+
+from pathlib import Path
+from typing import Optional, Tuple, Union
+import cv2
+import numpy as np
+
+from ..rendering.active_area import ActiveArea
+from ..rendering.sbs_composer import SBSComposer
+from .encoder import INTERLEAVED_PIXEL_FORMAT, PIXEL_FORMATS
+
+
+class OutputTarget:
+    """One output of a multi-output conversion."""
+
+    def __init__(
+        self,
+        output_format: str,
+        path: Union[str, Path],
+        resolution: Optional[Tuple[int, int]] = None,
+        codec: Optional[str] = None,
+        crf: int = 18,
+        depth_bits: int = 8
+    ):
+        """
+        Initialize output target.
+
+        Args:
+            output_format: Output format (see SBSComposer.FORMATS)
+            path: Output file path; may contain ``{stem}`` and ``{ext}`` for
+                batch runs
+            resolution: Final (width, height) of the composed frame
+                (None = native size of the format); even for interleaved
+                formats, whose eyes alternate every row or column
+            codec: Video codec (default: libx264, libx265 for 10-bit)
+            crf: Constant Rate Factor
+            depth_bits: Depth precision of 2D + depth formats (8 or 10)
+        """
+        if output_format not in SBSComposer.FORMATS:
+            raise ValueError(f"Unknown output format: {output_format}")
+        if depth_bits not in SBSComposer.RGBD_DEPTH_BITS:
+            raise ValueError(f"Unsupported depth bits: {depth_bits}")
+        if resolution and output_format in SBSComposer.INTERLEAVED_FORMATS:
+            if resolution[0] % 2 or resolution[1] % 2:
+                raise ValueError(f"{output_format} needs an even size, got {resolution[0]}x{resolution[1]}")
+
+        self.output_format = output_format
+        self.path = Path(path)
+        self.resolution = tuple(resolution) if resolution else None
+        self.crf = crf
+        self.depth_bits = depth_bits if self.is_rgbd else 8
+        self.codec = codec or ("libx265" if self.depth_bits > 8 else "libx264")
+
+    @classmethod
+    def parse(cls, spec: str) -> "OutputTarget":
+        """
+        Parse a command-line target specification.
+
+        Args:
+            spec: Comma-separated key=value pairs, e.g.
+                ``format=half_sbs,path=out.mp4,size=1920x1080,codec=libx265``.
+                Keys: format (required), path, size, codec, crf, depth_bits.
+                The default path is ``{stem}_<format>{ext}``.
+
+        Returns:
+            Output target
+        """
+        fields = {}
+        for item in spec.split(","):
+            key, sep, value = item.partition("=")
+            if not sep:
+                raise ValueError(f"Invalid target field '{item}' (expected key=value)")
+            fields[key.strip()] = value.strip()
+
+        unknown = set(fields) - {"format", "path", "size", "codec", "crf", "depth_bits"}
+        if unknown:
+            raise ValueError(f"Unknown target fields: {', '.join(sorted(unknown))}")
+        if "format" not in fields:
+            raise ValueError(f"Target '{spec}' has no format")
+
+        resolution = None
+        if "size" in fields:
+            width, _, height = fields["size"].lower().partition("x")
+            resolution = (int(width), int(height))
+
+        return cls(
+            fields["format"],
+            fields.get("path", f"{{stem}}_{fields['format']}{{ext}}"),
+            resolution=resolution,
+            codec=fields.get("codec"),
+            crf=int(fields.get("crf", 18)),
+            depth_bits=int(fields.get("depth_bits", 8))
+        )
+
+    @property
+    def is_rgbd(self) -> bool:
+        """Whether the target is 2D + depth (needs no stereo views)."""
+        return self.output_format in SBSComposer.RGBD_FORMATS
+
+    @property
+    def pix_fmt(self) -> str:
+        """Encoder pixel format for this target's frames."""
+        if self.output_format in SBSComposer.INTERLEAVED_FORMATS:
+            return INTERLEAVED_PIXEL_FORMAT
+        return PIXEL_FORMATS[self.depth_bits]
+
+    def for_input(
+        self,
+        stem: str,
+        output_dir: Optional[Path] = None,
+        ext: str = ".mp4"
+    ) -> "OutputTarget":
+        """
+        Resolve the path template for one input file.
+
+        Args:
+            stem: Input file stem substituted for ``{stem}``
+            output_dir: Directory for relative paths
+            ext: Extension substituted for ``{ext}`` (see image_extension
+                for image inputs)
+
+        Returns:
+            Copy of the target with a concrete path
+        """
+        path = Path(str(self.path).format(stem=stem, ext=ext))
+        if output_dir is not None and not path.is_absolute():
+            path = Path(output_dir) / path
+
+        return OutputTarget(
+            self.output_format, path, self.resolution, self.codec, self.crf, self.depth_bits
+        )
+
+    def image_extension(self, input_path: Union[str, Path]) -> str:
+        """
+        Get the file extension for this target's frame of an image input.
+
+        Args:
+            input_path: Input image
+
+        Returns:
+            The input's extension, or ``.png`` when the input format cannot
+            hold the composed frame (16-bit 2D + depth)
+        """
+        suffix = Path(input_path).suffix.lower()
+        if self.frame_dtype != np.uint8 and suffix not in (".png", ".tif", ".tiff"):
+            return ".png"
+        return suffix
+
+    def compose(
+        self,
+        composer: SBSComposer,
+        image: np.ndarray,
+        depth_map: np.ndarray,
+        views: Optional[Tuple[np.ndarray, np.ndarray]] = None,
+        out: Optional[np.ndarray] = None,
+        bgr: bool = False,
+        active_area: Optional[ActiveArea] = None
+    ) -> np.ndarray:
+        """
+        Compose this target's frame from shared per-frame results.
+
+        Args:
+            composer: SBS composer
+            image: Source RGB frame
+            depth_map: Depth map of the frame
+            views: Rendered (left, right) views; unused for 2D + depth
+            out: Preallocated frame at the format's native size (optional)
+            bgr: Produce BGR output for OpenCV/ffmpeg sinks
+            active_area: Picture area inside black bars; depth and views
+                then cover only the picture and ``image`` is the full frame
+
+        Returns:
+            Composed frame, scaled to ``resolution`` if set
+        """
+        if self.resolution and self.output_format in SBSComposer.INTERLEAVED_FORMATS:
+            # Scaling an interleaved frame would blend the eyes: scale the
+            # full-frame views, then interleave at the target size
+            if active_area is not None:
+                views = [active_area.paste(view, image, self.output_format) for view in views]
+            views = [cv2.resize(view, self.resolution, interpolation=cv2.INTER_AREA) for view in views]
+            return composer.compose(*views, self.output_format, bgr=bgr)
+
+        if self.is_rgbd:
+            if active_area is not None:
+                depth_map = active_area.uncrop_depth(depth_map)
+            frame = composer.compose_rgbd(
+                image, depth_map, self.output_format,
+                depth_bits=self.depth_bits, out=out, bgr=bgr
+            )
+        elif active_area is not None:
+            frame = composer.compose(*views, self.output_format, bgr=bgr)
+            frame = active_area.paste(frame, image, self.output_format, out=out, bgr=bgr)
+        else:
+            frame = composer.compose(*views, self.output_format, out=out, bgr=bgr)
+
+        if self.resolution and self.resolution != (frame.shape[1], frame.shape[0]):
+            frame = cv2.resize(frame, self.resolution, interpolation=cv2.INTER_AREA)
+
+        return frame
+
+    def frame_shape(self, height: int, width: int) -> Tuple[int, int, int]:
+        """
+        Get the native composed frame shape for a source size.
+
+        Args:
+            height: Source height
+            width: Source width
+
+        Returns:
+            (height, width, 3) before any resize to ``resolution``
+        """
+        return SBSComposer.output_shape(height, width, self.output_format) + (3,)
+
+    def rgbd_metadata(self, height: int, width: int) -> dict:
+        """
+        Describe the delivered 2D + depth layout for a metadata sidecar.
+
+        Args:
+            height: Source height
+            width: Source width
+
+        Returns:
+            SBSComposer.rgbd_metadata for the final (scaled) frame
+        """
+        if self.resolution:
+            out_w, out_h = self.resolution
+            if self.output_format == "rgbd_sbs":
+                width, height = out_w // 2, out_h
+            else:
+                width, height = out_w, out_h // 2
+
+        return SBSComposer.rgbd_metadata(self.output_format, height, width, self.depth_bits)
+
+    @property
+    def frame_dtype(self) -> np.dtype:
+        """Composed frame dtype (16-bit for 10-bit 2D + depth)."""
+        return np.dtype(np.uint16 if self.depth_bits > 8 else np.uint8)
+
+    def __repr__(self) -> str:
+        size = f"{self.resolution[0]}x{self.resolution[1]}" if self.resolution else "native"
+        return f"OutputTarget({self.output_format}, {size}, {self.codec}, {self.path})"
@@ -0,0 +1,145 @@
+"""
+Probe Cache Module
+
+Caches ffprobe results in memory and in a small JSON file, keyed by the
+absolute path and validated against the file's size and modification time.
+"""
+
+import json
+import logging
+import os
+import platform
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+
+def default_cache_dir() -> Path:
+    """Per-user application data directory (shared with license/updates)."""
+    if platform.system() == "Windows":
+        return Path(os.getenv("LOCALAPPDATA", Path.home())) / "3DConversion"
+    elif platform.system() == "Darwin":
+        return Path.home() / "Library" / "Application Support" / "com.3dconversion.app"
+    return Path.home() / ".config" / "3DConversion"
+
+
+class ProbeCache:
+    """Memory and on-disk cache of per-file probe results."""
+
+    _default: Optional["ProbeCache"] = None
+
+    def __init__(self, path: Optional[Union[str, Path]] = None, max_entries: int = 5000):
+        """
+        Initialize probe cache.
+
+        Args:
+            path: JSON file backing the cache (None = memory only)
+            max_entries: Files kept on disk; least recently used are dropped
+        """
+        self.path = Path(path) if path is not None else None
+        self.max_entries = max_entries
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        self._dirty = False
+
+        if self.path is not None and self.path.exists():
+            try:
+                with open(self.path, "r") as f:
+                    self._entries = json.load(f)
+            except (OSError, ValueError) as e:
+                logger.warning(f"Ignoring unreadable probe cache {self.path}: {e}")
+
+    @classmethod
+    def default(cls) -> "ProbeCache":
+        """Process-wide cache backed by the user's application data directory."""
+        if cls._default is None:
+            cls._default = cls(default_cache_dir() / "probe_cache.json")
+        return cls._default
+
+    @staticmethod
+    def _identity(path: Path) -> tuple:
+        """(absolute path, size, mtime) of a file."""
+        path = Path(path).resolve()
+        stat = path.stat()
+        return str(path), stat.st_size, stat.st_mtime_ns
+
+    def get(self, path: Union[str, Path], kind: str) -> Optional[Any]:
+        """
+        Get a cached probe result.
+
+        Args:
+            path: Probed file
+            kind: Result type (e.g. 'video_info', 'keyframes')
+
+        Returns:
+            Cached value, or None if missing or the file has changed
+        """
+        key, size, mtime = self._identity(path)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry["size"] != size or entry["mtime_ns"] != mtime:
+                return None
+
+            value = entry["results"].get(kind)
+            if value is not None:
+                entry["used"] = time.time()
+            return value
+
+    def put(self, path: Union[str, Path], kind: str, value: Any, save: bool = True):
+        """
+        Store a probe result.
+
+        Args:
+            path: Probed file
+            kind: Result type
+            value: JSON-serializable result
+            save: Write the disk store now (batch callers save once at the end)
+        """
+        key, size, mtime = self._identity(path)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry["size"] != size or entry["mtime_ns"] != mtime:
+                entry = {"size": size, "mtime_ns": mtime, "results": {}}
+                self._entries[key] = entry
+
+            entry["results"][kind] = value
+            entry["used"] = time.time()
+            self._dirty = True
+
+        if save:
+            self.save()
+
+    def save(self):
+        """Write the disk store atomically, if anything changed."""
+        if self.path is None:
+            return
+
+        with self._lock:
+            if not self._dirty:
+                return
+
+            if len(self._entries) > self.max_entries:
+                keep = sorted(self._entries, key=lambda k: self._entries[k].get("used", 0))
+                for key in keep[:len(self._entries) - self.max_entries]:
+                    del self._entries[key]
+
+            data = json.dumps(self._entries)
+            self._dirty = False
+
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_suffix(f".{os.getpid()}.tmp")
+            tmp_path.write_text(data)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            logger.warning(f"Could not write probe cache {self.path}: {e}")
+
+    def clear(self):
+        """Drop all cached results (memory and disk)."""
+        with self._lock:
+            self._entries.clear()
+            self._dirty = True
+        self.save()
@@ -0,0 +1,98 @@
+"""
+Scene Index Module
+
+Shot boundaries of a video, found once by FFmpeg's scene change score on a
+low-resolution decode, so temporal filters, segment splitting and other
+per-shot processing can share them instead of each scanning the video.
+"""
+
+from bisect import bisect_left, bisect_right
+from typing import Any, Dict, List, Sequence, Tuple
+
+# Scores below this are not kept; thresholds down to it need no new scan
+MIN_SCENE_SCORE = 0.1
+
+
+class SceneIndex:
+    """Scene change scores and the shot boundaries they give at a threshold."""
+
+    def __init__(self, frame_count: int, scores: Sequence[Tuple[int, float]], threshold: float = 0.3):
+        """
+        Initialize scene index.
+
+        Args:
+            frame_count: Number of frames
+            scores: (frame number, scene score in [0, 1]) of the frames
+                scoring at least MIN_SCENE_SCORE
+            threshold: Score above which a frame starts a new shot
+        """
+        if threshold < MIN_SCENE_SCORE:
+            raise ValueError(f"Scene threshold {threshold} below the indexed minimum {MIN_SCENE_SCORE}")
+
+        self.frame_count = frame_count
+        self.scores = sorted((int(frame), float(score)) for frame, score in scores)
+        self.threshold = threshold
+        self.cuts = [frame for frame, score in self.scores if score > threshold and 0 < frame < frame_count]
+
+    @classmethod
+    def from_scores(cls, scores: Sequence[Tuple[int, float]], threshold: float = 0.3) -> "SceneIndex":
+        """
+        Build the index from the score of every frame.
+
+        Args:
+            scores: (frame number, scene score) of each decoded frame
+            threshold: Score above which a frame starts a new shot
+
+        Returns:
+            Scene index
+        """
+        if not scores:
+            raise ValueError("No frames to index")
+
+        frame_count = max(frame for frame, _ in scores) + 1
+        return cls(frame_count, [(frame, score) for frame, score in scores if score >= MIN_SCENE_SCORE], threshold)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any], threshold: float = 0.3) -> "SceneIndex":
+        """Rebuild an index saved with to_dict, at any threshold."""
+        return cls(data["frame_count"], data["scores"], threshold)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON-serializable form (see from_dict)."""
+        return {
+            "frame_count": self.frame_count,
+            "scores": [[frame, round(score, 4)] for frame, score in self.scores],
+        }
+
+    @property
+    def shots(self) -> List[Tuple[int, int]]:
+        """(first frame, frame after the last) of each shot."""
+        bounds = [0] + self.cuts + [self.frame_count]
+        return list(zip(bounds[:-1], bounds[1:]))
+
+    def shot_start(self, frame_number: int) -> int:
+        """First frame of the shot containing a frame."""
+        i = bisect_right(self.cuts, frame_number)
+        return self.cuts[i - 1] if i else 0
+
+    def cuts_between(self, start: int, stop: int) -> List[int]:
+        """
+        Shot boundaries inside a frame range.
+
+        Args:
+            start: First frame of the range
+            stop: Frame after the last one
+
+        Returns:
+            Boundaries after ``start``, as offsets from it
+        """
+        first = bisect_right(self.cuts, start)
+        last = bisect_left(self.cuts, stop)
+        return [frame - start for frame in self.cuts[first:last]]
+
+    def __len__(self) -> int:
+        """Number of shots."""
+        return len(self.cuts) + 1
+
+    def __repr__(self) -> str:
+        return f"SceneIndex({len(self)} shots, {self.frame_count} frames, threshold {self.threshold})"
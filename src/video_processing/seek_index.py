@@ -0,0 +1,92 @@
+"""
+Seek Index Module
+
+Keyframe positions of a video, so that any frame can be fetched by seeking
+to the keyframe before it and decoding only the rest of that group of
+pictures.
+"""
+
+from bisect import bisect_right
+from typing import Any, Dict, List, Sequence, Tuple
+
+
+class SeekIndex:
+    """Keyframe timestamps and frame numbers of a video's first video stream."""
+
+    def __init__(self, start_time: float, frame_count: int, keyframes: Sequence[Tuple[float, int]]):
+        """
+        Initialize seek index.
+
+        Args:
+            start_time: Timestamp of the first frame (seconds)
+            frame_count: Number of frames
+            keyframes: (timestamp in seconds, frame number) of each keyframe,
+                in presentation order
+        """
+        self.start_time = start_time
+        self.frame_count = frame_count
+        self.keyframes = [(float(time), int(frame)) for time, frame in keyframes]
+        self._frames = [frame for _, frame in self.keyframes]
+
+    @classmethod
+    def from_packets(cls, packets: Sequence[Tuple[float, bool]]) -> "SeekIndex":
+        """
+        Build the index from the video packets.
+
+        Args:
+            packets: (timestamp, is keyframe) per packet, in any order
+                (packets come in decode order, frames are numbered in
+                presentation order)
+
+        Returns:
+            Seek index
+        """
+        packets = sorted(packets)
+        if not packets:
+            raise ValueError("No video packets to index")
+
+        keyframes = [(time, frame) for frame, (time, key) in enumerate(packets) if key]
+        return cls(packets[0][0], len(packets), keyframes)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "SeekIndex":
+        """Rebuild an index saved with to_dict."""
+        return cls(data["start_time"], data["frame_count"], data["keyframes"])
+
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON-serializable form (see from_dict)."""
+        return {
+            "start_time": self.start_time,
+            "frame_count": self.frame_count,
+            "keyframes": [list(keyframe) for keyframe in self.keyframes],
+        }
+
+    @property
+    def keyframe_times(self) -> List[float]:
+        """Keyframe timestamps in seconds."""
+        return [time for time, _ in self.keyframes]
+
+    def keyframe_before(self, frame_number: int) -> Tuple[float, int]:
+        """
+        Find the keyframe to seek to for a frame.
+
+        Args:
+            frame_number: Frame number (0-based)
+
+        Returns:
+            (timestamp, frame number) of the last keyframe at or before it
+        """
+        if not 0 <= frame_number < self.frame_count:
+            raise ValueError(f"Frame {frame_number} outside video of {self.frame_count} frames")
+
+        i = bisect_right(self._frames, frame_number) - 1
+        if i < 0:
+            # Open GOP at the start: decode from the first frame
+            return self.start_time, 0
+        return self.keyframes[i]
+
+    def __len__(self) -> int:
+        return len(self.keyframes)
+
+    def __repr__(self) -> str:
+        return f"SeekIndex({len(self.keyframes)} keyframes, {self.frame_count} frames)"
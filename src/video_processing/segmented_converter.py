@@ -0,0 +1,382 @@
+"""
+Segmented Converter Module
+
+Splits a video at keyframes into segments that are converted in separate
+processes and joined again without re-encoding.
+"""
+
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence
+import logging
+import multiprocessing
+import os
+import shutil
+import subprocess
+
+from ..ai_core.depth_estimation import DepthEstimator
+from ..rendering.dibr_renderer import create_renderer
+from .batch_processor import BatchProcessor, detect_video_active_area
+from .encoder import VideoEncoder
+from .ffmpeg_handler import FFmpegHandler
+from .intermediate_format import get_intermediate_format
+from .job_journal import JobJournal
+from .output_target import OutputTarget
+from .scene_index import SceneIndex
+
+logger = logging.getLogger(__name__)
+
+
+class VideoSegment:
+    """Frame range of a video converted by one worker."""
+
+    def __init__(self, index: int, start: int, stop: Optional[int], warmup: int = 0):
+        """
+        Initialize video segment.
+
+        Args:
+            index: Position of the segment in the output
+            start: First output frame (a keyframe, or 0)
+            stop: Frame after the last output frame (None = end of video)
+            warmup: Frames before ``start`` that are processed to prime the
+                temporal filters but not encoded
+        """
+        if start < 0 or (stop is not None and stop <= start):
+            raise ValueError(f"Invalid segment frames {start}:{stop}")
+        if not 0 <= warmup <= start:
+            raise ValueError(f"Invalid warm-up of {warmup} frames before frame {start}")
+
+        self.index = index
+        self.start = start
+        self.stop = stop
+        self.warmup = warmup
+
+    @property
+    def key(self) -> str:
+        """Identifier of the segment's frame range (stable across runs)."""
+        stop = "end" if self.stop is None else f"{self.stop:08d}"
+        return f"{self.start:08d}_{stop}_{self.warmup}"
+
+    @property
+    def first_frame(self) -> int:
+        """First decoded frame, including warm-up."""
+        return self.start - self.warmup
+
+    @property
+    def frame_count(self) -> Optional[int]:
+        """Number of decoded frames (None = to the end of the video)."""
+        return None if self.stop is None else self.stop - self.first_frame
+
+    def __repr__(self) -> str:
+        stop = "end" if self.stop is None else self.stop
+        return f"VideoSegment({self.index}, frames {self.start}:{stop}, warmup {self.warmup})"
+
+
+def plan_segments(
+    keyframes: Sequence[int],
+    total_frames: int,
+    segments: int,
+    overlap_frames: int = 0,
+    scene_cuts: Sequence[int] = ()
+) -> List[VideoSegment]:
+    """
+    Split a video into segments that start at keyframes.
+
+    Each split is placed at the keyframe nearest to an even division of
+    the video, so segments decode independently and their encodes can be
+    concatenated. Keyframes on a shot boundary within a quarter segment of the even
+    split are preferred: temporal state is reset there anyway, so such
+    segments need no warm-up.
+
+    Args:
+        keyframes: Keyframe frame numbers (see SeekIndex)
+        total_frames: Number of frames in the video
+        segments: Requested number of segments
+        overlap_frames: Warm-up frames decoded before each segment start
+        scene_cuts: Frames that start a new shot (see SceneIndex)
+
+    Returns:
+        Segments in order (fewer than requested if keyframes are sparse)
+    """
+    if segments < 1:
+        raise ValueError(f"Number of segments must be positive, got {segments}")
+
+    keyframes = sorted({frame for frame in keyframes if 0 < frame < total_frames})
+
+    cuts = set(scene_cuts)
+    shot_keyframes = [frame for frame in keyframes if frame in cuts]
+    tolerance = total_frames / segments / 4
+
+    bounds = [0]
+    for i in range(1, segments):
+        if not keyframes:
+            break
+        target = i * total_frames / segments
+        nearest = min(keyframes, key=lambda frame: abs(frame - target))
+        if shot_keyframes:
+            nearest_shot = min(shot_keyframes, key=lambda frame: abs(frame - target))
+            if abs(nearest_shot - target) <= tolerance:
+                nearest = nearest_shot
+        if nearest > bounds[-1]:
+            bounds.append(nearest)
+
+    # The last segment runs to the end, whatever the container reports
+    stops = bounds[1:] + [None]
+    return [
+        VideoSegment(i, start, stop, warmup=0 if start in cuts else min(overlap_frames, start))
+        for i, (start, stop) in enumerate(zip(bounds, stops))
+    ]
+
+
+# Pipeline of the current worker process, created once by _init_worker
+_worker: Dict[str, Any] = {}
+
+
+def _init_worker(
+    ffmpeg_path: str,
+    estimator_options: Dict[str, Any],
+    renderer_options: Dict[str, Any],
+    processor_options: Dict[str, Any],
+    threads: int
+):
+    """Load the model and pipeline once per worker process."""
+    import cv2
+    import torch
+
+    # Workers share the cores instead of each using all of them
+    torch.set_num_threads(threads)
+    cv2.setNumThreads(threads)
+
+    handler = FFmpegHandler(ffmpeg_path=ffmpeg_path)
+    _worker["ffmpeg"] = handler
+    _worker["encoder"] = VideoEncoder(ffmpeg_handler=handler)
+    depth_estimator = DepthEstimator(**estimator_options)
+    _worker["processor"] = BatchProcessor(
+        depth_estimator=depth_estimator,
+        dibr_renderer=create_renderer(device=depth_estimator.device, **renderer_options),
+        **processor_options
+    )
+
+
+def _convert_segment(job: Dict[str, Any]) -> List[Path]:
+    """
+    Decode, convert and encode one segment in a worker process.
+
+    Returns:
+        Encoded segment file per target, in target order
+    """
+    segment: VideoSegment = job["segment"]
+    targets: List[OutputTarget] = job["targets"]
+    fps = job["fps"]
+    segment_dir = Path(job["work_dir"]) / f"segment_{segment.key}"
+
+    # Leftovers of an interrupted attempt are redone from scratch
+    if segment_dir.exists():
+        shutil.rmtree(segment_dir)
+
+    # Frames are streamed from the decoder at full and model resolution
+    processor: BatchProcessor = _worker["processor"]
+    image_format = get_intermediate_format(processor.intermediate_format)
+    frames = processor.open_video(
+        _worker["ffmpeg"],
+        Path(job["input_path"]),
+        start_frame=segment.first_frame,
+        frame_count=segment.frame_count,
+        active_area=job["active_area"]
+    )
+
+    # Rendered and composed like convert_video's single-process loop, so
+    # segments match a conversion without workers
+    frame_count = len(processor.process_frames_multi(
+        frames, segment_dir, targets, job["depth_intensity"], scene_cuts=job["scene_cuts"]
+    )[0])
+    if frame_count <= segment.warmup:
+        raise RuntimeError(f"No frames decoded for {segment}")
+
+    # Warm-up frames are skipped; each encode starts with a keyframe
+    segment_paths = []
+    for i, target in enumerate(targets):
+        target_dir = segment_dir / f"target_{i}"
+        segment_path = segment_dir / f"target_{i}{target.path.suffix}"
+        _worker["encoder"].encode_from_frames(
+            target_dir,
+            segment_path,
+            fps=fps,
+            codec=target.codec,
+            crf=target.crf,
+            pix_fmt=target.pix_fmt,
+            start_number=segment.warmup + 1,
+            frame_pattern=image_format.for_dtype(target.frame_dtype).pattern
+        )
+        shutil.rmtree(target_dir)
+        segment_paths.append(segment_path)
+
+    return segment_paths
+
+
+class SegmentedConverter:
+    """Converts keyframe-aligned segments of a video in parallel processes."""
+
+    def __init__(
+        self,
+        ffmpeg_handler: Optional[FFmpegHandler] = None,
+        workers: int = 2,
+        segments: Optional[int] = None,
+        overlap_frames: int = 12
+    ):
+        """
+        Initialize segmented converter.
+
+        Args:
+            ffmpeg_handler: FFmpeg handler (creates default if None)
+            workers: Number of worker processes, each with its own model
+            segments: Number of segments (default: one per worker)
+            overlap_frames: Frames decoded before each segment to prime the
+                temporal depth filter and hole filler, so there is no
+                visible restart at segment boundaries
+        """
+        if workers < 1:
+            raise ValueError(f"Number of workers must be positive, got {workers}")
+
+        self.ffmpeg = ffmpeg_handler or FFmpegHandler()
+        self.workers = workers
+        self.segments = segments or workers
+        self.overlap_frames = overlap_frames
+
+    def convert(
+        self,
+        input_path: Path,
+        targets: Sequence[OutputTarget],
+        work_dir: Path,
+        depth_intensity: float = 0.75,
+        estimator_options: Optional[Dict[str, Any]] = None,
+        renderer_options: Optional[Dict[str, Any]] = None,
+        processor_options: Optional[Dict[str, Any]] = None,
+        keep_audio: bool = True,
+        all_tracks: bool = False,
+        progress_callback: Optional[Callable[[int, int], None]] = None,
+        journal: Optional[JobJournal] = None
+    ) -> List[Path]:
+        """
+        Convert a video into one or more targets.
+
+        Args:
+            input_path: Path to input video
+            targets: Output targets (format, resolution, codec, path)
+            work_dir: Directory for segment frames and encodes
+            depth_intensity: Depth effect strength
+            estimator_options: DepthEstimator keyword arguments
+            renderer_options: create_renderer keyword arguments (backend,
+                render_mode, stereo_mode)
+            processor_options: BatchProcessor keyword arguments
+                (hole_filling_method, crop_bars, temporal_filter,
+                temporal_method, intermediate_format, skip_static); bars
+                are detected here once for all segments
+            keep_audio: Mux the input's audio into the outputs
+            all_tracks: Keep all of the input's audio and subtitle tracks
+            progress_callback: Callback function(segments done, total)
+            journal: Job journal; segments it records as encoded are
+                reused and newly encoded ones are added
+
+        Returns:
+            Output video paths, in target order
+        """
+        info = self.ffmpeg.get_video_info(input_path)
+        fps = info["fps"]
+
+        # Keyframes are numbered like the decoded frames, whatever the start time
+        seek_index = self.ffmpeg.get_seek_index(input_path)
+        total_frames = seek_index.frame_count
+
+        # Shot boundaries place splits and reset temporal state in workers
+        try:
+            scene_index = self.ffmpeg.get_scene_index(input_path)
+        except (subprocess.CalledProcessError, ValueError) as e:
+            logger.warning(f"No scene index, converting without shot boundaries: {e}")
+            scene_index = SceneIndex(total_frames, [])
+
+        segments = plan_segments(
+            [frame for _, frame in seek_index.keyframes],
+            total_frames,
+            self.segments,
+            self.overlap_frames,
+            scene_cuts=scene_index.cuts
+        )
+        workers = min(self.workers, len(segments))
+        logger.info(f"Converting {len(segments)} segments with {workers} worker(s): {segments}")
+
+        # Segments encoded by an earlier, interrupted run are reused
+        results: List[Optional[List[Path]]] = [None] * len(segments)
+        if journal is not None:
+            for segment in segments:
+                results[segment.index] = journal.segment_outputs(segment.key)
+        pending = [segment for segment in segments if results[segment.index] is None]
+        if len(pending) < len(segments):
+            logger.info(f"Reusing {len(segments) - len(pending)} segments from the journal")
+
+        # Bars are detected once, so every segment crops the same picture
+        processor_options = dict(processor_options or {})
+        active_area = None
+        if pending and processor_options.get("crop_bars", True):
+            active_area = detect_video_active_area(self.ffmpeg, input_path)
+        processor_options["crop_bars"] = False
+
+        work_dir.mkdir(parents=True, exist_ok=True)
+        jobs = [
+            {
+                "segment": segment,
+                "targets": list(targets),
+                "input_path": str(input_path),
+                "work_dir": str(work_dir),
+                "fps": fps,
+                "depth_intensity": depth_intensity,
+                "active_area": active_area,
+                "scene_cuts": scene_index.cuts_between(
+                    segment.first_frame, segment.stop if segment.stop is not None else scene_index.frame_count
+                ),
+            }
+            for segment in pending
+        ]
+        # Workers share one benchmarked frame format
+        processor_options["intermediate_format"] = get_intermediate_format(
+            processor_options.get("intermediate_format", "png"), work_dir
+        ).name
+        initargs = (
+            self.ffmpeg.ffmpeg_path,
+            estimator_options or {},
+            renderer_options or {},
+            processor_options,
+            max(1, (os.cpu_count() or 1) // workers),
+        )
+
+        # Spawned workers do not inherit the parent's model or CUDA state
+        if jobs:
+            with ProcessPoolExecutor(
+                max_workers=min(workers, len(jobs)),
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+                initargs=initargs
+            ) as pool:
+                futures = {pool.submit(_convert_segment, job): job["segment"] for job in jobs}
+                done = len(segments) - len(jobs)
+                for future in as_completed(futures):
+                    segment = futures[future]
+                    results[segment.index] = future.result()
+                    if journal is not None:
+                        journal.mark_segment(segment.key, results[segment.index])
+
+                    done += 1
+                    logger.info(f"Finished {segment} ({done}/{len(segments)})")
+                    if progress_callback:
+                        progress_callback(done, len(segments))
+
+        audio_source = input_path if keep_audio and (info["has_audio"] or all_tracks) else None
+        for i, target in enumerate(targets):
+            self.ffmpeg.concat_segments(
+                [paths[i] for paths in results],
+                target.path,
+                audio_source=audio_source,
+                all_tracks=all_tracks
+            )
+
+        return [target.path for target in targets]
@@ -0,0 +1,109 @@
+"""
+Static Frame Detection Module
+
+Cheap similarity check between consecutive video frames, so repeated or
+near-static frames (animation on twos, slideshows, telecine duplicates,
+title cards) can reuse earlier depth maps or whole rendered outputs
+instead of running inference and rendering again.
+"""
+
+from typing import Optional, Tuple
+import cv2
+import numpy as np
+
+# What a frame can reuse from earlier frames
+REUSE_OUTPUT = "output"
+REUSE_DEPTH = "depth"
+
+
+class StaticFrameDetector:
+    """
+    Decides per frame whether earlier results can be reused.
+
+    Frames are compared as small area-averaged thumbnails by mean absolute
+    difference (0-255 scale). A frame reuses the last rendered output if
+    it is within ``output_threshold`` of the frame that output was rendered
+    from, or the last estimated depth map if it is within
+    ``depth_threshold`` of the frame that depth came from. Comparing with
+    those reference frames, not the previous frame, keeps slow changes
+    from accumulating.
+    """
+
+    def __init__(
+        self,
+        output_threshold: float = 0.5,
+        depth_threshold: float = 2.0,
+        size: Tuple[int, int] = (64, 36)
+    ):
+        """
+        Initialize detector.
+
+        Args:
+            output_threshold: Largest difference at which the rendered
+                output is reused (encoder noise on a repeated frame stays
+                well below 0.5 after averaging)
+            depth_threshold: Largest difference at which the depth map is
+                reused (the frame itself is still rendered)
+            size: (width, height) of the compared thumbnails
+        """
+        if not 0 <= output_threshold <= depth_threshold:
+            raise ValueError(
+                f"Thresholds must satisfy 0 <= output ({output_threshold}) <= depth ({depth_threshold})"
+            )
+
+        self.output_threshold = output_threshold
+        self.depth_threshold = depth_threshold
+        self.size = size
+        self.reset()
+
+    def reset(self):
+        """Forget the reference frames and counters (e.g. for a new sequence)."""
+        self._rendered: Optional[np.ndarray] = None
+        self._estimated: Optional[np.ndarray] = None
+        self.frames = 0
+        self.outputs_reused = 0
+        self.depths_reused = 0
+
+    def _signature(self, image: np.ndarray) -> np.ndarray:
+        """Small float32 luma-like thumbnail of a frame."""
+        thumbnail = cv2.resize(image, self.size, interpolation=cv2.INTER_AREA)
+        if thumbnail.ndim == 3:
+            thumbnail = thumbnail.mean(axis=2, dtype=np.float32)
+        return thumbnail.astype(np.float32)
+
+    def check(self, image: np.ndarray, can_reuse_output: bool = True) -> Optional[str]:
+        """
+        Classify the next frame of the sequence.
+
+        Args:
+            image: Frame (or the picture area of it), uint8
+            can_reuse_output: Whether the caller still has the last output
+                (e.g. not after a resume)
+
+        Returns:
+            REUSE_OUTPUT, REUSE_DEPTH, or None if the frame must be processed
+        """
+        signature = self._signature(image)
+        self.frames += 1
+
+        if can_reuse_output and self._rendered is not None:
+            if cv2.norm(signature, self._rendered, cv2.NORM_L1) / signature.size <= self.output_threshold:
+                self.outputs_reused += 1
+                return REUSE_OUTPUT
+
+        self._rendered = signature
+        if self._estimated is not None:
+            if cv2.norm(signature, self._estimated, cv2.NORM_L1) / signature.size <= self.depth_threshold:
+                self.depths_reused += 1
+                return REUSE_DEPTH
+
+        self._estimated = signature
+        return None
+
+    @property
+    def summary(self) -> str:
+        """Human-readable reuse counts."""
+        return (
+            f"{self.outputs_reused} of {self.frames} frames reused the previous output, "
+            f"{self.depths_reused} reused the previous depth map"
+        )
@@ -0,0 +1,39 @@
+"""
+Tests for Depth Map Post-processing
+"""
+import pytest
+import numpy as np
+from src.ai_core.postprocessing import SMOOTHING_METHODS, enhance_edges, smooth_depth_map
+
+
+class TestPostprocessing:
+    """Test depth post-processing functions"""
+
+    @pytest.mark.parametrize("method", SMOOTHING_METHODS)
+    @pytest.mark.parametrize("dtype", [np.float32, np.float16])
+    def test_smoothing_keeps_float_dtype(self, sample_depth_map, method, dtype):
+        """Smoothing returns half floats for half input, float32 otherwise"""
+        smoothed = smooth_depth_map(sample_depth_map.astype(dtype), method)
+
+        assert smoothed.shape == sample_depth_map.shape
+        assert smoothed.dtype == dtype
+
+    def test_fast_bilateral_preserves_edges(self):
+        """Reduced-grid smoothing removes noise but keeps a depth step"""
+        rng = np.random.default_rng(0)
+        depth = np.full((1080, 1920), 0.2, dtype=np.float32)
+        depth[:, 960:] = 0.8
+        noisy = depth + rng.normal(0, 0.02, depth.shape).astype(np.float32)
+
+        smoothed = smooth_depth_map(noisy, "fast_bilateral", strength=8)
+
+        assert smoothed[:, 100:900].std() < noisy[:, 100:900].std() / 2
+        assert abs(smoothed[:, :950].mean() - 0.2) < 0.01
+        assert abs(smoothed[:, 970:].mean() - 0.8) < 0.01
+
+    def test_enhance_edges_float32(self, sample_depth_map):
+        """Edge enhancement stays float32 and within [0, 1]"""
+        enhanced = enhance_edges(sample_depth_map.astype(np.float16))
+
+        assert enhanced.dtype == np.float32
+        assert 0.0 <= enhanced.min() and enhanced.max() <= 1.0
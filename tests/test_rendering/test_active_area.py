@@ -0,0 +1,39 @@
+"""
+Tests for Active Picture Area
+"""
+import pytest
+import numpy as np
+from src.rendering.active_area import ActiveArea
+from src.rendering.sbs_composer import SBSComposer
+
+
+class TestActiveArea:
+    """Test ActiveArea class"""
+
+    def test_detect_letterbox(self, sample_image):
+        """Bars are found and bounds rounded inward to even rows/columns"""
+        frame = np.zeros_like(sample_image)
+        frame[61:419, 3:] = 128
+
+        area = ActiveArea.detect([frame])
+
+        assert (area.top, area.bottom, area.left, area.right) == (62, 418, 0, 640)
+        assert area.shape == (356, 640)
+
+    def test_detect_full_frame(self, sample_image):
+        """A picture without bars (or a black frame) is not cropped"""
+        assert ActiveArea.detect([sample_image + 64]).is_full
+        assert ActiveArea.detect([np.zeros_like(sample_image)]).is_full
+
+    @pytest.mark.parametrize("output_format", ['half_sbs', 'full_sbs', 'top_bottom', 'checkerboard'])
+    def test_paste_restores_bars(self, sample_image, output_format):
+        """Picture-area frames land at the picture position of every eye"""
+        source = np.zeros_like(sample_image)
+        source[60:420] = sample_image[60:420] | 32
+        area = ActiveArea(480, 640, 60, 420)
+
+        picture = area.crop(source)
+        frame = SBSComposer.compose(picture, picture, output_format)
+        output = area.paste(frame, source, output_format)
+
+        assert np.array_equal(output, SBSComposer.compose(source, source, output_format))
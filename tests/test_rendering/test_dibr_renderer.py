@@ -32,3 +32,138 @@ class TestDIBRRenderer:
         # assert left.shape == sample_image.shape
         # assert right.shape == sample_image.shape
         pass
+
+    
+    @pytest.mark.parametrize("output_format", ["half_sbs", "top_bottom"])
+    def test_render_half_format(self, sample_image, sample_depth_map, output_format):
+        """Test direct half-resolution rendering matches render + downscale"""
+        from src.rendering.sbs_composer import SBSComposer
+        
+        renderer = DIBRRenderer()
+        left, right = renderer.render_stereo_pair(sample_image, sample_depth_map)
+        if output_format == "half_sbs":
+            expected = SBSComposer.compose_half_sbs(left, right)
+        else:
+            expected = SBSComposer.compose_top_bottom(left, right, half=True)
+        
+        out = np.empty_like(expected)
+        output = renderer.render_half_format(
+            sample_image, sample_depth_map, output_format, out=out
+        )
+        
+        assert output is out
+        assert np.abs(output.astype(int) - expected).mean() < 1.0
+    
+    @pytest.mark.parametrize("output_format", ["row_interleaved", "column_interleaved", "checkerboard"])
+    @pytest.mark.parametrize("stereo_mode", ["symmetric", "right_reference"])
+    def test_render_interleaved(self, sample_image, sample_depth_map, output_format, stereo_mode):
+        """Test rendering only the interleaved samples matches the full views"""
+        from src.rendering.sbs_composer import SBSComposer
+        
+        renderer = DIBRRenderer(stereo_mode=stereo_mode)
+        expected = SBSComposer.compose(
+            *renderer.render_stereo_pair(sample_image, sample_depth_map), output_format
+        )
+        output = SBSComposer.interleave_eyes(
+            *renderer.render_interleaved(sample_image, sample_depth_map, output_format),
+            output_format
+        )
+        
+        assert np.array_equal(output, expected)
+    
+    def test_layered_mode(self, sample_image, sample_depth_map):
+        """Test layered rendering stays close to the per-pixel remap"""
+        reference = DIBRRenderer()
+        renderer = DIBRRenderer(render_mode='layered')
+        
+        ref_left, ref_right = reference.render_stereo_pair(sample_image, sample_depth_map)
+        left, right = renderer.render_stereo_pair(sample_image, sample_depth_map)
+        
+        assert left.shape == sample_image.shape
+        assert np.abs(left.astype(int) - ref_left).mean() < 2.0
+        assert np.abs(right.astype(int) - ref_right).mean() < 2.0
+    
+    @pytest.mark.parametrize("depth_dtype", ["float16", "uint16"])
+    def test_compact_depth(self, sample_image, sample_depth_map, depth_dtype):
+        """Test compact depth maps render like float32 ones"""
+        from src.ai_core.postprocessing import quantize_depth
+        
+        renderer = DIBRRenderer()
+        compact = quantize_depth(sample_depth_map, depth_dtype)
+        
+        disparity = renderer.compute_disparity(compact)
+        assert disparity.dtype == np.float32
+        assert np.allclose(disparity, renderer.compute_disparity(sample_depth_map), atol=0.02)
+        
+        expected = renderer.render_half_format(sample_image, sample_depth_map)
+        output = renderer.render_half_format(sample_image, compact)
+        assert np.abs(output.astype(int) - expected).max() <= 2
+    
+    @pytest.mark.parametrize("render_mode", ["remap", "layered"])
+    def test_left_reference_mode(self, sample_image, sample_depth_map, render_mode):
+        """Test the left eye is the source frame and only the right is synthesized"""
+        renderer = DIBRRenderer(render_mode=render_mode, stereo_mode='left_reference')
+        left, right = renderer.render_stereo_pair(sample_image, sample_depth_map)
+        
+        assert renderer.reference_eye == 'left'
+        assert left is sample_image
+        
+        # Right eye carries the full disparity: twice the symmetric shift
+        symmetric = DIBRRenderer(render_mode=render_mode, ipd=130.0)
+        _, expected = symmetric.render_stereo_pair(sample_image, sample_depth_map)
+        assert np.abs(right.astype(int) - expected).mean() < 1.0
+
+
+    def test_disocclusion_masks(self):
+        """Only the background revealed beside a near object is masked"""
+        renderer = DIBRRenderer(stereo_mode='left_reference')
+        depth = np.ones((32, 200), dtype=np.float32)
+        depth[:, :100] = 0.0
+
+        left_mask, right_mask = renderer.disocclusion_masks(depth, depth_intensity=100)
+
+        # Right eye samples at x + d: the near half (d = 32.5 px) reaches
+        # into the far half over its last 32-33 columns
+        assert left_mask is None
+        assert right_mask[:, 68:100].all()
+        assert not right_mask[:, :67].any()
+        assert not right_mask[:, 100:].any()
+
+
+class TestTorchDIBRRenderer:
+    """Test tensor DIBR backend"""
+    
+    def test_matches_opencv_backend(self, sample_image, sample_depth_map):
+        """Test grid_sample output is comparable to the OpenCV path"""
+        pytest.importorskip("torch")
+        from src.rendering.dibr_renderer import create_renderer
+        
+        reference = DIBRRenderer()
+        renderer = create_renderer('torch')
+        
+        ref_left, ref_right = reference.render_stereo_pair(sample_image, sample_depth_map)
+        left, right = renderer.render_stereo_pair(sample_image, sample_depth_map)
+        
+        assert left.shape == sample_image.shape
+        assert np.abs(left.astype(int) - ref_left).max() <= 2
+        assert np.abs(right.astype(int) - ref_right).max() <= 2
+
+    @pytest.mark.parametrize("depth_dtype", ['float16', 'uint16'])
+    def test_compact_depth_matches_opencv_backend(self, sample_image, sample_depth_map, depth_dtype):
+        """Compact depth is dequantized like in the OpenCV path"""
+        pytest.importorskip("torch")
+        import torch
+        from src.ai_core.postprocessing import quantize_depth
+        from src.rendering.dibr_renderer import create_renderer
+        
+        depth = quantize_depth(sample_depth_map, depth_dtype)
+        reference = DIBRRenderer()
+        renderer = create_renderer('torch')
+        
+        ref_left, ref_right = reference.render_stereo_pair(sample_image, depth)
+        left, right = renderer.render_stereo_pair(sample_image, depth)
+        batch_left, _ = renderer.render_stereo_batch([sample_image], torch.from_numpy(depth[np.newaxis]))
+        
+        assert np.abs(left.astype(int) - ref_left).max() <= 2
+        assert np.abs(right.astype(int) - ref_right).max() <= 2
+        assert np.array_equal(renderer.to_numpy(batch_left)[0], left)
@@ -0,0 +1,60 @@
+"""
+Tests for Hole Filling
+"""
+import numpy as np
+from src.rendering.dibr_renderer import DIBRRenderer
+from src.rendering.hole_filling import TemporalHoleFiller
+
+NO_HOLES = (None, None)
+
+
+class TestTemporalHoleFiller:
+    """Test TemporalHoleFiller class"""
+
+    def test_fills_from_background_plate(self):
+        """Holes are filled with background seen in an earlier frame"""
+        filler = TemporalHoleFiller()
+        depth = np.ones((48, 64), dtype=np.float32)
+        background = np.full((48, 64, 3), 120, dtype=np.uint8)
+
+        filler.fill_stereo_pair(background, background, depth, NO_HOLES)
+
+        # Next frame has a disocclusion in the left view
+        left = background.copy()
+        left[10:20, 10:20] = 0
+        mask = np.zeros((48, 64), dtype=np.float32)
+        mask[10:20, 10:20] = 1
+        left_filled, right_filled = filler.fill_stereo_pair(left, background, depth, (mask, None))
+
+        assert (left_filled[10:20, 10:20] == 120).all()
+        assert (right_filled == background).all()
+
+    def test_reset_on_scene_change(self, sample_image, sample_depth_map):
+        """A large depth change drops the accumulated plates"""
+        filler = TemporalHoleFiller()
+        filler.fill_stereo_pair(sample_image, sample_image, sample_depth_map, NO_HOLES)
+        assert filler.plates['left'][1][:, 400:].all()
+
+        filler.fill_stereo_pair(sample_image, sample_image, 1.0 - sample_depth_map, NO_HOLES)
+
+        # Background of the previous shot is gone from the plate
+        assert not filler.plates['left'][1][:, 400:].any()
+
+    def test_dark_content_is_not_a_hole(self):
+        """Dark but validly rendered pixels keep their values"""
+        renderer = DIBRRenderer()
+        filler = TemporalHoleFiller()
+        depth = np.ones((48, 64), dtype=np.float32)
+        background = np.full((48, 64, 3), 120, dtype=np.uint8)
+        renderer_views = renderer.render_stereo_pair(background, depth)
+        filler.fill_stereo_pair(*renderer_views, depth, renderer.disocclusion_masks(depth))
+
+        # A night scene: the same far plane turns almost black
+        dark = np.full((48, 64, 3), 4, dtype=np.uint8)
+        left, right = renderer.render_stereo_pair(dark, depth)
+        left_filled, right_filled = filler.fill_stereo_pair(
+            left, right, depth, renderer.disocclusion_masks(depth)
+        )
+
+        assert (left_filled == left).all()
+        assert (right_filled == right).all()
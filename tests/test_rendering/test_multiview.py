@@ -0,0 +1,42 @@
+"""
+Tests for Multi-view Rendering
+"""
+import numpy as np
+from src.rendering.dibr_renderer import DIBRRenderer
+from src.rendering.multiview import MultiViewRenderer, MultiViewComposer
+
+
+class TestMultiViewRenderer:
+    """Test MultiViewRenderer class"""
+
+    def test_two_views_match_stereo_pair(self, sample_image, sample_depth_map):
+        """Outer views use the same disparity as a stereo pair"""
+        left, right = DIBRRenderer().render_stereo_pair(sample_image, sample_depth_map)
+        views = MultiViewRenderer(num_views=2).render_views(sample_image, sample_depth_map)
+
+        assert np.array_equal(views[0], left)
+        assert np.array_equal(views[1], right)
+
+    def test_lenticular_matches_interleaved_views(self, sample_image, sample_depth_map):
+        """Direct lenticular rendering equals interleaving rendered views"""
+        renderer = MultiViewRenderer(num_views=9)
+        composer = MultiViewComposer(num_views=9, pitch=7.5, slant=1 / 6)
+
+        views = renderer.render_views(sample_image, sample_depth_map)
+        expected = composer.compose_lenticular(views)
+        output = renderer.render_lenticular(sample_image, sample_depth_map, composer)
+
+        assert np.array_equal(output, expected)
+
+    def test_render_into_tiles(self, sample_image, sample_depth_map):
+        """Views can be rendered straight into a tiled frame"""
+        renderer = MultiViewRenderer(num_views=4)
+        composer = MultiViewComposer(num_views=4)
+
+        frame = np.zeros(composer.tiled_shape(240, 320) + (3,), dtype=np.uint8)
+        views = renderer.render_views(
+            sample_image, sample_depth_map, out=composer.split_tiles(frame)
+        )
+
+        assert frame.shape == (480, 640, 3)
+        assert np.array_equal(composer.compose_tiled(views), frame)
@@ -0,0 +1,64 @@
+"""
+Tests for SBS Composer
+"""
+import pytest
+import numpy as np
+from src.rendering.sbs_composer import SBSComposer, FrameBufferPool
+
+
+class TestSBSComposer:
+    """Test SBSComposer class"""
+
+    @pytest.mark.parametrize(
+        "output_format",
+        [f for f in SBSComposer.FORMATS if f not in SBSComposer.RGBD_FORMATS]
+    )
+    def test_out_buffer_and_bgr(self, sample_image, output_format):
+        """Composing into a buffer as BGR matches the RGB result reversed"""
+        left = sample_image
+        right = np.roll(sample_image, 5, axis=1)
+        expected = SBSComposer.compose(left, right, output_format)
+
+        h, w = left.shape[:2]
+        out = np.empty(SBSComposer.output_shape(h, w, output_format) + (3,), dtype=np.uint8)
+        result = SBSComposer.compose(left, right, output_format, out=out, bgr=True)
+
+        assert result is out
+        assert np.array_equal(result, expected[..., ::-1])
+
+    @pytest.mark.parametrize("depth_bits", SBSComposer.RGBD_DEPTH_BITS)
+    def test_rgbd_packs_frame_and_depth(self, sample_image, sample_depth_map, depth_bits):
+        """2D + depth keeps the frame and stores near depth as white"""
+        output = SBSComposer.compose_rgbd(
+            sample_image, sample_depth_map, 'rgbd_tb', depth_bits=depth_bits
+        )
+
+        h, w = sample_image.shape[:2]
+        levels = (1 << depth_bits) - 1
+        codes = output[h:].astype(np.int64) * levels // 65535 if depth_bits > 8 else output[h:]
+
+        assert output.shape == (2 * h, w, 3)
+        assert np.array_equal(output[:h] >> (8 if depth_bits > 8 else 0), sample_image)
+        assert codes[:, 0].min() == levels and codes[:, -1].max() == 0
+
+    def test_buffer_pool_recycles(self):
+        """Pool hands out the same buffers in a ring"""
+        pool = FrameBufferPool(size=2)
+        first = pool.acquire((4, 4, 3))
+        pool.acquire((4, 4, 3))
+
+        assert pool.acquire((4, 4, 3)) is first
+
+    def test_watermark_only_touches_roi(self, sample_image):
+        """Watermark blends a small region and leaves the rest untouched"""
+        result = SBSComposer.add_watermark(sample_image, position='bottom_right')
+
+        changed = np.any(result != sample_image, axis=2)
+        ys, xs = np.nonzero(changed)
+        assert changed.any()
+        assert ys.min() > sample_image.shape[0] // 2
+        assert xs.min() > 0
+
+        frame = sample_image.copy()
+        assert SBSComposer.add_watermark(frame, inplace=True) is frame
+        assert np.array_equal(frame, result)
@@ -0,0 +1,38 @@
+"""
+Tests for Stereoscopy Parameters
+"""
+import pytest
+from src.rendering.stereoscopy import StereoscopyManager
+
+
+class TestContentPresets:
+    """Test StereoscopyManager.adjust_for_content_type"""
+
+    @pytest.mark.parametrize("content_type", ["action", "documentary", "animation", "talking_head", "other"])
+    def test_presets_are_symmetric(self, content_type):
+        """Presets render both eyes unless a reference mode is requested"""
+        manager = StereoscopyManager()
+        preset = manager.adjust_for_content_type(content_type)
+
+        assert preset['stereo_mode'] == 'symmetric'
+        assert manager.stereo_mode == 'symmetric'
+
+    def test_explicit_reference_mode(self):
+        """An explicit stereo_mode overrides the preset's mode only"""
+        manager = StereoscopyManager()
+        preset = manager.adjust_for_content_type('documentary', stereo_mode='left_reference')
+
+        assert preset == {'depth_intensity': 65, 'convergence': 1.0, 'stereo_mode': 'left_reference'}
+        assert manager.stereo_mode == 'left_reference'
+        assert manager.validate_parameters()
+
+        # The next preset without an override is symmetric again
+        manager.adjust_for_content_type('documentary')
+        assert manager.stereo_mode == 'symmetric'
+
+    def test_unknown_stereo_mode_rejected(self):
+        """Unknown modes raise instead of reaching the renderer"""
+        manager = StereoscopyManager()
+
+        with pytest.raises(ValueError):
+            manager.adjust_for_content_type('action', stereo_mode='center')
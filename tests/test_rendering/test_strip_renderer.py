@@ -0,0 +1,63 @@
+"""
+Tests for Strip-parallel Rendering
+"""
+import pytest
+import numpy as np
+from src.rendering.dibr_renderer import DIBRRenderer
+from src.rendering.hole_filling import fill_stereo_pair_holes
+from src.rendering.sbs_composer import SBSComposer
+from src.rendering.strip_renderer import StripRenderer
+
+
+class TestStripRenderer:
+    """Test StripRenderer class"""
+
+    @pytest.mark.parametrize("output_format", ['half_sbs', 'top_bottom', 'full_sbs', 'anaglyph',
+                                               'row_interleaved', 'checkerboard'])
+    @pytest.mark.parametrize("render_mode", ['remap', 'layered'])
+    def test_matches_whole_frame(self, sample_image, output_format, render_mode):
+        """Strips produce the same frame as rendering it in one piece"""
+        rng = np.random.default_rng(0)
+        image = rng.integers(0, 256, sample_image.shape, dtype=np.uint8)
+        depth = rng.random(sample_image.shape[:2], dtype=np.float32)
+
+        renderer = DIBRRenderer(render_mode=render_mode)
+        composer = SBSComposer()
+        if output_format in ('half_sbs', 'top_bottom'):
+            expected = renderer.render_half_format(image, depth, output_format)
+        else:
+            expected = composer.compose(*renderer.render_stereo_pair(image, depth), output_format)
+
+        strips = StripRenderer(renderer, composer, workers=4, hole_method=None)
+        output = strips.render(image, depth, output_format, bgr=True)
+        strips.close()
+
+        assert len(strips.split_rows(image.shape[0])) == 4
+        assert np.array_equal(output, expected[:, :, ::-1])
+
+    @pytest.mark.parametrize("output_format", ['half_sbs', 'top_bottom', 'full_sbs', 'row_interleaved'])
+    def test_hole_filling_matches_whole_frame(self, sample_image, output_format):
+        """Holes reaching across strip seams are filled like in one piece"""
+        rng = np.random.default_rng(0)
+        image = rng.integers(0, 256, sample_image.shape, dtype=np.uint8)
+        image[100:400, 150:550] = 0
+        depth = rng.random(sample_image.shape[:2], dtype=np.float32)
+
+        renderer = DIBRRenderer()
+        composer = SBSComposer()
+        if output_format in ('half_sbs', 'top_bottom'):
+            expected = renderer.render_half_format(image, depth, output_format)
+            left, right = renderer.split_half_format(expected, output_format)
+            left[...], right[...] = fill_stereo_pair_holes(left, right)
+        elif output_format == 'row_interleaved':
+            views = fill_stereo_pair_holes(*renderer.render_interleaved(image, depth, output_format))
+            expected = composer.interleave_eyes(*views, output_format)
+        else:
+            views = fill_stereo_pair_holes(*renderer.render_stereo_pair(image, depth))
+            expected = composer.compose(*views, output_format)
+
+        strips = StripRenderer(renderer, composer, workers=4)
+        output = strips.render(image, depth, output_format)
+        strips.close()
+
+        assert np.array_equal(output, expected)
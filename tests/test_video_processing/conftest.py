@@ -0,0 +1,17 @@
+"""
+Video Processing Test Fixtures
+"""
+import pytest
+from src.video_processing.ffmpeg_handler import FFmpegHandler
+from src.video_processing.probe_cache import ProbeCache
+
+
+@pytest.fixture
+def make_ffmpeg_handler(monkeypatch):
+    """Factory for FFmpegHandlers that skip the FFmpeg binary check"""
+    monkeypatch.setattr(FFmpegHandler, "_verify_ffmpeg", lambda self: True)
+
+    def make(ffmpeg_path="/usr/bin/ffmpeg", probe_cache=None):
+        return FFmpegHandler(ffmpeg_path=str(ffmpeg_path), probe_cache=probe_cache or ProbeCache())
+
+    return make
@@ -0,0 +1,276 @@
+"""
+Tests for the Video Conversion Script
+"""
+from concurrent.futures import Future
+from pathlib import Path
+import cv2
+import numpy as np
+import pytest
+from scripts.utils import convert_video as convert_video_module
+from src.ai_core.temporal_filter import TemporalFilter
+from src.video_processing.batch_processor import detect_video_active_area
+from src.video_processing.frame_reader import DualResolutionReader
+from src.video_processing.intermediate_format import get_intermediate_format
+from src.video_processing import segmented_converter
+from src.video_processing.scene_index import SceneIndex
+from src.video_processing.seek_index import SeekIndex
+from src.video_processing.segmented_converter import SegmentedConverter, VideoSegment
+
+FRAME_COUNT = 8
+SCENE_CUT = 5
+
+
+def make_frames():
+    """Letterboxed frames: a moving square, frame 4 repeating frame 3, a cut at SCENE_CUT"""
+    frames = []
+    for i in range(FRAME_COUNT):
+        frame = np.zeros((120, 160, 3), dtype=np.uint8)
+        picture = frame[16:104]
+        step = 3 if i == 4 else i
+        picture[:] = np.linspace(60 + 8 * step, 180, 160, dtype=np.uint8)[None, :, None]
+        if i >= SCENE_CUT:
+            picture[:] = 255 - picture
+        x = 20 + 8 * step
+        cv2.rectangle(picture, (x, 30), (x + 30, 60), (230, 90, 40), -1)
+        frames.append(frame)
+    return frames
+
+
+class FakeFFmpegHandler:
+    """FFmpeg stand-in that 'decodes' make_frames()"""
+
+    ffmpeg_path = "ffmpeg"
+
+    def __init__(self, *args, **kwargs):
+        self.frames = make_frames()
+        self.reads = []
+
+    def get_video_info(self, video_path):
+        return {
+            "width": 160, "height": 120, "fps": 24.0, "duration": FRAME_COUNT / 24.0,
+            "codec": "h264", "has_audio": False, "frame_count": FRAME_COUNT,
+        }
+
+    def get_scene_index(self, video_path, threshold=0.3):
+        return SceneIndex(FRAME_COUNT, [(SCENE_CUT, 0.9)], threshold)
+
+    def get_seek_index(self, video_path):
+        return SeekIndex(0.0, FRAME_COUNT, [(0.0, 0), (SCENE_CUT / 24.0, SCENE_CUT)])
+
+    def read_frame(self, video_path, frame_number):
+        self.reads.append(frame_number)
+        return self.frames[frame_number]
+
+    def concat_segments(self, segment_paths, output_path, audio_source=None, all_tracks=False):
+        Path(output_path).write_bytes(b"video")
+
+    def extract_frames(self, video_path, output_dir, fps=None, intermediate_format="png"):
+        image_format = get_intermediate_format(intermediate_format)
+        for i, frame in enumerate(self.frames, 1):
+            image_format.write(Path(output_dir) / (image_format.pattern % i), frame)
+        return len(self.frames)
+
+
+class FrameFileReader(DualResolutionReader):
+    """Video reader over extracted frames; model frames are the uncropped picture"""
+
+    def __init__(self, frame_paths, active_area=None):
+        self.frame_paths = frame_paths
+        self.active_area = active_area
+
+    def __len__(self):
+        return len(self.frame_paths)
+
+    def __iter__(self):
+        for path in self.frame_paths:
+            image = cv2.cvtColor(cv2.imread(str(path)), cv2.COLOR_BGR2RGB)
+            picture = image if self.active_area is None else self.active_area.crop(image)
+            yield image, np.ascontiguousarray(picture)
+
+
+class FakePool:
+    """Runs nothing; records the jobs a conversion hands to its workers"""
+
+    jobs = []
+    initargs = ()
+
+    def __init__(self, *args, initargs=(), **kwargs):
+        FakePool.jobs = []
+        FakePool.initargs = initargs
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+    def submit(self, fn, job):
+        FakePool.jobs.append(job)
+        future = Future()
+        future.set_result([Path(job["work_dir"]) / f"segment_{job['segment'].key}.mp4"])
+        return future
+
+
+class FakeEstimator:
+    """Depth from brightness, so outputs depend on every frame"""
+
+    device = "cpu"
+    batch_size = 4
+
+    def __init__(self, *args, **kwargs):
+        pass
+
+    def estimate_depth(self, image, normalize=True):
+        depth = cv2.cvtColor(image, cv2.COLOR_RGB2GRAY).astype(np.float32)
+        if normalize:
+            # Like the model's min-max range, so bars in the input change depth
+            depth = (depth - depth.min()) / max(float(depth.max() - depth.min()), 1.0)
+        return depth
+
+    def batch_estimate(self, images, normalize=True, batch_size=4, output_size=None):
+        return [self.estimate_depth(image, normalize) for image in images]
+
+
+class FakeEncoder:
+    """Collects the frames each output would be encoded from"""
+
+    outputs = {}
+
+    def __init__(self, *args, **kwargs):
+        pass
+
+    def encode_from_frames(self, frame_dir, output_path, frame_pattern="frame_%06d.png", **kwargs):
+        extension = Path(frame_pattern).suffix
+        FakeEncoder.outputs[Path(output_path)] = [
+            cv2.imread(str(path)) for path in sorted(Path(frame_dir).glob(f"frame_*{extension}"))
+        ]
+        Path(output_path).write_bytes(b"video")
+
+
+class CountingTemporalFilter(TemporalFilter):
+    """Temporal filter that counts its resets"""
+
+    resets = 0
+
+    def reset(self):
+        CountingTemporalFilter.resets += 1
+        super().reset()
+
+
+@pytest.fixture
+def fake_pipeline(tmp_path, monkeypatch):
+    """Run convert_video on make_frames() without ffmpeg or a depth model"""
+    monkeypatch.setattr(convert_video_module, "WORK_ROOT", tmp_path / "work")
+    monkeypatch.setattr(convert_video_module, "FFmpegHandler", FakeFFmpegHandler)
+    monkeypatch.setattr(convert_video_module, "DepthEstimator", FakeEstimator)
+    monkeypatch.setattr(convert_video_module, "VideoEncoder", FakeEncoder)
+    monkeypatch.setattr(convert_video_module, "TemporalFilter", CountingTemporalFilter)
+    FakeEncoder.outputs = {}
+    CountingTemporalFilter.resets = 0
+
+    input_path = tmp_path / "movie.mp4"
+    input_path.write_bytes(b"video")
+    return input_path
+
+
+class TestConvertVideo:
+    """Test the single-process conversion loop"""
+
+    @pytest.mark.parametrize("temporal_method", ["ema", "median", "gaussian"])
+    def test_converts_every_frame(self, tmp_path, fake_pipeline, temporal_method, caplog):
+        """Temporal filtering, cut resets, static reuse and bar cropping run end to end"""
+        output_path = tmp_path / "movie_3d.mp4"
+        caplog.set_level("INFO")
+
+        convert_video_module.convert_video(
+            fake_pipeline, output_path, temporal_method=temporal_method, intermediate_format="png"
+        )
+
+        frames = FakeEncoder.outputs[output_path]
+        assert len(frames) == FRAME_COUNT
+        assert all(frame.shape == (120, 160, 3) for frame in frames)
+        # Bars are put back black; the duplicate reuses the previous output
+        assert frames[0][:8].max() == 0
+        assert np.array_equal(frames[3], frames[4])
+        assert "Black bars detected" in caplog.text
+        assert CountingTemporalFilter.resets == 1
+
+    @pytest.mark.parametrize("output_format", ["half_sbs", "anaglyph"])
+    def test_segment_workers_match_single_process(self, tmp_path, fake_pipeline, monkeypatch, output_format):
+        """A segment worker runs the same pipeline as the single-process loop"""
+        options = dict(
+            output_format=output_format, depth_intensity=75.0,
+            temporal_method="median", intermediate_format="png"
+        )
+        output_path = tmp_path / "movie_3d.mp4"
+        convert_video_module.convert_video(fake_pipeline, output_path, **options)
+        expected = FakeEncoder.outputs[output_path]
+
+        # Options the segmented branch hands to its workers
+        segmented = {}
+        monkeypatch.setattr(
+            convert_video_module, "_convert_segmented",
+            lambda input_path, targets, workers, **kwargs: segmented.update(kwargs, targets=targets)
+        )
+        convert_video_module.convert_video(fake_pipeline, output_path, workers=2, **options)
+
+        monkeypatch.setattr(segmented_converter, "FFmpegHandler", FakeFFmpegHandler)
+        monkeypatch.setattr(segmented_converter, "DepthEstimator", FakeEstimator)
+        monkeypatch.setattr(segmented_converter, "_worker", {})
+        segmented_converter._init_worker(
+            "ffmpeg", segmented["estimator_options"], segmented["renderer_options"],
+            segmented["processor_options"], 1
+        )
+
+        # The worker reads extracted frames instead of streaming the video
+        frames_dir = tmp_path / "frames"
+        frames_dir.mkdir()
+        FakeFFmpegHandler().extract_frames(fake_pipeline, frames_dir)
+        frame_paths = sorted(frames_dir.glob("frame_*.png"))
+        processor = segmented_converter._worker["processor"]
+        monkeypatch.setattr(
+            processor, "open_video",
+            lambda *args, active_area=None, **kwargs: FrameFileReader(frame_paths, active_area)
+        )
+        segmented_converter._worker["encoder"] = FakeEncoder()
+
+        segment_paths = segmented_converter._convert_segment({
+            "segment": VideoSegment(0, 0, None),
+            "targets": segmented["targets"],
+            "input_path": str(fake_pipeline),
+            "work_dir": str(tmp_path / "segments"),
+            "fps": 24.0,
+            "depth_intensity": segmented["depth_intensity"],
+            "active_area": detect_video_active_area(FakeFFmpegHandler(), fake_pipeline),
+            "scene_cuts": [SCENE_CUT],
+        })
+
+        actual = FakeEncoder.outputs[segment_paths[0]]
+        assert len(actual) == len(expected)
+        for actual_frame, expected_frame in zip(actual, expected):
+            assert np.array_equal(actual_frame, expected_frame)
+
+
+class TestSegmentedConverter:
+    """Test SegmentedConverter.convert"""
+
+    def test_bars_detected_once_for_all_segments(self, tmp_path, monkeypatch):
+        """Every worker crops the picture area detected on the whole video"""
+        monkeypatch.setattr(segmented_converter, "ProcessPoolExecutor", FakePool)
+        ffmpeg = FakeFFmpegHandler()
+        converter = SegmentedConverter(ffmpeg, workers=2, overlap_frames=2)
+        target = segmented_converter.OutputTarget("half_sbs", tmp_path / "out.mp4")
+
+        converter.convert(
+            tmp_path / "movie.mp4", [target], tmp_path / "work", keep_audio=False,
+            processor_options={"crop_bars": True}
+        )
+
+        assert len(FakePool.jobs) == 2
+        areas = [job["active_area"] for job in FakePool.jobs]
+        assert areas[0] is not None and areas[0].shape == (88, 160)
+        assert areas[1] is areas[0]
+        # Workers use it instead of detecting bars on their own frames
+        assert FakePool.initargs[3]["crop_bars"] is False
+        # Samples span the whole video, not one segment
+        assert min(ffmpeg.reads) < SCENE_CUT <= max(ffmpeg.reads)
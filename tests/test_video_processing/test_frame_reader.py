@@ -0,0 +1,40 @@
+"""
+Tests for the Dual-Resolution Frame Reader
+"""
+import sys
+from src.video_processing.frame_reader import DualResolutionReader, model_frame_size
+
+# Stand-in for FFmpeg: three stacked 8x4 + 4x2 (padded to 8 wide) frames
+FAKE_FFMPEG = """#!{python}
+import sys
+for value in range(3):
+    sys.stdout.buffer.write(bytes([value]) * (8 * 6 * 3))
+"""
+
+
+class TestDualResolutionReader:
+    """Test DualResolutionReader class"""
+
+    def test_model_frame_size(self):
+        """Shorter side goes to the model size, never upscaled"""
+        assert model_frame_size(1920, 1080, 384) == (682, 384)
+        assert model_frame_size(1080, 1920, 256) == (256, 456)
+        assert model_frame_size(320, 240, 384) == (320, 240)
+
+    def test_splits_stacked_frames(self, tmp_path, monkeypatch, make_ffmpeg_handler):
+        """Each raw frame is split into the full and the model frame"""
+        ffmpeg = tmp_path / "ffmpeg"
+        ffmpeg.write_text(FAKE_FFMPEG.format(python=sys.executable))
+        ffmpeg.chmod(0o755)
+        handler = make_ffmpeg_handler(ffmpeg)
+        monkeypatch.setattr(handler, "get_video_info", lambda path: {
+            "width": 8, "height": 4, "fps": 25.0, "duration": 0.12, "frame_count": 3
+        })
+
+        reader = DualResolutionReader(handler, tmp_path / "in.mp4", (4, 2), prefetch=1)
+        frames = [(full.copy(), model.copy()) for full, model in reader]
+
+        assert len(reader) == 3
+        assert [full.shape for full, _ in frames] == [(4, 8, 3)] * 3
+        assert [model.shape for _, model in frames] == [(2, 4, 3)] * 3
+        assert [int(model[0, 0, 0]) for _, model in frames] == [0, 1, 2]
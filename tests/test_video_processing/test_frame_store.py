@@ -0,0 +1,54 @@
+"""
+Tests for the Memory-Mapped Frame Store
+"""
+import pytest
+import numpy as np
+from src.video_processing.frame_manager import FrameManager
+from src.video_processing.frame_store import FrameStore
+
+
+class TestFrameStore:
+    """Test FrameStore class"""
+
+    def test_round_trip_and_reopen(self, tmp_path, sample_image):
+        """Records are read back by index and counted after reopening"""
+        path = tmp_path / "frames.fstore"
+        store = FrameStore.create(path, 10, sample_image.shape, np.uint8)
+        store.write(3, sample_image)
+        store.write(3, sample_image)
+        store.write(7, sample_image // 2)
+        store.close()
+
+        with FrameStore.open(path, readonly=True) as store:
+            assert store.count == 2
+            assert np.array_equal(store.read(3), sample_image)
+            assert np.array_equal(store.read(7), sample_image // 2)
+            assert store.read(0) is None
+
+    def test_rejects_wrong_shape(self, tmp_path, sample_image):
+        """Records must match the store's shape"""
+        store = FrameStore.create(tmp_path / "frames.fstore", 2, sample_image.shape, np.uint8)
+
+        with pytest.raises(ValueError):
+            store.write(0, sample_image[:10])
+
+
+class TestFrameManagerStore:
+    """Test FrameManager with the 'store' backend"""
+
+    def test_status_counts(self, tmp_path, sample_image, sample_depth_map):
+        """Frames, depth maps and views go to stores with O(1) counters"""
+        manager = FrameManager(str(tmp_path / "work"), storage='store', frame_count=5)
+        for i in range(3):
+            manager.save_frame(i, sample_image)
+            manager.save_depth_map(i, sample_depth_map, dtype='uint16')
+        manager.save_stereo_pair(0, sample_image, sample_image)
+
+        status = manager.get_processing_status()
+
+        assert status['total_frames'] == 3
+        assert status['depth_maps_generated'] == 3
+        assert status['stereo_pairs_generated'] == 1
+        assert manager.load_depth_map(1).dtype == np.uint16
+        assert np.array_equal(manager.load_frame(2), sample_image)
+        manager.cleanup()
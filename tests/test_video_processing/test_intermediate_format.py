@@ -0,0 +1,60 @@
+"""
+Tests for Intermediate Frame Formats
+"""
+import cv2
+import pytest
+import numpy as np
+from src.video_processing import intermediate_format
+from src.video_processing.intermediate_format import (
+    INTERMEDIATE_FORMATS,
+    get_intermediate_format,
+    intermediate_format_key,
+    job_intermediate_format,
+)
+from src.video_processing.job_journal import JobJournal
+
+
+class TestIntermediateFormat:
+    """Test intermediate frame formats"""
+
+    @pytest.mark.parametrize("name", [n for n, f in INTERMEDIATE_FORMATS.items() if f.lossless])
+    def test_lossless_round_trip(self, tmp_path, sample_image, name):
+        """Lossless formats read back exactly"""
+        image_format = get_intermediate_format(name)
+        path = tmp_path / f"frame_000001{image_format.extension}"
+
+        assert image_format.write(path, sample_image)
+        assert np.array_equal(cv2.imread(str(path)), sample_image)
+
+    def test_16bit_frames_fall_back_to_png(self):
+        """Formats without 16-bit support hand 16-bit frames to PNG"""
+        assert get_intermediate_format("bmp").for_dtype(np.uint16).name == "png"
+        assert get_intermediate_format("png_fast").for_dtype(np.uint16).name == "png_fast"
+
+    def test_auto_picks_lossless(self, tmp_path):
+        """The benchmark never picks a lossy format"""
+        assert get_intermediate_format("auto", tmp_path).lossless
+
+    def test_resume_keeps_recorded_format(self, tmp_path, monkeypatch):
+        """A resumed job reuses its frame format even if the benchmark now picks another"""
+        input_path = tmp_path / "movie.mp4"
+        input_path.write_bytes(b"video")
+        work_dir = tmp_path / "job"
+        settings = {"intermediate_format": intermediate_format_key("auto")}
+
+        monkeypatch.setattr(intermediate_format, "choose_intermediate_format", lambda work_dir: "bmp")
+        journal = JobJournal(work_dir, input_path, settings)
+        assert job_intermediate_format("auto", journal).name == "bmp"
+        journal.mark_stage("extract")
+
+        monkeypatch.setattr(intermediate_format, "choose_intermediate_format", lambda work_dir: "png")
+        journal = JobJournal(work_dir, input_path, settings, resume=True)
+        assert journal.is_stage_done("extract")
+        assert job_intermediate_format("auto", journal).name == "bmp"
+
+    def test_lossless_formats_share_job_setting(self):
+        """Only lossy formats change the job key"""
+        assert intermediate_format_key("auto") == intermediate_format_key("bmp") == "lossless"
+        assert intermediate_format_key("jpg") == "jpg"
+        with pytest.raises(ValueError):
+            intermediate_format_key("tiff")
@@ -0,0 +1,52 @@
+"""
+Tests for the Conversion Job Journal
+"""
+import pytest
+from src.video_processing.job_journal import JobJournal
+
+
+@pytest.fixture
+def input_video(tmp_path):
+    """Stand-in input file (only its path, size and mtime are hashed)"""
+    path = tmp_path / "movie.mp4"
+    path.write_bytes(b"video")
+    return path
+
+
+class TestJobJournal:
+    """Test JobJournal class"""
+
+    def test_resume_keeps_completed_work(self, tmp_path, input_video):
+        """Stages, frames and segments survive a restart with the same settings"""
+        work_dir = tmp_path / "job"
+        journal = JobJournal(work_dir, input_video, {"format": "half_sbs"})
+        journal.mark_stage("extract")
+        journal.mark_frames(0, 100)
+        journal.mark_frames(150, 160)
+        journal.mark_frames(100)
+        segment = work_dir / "segment.mp4"
+        segment.write_bytes(b"")
+        journal.mark_segment("a", [segment])
+        journal.flush()
+
+        resumed = JobJournal(work_dir, input_video, {"format": "half_sbs"}, resume=True)
+
+        assert resumed.resumed
+        assert resumed.is_stage_done("extract")
+        assert resumed.completed_ranges == [(0, 101), (150, 160)]
+        assert resumed.frames_done == 101
+        assert resumed.segment_outputs("a") == [segment]
+
+    def test_changed_settings_start_over(self, tmp_path, input_video):
+        """Work done with other settings is discarded"""
+        work_dir = tmp_path / "job"
+        journal = JobJournal(work_dir, input_video, {"format": "half_sbs"})
+        journal.mark_frames(0, 10)
+        journal.flush()
+        (work_dir / "frame_000001.png").write_bytes(b"")
+
+        restarted = JobJournal(work_dir, input_video, {"format": "anaglyph"}, resume=True)
+
+        assert not restarted.resumed
+        assert restarted.frames_done == 0
+        assert not (work_dir / "frame_000001.png").exists()
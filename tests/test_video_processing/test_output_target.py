@@ -0,0 +1,46 @@
+"""
+Tests for Output Targets
+"""
+import numpy as np
+import pytest
+from src.rendering.sbs_composer import SBSComposer
+from src.video_processing.output_target import OutputTarget
+
+
+class TestOutputTarget:
+    """Test OutputTarget class"""
+
+    @pytest.mark.parametrize("output_format", SBSComposer.INTERLEAVED_FORMATS)
+    def test_scaled_interleaving_keeps_eyes_apart(self, output_format):
+        """Interleaved targets scale the views first, so eyes are never blended"""
+        left = np.zeros((1080, 1920, 3), dtype=np.uint8)
+        right = np.full((1080, 1920, 3), 255, dtype=np.uint8)
+        target = OutputTarget.parse(f"format={output_format},size=960x540")
+
+        frame = target.compose(SBSComposer(), left, None, (left, right))
+
+        assert frame.shape == (540, 960, 3)
+        assert set(np.unique(frame)) == {0, 255}
+        assert (frame == 255).mean() == pytest.approx(0.5)
+
+    @pytest.mark.parametrize("size", ["961x540", "960x541"])
+    def test_interleaved_size_must_be_even(self, size):
+        """Odd sizes would break row and column parity"""
+        with pytest.raises(ValueError):
+            OutputTarget.parse(f"format=row_interleaved,size={size}")
+        assert OutputTarget.parse(f"format=half_sbs,size={size}").resolution
+
+    def test_default_path_uses_input_extension(self, tmp_path):
+        """Image inputs get image outputs, video inputs .mp4"""
+        target = OutputTarget.parse("format=half_sbs")
+
+        image_target = target.for_input("shot", tmp_path, ext=target.image_extension("shot.JPG"))
+        assert image_target.path == tmp_path / "shot_half_sbs.jpg"
+        assert target.for_input("clip").path.name == "clip_half_sbs.mp4"
+
+    def test_16bit_image_target_is_png(self):
+        """JPEG cannot hold 10-bit depth, so the frame is written as PNG"""
+        target = OutputTarget.parse("format=rgbd_sbs,depth_bits=10")
+
+        assert target.image_extension("shot.jpg") == ".png"
+        assert target.image_extension("shot.tiff") == ".tiff"
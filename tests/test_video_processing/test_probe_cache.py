@@ -0,0 +1,64 @@
+"""
+Tests for the ffprobe Metadata Cache
+"""
+import os
+import pytest
+from src.video_processing.probe_cache import ProbeCache
+
+
+@pytest.fixture
+def make_handler(make_ffmpeg_handler, monkeypatch):
+    """Factory for FFmpegHandlers with a fake ffprobe that counts its runs"""
+    def make(cache):
+        handler = make_ffmpeg_handler(probe_cache=cache)
+        handler.probes = []
+
+        def fake_probe(video_path):
+            handler.probes.append(video_path)
+            if "broken" in str(video_path):
+                raise ValueError("No video stream found")
+            return {"duration": 12.0, "width": 640, "height": 480, "fps": 25.0}
+
+        monkeypatch.setattr(handler, "_probe_video_info", fake_probe)
+        return handler
+
+    return make
+
+
+class TestProbeCache:
+    """Test cached and bulk probing"""
+
+    def test_cache_hits_and_invalidation(self, tmp_path, make_handler):
+        """Unchanged files are probed once, modified files again"""
+        video = tmp_path / "clip.mp4"
+        video.write_bytes(b"video")
+        handler = make_handler(ProbeCache(tmp_path / "cache.json"))
+
+        assert handler.get_video_info(video)["width"] == 640
+        handler.get_video_info(video)
+        assert len(handler.probes) == 1
+
+        # Persisted: a fresh cache answers without ffprobe
+        handler = make_handler(ProbeCache(tmp_path / "cache.json"))
+        handler.get_video_info(video)
+        assert handler.probes == []
+
+        stat = video.stat()
+        os.utime(video, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+        handler.get_video_info(video)
+        assert len(handler.probes) == 1
+
+    def test_probe_many(self, tmp_path, make_handler):
+        """Bulk probing reuses cached entries and reports failures as None"""
+        paths = [tmp_path / f"clip{i}.mp4" for i in range(5)] + [tmp_path / "broken.mp4"]
+        for path in paths:
+            path.write_bytes(b"video")
+        handler = make_handler(ProbeCache(tmp_path / "cache.json"))
+        handler.get_video_info(paths[0])
+
+        results = handler.probe_many(paths + [tmp_path / "missing.mp4"])
+
+        assert len(handler.probes) == 6
+        assert results[paths[0]]["fps"] == 25.0
+        assert results[tmp_path / "broken.mp4"] is None
+        assert results[tmp_path / "missing.mp4"] is None
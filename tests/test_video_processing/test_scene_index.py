@@ -0,0 +1,51 @@
+"""
+Tests for the Scene Index
+"""
+import subprocess
+import pytest
+from src.video_processing.scene_index import SceneIndex
+
+
+class TestSceneIndex:
+    """Test SceneIndex class"""
+
+    def test_shots_and_thresholds(self):
+        """Cuts follow the threshold; weak scores are not kept"""
+        scores = [(frame, 0.01) for frame in range(100)]
+        scores[30] = (30, 0.9)
+        scores[60] = (60, 0.2)
+
+        index = SceneIndex.from_scores(scores)
+
+        assert index.frame_count == 100
+        assert index.cuts == [30]
+        assert index.shots == [(0, 30), (30, 100)]
+        assert index.shot_start(45) == 30
+        assert index.cuts_between(20, 100) == [10]
+        assert index.cuts_between(30, 100) == []
+
+        lower = SceneIndex.from_dict(index.to_dict(), threshold=0.15)
+        assert lower.cuts == [30, 60]
+        with pytest.raises(ValueError):
+            SceneIndex.from_dict(index.to_dict(), threshold=0.05)
+
+    def test_scan_is_cached(self, tmp_path, monkeypatch, make_ffmpeg_handler):
+        """FFmpeg's scene scores are parsed once per file"""
+        video = tmp_path / "clip.mp4"
+        video.write_bytes(b"video")
+        handler = make_ffmpeg_handler()
+        runs = []
+
+        def fake_run(cmd, **kwargs):
+            runs.append(cmd)
+            stdout = "".join(
+                f"frame:{n:<4} pts:{n:<7} pts_time:{n / 25}\nlavfi.scene_score={score:.6f}\n"
+                for n, score in enumerate([0.0, 0.02, 0.5, 0.03])
+            )
+            return subprocess.CompletedProcess(cmd, 0, stdout=stdout, stderr="")
+
+        monkeypatch.setattr(subprocess, "run", fake_run)
+
+        assert handler.get_scene_index(video).shots == [(0, 2), (2, 4)]
+        assert handler.get_scene_index(video, threshold=0.6).cuts == []
+        assert len(runs) == 1
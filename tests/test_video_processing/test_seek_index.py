@@ -0,0 +1,31 @@
+"""
+Tests for the Keyframe Seek Index
+"""
+import pytest
+from src.video_processing.seek_index import SeekIndex
+
+
+class TestSeekIndex:
+    """Test SeekIndex class"""
+
+    def test_frames_numbered_in_presentation_order(self):
+        """Packets in decode order are numbered by timestamp"""
+        # I P B B I P B B (decode order), 4 fps
+        packets = [(0.0, True), (0.75, False), (0.25, False), (0.5, False),
+                   (1.0, True), (1.75, False), (1.25, False), (1.5, False)]
+
+        index = SeekIndex.from_packets(packets)
+
+        assert index.frame_count == 8
+        assert index.keyframes == [(0.0, 0), (1.0, 4)]
+        assert index.keyframe_before(3) == (0.0, 0)
+        assert index.keyframe_before(4) == (1.0, 4)
+        assert index.keyframe_before(7) == (1.0, 4)
+
+    def test_round_trip_and_bounds(self):
+        """Index survives serialization and rejects frames outside the video"""
+        index = SeekIndex.from_dict(SeekIndex(0.1, 100, [(0.1, 0), (2.1, 50)]).to_dict())
+
+        assert index.keyframe_times == [0.1, 2.1]
+        with pytest.raises(ValueError):
+            index.keyframe_before(100)
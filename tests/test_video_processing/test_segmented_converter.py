@@ -0,0 +1,55 @@
+"""
+Tests for Segmented Conversion
+"""
+import pytest
+from src.video_processing.seek_index import SeekIndex
+from src.video_processing.segmented_converter import VideoSegment, plan_segments
+
+
+class TestPlanSegments:
+    """Test keyframe-aligned segment planning"""
+
+    def test_splits_at_nearest_keyframes(self):
+        """Segments start at keyframes and warm up on preceding frames"""
+        keyframes = [0, 50, 100, 150, 200, 250]
+
+        segments = plan_segments(keyframes, total_frames=300, segments=3, overlap_frames=12)
+
+        assert [(s.start, s.stop, s.warmup) for s in segments] == [
+            (0, 100, 0), (100, 200, 12), (200, None, 12)
+        ]
+        assert segments[1].first_frame == 88
+        assert segments[1].frame_count == 112
+
+    def test_prefers_shot_boundaries(self):
+        """Nearby keyframes on a cut win and need no warm-up"""
+        keyframes = [0, 50, 110, 150, 200, 250]
+
+        segments = plan_segments(
+            keyframes, total_frames=300, segments=3, overlap_frames=12, scene_cuts=[110, 150]
+        )
+
+        assert [(s.start, s.warmup) for s in segments] == [(0, 0), (110, 0), (200, 12)]
+
+    def test_splits_at_seek_index_frames(self):
+        """Splits use keyframe frame numbers, not timestamps, when the video starts late"""
+        packets = [(1.4 + i / 25, i % 50 == 0) for i in range(300)]
+        seek_index = SeekIndex.from_packets(packets)
+
+        segments = plan_segments(
+            [frame for _, frame in seek_index.keyframes], seek_index.frame_count, segments=3
+        )
+
+        assert [(s.start, s.stop) for s in segments] == [(0, 100), (100, 200), (200, None)]
+
+    def test_sparse_keyframes(self):
+        """Without usable keyframes the video stays one segment"""
+        segments = plan_segments([0], total_frames=300, segments=4)
+
+        assert len(segments) == 1
+        assert segments[0].frame_count is None
+
+    def test_invalid_warmup(self):
+        """Warm-up cannot reach before the first frame"""
+        with pytest.raises(ValueError):
+            VideoSegment(1, 5, 10, warmup=6)
@@ -0,0 +1,48 @@
+"""
+Tests for Static Frame Detection
+"""
+import numpy as np
+import pytest
+from src.video_processing.static_frames import StaticFrameDetector, REUSE_DEPTH, REUSE_OUTPUT
+
+
+def make_frame(seed):
+    """Random 90x160 RGB frame"""
+    return np.random.default_rng(seed).integers(0, 256, (90, 160, 3), dtype=np.uint8)
+
+
+class TestStaticFrameDetector:
+    """Test StaticFrameDetector"""
+
+    def test_reuse_modes(self):
+        """Duplicates reuse the output, small changes the depth, cuts nothing"""
+        detector = StaticFrameDetector()
+        frame = make_frame(0)
+
+        assert detector.check(frame) is None
+        assert detector.check(frame.copy()) == REUSE_OUTPUT
+        assert detector.check(frame + np.uint8(1)) == REUSE_DEPTH
+        assert detector.check(make_frame(1)) is None
+        assert (detector.frames, detector.outputs_reused, detector.depths_reused) == (4, 1, 1)
+
+    def test_slow_drift_is_not_accumulated(self):
+        """Changes are measured from the frame depth was estimated on"""
+        detector = StaticFrameDetector()
+        frame = np.full((90, 160, 3), 100, np.uint8)
+
+        modes = [detector.check(frame + np.uint8(step)) for step in range(4)]
+
+        assert modes == [None, REUSE_DEPTH, REUSE_DEPTH, None]
+
+    def test_output_reuse_disabled(self):
+        """Without a previous output, duplicates still reuse the depth map"""
+        detector = StaticFrameDetector()
+        frame = make_frame(0)
+        detector.check(frame)
+
+        assert detector.check(frame, can_reuse_output=False) == REUSE_DEPTH
+
+    def test_invalid_thresholds(self):
+        """The output threshold cannot exceed the depth threshold"""
+        with pytest.raises(ValueError):
+            StaticFrameDetector(output_threshold=3.0, depth_threshold=2.0)
@@ -0,0 +1,50 @@
+"""
+Tests for Audio and Subtitle Stream Mapping
+"""
+import pytest
+from pathlib import Path
+
+
+@pytest.fixture
+def make_handler(make_ffmpeg_handler, monkeypatch):
+    """Factory for FFmpegHandlers whose source file has the given stream codecs"""
+    def make(audio, subtitle):
+        handler = make_ffmpeg_handler()
+        monkeypatch.setattr(
+            handler, "get_stream_codecs", lambda path: {"audio": audio, "subtitle": subtitle}
+        )
+        return handler
+
+    return make
+
+
+class TestStreamMux:
+    """Test FFmpegHandler.stream_mux_args"""
+
+    def test_copies_supported_audio(self, make_handler):
+        """Compatible audio is copied; only the first track by default"""
+        handler = make_handler(["aac", "dts"], ["subrip"])
+
+        args = handler.stream_mux_args(Path("in.mkv"), Path("out.mp4"))
+
+        assert args == ["-map", "1:a:0", "-c:a:0", "copy"]
+
+    def test_all_tracks_into_mp4(self, make_handler):
+        """Unsupported audio is transcoded, text subtitles converted, bitmap dropped"""
+        handler = make_handler(["aac", "dts"], ["hdmv_pgs_subtitle", "subrip"])
+
+        args = handler.stream_mux_args(Path("in.mkv"), Path("out.mp4"), all_tracks=True)
+
+        assert args == [
+            "-map", "1:a:0", "-c:a:0", "copy",
+            "-map", "1:a:1", "-c:a:1", "aac", "-b:a:1", "192k",
+            "-map", "1:s:1", "-c:s:0", "mov_text",
+        ]
+
+    def test_mkv_copies_everything(self, make_handler):
+        """Matroska takes any audio and subtitle codec"""
+        handler = make_handler(["dts"], ["hdmv_pgs_subtitle"])
+
+        args = handler.stream_mux_args(Path("in.mkv"), Path("out.mkv"), input_index=2, all_tracks=True)
+
+        assert args == ["-map", "2:a:0", "-c:a:0", "copy", "-map", "2:s:0", "-c:s:0", "copy"]